@@ -0,0 +1,456 @@
+"""
+File: checkpoint.py
+Created: 2026-10-19
+Description: LangGraph 체크포인터 (단일 노드용 SQLite, 쓰기 지연 방식)
+             - thread_id = 면접 session_id. 세션별 (namespace별) "최신" 체크포인트 1개와 그 pending writes만 보관
+             - put/put_writes는 메모리 캐시에 반영하고 바로 반환, SQLite 기록은 백그라운드 스레드가 묶어서 처리
+               → invoke 경로에는 직렬화 비용만 남는다 (같은 세션의 밀린 쓰기는 최신 것 하나로 합쳐짐)
+             - 재시작 후 메모리에 없는 세션은 조회 시점에 SQLite에서 읽어 복구
+             - LANGGRAPH_CHECKPOINT_PATH (기본 ./backend/checkpoints/langgraph.sqlite, 빈 값이면 비활성)
+             - LANGGRAPH_DURABILITY (기본 exit): 면접은 턴 단위로만 재개하면 되므로 invoke가 끝날 때 한 번만 저장
+               (async/sync는 노드마다 저장 → LangGraph 내부 백그라운드 실행기 비용까지 더해져 턴당 지연이 약 2배)
+             - langgraph-checkpoint-sqlite 패키지 없이 표준 sqlite3만 사용
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from backend.core import metrics
+from backend.core.structured_log import log_event
+
+CHECKPOINT_PATH = os.getenv("LANGGRAPH_CHECKPOINT_PATH", "./backend/checkpoints/langgraph.sqlite").strip()
+# 메모리에 올려두는 최대 세션 수 (넘치면 오래 안 쓴 세션부터 내림 - SQLite에는 남아 있음)
+CACHE_MAX_THREADS = int(os.getenv("LANGGRAPH_CHECKPOINT_CACHE", "1000"))
+DURABILITY = os.getenv("LANGGRAPH_DURABILITY", "exit").strip() or "exit"
+
+CHECKPOINT_WRITES = metrics.counter(
+    "langgraph_checkpoint_writes_total", "SQLite에 기록한 체크포인트 행 (kind=checkpoint|writes)", ("kind",)
+)
+CHECKPOINT_COALESCED = metrics.counter(
+    "langgraph_checkpoint_coalesced_total", "최신 체크포인트로 합쳐져 기록을 생략한 put"
+)
+CHECKPOINT_FLUSH = metrics.histogram(
+    "langgraph_checkpoint_flush_seconds", "쓰기 지연 배치 1회 커밋 시간", buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+)
+CHECKPOINT_QUEUE = metrics.gauge("langgraph_checkpoint_queue_depth", "SQLite 기록 대기 중인 작업 수")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS checkpoints (
+        thread_id TEXT NOT NULL,
+        checkpoint_ns TEXT NOT NULL DEFAULT '',
+        checkpoint_id TEXT NOT NULL,
+        parent_checkpoint_id TEXT,
+        checkpoint_type TEXT NOT NULL,
+        checkpoint BLOB NOT NULL,
+        metadata_type TEXT NOT NULL,
+        metadata BLOB NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (thread_id, checkpoint_ns)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS checkpoint_writes (
+        thread_id TEXT NOT NULL,
+        checkpoint_ns TEXT NOT NULL DEFAULT '',
+        checkpoint_id TEXT NOT NULL,
+        task_id TEXT NOT NULL,
+        idx INTEGER NOT NULL,
+        channel TEXT NOT NULL,
+        value_type TEXT NOT NULL,
+        value BLOB NOT NULL,
+        task_path TEXT NOT NULL DEFAULT '',
+        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+    )
+    """,
+)
+
+_Key = Tuple[str, str]  # (thread_id, checkpoint_ns)
+_Typed = Tuple[str, bytes]  # serde.dumps_typed 결과
+
+
+class _Entry:
+    """
+    세션(네임스페이스)별 최신 체크포인트 (channel_values 포함).
+    노드가 상태를 제자리에서 고치므로(history.append 등) 객체가 아닌 직렬화된 바이트로 보관하고 조회 때 복원한다.
+    """
+
+    __slots__ = ("checkpoint_id", "checkpoint", "metadata", "parent_id", "writes")
+
+    def __init__(self, checkpoint_id: str, checkpoint: _Typed, metadata: _Typed, parent_id: Optional[str]):
+        self.checkpoint_id = checkpoint_id
+        self.checkpoint = checkpoint
+        self.metadata = metadata
+        self.parent_id = parent_id
+        # (task_id, idx) -> (task_id, channel, value, task_path)
+        self.writes: Dict[Tuple[str, int], Tuple[str, str, _Typed, str]] = {}
+
+
+class SqliteWriteBehindSaver(BaseCheckpointSaver[str]):
+    """
+    최신 체크포인트만 유지하는 SQLite 체크포인터.
+    write_behind=False면 put마다 바로 커밋 (벤치마크 비교용).
+    이전 체크포인트 이력(time travel)은 지원하지 않는다 - 면접 재개에는 최신 상태만 필요.
+    """
+
+    def __init__(
+        self,
+        path: str = CHECKPOINT_PATH,
+        *,
+        write_behind: bool = True,
+        batch_max: int = 256,
+        cache_max_threads: int = CACHE_MAX_THREADS,
+    ):
+        super().__init__()
+        self.path = path
+        self.write_behind = write_behind
+        self.batch_max = batch_max
+        self.cache_max_threads = cache_max_threads
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[_Key, _Entry]" = OrderedDict()
+        self._conn = self._connect()
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        if write_behind:
+            self._writer = threading.Thread(target=self._write_loop, name="lg-checkpoint-writer", daemon=True)
+            self._writer.start()
+
+    # ─── SQLite ─────────────────────────────────────────
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for ddl in _SCHEMA:
+            conn.execute(ddl)
+        return conn
+
+    def _apply(self, ops: List[tuple]) -> None:
+        """작업 묶음을 트랜잭션 하나로 기록. 같은 세션의 체크포인트는 마지막 것만 쓴다"""
+        latest: Dict[_Key, tuple] = {}
+        writes: List[tuple] = []
+        deletes: List[str] = []
+        for op in ops:
+            kind = op[0]
+            if kind == "checkpoint":
+                if op[1] in latest:
+                    CHECKPOINT_COALESCED.inc()
+                latest[op[1]] = op
+            elif kind == "writes":
+                writes.extend(op[1])
+            elif kind == "delete":
+                deletes.append(op[1])
+                for key in [k for k in latest if k[0] == op[1]]:
+                    del latest[key]
+                writes = [w for w in writes if w[0] != op[1]]
+        # 합쳐져 사라진 이전 체크포인트의 writes는 기록하지 않는다
+        writes = [w for w in writes if (w[0], w[1]) not in latest or latest[(w[0], w[1])][2][0] == w[2]]
+
+        started = time.perf_counter()
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                for thread_id in deletes:
+                    cur.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+                    cur.execute("DELETE FROM checkpoint_writes WHERE thread_id = ?", (thread_id,))
+                for (thread_id, ns), (_, _, row) in latest.items():
+                    cur.execute(
+                        "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (thread_id, ns, *row),
+                    )
+                    # 새 체크포인트로 넘어가면 이전 체크포인트의 pending writes는 필요 없다
+                    cur.execute(
+                        "DELETE FROM checkpoint_writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id != ?",
+                        (thread_id, ns, row[0]),
+                    )
+                if writes:
+                    cur.executemany(
+                        "INSERT OR REPLACE INTO checkpoint_writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", writes
+                    )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+        CHECKPOINT_FLUSH.observe(time.perf_counter() - started)
+        if latest:
+            CHECKPOINT_WRITES.inc(len(latest), kind="checkpoint")
+        if writes:
+            CHECKPOINT_WRITES.inc(len(writes), kind="writes")
+
+    def _submit(self, op: tuple) -> None:
+        if self.write_behind:
+            self._queue.put(op)
+            CHECKPOINT_QUEUE.set(self._queue.qsize())
+        else:
+            self._apply([op])
+
+    def _write_loop(self) -> None:
+        while True:
+            op = self._queue.get()
+            ops = [op]
+            # 밀린 작업을 한 번에 가져와 트랜잭션 하나로 처리
+            while len(ops) < self.batch_max:
+                try:
+                    ops.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(o is None for o in ops)
+            batch = [o for o in ops if o is not None]
+            try:
+                if batch:
+                    self._apply(batch)
+            except Exception as e:
+                log_event("langgraph", "checkpoint.flush_failed", level=logging.ERROR, ops=len(batch), error=repr(e))
+            finally:
+                for _ in ops:
+                    self._queue.task_done()
+                CHECKPOINT_QUEUE.set(self._queue.qsize())
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """대기 중인 기록이 모두 커밋될 때까지 대기"""
+        if self.write_behind:
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout=10)
+        with self._lock:
+            self._conn.close()
+
+    def _load(self, key: _Key) -> Optional[_Entry]:
+        # 아직 기록되지 않은 쓰기가 있으면 먼저 비워야 최신 상태를 읽는다
+        if self.write_behind and self._queue.unfinished_tasks:
+            self.flush()
+        thread_id, ns = key
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT checkpoint_id, parent_checkpoint_id, checkpoint_type, checkpoint, metadata_type, metadata "
+                "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, ns),
+            ).fetchone()
+            if row is None:
+                return None
+            write_rows = self._conn.execute(
+                "SELECT task_id, idx, channel, value_type, value, task_path FROM checkpoint_writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, ns, row[0]),
+            ).fetchall()
+        entry = _Entry(row[0], (row[2], row[3]), (row[4], row[5]), row[1])
+        for task_id, idx, channel, value_type, value, task_path in write_rows:
+            entry.writes[(task_id, idx)] = (task_id, channel, (value_type, value), task_path)
+        return entry
+
+    # ─── 메모리 캐시 ─────────────────────────────────────
+    def _get_entry(self, key: _Key) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                return entry
+        entry = self._load(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: _Key, entry: _Entry) -> None:
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_max_threads:
+                self._cache.popitem(last=False)
+
+    def _tuple(self, key: _Key, entry: _Entry) -> CheckpointTuple:
+        thread_id, ns = key
+        with self._lock:
+            writes = list(entry.writes.values())
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": ns,
+                    "checkpoint_id": entry.checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed(entry.checkpoint),
+            metadata=self.serde.loads_typed(entry.metadata),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": entry.parent_id}}
+                if entry.parent_id
+                else None
+            ),
+            pending_writes=[(task_id, channel, self.serde.loads_typed(value)) for task_id, channel, value, _ in writes],
+        )
+
+    # ─── BaseCheckpointSaver ────────────────────────────
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        key = (str(config["configurable"]["thread_id"]), config["configurable"].get("checkpoint_ns", ""))
+        entry = self._get_entry(key)
+        if entry is None:
+            return None
+        checkpoint_id = get_checkpoint_id(config)
+        if checkpoint_id and checkpoint_id != entry.checkpoint_id:
+            return None
+        return self._tuple(key, entry)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        if config is None:
+            return
+        found = self.get_tuple(config)
+        if found is None or (limit is not None and limit <= 0):
+            return
+        if before and (before_id := get_checkpoint_id(before)) and found.config["configurable"]["checkpoint_id"] >= before_id:
+            return
+        if filter and not all(found.metadata.get(k) == v for k, v in filter.items()):
+            return
+        yield found
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = str(config["configurable"]["thread_id"])
+        ns = config["configurable"].get("checkpoint_ns", "")
+        key = (thread_id, ns)
+
+        # 보통 channel_values에 모든 채널 값이 들어오지만, 빠진 채널이 있으면 직전 체크포인트 값을 유지
+        # (new_versions에 있는데 값이 없으면 비워진 채널 - InMemorySaver와 같은 의미)
+        values = dict(checkpoint.get("channel_values") or {})
+        missing = [c for c in checkpoint["channel_versions"] if c not in values and c not in new_versions]
+        if missing:
+            prev = self._get_entry(key)
+            prev_values = self.serde.loads_typed(prev.checkpoint).get("channel_values", {}) if prev else {}
+            values.update({c: prev_values[c] for c in missing if c in prev_values})
+        full: Checkpoint = {**checkpoint, "channel_values": values}
+        parent_id = config["configurable"].get("checkpoint_id")
+
+        ck = self.serde.dumps_typed(full)
+        md = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        self._remember(key, _Entry(checkpoint["id"], ck, md, parent_id))
+        self._submit(("checkpoint", key, (checkpoint["id"], parent_id, ck[0], ck[1], md[0], md[1], time.time())))
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = str(config["configurable"]["thread_id"])
+        ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        entry = self._get_entry((thread_id, ns))
+        if entry is None or entry.checkpoint_id != checkpoint_id:
+            return
+        rows = []
+        with self._lock:
+            for idx, (channel, value) in enumerate(writes):
+                inner = (task_id, WRITES_IDX_MAP.get(channel, idx))
+                if inner[1] >= 0 and inner in entry.writes:
+                    continue
+                typed = self.serde.dumps_typed(value)
+                entry.writes[inner] = (task_id, channel, typed, task_path)
+                rows.append((thread_id, ns, checkpoint_id, task_id, inner[1], channel, typed[0], typed[1], task_path))
+        if rows:
+            self._submit(("writes", rows))
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self._cache if k[0] == str(thread_id)]:
+                del self._cache[key]
+        self._submit(("delete", str(thread_id)))
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.delete_thread(thread_id)
+
+
+_saver: Optional[SqliteWriteBehindSaver] = None
+_saver_lock = threading.Lock()
+
+
+def get_checkpointer() -> Optional[SqliteWriteBehindSaver]:
+    """프로세스 공용 체크포인터 (LANGGRAPH_CHECKPOINT_PATH가 비어 있으면 None)"""
+    global _saver
+    if not CHECKPOINT_PATH:
+        return None
+    if _saver is None:
+        with _saver_lock:
+            if _saver is None:
+                _saver = SqliteWriteBehindSaver(CHECKPOINT_PATH)
+                atexit.register(_saver.close)
+    return _saver
+
+
+def thread_config(session_id: Any) -> RunnableConfig:
+    return {"configurable": {"thread_id": str(session_id)}}
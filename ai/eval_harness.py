@@ -0,0 +1,358 @@
+"""
+File: eval_harness.py
+Created: 2026-10-19
+Description: 평가 프롬프트/모델 회귀 + 지연 하네스 (test_eval_prompt.py의 일괄 실행판)
+             - 케이스 파일(JSONL): {id, question_row, answer, expected: [최저, 최고], rag_context?}
+             - 케이스 × 변형(variant) × 반복을 동시에 ai/evaluator.evaluate_answer로 평가
+             - 케이스별 기록: 점수, 기대 구간 적중 여부, JSON 유효성(valid/salvaged/repaired/failed), 지연, 토큰/비용
+             - 변형별 요약: 구간 적중률, JSON 유효율, 지연 p50/p95/p99, 케이스당 토큰
+             - 두 변형(또는 --baseline으로 지정한 이전 리포트) 비교: 점수 드리프트, 구간 이탈/복귀 케이스, 지연/토큰 차이
+             - 변형 지정: --variant 이름:model=gpt-4.1-mini,prompts=프롬프트.json
+               (prompts JSON 키: SYSTEM_PROMPT_EVAL / EVAL_JSON_SCHEMA_INSTRUCTIONS / EVAL_FEWSHOT 중 바꿀 것)
+             - --standin: 로컬 OpenAI 스탠드인으로 드라이런
+
+실행: python -m ai.eval_harness --variant base:model=gpt-4.1-mini --variant cand:model=gpt-4.1-mini,prompts=new_prompts.json
+      python -m ai.eval_harness --standin --repeat 3
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CASES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eval_cases.jsonl")
+DEFAULT_MODEL = "gpt-4.1-mini"
+CALL_SITE = "eval_harness"
+
+# question_row에 빠진 키는 평가 프롬프트가 기대하는 기본값으로 채운다
+_ROW_DEFAULTS: Dict[str, Any] = {
+    "answer": "",
+    "difficulty": "",
+    "topic": "",
+    "subcategory": "",
+    "difficulty_score": None,
+    "tags": [],
+    "code_example": "",
+    "time_complexity": "",
+    "space_complexity": "",
+}
+
+
+@dataclass
+class Case:
+    id: str
+    question_row: Dict[str, Any]
+    answer: str
+    expected: Tuple[int, int]
+    rag_context: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Variant:
+    name: str
+    model: str = DEFAULT_MODEL
+    prompts_path: Optional[str] = None
+    prompt_overrides: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class CaseResult:
+    case_id: str
+    variant: str
+    repeat: int
+    score: Optional[int]
+    in_band: bool
+    band_error: Optional[int]   # 기대 구간 밖으로 벗어난 점수 (구간 안이면 0)
+    json_outcome: str           # valid / salvaged / repaired / failed
+    latency_ms: float
+    tokens_in: int
+    tokens_out: int
+    tokens_cached: int
+    cost_usd: float
+    error: str = ""
+
+
+def load_cases(path: str) -> List[Case]:
+    cases = []
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            raw = json.loads(line)
+            low, high = raw["expected"]
+            row = {**_ROW_DEFAULTS, **raw["question_row"]}
+            cases.append(Case(str(raw.get("id") or f"line{n}"), row, raw["answer"], (int(low), int(high)), raw.get("rag_context") or {}))
+    return cases
+
+
+def parse_variant(spec: str) -> Variant:
+    """"이름:model=...,prompts=..." → Variant"""
+    name, _, rest = spec.partition(":")
+    variant = Variant(name=name.strip() or "base")
+    for item in filter(None, (p.strip() for p in rest.split(","))):
+        key, _, value = item.partition("=")
+        if key == "model":
+            variant.model = value
+        elif key == "prompts":
+            variant.prompts_path = value
+            with open(value, "r", encoding="utf-8") as f:
+                variant.prompt_overrides = json.load(f)
+        else:
+            raise SystemExit(f"알 수 없는 변형 옵션: {item} (model= / prompts= 만 지원)")
+    return variant
+
+
+def band_error(score: Optional[int], band: Tuple[int, int]) -> Optional[int]:
+    if score is None:
+        return None
+    low, high = band
+    return low - score if score < low else score - high if score > high else 0
+
+
+def _json_outcome(out_text: str, out_text2: str) -> str:
+    from pydantic import ValidationError
+
+    from ai.eval_schema import AnswerEvaluation
+
+    if out_text2:
+        return "repaired"
+    try:
+        AnswerEvaluation.model_validate_json(out_text)
+        return "valid"
+    except ValidationError:
+        return "salvaged"
+
+
+def run_case(case: Case, variant: Variant, repeat: int) -> CaseResult:
+    from ai.evaluator import evaluate_answer
+    from backend.core import metrics
+
+    score: Optional[int] = None
+    outcome, error = "failed", ""
+    started = time.perf_counter()
+    with metrics.capture_llm_usage() as usage:
+        try:
+            eval_json, out_text, out_text2 = evaluate_answer(
+                question_row=case.question_row,
+                user_answer_text=case.answer,
+                rag_context=case.rag_context,
+                model=variant.model,
+                call_site=CALL_SITE,
+                prompt_overrides=variant.prompt_overrides,
+            )
+            score = int(eval_json["score"])
+            outcome = _json_outcome(out_text, out_text2)
+        except Exception as e:
+            error = repr(e)
+    latency_ms = (time.perf_counter() - started) * 1000
+    err = band_error(score, case.expected)
+    return CaseResult(
+        case_id=case.id,
+        variant=variant.name,
+        repeat=repeat,
+        score=score,
+        in_band=err == 0,
+        band_error=err,
+        json_outcome=outcome,
+        latency_ms=round(latency_ms, 1),
+        tokens_in=int(usage["input"]),
+        tokens_out=int(usage["output"]),
+        tokens_cached=int(usage["cached"]),
+        cost_usd=round(usage["cost_usd"], 6),
+        error=error,
+    )
+
+
+def run_all(cases: List[Case], variants: List[Variant], repeat: int, concurrency: int) -> List[CaseResult]:
+    # 변형끼리 같은 시간대에 섞여 돌도록 (케이스, 반복, 변형) 순서로 제출
+    jobs = [(c, v, r) for c in cases for r in range(repeat) for v in variants]
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="eval-harness") as pool:
+        return list(pool.map(lambda job: run_case(*job), jobs))
+
+
+# ─── 집계 ─────────────────────────────────────────────────
+def _percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(p * len(ordered))) - 1))]
+
+
+def summarize(results: List[CaseResult]) -> Dict[str, Any]:
+    n = len(results)
+    scored = [r for r in results if r.score is not None]
+    latencies = [r.latency_ms for r in results]
+    outcomes = {k: sum(1 for r in results if r.json_outcome == k) for k in ("valid", "salvaged", "repaired", "failed")}
+    # 같은 케이스를 반복했을 때 점수 흔들림 (케이스별 표준편차의 평균)
+    by_case: Dict[str, List[int]] = {}
+    for r in scored:
+        by_case.setdefault(r.case_id, []).append(r.score)
+    spreads = [statistics.pstdev(v) for v in by_case.values() if len(v) > 1]
+    return {
+        "runs": n,
+        "band_hit_rate": round(sum(1 for r in results if r.in_band) / n, 3) if n else 0.0,
+        "band_mae": round(statistics.mean(r.band_error for r in scored), 2) if scored else None,
+        "json_valid_rate": round((outcomes["valid"] + outcomes["salvaged"]) / n, 3) if n else 0.0,
+        "json_outcomes": outcomes,
+        "score_repeat_stdev": round(statistics.mean(spreads), 2) if spreads else None,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 0.50), 1),
+            "p95": round(_percentile(latencies, 0.95), 1),
+            "p99": round(_percentile(latencies, 0.99), 1),
+        },
+        "tokens_per_case": {
+            "input": round(statistics.mean(r.tokens_in for r in results), 1) if n else 0,
+            "cached": round(statistics.mean(r.tokens_cached for r in results), 1) if n else 0,
+            "output": round(statistics.mean(r.tokens_out for r in results), 1) if n else 0,
+        },
+        "cost_usd": round(sum(r.cost_usd for r in results), 6),
+    }
+
+
+def _mean_scores(results: List[Dict[str, Any]]) -> Dict[str, float]:
+    by_case: Dict[str, List[int]] = {}
+    for r in results:
+        if r["score"] is not None:
+            by_case.setdefault(r["case_id"], []).append(r["score"])
+    return {cid: statistics.mean(v) for cid, v in by_case.items()}
+
+
+def compare(base: Dict[str, Any], cand: Dict[str, Any], drift_threshold: float) -> Dict[str, Any]:
+    """base/cand: {"name", "summary", "results"(dict 목록), "bands"}. 케이스별 평균 점수 기준 드리프트"""
+    a, b = _mean_scores(base["results"]), _mean_scores(cand["results"])
+    bands = {**base.get("bands", {}), **cand.get("bands", {})}
+    common = sorted(set(a) & set(b))
+    drifts = {cid: round(b[cid] - a[cid], 1) for cid in common}
+
+    def in_band(cid: str, score: float) -> bool:
+        low, high = bands.get(cid, (0, 100))
+        return low <= score <= high
+
+    sa, sb = base["summary"], cand["summary"]
+    return {
+        "base": base["name"],
+        "candidate": cand["name"],
+        "cases_compared": len(common),
+        "mean_drift": round(statistics.mean(drifts.values()), 2) if drifts else None,
+        "mean_abs_drift": round(statistics.mean(abs(d) for d in drifts.values()), 2) if drifts else None,
+        "drifted_cases": {cid: d for cid, d in drifts.items() if abs(d) >= drift_threshold},
+        "left_band": [cid for cid in common if in_band(cid, a[cid]) and not in_band(cid, b[cid])],
+        "entered_band": [cid for cid in common if not in_band(cid, a[cid]) and in_band(cid, b[cid])],
+        "band_hit_rate_delta": round(sb["band_hit_rate"] - sa["band_hit_rate"], 3),
+        "json_valid_rate_delta": round(sb["json_valid_rate"] - sa["json_valid_rate"], 3),
+        "latency_p50_delta_ms": round(sb["latency_ms"]["p50"] - sa["latency_ms"]["p50"], 1),
+        "latency_p95_delta_ms": round(sb["latency_ms"]["p95"] - sa["latency_ms"]["p95"], 1),
+        "tokens_per_case_delta": {
+            k: round(sb["tokens_per_case"][k] - sa["tokens_per_case"][k], 1) for k in sa["tokens_per_case"]
+        },
+    }
+
+
+# ─── 출력 ─────────────────────────────────────────────────
+def format_summary(name: str, s: Dict[str, Any]) -> str:
+    lat, tok = s["latency_ms"], s["tokens_per_case"]
+    return (
+        f"[{name}] {s['runs']}회 | 구간 적중 {s['band_hit_rate'] * 100:.0f}% (MAE {s['band_mae']}) "
+        f"| JSON 유효 {s['json_valid_rate'] * 100:.0f}% {s['json_outcomes']} | 반복 표준편차 {s['score_repeat_stdev']}\n"
+        f"    지연 p50 {lat['p50']}ms p95 {lat['p95']}ms p99 {lat['p99']}ms "
+        f"| 케이스당 토큰 입력 {tok['input']} (캐시 {tok['cached']}) 출력 {tok['output']} | 비용 ${s['cost_usd']:.4f}"
+    )
+
+
+def format_comparison(c: Dict[str, Any]) -> str:
+    lines = [
+        f"=== {c['base']} → {c['candidate']} ({c['cases_compared']}개 케이스) ===",
+        f"평균 드리프트 {c['mean_drift']:+} / 평균 |드리프트| {c['mean_abs_drift']}" if c["mean_drift"] is not None else "공통 케이스 없음",
+        f"구간 적중률 {c['band_hit_rate_delta']:+.3f} | JSON 유효율 {c['json_valid_rate_delta']:+.3f} "
+        f"| 지연 p50 {c['latency_p50_delta_ms']:+}ms p95 {c['latency_p95_delta_ms']:+}ms "
+        f"| 케이스당 토큰 {c['tokens_per_case_delta']}",
+    ]
+    if c["drifted_cases"]:
+        lines.append("드리프트 큰 케이스: " + ", ".join(f"{k}({v:+})" for k, v in sorted(c["drifted_cases"].items())))
+    if c["left_band"]:
+        lines.append("구간 이탈: " + ", ".join(c["left_band"]))
+    if c["entered_band"]:
+        lines.append("구간 복귀: " + ", ".join(c["entered_band"]))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default=DEFAULT_CASES)
+    parser.add_argument("--variant", action="append", default=[], help="이름:model=...,prompts=... (최대 2개)")
+    parser.add_argument("--baseline", help="이전 리포트 JSON - 이번 첫 번째 변형과 비교")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--drift-threshold", type=float, default=10.0)
+    parser.add_argument("--out", help="리포트 JSON 경로 (기본 ai/logs/eval_harness_<시각>.json)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="후보 변형의 구간 적중률/JSON 유효율이 떨어지면 종료 코드 1")
+    parser.add_argument("--standin", action="store_true", help="로컬 OpenAI 스탠드인으로 드라이런")
+    args = parser.parse_args(argv)
+
+    standin = None
+    if args.standin:
+        from devtools.standins import use_openai_standin
+
+        standin = use_openai_standin()
+    variants = [parse_variant(v) for v in args.variant] or [Variant("base")]
+    if len(variants) > 2:
+        raise SystemExit("--variant는 최대 2개 (기준, 후보)")
+    cases = load_cases(args.cases)
+    print(f"케이스 {len(cases)}개 × 변형 {len(variants)}개 × 반복 {args.repeat} (동시 {args.concurrency})")
+
+    started = time.perf_counter()
+    try:
+        results = run_all(cases, variants, args.repeat, args.concurrency)
+    finally:
+        if standin is not None:
+            standin.stop()
+    wall = time.perf_counter() - started
+
+    bands = {c.id: list(c.expected) for c in cases}
+    report: Dict[str, Any] = {"created_at": datetime.now().isoformat(), "cases_file": args.cases, "wall_sec": round(wall, 2), "variants": []}
+    for v in variants:
+        rows = [asdict(r) for r in results if r.variant == v.name]
+        summary = summarize([r for r in results if r.variant == v.name])
+        report["variants"].append(
+            {"name": v.name, "model": v.model, "prompts": v.prompts_path, "summary": summary, "results": rows, "bands": bands}
+        )
+        print(format_summary(v.name, summary))
+
+    comparison = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            previous = json.load(f)["variants"][0]
+        previous["name"] = f"{previous['name']}@baseline"
+        comparison = compare(previous, report["variants"][0], args.drift_threshold)
+    elif len(variants) == 2:
+        comparison = compare(report["variants"][0], report["variants"][1], args.drift_threshold)
+    if comparison is not None:
+        report["comparison"] = comparison
+        print(format_comparison(comparison))
+
+    out = args.out or os.path.join("ai", "logs", f"eval_harness_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"리포트: {out} ({wall:.1f}s)")
+
+    if args.fail_on_regression and comparison is not None:
+        if comparison["band_hit_rate_delta"] < 0 or comparison["json_valid_rate_delta"] < 0:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+File: eval_schema.py
+Created: 2026-10-19
+Description: 답변 평가 JSON 스키마 (Pydantic) - ai/evaluator와 backend llm_service가 공유
+             - OpenAI Structured Outputs(strict json_schema)에 그대로 넘길 스키마 생성
+             - 응답은 model_validate_json 한 번으로 파싱 + 검증 (pydantic-core)
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class RubricHits(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    clarity: int = Field(ge=0, le=5)
+    correctness: int = Field(ge=0, le=5)
+    depth: int = Field(ge=0, le=5)
+    structure: int = Field(ge=0, le=5)
+
+
+class MetadataUsed(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    difficulty: str
+    topic: str
+    subcategory: str
+    difficulty_score: Optional[float]
+    tags: List[str]
+    time_complexity: str
+    space_complexity: str
+
+
+class Evidence(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    claim: str
+    support: str
+
+
+class _EvaluationBase(BaseModel):
+    """두 평가 경로가 공통으로 쓰는 필드 (score는 0~100)"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    question_id: str
+    score: int = Field(ge=0, le=100)
+    passed: bool
+    feedback: str
+    strengths: List[str]
+    weaknesses: List[str]
+    missing_points: List[str]
+    follow_up_needed: bool
+    follow_up_question: str
+    rubric_hits: RubricHits
+
+
+class AnswerEvaluation(_EvaluationBase):
+    """ai/evaluator.evaluate_answer 출력 (prompts.EVAL_JSON_SCHEMA_INSTRUCTIONS와 동일)"""
+
+    pass_threshold: int = Field(ge=0, le=100)
+    metadata_used: MetadataUsed
+    evidence: List[Evidence] = Field(max_length=3)
+
+
+class TurnEvaluation(_EvaluationBase):
+    """backend llm_service.evaluate_and_respond 출력 (다음 메인 질문 번역 포함)"""
+
+    next_question_translated: str
+
+
+# strict 모드에서 허용되지 않는 키워드
+_UNSUPPORTED_KEYS = ("default", "title")
+
+
+def _strictify(node: Any) -> None:
+    if isinstance(node, dict):
+        for key in _UNSUPPORTED_KEYS:
+            # properties 안의 "title"이라는 이름의 필드는 건드리지 않는다
+            if key in node and not isinstance(node[key], dict):
+                node.pop(key)
+        if node.get("type") == "object" and "properties" in node:
+            node["additionalProperties"] = False
+            node["required"] = list(node["properties"].keys())
+        for value in node.values():
+            _strictify(value)
+    elif isinstance(node, list):
+        for item in node:
+            _strictify(item)
+
+
+_SCHEMA_CACHE: Dict[type, Dict[str, Any]] = {}
+
+
+def strict_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Pydantic 모델 → Structured Outputs strict 스키마
+    (모든 필드 required, additionalProperties=false, default/title 제거)
+    """
+    schema = _SCHEMA_CACHE.get(model)
+    if schema is None:
+        schema = copy.deepcopy(model.model_json_schema())
+        _strictify(schema)
+        _SCHEMA_CACHE[model] = schema
+    return schema
+
+
+def responses_text_format(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Responses API용: responses.create(text=...)"""
+    return {
+        "format": {
+            "type": "json_schema",
+            "name": model.__name__,
+            "schema": strict_json_schema(model),
+            "strict": True,
+        }
+    }
+
+
+def chat_response_format(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Chat Completions API용: chat.completions.create(response_format=...)"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "schema": strict_json_schema(model),
+            "strict": True,
+        },
+    }
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 from dotenv import load_dotenv
-from openai import OpenAI
+from pydantic import ValidationError
 
+from backend.core import metrics
+from backend.core.http_clients import get_openai_client
+from backend.core.llm_scheduler import Priority, estimate_tokens, run_llm
+from ai.eval_schema import AnswerEvaluation, responses_text_format
 from ai.prompts import (
     SYSTEM_PROMPT_EVAL,
     EVAL_JSON_SCHEMA_INSTRUCTIONS,
@@ -24,7 +28,7 @@ _api_key = os.environ.get("OPENAI_API_KEY")
 if not _api_key:
     _api_key = ""
 
-_client = OpenAI(api_key=_api_key)
+_client = get_openai_client(_api_key)
 
 
 def safe_json_parse(text: str) -> Dict[str, Any]:
@@ -36,6 +40,17 @@ def safe_json_parse(text: str) -> Dict[str, Any]:
     return json.loads(t[start : end + 1])
 
 
+def parse_evaluation(text: str) -> AnswerEvaluation:
+    """
+    strict 스키마 응답은 model_validate_json 한 번으로 끝난다.
+    앞뒤에 잡음이 붙은 경우만 중괄호 구간을 잘라 다시 검증.
+    """
+    try:
+        return AnswerEvaluation.model_validate_json(text)
+    except ValidationError:
+        return AnswerEvaluation.model_validate(safe_json_parse(text))
+
+
 def evaluate_answer(
     question_row: Dict[str, Any],
     user_answer_text: str,
@@ -43,31 +58,72 @@ def evaluate_answer(
     *,
     model: str = "gpt-4.1-mini",
     max_output_tokens: int = 900,
+    priority: Priority = Priority.INTERACTIVE,
+    call_site: str = "evaluate_answer",
+    prompt_overrides: Optional[Dict[str, str]] = None,
 ) -> Tuple[Dict[str, Any], str, str]:
+    """prompt_overrides: SYSTEM_PROMPT_EVAL / EVAL_JSON_SCHEMA_INSTRUCTIONS / EVAL_FEWSHOT 중 바꿀 것 (프롬프트 비교용)"""
     user_prompt = build_eval_user_prompt(question_row, user_answer_text, rag_context)
+    overrides = prompt_overrides or {}
 
     messages = [
-        {"role": "system", "content": SYSTEM_PROMPT_EVAL},
-        {"role": "system", "content": EVAL_JSON_SCHEMA_INSTRUCTIONS},
-        {"role": "system", "content": EVAL_FEWSHOT},
+        {"role": "system", "content": overrides.get("SYSTEM_PROMPT_EVAL", SYSTEM_PROMPT_EVAL)},
+        {"role": "system", "content": overrides.get("EVAL_JSON_SCHEMA_INSTRUCTIONS", EVAL_JSON_SCHEMA_INSTRUCTIONS)},
+        {"role": "system", "content": overrides.get("EVAL_FEWSHOT", EVAL_FEWSHOT)},
         {"role": "user", "content": user_prompt},
     ]
 
-    r = _client.responses.create(model=model, input=messages, max_output_tokens=max_output_tokens)
+    # Structured Outputs(strict): 스키마를 벗어난 출력은 모델 쪽에서 막힌다
+    r = run_llm(
+        lambda: _client.responses.create(
+            model=model,
+            input=messages,
+            max_output_tokens=max_output_tokens,
+            text=responses_text_format(AnswerEvaluation),
+        ),
+        model=model,
+        priority=priority,
+        call_site=call_site,
+        est_tokens=estimate_tokens(messages, max_output_tokens),
+    )
     out_text = getattr(r, "output_text", None) or str(r)
 
     try:
-        parsed = safe_json_parse(out_text)
-        return parsed, out_text, ""
+        parsed = AnswerEvaluation.model_validate_json(out_text)
+        metrics.LLM_STRUCTURED_OUTPUT.inc(call_site=call_site, outcome="valid")
+        return parsed.model_dump(), out_text, ""
+    except ValidationError:
+        pass
+
+    try:
+        parsed = AnswerEvaluation.model_validate(safe_json_parse(out_text))
+        metrics.LLM_STRUCTURED_OUTPUT.inc(call_site=call_site, outcome="salvaged")
+        return parsed.model_dump(), out_text, ""
     except Exception:
-        r2 = _client.responses.create(
+        pass
+
+    # 최후 수단: 토큰 한도로 잘렸거나 거절(refusal)된 경우에만 재호출
+    repair_messages = [
+        {"role": "system", "content": JSON_REPAIR_SYSTEM},
+        {"role": "user", "content": out_text},
+    ]
+    r2 = run_llm(
+        lambda: _client.responses.create(
             model=model,
-            input=[
-                {"role": "system", "content": JSON_REPAIR_SYSTEM},
-                {"role": "user", "content": out_text},
-            ],
+            input=repair_messages,
             max_output_tokens=max_output_tokens,
-        )
-        out_text2 = getattr(r2, "output_text", None) or str(r2)
-        parsed2 = safe_json_parse(out_text2)
-        return parsed2, out_text, out_text2
\ No newline at end of file
+            text=responses_text_format(AnswerEvaluation),
+        ),
+        model=model,
+        priority=priority,
+        call_site=f"{call_site}.repair",
+        est_tokens=estimate_tokens(repair_messages, max_output_tokens),
+    )
+    out_text2 = getattr(r2, "output_text", None) or str(r2)
+    try:
+        parsed2 = parse_evaluation(out_text2)
+    except Exception:
+        metrics.LLM_STRUCTURED_OUTPUT.inc(call_site=call_site, outcome="failed")
+        raise
+    metrics.LLM_STRUCTURED_OUTPUT.inc(call_site=call_site, outcome="repaired")
+    return parsed2.model_dump(), out_text, out_text2
@@ -6,11 +6,19 @@ Description: 랭그래프 생성
 
 Modification History: 
 - 2026-02-23 (유헌상): 초기 랭그래프 생성
+- 2026-10-19: 답변 그래프에 체크포인터(세션별 상태 영속화) 연결 옵션 추가
+- 2026-10-19: 출제를 약점 topic 가중 무작위 + 출제 비트맵으로 변경
+- 2026-10-19: 답변 그래프 병렬화 (평가와 동시에 팩트체크 검색 / 다음 질문 선출제, 분기만 점수를 기다림)
+- 2026-10-19: 팩트체크 노드는 FACT_CHECK_ENABLED=1일 때만 그래프에 포함 (기본 비활성, 결과를 쓰는 곳이 로그뿐)
 """
 
 from __future__ import annotations
 
-from langgraph.graph import StateGraph, END
+import os
+import re
+from typing import Any, Dict, List
+
+from langgraph.graph import StateGraph, START, END
 
 from ai.state import (
     InterviewState,
@@ -22,22 +30,70 @@ from ai.state import (
 from ai.question_bank import get_bank
 from ai.evaluator import evaluate_answer
 
+# 1이면 팩트체크 검색 / 다음 질문 선출제를 LLM 평가와 같은 단계에서 동시에 실행
+PARALLEL_BRANCHES = os.getenv("ANSWER_GRAPH_PARALLEL", "1") == "1"
+# 팩트체크 결과는 평가/분기에 쓰이지 않고 infer_adapter 로그(unverified_terms)에만 남으므로 기본 비활성
+# (켜면 턴마다 ChromaDB 검색 + 임베딩 1회 추가)
+FACT_CHECK_ENABLED = os.getenv("FACT_CHECK_ENABLED", "0") == "1"
+FACT_CHECK_RESULTS = int(os.getenv("FACT_CHECK_RESULTS", "3"))
+
+# 답변에서 기술 용어로 볼 영문 토큰 (Redis, k8s, C++, Node.js ...)
+_TECH_TERM = re.compile(r"[A-Za-z][A-Za-z0-9+#.]*[A-Za-z0-9+#]")
+
 # 면접관 에이전트 : 라우터의 결정에 따라 실제 사용자에게 던질 대사 세팅함. 꼬리 질문시 이전 질문의 메타데이터(topic, subcategory)를 활용해 관련 질문을 던짐
 def node_pick_question(st: InterviewState) -> InterviewState:
     bank = get_bank()
-    asked = st.get("asked_question_ids", []) or []
+    spec = st.get("speculative_pick") or {}
+    q = bank.by_id.get(spec.get("id")) if spec.get("version") == bank.version else None
+    if q is not None:
+        # 평가와 동시에 골라 둔 질문을 그대로 출제 (질문은행이 그사이 바뀌지 않았을 때만)
+        bank.commit_pick(st, q)
+    else:
+        # 직전 평가의 약한 루브릭 topic을 우선해 무작위 출제 (출제 기록은 비트맵으로 갱신)
+        q = bank.pick_for_state(st)
+    st["speculative_pick"] = None
 
-    q = bank.pick_next(asked)
+    return set_question(st, q.id, q.question, question_row=q.to_dict())
 
-    if q.id not in asked:
-        asked.append(q.id)
-    st["asked_question_ids"] = asked
 
-    return set_question(st, q.id, q.question, question_row=q.to_dict())
+# 선출제 : 평가 결과를 기다리지 않고 다음 질문 후보를 미리 고른다 (상태는 바꾸지 않음)
+# 이번 답변의 약점 갱신 전 가중치로 고르지만, 이 후보는 점수가 기준 이상(=새 질문으로 넘어감)일 때만 쓰이므로
+# 약점 가중치 변화는 작다. 꼬리질문으로 가면 버린다.
+def node_speculate_pick(st: InterviewState) -> Dict[str, Any]:
+    bank = get_bank()
+    try:
+        q = bank.pick_next(asked_bitmap=bank.asked_bitmap_for_state(st), topic_weakness=st.get("topic_weakness"))
+    except Exception:
+        return {"speculative_pick": None}
+    return {"speculative_pick": {"id": q.id, "version": bank.version}}
+
+
+def retrieve_fact_chunks(query: str, session_id: str) -> List[str]:
+    """답변 텍스트로 이력서 청크(ChromaDB) 검색. RAG 서비스를 쓸 수 없으면 빈 리스트"""
+    try:
+        from backend.services.rag_service import retrieve_relevant_chunks
+    except ImportError:
+        return []
+    return retrieve_relevant_chunks(query, session_id, n_results=FACT_CHECK_RESULTS)
+
+
+# 팩트체크 : 답변 자체를 쿼리로 이력서를 한 번 더 검색해, 답변에 나온 기술 중 이력서에서 찾을 수 없는 것을 표시
+def node_fact_check(st: InterviewState) -> Dict[str, Any]:
+    ans = (st.get("last_user_answer_text") or "").strip()
+    if not ans:
+        return {"fact_check": None}
+    chunks = retrieve_fact_chunks(ans, str(st.get("session_id") or "anonymous"))
+    if not chunks:
+        return {"fact_check": {"chunks": [], "unverified_terms": []}}
+    resume_text = " ".join(chunks).lower()
+    terms = dict.fromkeys(t.lower() for t in _TECH_TERM.findall(ans))
+    unverified = [t for t in terms if t not in resume_text]
+    return {"fact_check": {"chunks": chunks, "unverified_terms": unverified}}
 
 
 # 평가 에이전트 : 사용자의 답변(ans)과 RAG를 통해 가져온 팩트 데이터(rag_context)를 기반으로 평가
-def node_evaluate(st: InterviewState) -> InterviewState:
+# 병렬 단계에서 다른 노드와 같은 키를 쓰지 않도록, 바뀐 키만 돌려준다
+def node_evaluate(st: InterviewState) -> Dict[str, Any]:
     question_row = st.get("question_row")
     if not question_row:
         raise RuntimeError("question_row is missing. Run pick_question first.")
@@ -56,7 +112,7 @@ def node_evaluate(st: InterviewState) -> InterviewState:
     )
 
     st = set_evaluation(st, eval_json)
-    return st
+    return {key: st[key] for key in ("last_user_answer_text", "last_eval_json", "last_score", "history")}
 
 # 면접관 에이전트 : 라우터의 결정에 따라 실제 사용자에게 던질 대사 세팅함. 꼬리 질문시 이전 질문의 메타데이터(topic, subcategory)를 활용해 관련 질문을 던짐
 def node_follow_up(st: InterviewState) -> InterviewState:
@@ -80,6 +136,7 @@ def node_follow_up(st: InterviewState) -> InterviewState:
         "time_complexity": "",
         "space_complexity": "",
     }
+    st["speculative_pick"] = None
 
     return set_question(st, follow_id, fq, question_row=st["question_row"])
 
@@ -97,13 +154,31 @@ def build_start_graph():
     return g.compile()
 
 # 답변 후 순환하는 그래프 (무한루프 방지)
-def build_answer_graph():
+# checkpointer를 주면 invoke 시 config의 thread_id(=session_id) 단위로 상태가 저장/복구된다
+# parallel=True : START → evaluate | fact_check | speculate_pick (한 단계에서 동시 실행) → 분기는 evaluate 점수로만 결정
+# parallel=False: START → fact_check → evaluate → 분기 (다음 질문은 분기 후에 고름)
+# fact_check=False면 팩트체크 노드를 그래프에 넣지 않는다
+def build_answer_graph(checkpointer=None, parallel: bool = PARALLEL_BRANCHES, fact_check: bool = FACT_CHECK_ENABLED):
     g = StateGraph(InterviewState)
     g.add_node("evaluate", node_evaluate)
     g.add_node("follow_up", node_follow_up)
     g.add_node("pick_question", node_pick_question)
-
-    g.set_entry_point("evaluate")
+    if fact_check:
+        g.add_node("fact_check", node_fact_check)
+
+    if parallel:
+        g.add_node("speculate_pick", node_speculate_pick)
+        for node in ("evaluate", "fact_check", "speculate_pick") if fact_check else ("evaluate", "speculate_pick"):
+            g.add_edge(START, node)
+        # 같은 단계가 끝나야 다음 단계로 넘어가므로 pick_question은 선출제 결과를 볼 수 있다
+        if fact_check:
+            g.add_edge("fact_check", END)
+        g.add_edge("speculate_pick", END)
+    elif fact_check:
+        g.add_edge(START, "fact_check")
+        g.add_edge("fact_check", "evaluate")
+    else:
+        g.add_edge(START, "evaluate")
     g.add_conditional_edges(
         "evaluate",
         route_after_eval,
@@ -111,7 +186,7 @@ def build_answer_graph():
     )
     g.add_edge("follow_up", END)
     g.add_edge("pick_question", END)
-    return g.compile()
+    return g.compile(checkpointer=checkpointer)
 
 
 """
@@ -127,4 +202,5 @@ def build_answer_graph():
 - LLM을 활용해 평가 로직을 더 정교하게 만들기.
 - 사용자의 답변(ans) 텍스트 자체를 쿼리로 삼아 ChromaDB를 한 번 더 검색해 오는 로직을 추가
     - 지원자가 답변 중에 이력서에 없는 기술을 언급했는지 팩트 체크용
+    - (반영) node_fact_check: 평가와 병렬로 검색, 결과는 st["fact_check"] (평가 프롬프트에는 아직 넣지 않음)
 """
\ No newline at end of file
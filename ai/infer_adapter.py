@@ -3,8 +3,11 @@ from __future__ import annotations
 from typing import Any, Dict, Optional
 
 from ai.state import init_state, set_user_answer, set_question, InterviewState
+from ai.checkpoint import DURABILITY, get_checkpointer, thread_config
 from ai.graph import build_answer_graph
 from ai.question_bank import get_bank
+from ai.state_store import StateStore, get_state_store
+from backend.core.structured_log import log_event
 
 
 class InterviewEngine:
@@ -12,18 +15,25 @@ class InterviewEngine:
     [score] | [confidence] | [feedback] | [next_question]
     """
 
-    def __init__(self):
-        self._states: Dict[str, InterviewState] = {}
-        self._g_answer = build_answer_graph()
-        self._bank = get_bank()
+    def __init__(self, store: Optional[StateStore] = None):
+        # 세션 상태는 저장소에 둔다 (기본 STATE_STORE_URL, 워커 여러 개면 redis://)
+        self._store = store or get_state_store()
+        # 재시작 후에도 면접을 이어갈 수 있도록 그래프 상태를 체크포인트로 남긴다 (SQLite, 쓰기 지연)
+        self._checkpointer = get_checkpointer()
+        self._g_answer = build_answer_graph(checkpointer=self._checkpointer)
 
     def _get_or_create_state(self, session_id: str) -> InterviewState:
         sid = str(session_id)
-        st = self._states.get(sid)
+        st = self._store.get(sid)
+        if st is None and self._checkpointer is not None:
+            # 저장소에 없으면(재시작 등) 마지막 체크포인트에서 복구
+            saved = self._g_answer.get_state(thread_config(sid)).values
+            if saved:
+                st = dict(saved)
+                log_event("interview.state", "restored_from_checkpoint", session_id=sid)
         if st is None:
             st = init_state(sid)
-            # 첫 질문을 아직 모를 수 있으므로 placeholder로 시작
-            self._states[sid] = st
+            # 첫 질문을 아직 모를 수 있으므로 placeholder로 시작 (저장은 턴이 끝난 뒤 한 번)
         return st
 
     def generate_interview_response(
@@ -82,8 +92,10 @@ class InterviewEngine:
         st = set_user_answer(st, str(user_answer or "").strip())
 
         # 4) 평가 + 다음질문/꼬리질문 세팅(우리 LangGraph 실행)
-        st = self._g_answer.invoke(st)
-        self._states[str(session_id)] = st  # 상태 저장
+        if self._checkpointer is not None:
+            st = self._g_answer.invoke(st, thread_config(session_id), durability=DURABILITY)
+        else:
+            st = self._g_answer.invoke(st)
 
         ev = st.get("last_eval_json") or {}
         score = float(ev.get("score", 0))
@@ -95,14 +107,21 @@ class InterviewEngine:
 
         # 5) 다음 질문이 비어있으면 질문리스트에서 하나 뽑아 채워줌(파싱 실패 대비)
         if not next_q:
-            asked = st.get("asked_question_ids", []) or []
-            q = self._bank.pick_next(asked)
-            asked.append(q.id)
-            st["asked_question_ids"] = asked
+            # 핫 리로드로 교체됐을 수 있으므로 매번 현재 질문은행을 사용
+            q = get_bank().pick_for_state(st)
             next_q = q.question
             st = set_question(st, q.id, q.question, question_row=q.to_dict())
-            self._states[str(session_id)] = st
-        print(f"[{score}] | [{confidence}] | {feedback} | {next_q}")
+        self._store.put(str(session_id), st)  # 상태 저장 (턴당 1회)
+        log_event(
+            "interview.result",
+            "generate_interview_response",
+            session_id=str(session_id),
+            score=score,
+            confidence=confidence,
+            feedback=feedback,
+            next_question=next_q,
+            unverified_terms=(st.get("fact_check") or {}).get("unverified_terms"),
+        )
         # [점수] | [자신감] | [피드백] | [다음질문]
         return f"[{score}] | [{confidence}] | {feedback} | {next_q}"
     
@@ -1,9 +1,34 @@
 from __future__ import annotations
 
 import csv
+import logging
 import os
+import random
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+RUBRIC_KEYS = ("clarity", "correctness", "depth", "structure")
+# 약점 점수(0~1)가 1인 topic은 기본 가중치 1 + WEAKNESS_BOOST 로 뽑힌다
+WEAKNESS_BOOST = float(os.getenv("QUESTION_WEAKNESS_BOOST", "3.0"))
+# 이전 평가의 약점을 얼마나 오래 기억할지 (지수 이동 평균 계수)
+WEAKNESS_DECAY = 0.5
+# 무작위로 고른 행이 이미 출제된 경우 다시 뽑는 횟수 (초과하면 해당 topic을 순차 탐색)
+_MAX_REJECTS = 8
+
+# CSV를 열 단위로 미리 변환해 둔 스냅샷 (ormsgpack). CSV가 바뀌면(크기/수정 시각) 다시 만든다
+SNAPSHOT_ENABLED = os.getenv("QUESTION_SNAPSHOT", "1") == "1"
+SNAPSHOT_VERSION = 1
+# 0보다 크면 그 간격(초)으로 CSV 변경을 확인해 질문은행을 통째로 교체
+WATCH_INTERVAL_SEC = float(os.getenv("QUESTION_BANK_WATCH_SEC", "0"))
+
+_COLUMNS = (
+    "id", "question", "answer", "difficulty", "topic", "subcategory",
+    "difficulty_score", "tags", "code_example", "time_complexity", "space_complexity",
+)
 
 
 def _split_tags(tags: Any) -> List[str]:
@@ -60,47 +85,303 @@ class QuestionRow:
         }
 
 
+def rubric_weakness(eval_json: Optional[Dict[str, Any]]) -> Optional[float]:
+    """rubric_hits(0~5 정수) 평균이 낮을수록 1에 가까운 약점 점수. 루브릭이 없으면 None"""
+    hits = (eval_json or {}).get("rubric_hits") or {}
+    values = []
+    for k in RUBRIC_KEYS:
+        v = hits.get(k)
+        if isinstance(v, bool) or not isinstance(v, (int, float)):
+            continue
+        values.append(min(max(float(v), 0.0), 5.0))
+    if not values:
+        return None
+    return 1.0 - sum(values) / (5.0 * len(values))
+
+
+def update_topic_weakness(
+    weakness: Optional[Dict[str, float]], eval_json: Optional[Dict[str, Any]], topic: Optional[str] = None
+) -> Dict[str, float]:
+    """직전 평가의 루브릭 약점을 해당 topic에 반영 (다른 topic의 기억은 유지)"""
+    out = dict(weakness or {})
+    w = rubric_weakness(eval_json)
+    topic = topic or ((eval_json or {}).get("metadata_used") or {}).get("topic") or ""
+    if w is None or not topic:
+        return out
+    prev = out.get(topic)
+    out[topic] = round(w if prev is None else WEAKNESS_DECAY * prev + (1 - WEAKNESS_DECAY) * w, 4)
+    return out
+
+
+def csv_fingerprint(csv_path: str) -> str:
+    st = os.stat(csv_path)
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def snapshot_path_for(csv_path: str) -> str:
+    return os.getenv("QUESTION_SNAPSHOT_PATH") or os.path.splitext(csv_path)[0] + ".snapshot.msgpack"
+
+
+class _RowView(Sequence):
+    """열 데이터에서 필요한 행만 QuestionRow로 만들어 캐시 (시작 시 전체 행 객체를 만들지 않는다)"""
+
+    def __init__(self, columns: Dict[str, list]):
+        self._columns = columns
+        self._cache: List[Optional[QuestionRow]] = [None] * len(columns["id"])
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __getitem__(self, pos):  # type: ignore[override]
+        if isinstance(pos, slice):
+            return [self[i] for i in range(*pos.indices(len(self)))]
+        row = self._cache[pos]
+        if row is None:
+            c = self._columns
+            row = QuestionRow(**{name: c[name][pos] for name in _COLUMNS})
+            self._cache[pos] = row
+        return row
+
+    def __iter__(self) -> Iterator[QuestionRow]:
+        for pos in range(len(self)):
+            yield self[pos]
+
+
+class _ByIdView(Mapping):
+    def __init__(self, bank: "QuestionBank"):
+        self._bank = bank
+
+    def __getitem__(self, qid: str) -> QuestionRow:
+        return self._bank.rows[self._bank.pos_by_id[qid]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._bank.pos_by_id)
+
+    def __len__(self) -> int:
+        return len(self._bank.pos_by_id)
+
+
 class QuestionBank:
-    def __init__(self, csv_path: str):
-        self.csv_path = csv_path
-        self.rows: List[QuestionRow] = []
-        self.by_id: Dict[str, QuestionRow] = {}
-        self._load()
+    """
+    질문 CSV 로더 + 출제기
+    - topic / subcategory / difficulty / tag별 인덱스 (행 번호 리스트)
+    - 세션별 출제 여부는 행 번호 비트맵(bytes)으로 관리 → 확인 O(1)
+    - pick_next: 약점 topic 가중 무작위 → topic 안에서 무작위 행. 비용은 질문 수가 아니라 topic 수에 비례
+    - 열 데이터와 인덱스는 ormsgpack 스냅샷 파일에서 한 번에 읽고, CSV가 바뀐 경우에만 CSV를 파싱
+      (전체를 파이썬 객체로 디코딩하므로 이득은 CSV 파싱 + 인덱스 구성을 건너뛰는 데서 나온다)
+    """
 
-    def _load(self) -> None:
+    def __init__(self, csv_path: str, use_snapshot: bool = SNAPSHOT_ENABLED):
+        self.csv_path = csv_path
         if not os.path.exists(self.csv_path):
             raise FileNotFoundError(f"Question CSV not found: {self.csv_path}")
+        # 세션 비트맵이 어느 CSV 기준인지 구분 (핫 리로드 후 행 번호가 바뀔 수 있음)
+        self.version = csv_fingerprint(csv_path)
+        self.loaded_from = "csv"
+
+        data = self._read_snapshot() if use_snapshot else None
+        if data is None:
+            data = self._parse_csv()
+            if use_snapshot:
+                self._write_snapshot(data)
+        else:
+            self.loaded_from = "snapshot"
+
+        self._columns: Dict[str, list] = data["columns"]
+        self.rows: Sequence[QuestionRow] = _RowView(self._columns)
+        self.pos_by_id: Dict[str, int] = data["pos_by_id"]
+        self.by_id: Mapping[str, QuestionRow] = _ByIdView(self)
+        idx = data["indexes"]
+        self.by_topic: Dict[str, List[int]] = idx["topic"]
+        self.by_subcategory: Dict[str, List[int]] = idx["subcategory"]
+        self.by_difficulty: Dict[str, List[int]] = idx["difficulty"]
+        self.by_tag: Dict[str, List[int]] = idx["tag"]
+        # (topic, difficulty) 조합은 난이도 지정 출제용 (스냅샷에는 "topic\x1fdifficulty" 키로 저장)
+        self.by_topic_difficulty: Dict[tuple, List[int]] = {
+            tuple(k.split("\x1f", 1)): v for k, v in idx["topic_difficulty"].items()
+        }
 
+    # ─── CSV / 스냅샷 ───────────────────────────────────
+    def _parse_csv(self) -> Dict[str, Any]:
+        columns: Dict[str, list] = {name: [] for name in _COLUMNS}
+        pos_by_id: Dict[str, int] = {}
         with open(self.csv_path, "r", encoding="utf-8-sig", newline="") as f:
             reader = csv.DictReader(f)
             for r in reader:
-                q = QuestionRow(
-                    id=_as_str(r.get("id")),
-                    question=_as_str(r.get("question")),
-                    answer=_as_str(r.get("answer")),
-                    difficulty=_as_str(r.get("difficulty")),
-                    topic=_as_str(r.get("topic")),
-                    subcategory=_as_str(r.get("subcategory")),
-                    difficulty_score=_as_float(r.get("difficulty_score")),
-                    tags=_split_tags(r.get("tags")),
-                    code_example=_as_str(r.get("code_example")),
-                    time_complexity=_as_str(r.get("time_complexity")),
-                    space_complexity=_as_str(r.get("space_complexity")),
-                )
-                if not q.id:
+                qid = _as_str(r.get("id"))
+                if not qid or qid in pos_by_id:
                     continue
-                self.rows.append(q)
-                self.by_id[q.id] = q
-
-    def pick_next(self, asked_ids: List[str]) -> QuestionRow:
-        asked = set(str(x) for x in (asked_ids or []))
-        for q in self.rows:
-            if q.id not in asked:
-                return q
+                pos_by_id[qid] = len(columns["id"])
+                columns["id"].append(qid)
+                columns["difficulty_score"].append(_as_float(r.get("difficulty_score")))
+                columns["tags"].append(_split_tags(r.get("tags")))
+                for name in _COLUMNS:
+                    if name not in ("id", "difficulty_score", "tags"):
+                        columns[name].append(_as_str(r.get(name)))
+
+        indexes: Dict[str, Dict[str, List[int]]] = {
+            "topic": {}, "subcategory": {}, "difficulty": {}, "tag": {}, "topic_difficulty": {}
+        }
+        for pos in range(len(columns["id"])):
+            topic, difficulty = columns["topic"][pos], columns["difficulty"][pos]
+            indexes["topic"].setdefault(topic, []).append(pos)
+            indexes["subcategory"].setdefault(columns["subcategory"][pos], []).append(pos)
+            indexes["difficulty"].setdefault(difficulty, []).append(pos)
+            for tag in columns["tags"][pos]:
+                indexes["tag"].setdefault(tag, []).append(pos)
+            indexes["topic_difficulty"].setdefault(f"{topic}\x1f{difficulty}", []).append(pos)
+        return {"columns": columns, "pos_by_id": pos_by_id, "indexes": indexes}
+
+    def _read_snapshot(self) -> Optional[Dict[str, Any]]:
+        path = snapshot_path_for(self.csv_path)
+        try:
+            import ormsgpack
+
+            with open(path, "rb") as f:
+                data = ormsgpack.unpackb(f.read())
+        except (FileNotFoundError, ValueError, ImportError):
+            return None
+        except Exception as e:
+            logger.warning("question snapshot unreadable (%s): %r", path, e)
+            return None
+        if data.get("v") != SNAPSHOT_VERSION or data.get("fingerprint") != self.version:
+            return None
+        return data
+
+    def _write_snapshot(self, data: Dict[str, Any]) -> None:
+        path = snapshot_path_for(self.csv_path)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            import ormsgpack
+
+            with open(tmp, "wb") as f:
+                f.write(ormsgpack.packb({"v": SNAPSHOT_VERSION, "fingerprint": self.version, **data}))
+            os.replace(tmp, path)  # 다른 워커가 읽는 중이어도 원자적으로 교체
+        except Exception as e:
+            logger.warning("question snapshot not written (%s): %r", path, e)
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    # ─── 출제 비트맵 ─────────────────────────────────────
+    def new_bitmap(self) -> bytearray:
+        return bytearray((len(self.rows) + 7) // 8)
+
+    def bitmap_from_ids(self, asked_ids: Optional[Iterable[str]]) -> bytearray:
+        """기존 asked_question_ids 리스트로부터 비트맵 생성 (비트맵이 없는 예전 세션 호환용)"""
+        bitmap = self.new_bitmap()
+        for qid in asked_ids or []:
+            self.mark_asked(bitmap, str(qid))
+        return bitmap
+
+    def mark_asked(self, bitmap: bytearray, qid: str) -> bytearray:
+        pos = self.pos_by_id.get(qid)
+        if pos is not None:
+            bitmap[pos >> 3] |= 1 << (pos & 7)
+        return bitmap
+
+    @staticmethod
+    def _is_asked(bitmap: bytearray, pos: int) -> bool:
+        return bool(bitmap[pos >> 3] & (1 << (pos & 7)))
+
+    # ─── 출제 ───────────────────────────────────────────
+    def _pick_in(self, positions: List[int], bitmap: bytearray, rng: random.Random) -> Optional[int]:
+        for _ in range(_MAX_REJECTS):
+            pos = positions[rng.randrange(len(positions))]
+            if not self._is_asked(bitmap, pos):
+                return pos
+        # 거의 다 출제된 topic: 임의 위치부터 한 바퀴만 확인
+        start = rng.randrange(len(positions))
+        for i in range(len(positions)):
+            pos = positions[(start + i) % len(positions)]
+            if not self._is_asked(bitmap, pos):
+                return pos
+        return None
+
+    def asked_bitmap_for_state(self, st: Dict[str, Any]) -> bytearray:
+        """상태에 저장된 출제 비트맵 (질문은행이 바뀌었으면 asked_question_ids로 다시 만든다)"""
+        raw = st.get("asked_bitmap")
+        same_bank = st.get("asked_bitmap_version") == self.version
+        if raw and same_bank and len(raw) == (len(self.rows) + 7) // 8:
+            return bytearray(raw)
+        return self.bitmap_from_ids(st.get("asked_question_ids"))
+
+    def pick_for_state(self, st: Dict[str, Any], difficulty: Optional[str] = None) -> QuestionRow:
+        """
+        세션 상태(InterviewState) 기준 출제 + 상태 갱신
+        - 직전 평가(last_eval_json) 루브릭으로 topic_weakness 갱신
+        - asked_bitmap / asked_question_ids에 출제 기록
+        """
+        bitmap = self.asked_bitmap_for_state(st)
+        row = st.get("question_row") or {}
+        weakness = update_topic_weakness(st.get("topic_weakness"), st.get("last_eval_json"), row.get("topic"))
+
+        q = self.pick_next(asked_bitmap=bitmap, topic_weakness=weakness, difficulty=difficulty)
+        self.commit_pick(st, q, bitmap=bitmap, weakness=weakness)
+        return q
+
+    def commit_pick(
+        self,
+        st: Dict[str, Any],
+        q: QuestionRow,
+        *,
+        bitmap: Optional[bytearray] = None,
+        weakness: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """미리 골라 둔 질문(q)을 출제한 것으로 상태에 기록 (pick_for_state의 상태 갱신 부분)"""
+        if bitmap is None:
+            bitmap = self.asked_bitmap_for_state(st)
+        if weakness is None:
+            row = st.get("question_row") or {}
+            weakness = update_topic_weakness(st.get("topic_weakness"), st.get("last_eval_json"), row.get("topic"))
+        self.mark_asked(bitmap, q.id)
+        asked = list(st.get("asked_question_ids") or [])
+        if q.id not in asked:
+            asked.append(q.id)
+        st["asked_question_ids"] = asked
+        st["asked_bitmap"] = bytes(bitmap)
+        st["asked_bitmap_version"] = self.version
+        st["topic_weakness"] = weakness
+
+    def pick_next(
+        self,
+        asked_ids: Optional[List[str]] = None,
+        *,
+        asked_bitmap: Optional[bytearray] = None,
+        topic_weakness: Optional[Dict[str, float]] = None,
+        difficulty: Optional[str] = None,
+        rng: Optional[random.Random] = None,
+    ) -> QuestionRow:
+        """
+        아직 출제하지 않은 질문 하나를 무작위로 고른다.
+        topic_weakness(topic → 0~1)가 높은 topic일수록 더 자주 뽑힌다 (ai/prompts.py 출제 규칙).
+        difficulty를 주면 해당 난이도 질문을 우선하고, 없으면 전체에서 고른다.
+        """
+        bitmap = asked_bitmap if asked_bitmap is not None else self.bitmap_from_ids(asked_ids)
+        rng = rng or random
+        weakness = topic_weakness or {}
+
+        for diff in ((difficulty, None) if difficulty else (None,)):
+            candidates = {}
+            for topic in self.by_topic:
+                positions = self.by_topic_difficulty.get((topic, diff), []) if diff else self.by_topic[topic]
+                if positions:
+                    candidates[topic] = positions
+            while candidates:
+                topics = list(candidates)
+                weights = [1.0 + WEAKNESS_BOOST * weakness.get(t, 0.0) for t in topics]
+                topic = rng.choices(topics, weights=weights)[0]
+                pos = self._pick_in(candidates[topic], bitmap, rng)
+                if pos is not None:
+                    return self.rows[pos]
+                del candidates[topic]  # 이 topic은 모두 출제됨
         raise RuntimeError("No more questions available (all asked).")
 
 
 _bank: Optional[QuestionBank] = None
+_bank_lock = threading.Lock()
+_watcher: Optional[threading.Thread] = None
 
 
 def resolve_default_csv_path() -> str:
@@ -125,5 +406,42 @@ def resolve_default_csv_path() -> str:
 def get_bank() -> QuestionBank:
     global _bank
     if _bank is None:
-        _bank = QuestionBank(resolve_default_csv_path())
-    return _bank
\ No newline at end of file
+        with _bank_lock:
+            if _bank is None:
+                _bank = QuestionBank(resolve_default_csv_path())
+                if WATCH_INTERVAL_SEC > 0:
+                    start_watcher(WATCH_INTERVAL_SEC)
+    return _bank
+
+
+def reload_bank(force: bool = False) -> bool:
+    """CSV가 바뀌었으면 새 질문은행을 만든 뒤 참조를 통째로 교체 (진행 중인 출제는 이전 객체로 끝난다)"""
+    global _bank
+    current = _bank
+    path = current.csv_path if current is not None else resolve_default_csv_path()
+    if not force and current is not None and csv_fingerprint(path) == current.version:
+        return False
+    fresh = QuestionBank(path)
+    with _bank_lock:
+        _bank = fresh
+    logger.info("question bank reloaded: %s rows=%d version=%s", path, len(fresh.rows), fresh.version)
+    return True
+
+
+def start_watcher(interval_sec: float) -> None:
+    """CSV 변경 감시 (stat 폴링 - 별도 의존성 없이 모든 파일시스템에서 동작)"""
+    global _watcher
+    if _watcher is not None:
+        return
+
+    def _loop() -> None:
+        while True:
+            time.sleep(interval_sec)
+            try:
+                reload_bank()
+            except Exception as e:
+                # 편집 도중의 깨진 CSV 등 - 기존 질문은행을 계속 사용
+                logger.warning("question bank reload failed: %r", e)
+
+    _watcher = threading.Thread(target=_loop, name="question-bank-watch", daemon=True)
+    _watcher.start()
@@ -20,6 +20,11 @@ class InterviewState(TypedDict, total=False):
 
     # 중복 방지용: 이미 출제한 question_id들
     asked_question_ids: List[str]
+    # 같은 정보를 질문은행 행 번호 비트맵으로 (출제 여부 확인 O(1)) - QuestionBank.pick_for_state가 관리
+    asked_bitmap: Optional[bytes]
+    asked_bitmap_version: Optional[str]
+    # topic별 루브릭 약점(0~1, 높을수록 약함) - 약한 topic을 더 자주 출제
+    topic_weakness: Dict[str, float]
 
     # 현재 질문(화면에 보여줄 질문)
     current_question_id: Optional[str]
@@ -41,6 +46,11 @@ class InterviewState(TypedDict, total=False):
     # (선택) 현재 질문 row(질문은행에서 조회한 1개 row)
     question_row: Optional[Dict[str, Any]]
 
+    # 답변 기준 이력서 재검색 결과 {chunks, unverified_terms} - 평가와 병렬로 채워짐
+    fact_check: Optional[Dict[str, Any]]
+    # 평가와 병렬로 미리 고른 다음 질문 {id, version} - pick_question이 소비
+    speculative_pick: Optional[Dict[str, Any]]
+
 
 def init_state(session_id: str) -> InterviewState:
     """
@@ -50,6 +60,9 @@ def init_state(session_id: str) -> InterviewState:
         "session_id": session_id,
         "stage": "pick_question",
         "asked_question_ids": [],
+        "asked_bitmap": None,
+        "asked_bitmap_version": None,
+        "topic_weakness": {},
         "current_question_id": None,
         "current_question_text": None,
         "last_user_answer_text": None,
@@ -58,6 +71,8 @@ def init_state(session_id: str) -> InterviewState:
         "history": [],
         "rag_context": None,
         "question_row": None,
+        "fact_check": None,
+        "speculative_pick": None,
     }
 
 
@@ -0,0 +1,209 @@
+"""
+File: state_store.py
+Created: 2026-10-19
+Description: InterviewEngine 세션 상태(InterviewState) 저장소
+             - MemoryStateStore: 프로세스 내 LRU + TTL (최대 세션 수 / 유휴 만료 시간으로 메모리 상한)
+             - RedisStateStore : ormsgpack 직렬화 후 Redis에 SET EX 저장 → 워커 여러 개 / 재시작 후에도 세션 유지
+             - 선택: STATE_STORE_URL="memory://" (기본) | "redis://host:6379/0"
+               STATE_STORE_TTL_SEC (기본 6시간), STATE_STORE_MAX_SESSIONS (메모리 저장소 기본 1000)
+             - history는 최근 STATE_HISTORY_MAX 턴만 보관 (평가 원문이 매 턴 쌓이므로)
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: Redis 오류 시 요청을 실패시키지 않고 경고 로그 후 캐시 미스로 처리 (체크포인트 / 초기 상태로 진행)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from ai.state import InterviewState
+from backend.core import metrics
+from backend.core.structured_log import log_event
+
+STATE_STORE_URL = os.getenv("STATE_STORE_URL", "memory://").strip() or "memory://"
+STATE_TTL_SEC = int(os.getenv("STATE_STORE_TTL_SEC", str(6 * 3600)))
+MAX_SESSIONS = int(os.getenv("STATE_STORE_MAX_SESSIONS", "1000"))
+HISTORY_MAX = int(os.getenv("STATE_HISTORY_MAX", "30"))
+
+STATE_STORE_OPS = metrics.counter(
+    "state_store_ops_total", "세션 상태 저장소 호출 (op=get|put|delete, outcome=hit|miss|ok|error)", ("backend", "op", "outcome")
+)
+STATE_STORE_EVICTIONS = metrics.counter(
+    "state_store_evictions_total", "메모리 저장소에서 밀려난 세션 (reason=lru|ttl)", ("reason",)
+)
+STATE_STORE_BYTES = metrics.histogram(
+    "state_store_payload_bytes", "직렬화된 세션 상태 크기", buckets=(512, 2048, 8192, 32768, 131072, 524288)
+)
+
+
+def trim_history(st: InterviewState, limit: int = HISTORY_MAX) -> InterviewState:
+    """오래된 턴 기록을 잘라 상태 크기를 일정하게 유지"""
+    history = st.get("history")
+    if limit > 0 and history and len(history) > limit:
+        st["history"] = history[-limit:]
+    return st
+
+
+def encode_state(st: InterviewState) -> bytes:
+    import ormsgpack
+
+    return ormsgpack.packb(st, option=ormsgpack.OPT_NON_STR_KEYS)
+
+
+def decode_state(raw: bytes) -> InterviewState:
+    import ormsgpack
+
+    return ormsgpack.unpackb(raw)
+
+
+class StateStore(ABC):
+    """세션 id → InterviewState. put은 항상 상태 전체를 덮어쓴다 (턴 단위 last-write-wins)"""
+
+    backend = "base"
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[InterviewState]:
+        ...
+
+    @abstractmethod
+    def put(self, session_id: str, st: InterviewState) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryStateStore(StateStore):
+    """
+    단일 프로세스용. 상태 객체를 그대로 보관하므로 직렬화 비용이 없다.
+    max_sessions를 넘으면 가장 오래 안 쓴 세션부터, ttl_sec 동안 접근이 없으면 만료.
+    """
+
+    backend = "memory"
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, ttl_sec: float = STATE_TTL_SEC):
+        self.max_sessions = max_sessions
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        # session_id -> (마지막 접근 시각, 상태). 앞쪽일수록 오래 안 쓴 세션
+        self._items: "OrderedDict[str, Tuple[float, InterviewState]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def _expire(self, now: float) -> None:
+        while self._items:
+            sid, (touched, _) = next(iter(self._items.items()))
+            if now - touched < self.ttl_sec:
+                break
+            del self._items[sid]
+            STATE_STORE_EVICTIONS.inc(reason="ttl")
+
+    def get(self, session_id: str) -> Optional[InterviewState]:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            item = self._items.get(session_id)
+            if item is not None:
+                self._items[session_id] = (now, item[1])
+                self._items.move_to_end(session_id)
+        STATE_STORE_OPS.inc(backend=self.backend, op="get", outcome="hit" if item else "miss")
+        return item[1] if item else None
+
+    def put(self, session_id: str, st: InterviewState) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._items[session_id] = (now, trim_history(st))
+            self._items.move_to_end(session_id)
+            self._expire(now)
+            while len(self._items) > self.max_sessions:
+                self._items.popitem(last=False)
+                STATE_STORE_EVICTIONS.inc(reason="lru")
+        STATE_STORE_OPS.inc(backend=self.backend, op="put", outcome="ok")
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._items.pop(session_id, None)
+        STATE_STORE_OPS.inc(backend=self.backend, op="delete", outcome="ok")
+
+
+class RedisStateStore(StateStore):
+    """
+    여러 uvicorn 워커가 같은 세션을 이어받을 수 있도록 Redis에 저장.
+    키: <prefix><session_id>, 값: ormsgpack 바이트, 만료: put할 때마다 ttl_sec으로 갱신.
+    Redis는 캐시 역할이라 오류는 올리지 않는다: get은 None(→ 체크포인트 복구 / 초기 상태), put은 건너뜀(체크포인트에는 남음).
+    """
+
+    backend = "redis"
+
+    def __init__(self, url: str, ttl_sec: int = STATE_TTL_SEC, prefix: str = "interview:state:"):
+        import redis
+
+        self.ttl_sec = ttl_sec
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=2.0, socket_connect_timeout=2.0)
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def get(self, session_id: str) -> Optional[InterviewState]:
+        try:
+            raw = self._client.get(self._key(session_id))
+        except Exception as e:
+            STATE_STORE_OPS.inc(backend=self.backend, op="get", outcome="error")
+            log_event("interview.state", "store.get_failed", level=logging.WARNING, session_id=session_id, error=repr(e))
+            return None
+        STATE_STORE_OPS.inc(backend=self.backend, op="get", outcome="hit" if raw else "miss")
+        return decode_state(raw) if raw else None
+
+    def put(self, session_id: str, st: InterviewState) -> None:
+        raw = encode_state(trim_history(st))
+        STATE_STORE_BYTES.observe(len(raw))
+        try:
+            self._client.set(self._key(session_id), raw, ex=self.ttl_sec)
+        except Exception as e:
+            STATE_STORE_OPS.inc(backend=self.backend, op="put", outcome="error")
+            log_event("interview.state", "store.put_failed", level=logging.WARNING, session_id=session_id, error=repr(e))
+            return
+        STATE_STORE_OPS.inc(backend=self.backend, op="put", outcome="ok")
+
+    def delete(self, session_id: str) -> None:
+        self._client.delete(self._key(session_id))
+        STATE_STORE_OPS.inc(backend=self.backend, op="delete", outcome="ok")
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def create_state_store(url: str = STATE_STORE_URL) -> StateStore:
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStateStore(url)
+    if url.startswith("memory://"):
+        return MemoryStateStore()
+    raise ValueError(f"지원하지 않는 STATE_STORE_URL: {url}")
+
+
+_store: Optional[StateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_state_store() -> StateStore:
+    """프로세스 공용 저장소 (STATE_STORE_URL 기준)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_state_store()
+    return _store
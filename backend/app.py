@@ -1,13 +1,18 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from backend.api.v1.endpoints import jobs_api, resume_api
+from backend.core import http_clients, inference_pool, metrics
 from backend.db.base import Base
-from backend.db.schema_patch import patch_user_table_columns
+from backend.db.schema_patch import patch_report_table_columns, patch_user_table_columns
 from backend.db.session import engine
 from backend.models import refresh_token, user
 from backend.routers import admin, auth, home, infer, social_auth, interview, attitude
+from backend.services import rescore_service
+from backend.services.report_job_service import resume_unfinished_reports
 
 
 app = FastAPI()
@@ -30,10 +35,41 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def record_http_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # 경로 파라미터가 라벨에 섞이지 않도록 매칭된 라우트 템플릿을 사용
+        route = request.scope.get("route")
+        path = getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+        metrics.HTTP_LATENCY.observe(
+            time.perf_counter() - started, method=request.method, route=path, status=str(status)
+        )
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
     patch_user_table_columns()
+    patch_report_table_columns()
+    resume_unfinished_reports()
+    rescore_service.kick()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    http_clients.close_all()
+    inference_pool.shutdown_all()
 
 
 app.include_router(auth.router)
@@ -0,0 +1,368 @@
+"""
+File: rescore_answers.py
+Created: 2026-10-19
+Description: 저장된 면접 답변(interview_details) 일괄 재채점 CLI
+             - 평가 프롬프트/모델이 바뀌면 기존 점수와 새 점수를 비교할 수 없으므로, 같은 평가 버전으로 과거 답변 전체를 다시 채점
+             - interview_details를 id 순으로 페이지 단위 스트리밍(SSDictCursor, 키셋 페이지네이션)
+             - ai/evaluator.evaluate_answer를 그대로 사용, 동시 실행 수 제한(--concurrency)
+             - 호출량 제한(--rpm / --tpm, 기본값은 서버 한도의 일부): CLI는 서버와 다른 프로세스라 스케줄러/버킷이 따로다.
+               BATCH 우선순위는 이 프로세스 안의 순서만 정할 뿐 서버의 면접 턴을 보호하지 못하고,
+               조직 단위 RPM/TPM은 서버와 나눠 쓰므로 CLI 쪽 한도를 낮게 잡아 서버 몫을 남긴다
+             - 결과는 interview_detail_scores (detail_id, scoring_version) 단위로 upsert → 재실행해도 중복 없음
+             - 진행 상황은 페이지마다 체크포인트 파일에 기록 → 중단 후 같은 명령으로 이어서 실행
+             - 처리량(rows/s)과 토큰 사용량 / 추정 비용 출력
+             - --standin: 로컬 OpenAI 스탠드인(devtools/standins)을 띄워 LLM 비용 없이 드라이런
+
+실행: python -m backend.cli.rescore_answers --concurrency 8
+      python -m backend.cli.rescore_answers --standin --no-write --limit 200
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: 페이지마다 DB 연결을 새로 열도록 변경, CLI 전용 호출량 제한(--rpm/--tpm) 추가
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from pymysql.cursors import SSDictCursor
+
+from backend.core import metrics
+from backend.core.llm_scheduler import Priority
+from backend.core.structured_log import log_event
+from backend.db.database import get_connection
+
+CALL_SITE = "rescore_answers"
+DEFAULT_MODEL = "gpt-4.1-mini"
+# 서버 기본 한도(gpt-4.1-mini rpm 500 / tpm 200000)의 약 1/5
+DEFAULT_RPM = int(os.getenv("RESCORE_RPM", "100"))
+DEFAULT_TPM = int(os.getenv("RESCORE_TPM", "40000"))
+CHECKPOINT_DIR = os.getenv("RESCORE_CHECKPOINT_DIR", "./backend/checkpoints")
+
+_SELECT_PAGE = """
+    SELECT d.id, d.session_id, d.turn_index, d.question, d.answer, d.score AS old_score,
+           s.job_role, s.difficulty
+    FROM interview_details d
+    LEFT JOIN interview_sessions s ON d.session_id = s.id
+    WHERE d.id > %s AND d.answer IS NOT NULL AND d.answer <> ''
+    ORDER BY d.id
+    LIMIT %s
+"""
+
+_UPSERT = """
+    INSERT INTO interview_detail_scores (detail_id, scoring_version, model, score, passed, feedback, eval_json)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE model = VALUES(model), score = VALUES(score), passed = VALUES(passed),
+        feedback = VALUES(feedback), eval_json = VALUES(eval_json), created_at = CURRENT_TIMESTAMP
+"""
+
+RESCORED = metrics.counter("rescore_answers_rows_total", "일괄 재채점한 답변 수 (outcome=ok|failed)", ("outcome",))
+
+
+def default_scoring_version(model: str) -> str:
+    """모델 + 평가 프롬프트/스키마 해시. 프롬프트를 고치면 버전이 자동으로 바뀐다"""
+    from ai import prompts
+    from ai.eval_schema import AnswerEvaluation
+
+    digest = hashlib.sha1()
+    for part in (
+        prompts.SYSTEM_PROMPT_EVAL,
+        prompts.EVAL_JSON_SCHEMA_INSTRUCTIONS,
+        prompts.EVAL_FEWSHOT,
+        inspect.getsource(prompts.build_eval_user_prompt),
+        json.dumps(AnswerEvaluation.model_json_schema(), sort_keys=True),
+    ):
+        digest.update(part.encode("utf-8"))
+    return f"{model}:{digest.hexdigest()[:10]}"
+
+
+# ─── 체크포인트 ────────────────────────────────────────────
+@dataclass
+class Checkpoint:
+    path: str
+    scoring_version: str
+    last_id: int = 0
+    processed: int = 0
+    failed_ids: List[int] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: str, scoring_version: str) -> "Checkpoint":
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(path, scoring_version)
+        if data.get("scoring_version") != scoring_version:
+            raise SystemExit(
+                f"체크포인트 {path}의 평가 버전({data.get('scoring_version')})이 {scoring_version}와 다릅니다. "
+                "--checkpoint로 다른 파일을 지정하거나 --restart를 사용하세요."
+            )
+        return cls(
+            path,
+            scoring_version,
+            last_id=int(data.get("last_id", 0)),
+            processed=int(data.get("processed", 0)),
+            failed_ids=[int(x) for x in data.get("failed_ids", [])],
+        )
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "scoring_version": self.scoring_version,
+                    "last_id": self.last_id,
+                    "processed": self.processed,
+                    "failed_ids": self.failed_ids,
+                    "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp, self.path)
+
+
+def default_checkpoint_path(scoring_version: str) -> str:
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in scoring_version)
+    return os.path.join(CHECKPOINT_DIR, f"rescore_{safe}.json")
+
+
+# ─── 읽기 / 쓰기 ───────────────────────────────────────────
+def stream_pages(after_id: int, page_size: int, limit: Optional[int] = None) -> Iterator[List[dict]]:
+    """id > after_id 인 답변을 page_size씩.
+    연결은 페이지마다 열고 다 읽은 뒤 닫으므로 LLM 호출 동안 유휴 연결/커서가 남지 않는다 (wait_timeout에 끊길 일도 없음)"""
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = page_size if remaining is None else min(page_size, remaining)
+        with get_connection() as conn:
+            with conn.cursor(SSDictCursor) as cur:
+                cur.execute(_SELECT_PAGE, (after_id, size))
+                page = list(cur.fetchall_unbuffered())
+        if not page:
+            return
+        yield page
+        after_id = page[-1]["id"]
+        if remaining is not None:
+            remaining -= len(page)
+
+
+def fetch_rows_by_id(ids: List[int]) -> List[dict]:
+    if not ids:
+        return []
+    placeholders = ", ".join(["%s"] * len(ids))
+    sql = _SELECT_PAGE.replace("WHERE d.id > %s", f"WHERE d.id IN ({placeholders})").replace("LIMIT %s", "")
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql, tuple(ids))
+            return list(cur.fetchall())
+
+
+def write_scores(results: List[dict], scoring_version: str, model: str) -> None:
+    if not results:
+        return
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.executemany(
+                _UPSERT,
+                [
+                    (
+                        r["detail_id"], scoring_version, model, r["score"], r["passed"], r["feedback"],
+                        json.dumps(r["eval_json"], ensure_ascii=False),
+                    )
+                    for r in results
+                ],
+            )
+
+
+# ─── 채점 ─────────────────────────────────────────────────
+def question_row_for(row: dict) -> Dict[str, Any]:
+    """interview_details에는 질문 본문만 있으므로 평가 프롬프트용 최소 row 구성 (InterviewEngine과 같은 형태)"""
+    return {
+        "id": f"detail:{row['id']}",
+        "question": row.get("question") or "",
+        "answer": "",
+        "difficulty": row.get("difficulty") or "",
+        "topic": row.get("job_role") or "",
+        "subcategory": "",
+        "difficulty_score": None,
+        "tags": [],
+        "code_example": "",
+        "time_complexity": "",
+        "space_complexity": "",
+    }
+
+
+class Rescorer:
+    def __init__(self, model: str, concurrency: int):
+        # evaluator는 import 시점에 OpenAI 클라이언트를 만들므로 --standin 환경변수 설정 뒤에 불러온다
+        from ai.evaluator import evaluate_answer
+
+        self._evaluate = evaluate_answer
+        self.model = model
+        self._pool = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="rescore")
+        self._lock = threading.Lock()
+        self.ok = 0
+        self.failed = 0
+        # 지표 카운터는 프로세스 누적이므로 시작 시점 값을 빼서 이번 실행분만 보고
+        self._usage_base = token_usage(model)
+
+    def _score_one(self, row: dict) -> Optional[dict]:
+        try:
+            eval_json, _, _ = self._evaluate(
+                question_row=question_row_for(row),
+                user_answer_text=row["answer"],
+                rag_context={},
+                model=self.model,
+                priority=Priority.BATCH,
+                call_site=CALL_SITE,
+            )
+        except Exception as e:
+            RESCORED.inc(outcome="failed")
+            log_event("rescore", "row.failed", level=logging.WARNING, detail_id=row["id"], error=repr(e))
+            with self._lock:
+                self.failed += 1
+            return None
+        RESCORED.inc(outcome="ok")
+        with self._lock:
+            self.ok += 1
+        return {
+            "detail_id": row["id"],
+            "score": eval_json.get("score"),
+            "passed": eval_json.get("passed"),
+            "feedback": eval_json.get("feedback"),
+            "eval_json": eval_json,
+        }
+
+    def score_page(self, rows: List[dict]) -> tuple[List[dict], List[int]]:
+        """페이지 전체를 동시 실행 수 제한 안에서 채점. (성공 결과, 실패 id) 반환"""
+        outcomes = list(self._pool.map(self._score_one, rows))
+        results = [o for o in outcomes if o is not None]
+        failed = [row["id"] for row, o in zip(rows, outcomes) if o is None]
+        return results, failed
+
+    def usage(self) -> Dict[str, float]:
+        now = token_usage(self.model)
+        return {k: now[k] - self._usage_base[k] for k in now}
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+def token_usage(model: str) -> Dict[str, float]:
+    usage = {"input": 0.0, "output": 0.0, "cached": 0.0, "cost_usd": 0.0}
+    for site in (CALL_SITE, f"{CALL_SITE}.repair"):
+        for kind in ("input", "output", "cached"):
+            usage[kind] += metrics.LLM_TOKENS.value(call_site=site, model=model, kind=kind)
+        usage["cost_usd"] += metrics.LLM_COST.value(call_site=site, model=model)
+    return usage
+
+
+def _report(prefix: str, rescorer: Rescorer, started: float) -> str:
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    done = rescorer.ok + rescorer.failed
+    u = rescorer.usage()
+    return (
+        f"[{prefix}] {done}건 (성공 {rescorer.ok}, 실패 {rescorer.failed}) {elapsed:.1f}s "
+        f"{done / elapsed:.2f} rows/s | 토큰 입력 {int(u['input'])} (캐시 {int(u['cached'])}) 출력 {int(u['output'])} "
+        f"| 추정 비용 ${u['cost_usd']:.4f}"
+    )
+
+
+def apply_rate_limits(model: str, rpm: int, tpm: int, concurrency: int) -> None:
+    """이 프로세스의 LLM 스케줄러 한도를 CLI 값으로 (스케줄러는 첫 호출 때 만들어지므로 채점 전에 호출)"""
+    try:
+        limits = json.loads(os.getenv("LLM_SCHEDULER_LIMITS", "") or "{}")
+    except ValueError:
+        limits = {}
+    limits[model] = {"rpm": rpm, "tpm": tpm}
+    os.environ["LLM_SCHEDULER_LIMITS"] = json.dumps(limits)
+    os.environ["LLM_MAX_CONCURRENCY"] = str(max(1, concurrency))
+
+
+def _start_standin() -> Any:
+    from devtools.standins import use_openai_standin
+
+    running = use_openai_standin()
+    print(f"OpenAI 스탠드인: {running.url}")
+    return running
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--scoring-version", help="기본값: <model>:<평가 프롬프트 해시>")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("RESCORE_CONCURRENCY", "4")))
+    parser.add_argument("--rpm", type=int, default=DEFAULT_RPM, help="이 CLI의 분당 요청 수 상한 (서버와 한도를 나눠 씀)")
+    parser.add_argument("--tpm", type=int, default=DEFAULT_TPM, help="이 CLI의 분당 토큰 수 상한")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--limit", type=int, help="이번 실행에서 처리할 최대 행 수")
+    parser.add_argument("--checkpoint", help="기본값: RESCORE_CHECKPOINT_DIR/rescore_<version>.json")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터")
+    parser.add_argument("--retry-failed", action="store_true", help="체크포인트에 남은 실패 행만 다시 채점")
+    parser.add_argument("--no-write", action="store_true", help="점수 테이블/체크포인트에 쓰지 않음 (드라이런)")
+    parser.add_argument("--standin", action="store_true", help="로컬 OpenAI 스탠드인으로 채점 (LLM 비용 없음)")
+    parser.add_argument("--report-every", type=float, default=10.0, help="진행 상황 출력 간격(초)")
+    args = parser.parse_args(argv)
+
+    apply_rate_limits(args.model, args.rpm, args.tpm, args.concurrency)
+    standin = _start_standin() if args.standin else None
+    scoring_version = args.scoring_version or default_scoring_version(args.model)
+    ckpt_path = args.checkpoint or default_checkpoint_path(scoring_version)
+    ckpt = Checkpoint(ckpt_path, scoring_version) if args.restart else Checkpoint.load(ckpt_path, scoring_version)
+    print(f"평가 버전 {scoring_version} | 체크포인트 {ckpt_path} (last_id={ckpt.last_id}, 실패 {len(ckpt.failed_ids)}건)")
+
+    if args.retry_failed:
+        retry_ids, ckpt.failed_ids = ckpt.failed_ids, []
+        pages: Iterator[List[dict]] = iter([fetch_rows_by_id(retry_ids)])
+    else:
+        pages = stream_pages(ckpt.last_id, args.page_size, args.limit)
+
+    rescorer = Rescorer(args.model, args.concurrency)
+    started = last_report = time.perf_counter()
+    try:
+        for page in pages:
+            results, failed = rescorer.score_page(page)
+            if not args.no_write:
+                write_scores(results, scoring_version, args.model)
+                if not args.retry_failed:
+                    ckpt.last_id = max(ckpt.last_id, page[-1]["id"])
+                ckpt.processed += len(results)
+                ckpt.failed_ids.extend(failed)
+                ckpt.save()
+            if time.perf_counter() - last_report >= args.report_every:
+                print(_report("진행", rescorer, started), flush=True)
+                last_report = time.perf_counter()
+    except KeyboardInterrupt:
+        print("중단됨 - 마지막으로 끝난 페이지까지 체크포인트에 기록되어 있습니다.", file=sys.stderr)
+        return 130
+    finally:
+        rescorer.close()
+        if standin is not None:
+            standin.stop()
+    print(_report("완료", rescorer, started))
+    log_event(
+        "rescore",
+        "run.finished",
+        scoring_version=scoring_version,
+        ok=rescorer.ok,
+        failed=rescorer.failed,
+        duration_sec=round(time.perf_counter() - started, 1),
+        **{f"tokens_{k}": v for k, v in rescorer.usage().items()},
+    )
+    return 0 if rescorer.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
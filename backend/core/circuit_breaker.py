@@ -0,0 +1,208 @@
+"""
+File: circuit_breaker.py
+Created: 2026-10-19
+Description: 외부 제공자(OpenAI LLM / 임베딩) 호출용 서킷 브레이커
+             - 최근 N건의 호출에서 실패율 또는 느린 호출 비율이 임계값을 넘으면 OPEN
+             - OPEN 동안은 호출 없이 즉시 CircuitOpenError → 호출 측이 성능 저하 응답(degraded)으로 처리
+             - open_sec 경과 후 HALF_OPEN: 시험 호출 몇 건이 성공하면 CLOSED로 복귀, 실패하면 다시 OPEN
+             - 상태 전이 리스너 (복구 시 밀린 재채점 작업 실행 등)
+             설정: CIRCUIT_BREAKER_CONFIG='{"llm": {"failure_rate": 0.5, "open_sec": 30}}'
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from backend.core import metrics
+
+T = TypeVar("T")
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+_STATE_VALUE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_STATE = metrics.gauge("circuit_breaker_state", "서킷 상태 (0=CLOSED, 1=HALF_OPEN, 2=OPEN)", ("name",))
+CIRCUIT_TRANSITIONS = metrics.counter("circuit_breaker_transitions_total", "서킷 상태 전이", ("name", "to"))
+CIRCUIT_REJECTED = metrics.counter("circuit_breaker_rejected_total", "OPEN 상태라 보내지 않은 호출", ("name",))
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷이 열려 있어 호출을 보내지 않은 경우"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"서킷 '{name}' OPEN (약 {retry_in:.0f}초 후 재시도)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+@dataclass
+class BreakerPolicy:
+    window: int = 20              # 최근 호출 표본 수
+    min_calls: int = 8            # 이만큼 쌓이기 전에는 열지 않는다
+    failure_rate: float = 0.5     # 실패 비율 임계값
+    slow_call_sec: float = 15.0   # 이보다 오래 걸린 호출은 "느린 호출"
+    slow_rate: float = 0.6        # 느린 호출 비율 임계값
+    open_sec: float = 30.0        # OPEN 유지 시간
+    half_open_calls: int = 2      # HALF_OPEN에서 연속 성공해야 하는 시험 호출 수
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, policy: Optional[BreakerPolicy] = None):
+        self.name = name
+        self.policy = policy or BreakerPolicy()
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        # (실패 여부, 느린 호출 여부)
+        self._calls: Deque[Tuple[bool, bool]] = deque(maxlen=self.policy.window)
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._listeners: List[Callable[[str, str], None]] = []
+        CIRCUIT_STATE.set(0, name=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def add_listener(self, fn: Callable[[str, str], None]) -> None:
+        """fn(old_state, new_state) - 락 밖에서 호출된다"""
+        self._listeners.append(fn)
+
+    # ─── 상태 전이 ────────────────────────────────────────
+    def _transition(self, new_state: str) -> Optional[Tuple[str, str]]:
+        old = self._state
+        if old == new_state:
+            return None
+        self._state = new_state
+        if new_state == OPEN:
+            self._opened_at = time.monotonic()
+        if new_state != HALF_OPEN:
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        if new_state == CLOSED:
+            self._calls.clear()
+        CIRCUIT_STATE.set(_STATE_VALUE[new_state], name=self.name)
+        CIRCUIT_TRANSITIONS.inc(name=self.name, to=new_state)
+        return old, new_state
+
+    def _maybe_half_open(self, now: float) -> Optional[Tuple[str, str]]:
+        if self._state == OPEN and now - self._opened_at >= self.policy.open_sec:
+            return self._transition(HALF_OPEN)
+        return None
+
+    def _notify(self, change: Optional[Tuple[str, str]]) -> None:
+        if change is None:
+            return
+        for fn in list(self._listeners):
+            try:
+                fn(*change)
+            except Exception:
+                pass
+
+    # ─── 호출 전후 ────────────────────────────────────────
+    def before_call(self) -> None:
+        """보내도 되면 그대로 반환, 아니면 CircuitOpenError"""
+        with self._lock:
+            now = time.monotonic()
+            change = self._maybe_half_open(now)
+            if self._state == OPEN:
+                retry_in = self.policy.open_sec - (now - self._opened_at)
+            elif self._state == HALF_OPEN and self._probes_in_flight >= self.policy.half_open_calls:
+                retry_in = 1.0
+            else:
+                if self._state == HALF_OPEN:
+                    self._probes_in_flight += 1
+                retry_in = None
+        self._notify(change)
+        if retry_in is not None:
+            CIRCUIT_REJECTED.inc(name=self.name)
+            raise CircuitOpenError(self.name, max(0.0, retry_in))
+
+    def reject_if_open(self) -> None:
+        """대기열 진입 전 빠른 확인 (HALF_OPEN 시험 호출 슬롯은 건드리지 않는다)"""
+        with self._lock:
+            now = time.monotonic()
+            change = self._maybe_half_open(now)
+            retry_in = self.policy.open_sec - (now - self._opened_at) if self._state == OPEN else None
+        self._notify(change)
+        if retry_in is not None:
+            CIRCUIT_REJECTED.inc(name=self.name)
+            raise CircuitOpenError(self.name, max(0.0, retry_in))
+
+    def record(self, failed: bool, latency: float) -> None:
+        slow = latency >= self.policy.slow_call_sec
+        with self._lock:
+            change = None
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed or slow:
+                    change = self._transition(OPEN)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.policy.half_open_calls:
+                        change = self._transition(CLOSED)
+            elif self._state == CLOSED:
+                self._calls.append((failed, slow))
+                n = len(self._calls)
+                if n >= self.policy.min_calls:
+                    failures = sum(1 for f, _ in self._calls if f)
+                    slows = sum(1 for _, s in self._calls if s)
+                    if failures / n >= self.policy.failure_rate or slows / n >= self.policy.slow_rate:
+                        change = self._transition(OPEN)
+        self._notify(change)
+
+    def call(self, fn: Callable[[], T], is_failure: Callable[[BaseException], bool] = lambda e: True) -> T:
+        """
+        fn()을 서킷으로 감싸 실행.
+        is_failure(e)가 False인 예외(잘못된 요청 등 제공자 장애가 아닌 오류)는 실패로 세지 않는다.
+        """
+        self.before_call()
+        started = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            self.record(is_failure(e), time.perf_counter() - started)
+            raise
+        self.record(False, time.perf_counter() - started)
+        return result
+
+
+def _load_policies() -> Dict[str, BreakerPolicy]:
+    policies: Dict[str, BreakerPolicy] = {}
+    raw = os.getenv("CIRCUIT_BREAKER_CONFIG", "").strip()
+    if raw:
+        try:
+            for name, conf in json.loads(raw).items():
+                policies[name] = BreakerPolicy(**(conf or {}))
+        except Exception:
+            return {}
+    return policies
+
+
+_policies = _load_policies()
+_breakers: Dict[str, CircuitBreaker] = {}
+_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """이름별 프로세스 공용 브레이커 ("llm", "embedding")"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, _policies.get(name))
+                _breakers[name] = breaker
+    return breaker
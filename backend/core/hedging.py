@@ -0,0 +1,231 @@
+"""
+File: hedging.py
+Created: 2026-10-19
+Description: LLM 호출 헤징(hedged request) - 꼬리 지연 완화
+             - 첫 요청이 호출 지점별 지연 백분위(p95 등) 안에 끝나지 않으면 같은 요청을 한 번 더 보내고
+               먼저 끝난 쪽 결과를 사용한다.
+             - 호출 지점별 예산: 일반 요청 1건마다 budget만큼 크레딧이 쌓이고 헤지 1건이 1을 쓴다
+               → 헤지 비율은 장기적으로 budget(기본 5%)을 넘지 않는다.
+             - 진 쪽 요청은 아직 시작 전이면 취소, 이미 전송 중이면 결과를 버린다
+               (동기 SDK 호출은 중간에 끊을 수 없으므로 예산으로 비용 상한을 둔다).
+             - 기준 지연은 첫 요청이 실제로 전송된 시점부터 잰다 (스케줄러 대기열 대기는 제외).
+             - 헤지 풀 슬롯(LLM_HEDGE_WORKERS)이 모자라면 헤징하지 않는다. 결과를 버린 요청이
+               슬롯을 다 차지해도 호출자는 자기 스레드에서 바로 실행하므로 막히지 않는다.
+             - 기본 비활성. LLM_HEDGE_CALL_SITES 환경변수(JSON)로 켠다.
+               예: LLM_HEDGE_CALL_SITES='{"evaluate_and_respond": {"percentile": 0.95, "budget": 0.05}}'
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: 기준 지연을 실제 전송 시점부터 측정, 빈 슬롯이 없으면 헤징 생략(no_worker), 풀 슬롯 상한
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional, TypeVar
+
+from backend.core import metrics
+
+T = TypeVar("T")
+
+LLM_HEDGES = metrics.counter(
+    "llm_hedges_total",
+    "헤지 요청 (outcome=fired|won|lost|no_budget|no_worker)",
+    ("call_site", "outcome"),
+)
+HEDGE_DEADLINE = metrics.gauge("llm_hedge_deadline_seconds", "현재 헤지 발사 기준 지연", ("call_site",))
+
+
+@dataclass
+class HedgePolicy:
+    percentile: float = 0.95      # 이 백분위 지연을 넘기면 헤지 발사
+    budget: float = 0.05          # 일반 요청 대비 헤지 비율 상한
+    burst: float = 2.0            # 쌓아둘 수 있는 최대 크레딧
+    min_samples: int = 20         # 이만큼 표본이 모이기 전에는 initial_delay_sec 사용
+    initial_delay_sec: float = 10.0
+    min_delay_sec: float = 0.3    # 백분위가 아무리 낮아도 이보다 빨리 헤지하지 않는다
+    window: int = 256             # 최근 지연 표본 수
+
+
+class _SiteState:
+    def __init__(self, call_site: str, policy: HedgePolicy):
+        self.call_site = call_site
+        self.policy = policy
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=policy.window)
+        self._since_recompute = 0
+        self._deadline = policy.initial_delay_sec
+        self._credits = 0.0
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+            self._since_recompute += 1
+            # 매번 정렬하지 않고 16개마다 기준 지연을 다시 계산
+            if len(self._samples) >= self.policy.min_samples and self._since_recompute >= 16:
+                self._since_recompute = 0
+                ordered = sorted(self._samples)
+                idx = min(len(ordered) - 1, max(0, math.ceil(self.policy.percentile * len(ordered)) - 1))
+                self._deadline = max(self.policy.min_delay_sec, ordered[idx])
+                HEDGE_DEADLINE.set(self._deadline, call_site=self.call_site)
+
+    def deadline(self) -> float:
+        with self._lock:
+            return self._deadline
+
+    def earn(self) -> None:
+        with self._lock:
+            self._credits = min(self.policy.burst, self._credits + self.policy.budget)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._credits >= 1.0:
+                self._credits -= 1.0
+                return True
+            return False
+
+
+def _load_policies() -> Dict[str, HedgePolicy]:
+    raw = os.getenv("LLM_HEDGE_CALL_SITES", "").strip()
+    policies: Dict[str, HedgePolicy] = {}
+    if not raw:
+        return policies
+    try:
+        for call_site, conf in json.loads(raw).items():
+            policies[call_site] = HedgePolicy(**(conf or {}))
+    except Exception:
+        return {}
+    return policies
+
+
+_policies: Dict[str, HedgePolicy] = _load_policies()
+_states: Dict[str, _SiteState] = {}
+_states_lock = threading.Lock()
+_WORKERS = max(2, int(os.getenv("LLM_HEDGE_WORKERS", "32")))
+# 실행 중(결과를 버린 요청 포함)인 작업 수 상한. 풀 크기와 같으므로 풀 안에서 줄을 서는 작업은 없다
+_slots = threading.BoundedSemaphore(_WORKERS)
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _states_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=_WORKERS, thread_name_prefix="llm-hedge")
+    return _executor
+
+
+def _try_submit(fn: Callable[..., T], *args) -> Optional[Future]:
+    """빈 슬롯이 있을 때만 풀에 넣는다. 없으면 None"""
+    if not _slots.acquire(blocking=False):
+        return None
+
+    def run() -> T:
+        try:
+            return fn(*args)
+        finally:
+            _slots.release()
+
+    try:
+        return _get_executor().submit(run)
+    except BaseException:
+        _slots.release()
+        raise
+
+
+def configure(call_site: str, policy: Optional[HedgePolicy]) -> None:
+    """코드에서 직접 정책 지정 (None이면 해당 호출 지점 헤징 해제). 벤치마크/테스트용"""
+    with _states_lock:
+        if policy is None:
+            _policies.pop(call_site, None)
+        else:
+            _policies[call_site] = policy
+        _states.pop(call_site, None)
+
+
+def is_enabled(call_site: str) -> bool:
+    return call_site in _policies
+
+
+def _state(call_site: str) -> _SiteState:
+    st = _states.get(call_site)
+    if st is None:
+        with _states_lock:
+            st = _states.get(call_site)
+            if st is None:
+                st = _SiteState(call_site, _policies.get(call_site) or HedgePolicy())
+                _states[call_site] = st
+    return st
+
+
+def hedged(primary: Callable[[Callable[[], None]], T], hedge: Callable[[], T], call_site: str) -> T:
+    """
+    primary(on_start)를 실행하고, 기준 지연 안에 끝나지 않으면 예산이 허락할 때 hedge()를 추가로 실행.
+    primary는 실제 요청을 보내기 직전에 on_start()를 불러야 한다 (기준 지연은 그때부터 잰다).
+    둘 중 먼저 성공한 결과를 반환. 둘 다 실패하면 primary의 예외를 올린다.
+    """
+    st = _state(call_site)
+    st.earn()
+
+    started = threading.Event()
+    started_at = [0.0]
+
+    def on_start() -> None:
+        # 재시도마다 불리지만 첫 전송 시각만 쓴다
+        if not started.is_set():
+            started_at[0] = time.perf_counter()
+            started.set()
+
+    first = _try_submit(primary, on_start)
+    if first is None:
+        LLM_HEDGES.inc(call_site=call_site, outcome="no_worker")
+        return primary(lambda: None)
+
+    # 백분위 표본은 이긴 쪽이 아니라 "단일 요청"의 실제 지연으로 쌓는다 (헤지가 분포를 왜곡하지 않도록)
+    def _record(f: Future) -> None:
+        if not f.cancelled() and f.exception() is None and started.is_set():
+            st.record(time.perf_counter() - started_at[0])
+
+    first.add_done_callback(_record)
+    # 전송 전에 끝나면(대기열 시간 초과 등) 바로 깨어나도록
+    first.add_done_callback(lambda _f: started.set())
+
+    started.wait()
+    if first.done():
+        return first.result()
+    remaining = st.deadline() - (time.perf_counter() - started_at[0])
+    done, _ = wait([first], timeout=max(0.0, remaining))
+    if done:
+        return first.result()
+
+    if not st.try_spend():
+        LLM_HEDGES.inc(call_site=call_site, outcome="no_budget")
+        return first.result()
+
+    second = _try_submit(hedge)
+    if second is None:
+        # 크레딧은 쓰지 않은 것으로 되돌리지 않는다 (혼잡할 때 헤지를 더 줄이는 쪽이 안전)
+        LLM_HEDGES.inc(call_site=call_site, outcome="no_worker")
+        return first.result()
+
+    LLM_HEDGES.inc(call_site=call_site, outcome="fired")
+    pending = {first, second}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for f in done:
+            if f.exception() is None:
+                for other in pending:
+                    other.cancel()
+                LLM_HEDGES.inc(call_site=call_site, outcome="won" if f is second else "lost")
+                return f.result()
+
+    LLM_HEDGES.inc(call_site=call_site, outcome="lost")
+    return first.result()
@@ -0,0 +1,157 @@
+"""
+File: http_clients.py
+Created: 2026-10-19
+Description: 프로세스 공용 HTTP / OpenAI / Tavily 클라이언트 팩토리
+             - httpx 연결 풀 1개를 오래 유지 (keep-alive, h2 패키지가 있으면 HTTP/2)
+             - OpenAI 클라이언트는 API 키/베이스 URL별로 1개만 생성해 재사용
+             - TCP 연결 / TLS 핸드셰이크 수를 지표로 남겨 요청 대비 절감량 확인
+             - 백엔드 종료(shutdown 훅)와 프로세스 종료(atexit) 시 풀 정리
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: 공용 OpenAI 클라이언트의 SDK 자체 재시도 끄기 (max_retries=0)
+"""
+
+from __future__ import annotations
+
+import atexit
+import importlib.util
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from backend.core import metrics
+
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "1") == "1" and importlib.util.find_spec("h2") is not None
+
+POOL_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "100")),
+    max_keepalive_connections=int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "20")),
+    keepalive_expiry=float(os.getenv("HTTP_POOL_KEEPALIVE_SEC", "90")),
+)
+
+# LLM 응답은 수십 초 걸릴 수 있으므로 read만 길게, 연결/풀 대기는 짧게
+OPENAI_TIMEOUT = httpx.Timeout(
+    connect=float(os.getenv("OPENAI_CONNECT_TIMEOUT_SEC", "5")),
+    read=float(os.getenv("OPENAI_READ_TIMEOUT_SEC", "120")),
+    write=30.0,
+    pool=10.0,
+)
+DEFAULT_TIMEOUT = httpx.Timeout(connect=5.0, read=30.0, write=30.0, pool=10.0)
+
+HTTP_REQUESTS = metrics.counter("http_client_requests_total", "공용 클라이언트 아웃바운드 요청 수", ("client",))
+HTTP_CONNECTIONS = metrics.counter("http_client_connections_total", "새로 연 TCP 연결 수", ("client",))
+TLS_HANDSHAKES = metrics.counter("http_client_tls_handshakes_total", "TLS 핸드셰이크 수", ("client",))
+
+_lock = threading.Lock()
+_http_clients: Dict[str, httpx.Client] = {}
+_openai_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+_tavily_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+
+
+def _tracer(name: str):
+    """httpcore trace 확장으로 연결 수립 / TLS 완료 이벤트를 센다"""
+
+    def trace(event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.complete":
+            HTTP_CONNECTIONS.inc(client=name)
+        elif event == "connection.start_tls.complete":
+            TLS_HANDSHAKES.inc(client=name)
+
+    def on_request(request: httpx.Request) -> None:
+        HTTP_REQUESTS.inc(client=name)
+        request.extensions["trace"] = trace
+
+    return on_request
+
+
+def _build_http_client(name: str, timeout: httpx.Timeout) -> httpx.Client:
+    return httpx.Client(
+        http2=HTTP2_ENABLED,
+        limits=POOL_LIMITS,
+        timeout=timeout,
+        event_hooks={"request": [_tracer(name)]},
+    )
+
+
+def get_http_client(name: str = "default") -> httpx.Client:
+    """이름별 공용 httpx.Client (openai / landmark 등 용도별로 지표가 나뉜다)"""
+    client = _http_clients.get(name)
+    if client is None:
+        with _lock:
+            client = _http_clients.get(name)
+            if client is None:
+                client = _build_http_client(name, OPENAI_TIMEOUT if name == "openai" else DEFAULT_TIMEOUT)
+                _http_clients[name] = client
+    return client
+
+
+def get_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None):
+    """
+    공용 연결 풀을 쓰는 OpenAI 클라이언트.
+    api_key를 생략하면 OPENAI_API_KEY, base_url을 생략하면 OPENAI_BASE_URL(없으면 기본 엔드포인트)
+    """
+    from openai import OpenAI
+
+    key = api_key if api_key is not None else os.getenv("OPENAI_API_KEY", "")
+    url = base_url or os.getenv("OPENAI_BASE_URL") or None
+    client = _openai_clients.get((key, url))
+    if client is None:
+        http_client = get_http_client("openai")
+        with _lock:
+            client = _openai_clients.get((key, url))
+            if client is None:
+                # 재시도는 LLM 스케줄러 한 곳에서만 (SDK 기본 2회 재시도와 겹치면 호출 시간이 곱으로 늘어난다)
+                client = OpenAI(
+                    api_key=key, base_url=url, http_client=http_client, timeout=OPENAI_TIMEOUT, max_retries=0
+                )
+                _openai_clients[(key, url)] = client
+    return client
+
+
+def get_tavily_client(api_key: str):
+    """
+    TavilyClient 재사용 (TAVILY_BASE_URL이 있으면 해당 주소로).
+    tavily-python은 내부적으로 requests를 쓰므로 httpx 풀 대신 클라이언트 인스턴스를 유지한다.
+    """
+    from tavily import TavilyClient
+
+    base_url = os.getenv("TAVILY_BASE_URL") or None
+    client = _tavily_clients.get((api_key, base_url))
+    if client is None:
+        with _lock:
+            client = _tavily_clients.get((api_key, base_url))
+            if client is None:
+                if base_url:
+                    client = TavilyClient(api_key=api_key, api_base_url=base_url)
+                else:
+                    client = TavilyClient(api_key=api_key)
+                _tavily_clients[(api_key, base_url)] = client
+    return client
+
+
+def close_all() -> None:
+    """모든 공용 클라이언트 종료 (FastAPI shutdown / atexit)"""
+    with _lock:
+        clients = list(_http_clients.values())
+        tavily = list(_tavily_clients.values())
+        _http_clients.clear()
+        _openai_clients.clear()
+        _tavily_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+    for client in tavily:
+        session = getattr(client, "session", None)
+        if session is not None:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+
+atexit.register(close_all)
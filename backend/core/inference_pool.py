@@ -0,0 +1,315 @@
+"""
+File: inference_pool.py
+Created: 2026-10-19
+Description: 프로세스 전역 추론 작업 풀 (얼굴 랜드마크 추론 등 무거운 동기 호출용)
+             - 고정 크기 워커 스레드 (요청마다 ThreadPoolExecutor를 새로 만들지 않음)
+             - 대기열 상한 (작업 가중치 = 프레임 수 합계), 넘치면 즉시 PoolSaturated → 호출자가 빈 결과로 처리
+             - 작업별 마감 시각: 워커가 꺼냈을 때 이미 지났으면 실행하지 않고 DeadlineExceeded
+             - CancelToken: 같은 턴의 작업을 한 번에 취소 (대기열에서 즉시 제거, 버려진 턴이 워커를 잡지 않도록)
+             - 지표: 대기 시간 / 실행 시간 히스토그램, 결과별 작업 수, 대기열 깊이 / 실행 중 워커 게이지
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, TypeVar
+
+from backend.core import metrics
+
+T = TypeVar("T")
+
+
+class PoolSaturated(RuntimeError):
+    """대기열이 가득 차 작업을 받지 않은 경우"""
+
+
+class DeadlineExceeded(RuntimeError):
+    """작업이 실행되기 전에 마감 시각이 지난 경우"""
+
+
+class JobCancelled(RuntimeError):
+    """작업이 속한 요청(턴)이 취소된 경우"""
+
+
+POOL_QUEUE_WAIT = metrics.histogram("inference_pool_queue_wait_seconds", "추론 풀 대기열 대기 시간", ("pool",))
+POOL_SERVICE = metrics.histogram("inference_pool_service_seconds", "추론 풀 작업 실행 시간", ("pool",))
+POOL_JOBS = metrics.counter("inference_pool_jobs_total", "추론 풀 작업 결과별 수", ("pool", "result"))
+_QUEUE_DEPTH = metrics.gauge("inference_pool_queue_depth", "추론 풀 대기 중인 작업 가중치(프레임 수)", ("pool",))
+_BUSY = metrics.gauge("inference_pool_busy_workers", "추론 풀 실행 중인 워커 수", ("pool",))
+
+
+class CancelToken:
+    """
+    한 요청(턴)에 속한 작업 묶음. cancel()하면 대기 중인 작업은 버리고 새 작업도 받지 않는다.
+    parent를 주면 부모가 취소될 때 같이 취소된다 (부모를 건드리지 않고 호출 하나의 작업만 정리할 때)
+    """
+
+    def __init__(self, parent: Optional["CancelToken"] = None) -> None:
+        self._event = threading.Event()
+        self._pools: List["InferencePool"] = []
+        self._children: List["CancelToken"] = []
+        self._lock = threading.Lock()
+        if parent is not None:
+            with parent._lock:
+                parent._children.append(self)
+            if parent.cancelled:
+                self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def _attach(self, pool: "InferencePool") -> None:
+        with self._lock:
+            if pool not in self._pools:
+                self._pools.append(pool)
+
+    def cancel(self) -> None:
+        self._event.set()
+        with self._lock:
+            pools = list(self._pools)
+            children = list(self._children)
+        for pool in pools:
+            pool.purge(self)
+        for child in children:
+            child.cancel()
+
+    def _forget(self, child: "CancelToken") -> None:
+        with self._lock:
+            if child in self._children:
+                self._children.remove(child)
+
+
+class _Job:
+    __slots__ = ("fn", "weight", "deadline", "token", "future", "enqueued_at")
+
+    def __init__(self, fn: Callable[[], Any], weight: int, deadline: Optional[float], token: Optional[CancelToken]):
+        self.fn = fn
+        self.weight = weight
+        self.deadline = deadline
+        self.token = token
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class InferencePool:
+    """
+    동기 호출자를 위한 고정 크기 작업 풀.
+    submit()은 Future를 돌려주고, run_all()은 여러 작업을 넣은 뒤 마감 시각까지 기다려 결과(또는 예외)를 모은다.
+    """
+
+    def __init__(self, name: str, workers: int = 4, max_queue: int = 64) -> None:
+        self.name = name
+        self._workers = max(1, int(workers))
+        self._max_queue = max(1, int(max_queue))
+        self._cv = threading.Condition()
+        self._jobs: Deque[_Job] = deque()
+        self._queued_weight = 0
+        self._busy = 0
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+        self._counts: Dict[str, int] = {}
+
+    # ─── 워커 ─────────────────────────────────────────────
+    def _start_workers(self) -> None:
+        # 호출자가 _cv를 잡은 상태
+        while len(self._threads) < self._workers:
+            t = threading.Thread(target=self._worker, name=f"{self.name}-pool-{len(self._threads)}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _worker(self) -> None:
+        while True:
+            with self._cv:
+                while not self._jobs and not self._closed:
+                    self._cv.wait()
+                if not self._jobs:
+                    return
+                job = self._jobs.popleft()
+                self._queued_weight -= job.weight
+                self._busy += 1
+            try:
+                self._run(job)
+            finally:
+                with self._cv:
+                    self._busy -= 1
+
+    def _run(self, job: _Job) -> None:
+        now = time.monotonic()
+        POOL_QUEUE_WAIT.observe(now - job.enqueued_at, pool=self.name)
+        if job.token is not None and job.token.cancelled:
+            self._finish(job, "cancelled", exc=JobCancelled(f"{self.name}: 요청이 취소됨"))
+            return
+        if job.deadline is not None and now >= job.deadline:
+            self._finish(job, "expired", exc=DeadlineExceeded(f"{self.name}: 실행 전 마감 시각 초과"))
+            return
+        if not job.future.set_running_or_notify_cancel():
+            self._count("cancelled")
+            return
+        started = time.perf_counter()
+        try:
+            result = job.fn()
+        except BaseException as exc:
+            POOL_SERVICE.observe(time.perf_counter() - started, pool=self.name)
+            self._count("error")
+            job.future.set_exception(exc)
+            return
+        POOL_SERVICE.observe(time.perf_counter() - started, pool=self.name)
+        self._count("ok")
+        job.future.set_result(result)
+
+    def _finish(self, job: _Job, result: str, exc: BaseException) -> None:
+        self._count(result)
+        if job.future.set_running_or_notify_cancel():
+            job.future.set_exception(exc)
+
+    def _count(self, result: str) -> None:
+        POOL_JOBS.inc(pool=self.name, result=result)
+        with self._cv:
+            self._counts[result] = self._counts.get(result, 0) + 1
+
+    # ─── 공개 API ─────────────────────────────────────────
+    def submit(
+        self,
+        fn: Callable[[], T],
+        *,
+        weight: int = 1,
+        deadline: Optional[float] = None,
+        token: Optional[CancelToken] = None,
+    ) -> "Future[T]":
+        """deadline은 time.monotonic() 기준 시각. 대기열이 넘치면 PoolSaturated, 취소된 토큰이면 JobCancelled"""
+        if token is not None:
+            if token.cancelled:
+                raise JobCancelled(f"{self.name}: 요청이 취소됨")
+            token._attach(self)
+        job = _Job(fn, max(1, int(weight)), deadline, token)
+        with self._cv:
+            if self._closed:
+                raise RuntimeError(f"{self.name}: 풀이 종료됨")
+            # 빈 대기열에는 상한보다 큰 작업도 하나는 받는다 (한 턴 배치가 통째로 거절되지 않도록)
+            if self._queued_weight and self._queued_weight + job.weight > self._max_queue:
+                self._counts["rejected"] = self._counts.get("rejected", 0) + 1
+                POOL_JOBS.inc(pool=self.name, result="rejected")
+                raise PoolSaturated(f"{self.name}: 대기열 가득 참 ({self._queued_weight}/{self._max_queue})")
+            self._jobs.append(job)
+            self._queued_weight += job.weight
+            self._start_workers()
+            self._cv.notify()
+        return job.future
+
+    def run_all(
+        self,
+        fns: List[Callable[[], T]],
+        *,
+        timeout: Optional[float] = None,
+        token: Optional[CancelToken] = None,
+        weights: Optional[List[int]] = None,
+    ) -> List[Any]:
+        """
+        작업 여러 개를 넣고 timeout(초)까지 기다린다. 순서대로 결과 또는 예외 객체를 돌려준다.
+        시간 안에 끝나지 않은 작업은 토큰을 취소해 대기열에서 빼고 DeadlineExceeded로 채운다.
+        """
+        own_token = CancelToken(parent=token)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        futures: List[Optional[Future]] = []
+        results: List[Any] = [None] * len(fns)
+        for i, fn in enumerate(fns):
+            try:
+                futures.append(self.submit(fn, weight=weights[i] if weights else 1, deadline=deadline, token=own_token))
+            except (PoolSaturated, JobCancelled) as exc:
+                futures.append(None)
+                results[i] = exc
+        for i, fut in enumerate(futures):
+            if fut is None:
+                continue
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                results[i] = fut.result(timeout=remaining)
+            except TimeoutError:
+                results[i] = DeadlineExceeded(f"{self.name}: 결과 대기 시간 초과")
+            except Exception as exc:  # 작업 예외 / 취소 / 마감
+                results[i] = exc
+        if any(isinstance(r, DeadlineExceeded) for r in results):
+            # 이미 포기한 턴의 남은 작업이 워커를 잡지 않도록
+            own_token.cancel()
+        if token is not None:
+            token._forget(own_token)
+        return results
+
+    def purge(self, token: CancelToken) -> int:
+        """토큰에 속한 대기 중 작업을 대기열에서 빼고 JobCancelled로 끝낸다. 뺀 작업 수"""
+        with self._cv:
+            kept: Deque[_Job] = deque()
+            dropped: List[_Job] = []
+            for job in self._jobs:
+                (dropped if job.token is token else kept).append(job)
+            self._jobs = kept
+            self._queued_weight -= sum(j.weight for j in dropped)
+        for job in dropped:
+            self._finish(job, "cancelled", exc=JobCancelled(f"{self.name}: 요청이 취소됨"))
+        return len(dropped)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cv:
+            return {
+                "workers": self._workers,
+                "busy": self._busy,
+                "queued_jobs": len(self._jobs),
+                "queued_weight": self._queued_weight,
+                "max_queue": self._max_queue,
+                "jobs": dict(self._counts),
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """새 작업을 막고 대기 중인 작업은 취소. wait=True면 실행 중인 작업이 끝날 때까지 기다린다"""
+        with self._cv:
+            self._closed = True
+            dropped = list(self._jobs)
+            self._jobs.clear()
+            self._queued_weight = 0
+            self._cv.notify_all()
+            threads = list(self._threads)
+        for job in dropped:
+            self._finish(job, "cancelled", exc=JobCancelled(f"{self.name}: 풀 종료"))
+        if wait:
+            for t in threads:
+                t.join()
+
+
+_pools: Dict[str, InferencePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str, workers: int, max_queue: int) -> InferencePool:
+    """이름별 프로세스 전역 풀 (처음 호출할 때의 크기로 만든다)"""
+    pool = _pools.get(name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = _pools[name] = InferencePool(name, workers=workers, max_queue=max_queue)
+    return pool
+
+
+def shutdown_all() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+def _collect_pool_gauges() -> None:
+    for name, pool in list(_pools.items()):
+        snap = pool.snapshot()
+        _QUEUE_DEPTH.set(snap["queued_weight"], pool=name)
+        _BUSY.set(snap["busy"], pool=name)
+
+
+metrics.REGISTRY.add_collector(_collect_pool_gauges)
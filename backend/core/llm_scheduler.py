@@ -0,0 +1,478 @@
+"""
+File: llm_scheduler.py
+Created: 2026-10-19
+Description: 모든 LLM(OpenAI) 호출이 거쳐가는 중앙 스케줄러
+             - 모델별 토큰 버킷(분당 요청 수 / 분당 토큰 수) 제한
+             - 우선순위 큐 (면접 턴 > 리포트 > 이력서 분석 > 뉴스 > 일괄 재채점)
+             - 지터가 섞인 지수 백오프 재시도
+             - 큐 깊이 / 대기 시간 / 재시도 지표
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: 호출 지연/토큰/비용 Prometheus 지표 기록 및 큐 깊이 Gauge 노출
+- 2026-10-19: LLM_HEDGE_CALL_SITES에 지정된 호출 지점은 헤지 요청(core/hedging.py) 경유
+- 2026-10-19: 모든 호출을 "llm" 서킷 브레이커(core/circuit_breaker.py)로 감싸 제공자 장애 시 즉시 실패
+- 2026-10-19: 저장된 답변 일괄 재채점용 BATCH 우선순위 추가
+- 2026-10-19: 다른 모델 요청이 추월해 슬롯을 얻을 때 맨 앞 티켓을 잘못 꺼내던 문제 수정
+- 2026-10-19: 호출 단위 전체 마감 시각(deadline) 지원 - 대기와 재시도가 마감을 넘기지 않도록
+- 2026-10-19: 헤지 기준 지연을 대기열 통과 후 실제 전송 시점부터 재도록 primary에 시작 콜백 전달
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from backend.core import hedging, metrics
+from backend.core.circuit_breaker import get_breaker
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """값이 작을수록 먼저 처리된다."""
+
+    INTERACTIVE = 0  # 면접 턴 평가, TTS, 가이드봇 등 사용자가 화면 앞에서 기다리는 호출
+    REPORT = 1       # 종합 리포트 생성
+    RESUME = 2       # 이력서 분석 / 키워드 추출
+    NEWS = 3         # 뉴스 요약 등 백그라운드 호출
+    BATCH = 4        # 저장된 답변 일괄 재채점 (backend/cli/rescore_answers.py)
+
+
+# 모델별 기본 한도 (LLM_SCHEDULER_LIMITS 환경변수(JSON)로 덮어쓸 수 있음)
+# 예: LLM_SCHEDULER_LIMITS='{"gpt-4.1-mini": {"rpm": 300, "tpm": 100000}}'
+DEFAULT_LIMITS: Dict[str, Dict[str, int]] = {
+    "gpt-4.1-mini": {"rpm": 500, "tpm": 200000},
+    "gpt-4o-mini": {"rpm": 500, "tpm": 200000},
+    "tts-1": {"rpm": 50, "tpm": 0},
+    "text-embedding-3-small": {"rpm": 3000, "tpm": 1000000},
+}
+FALLBACK_LIMITS = {"rpm": 300, "tpm": 100000}
+
+# 재시도 대상 HTTP 상태 코드 / 예외 클래스 이름 (openai SDK를 직접 import하지 않기 위해 이름으로 판별)
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {
+    "RateLimitError",
+    "APITimeoutError",
+    "APIConnectionError",
+    "InternalServerError",
+    "TimeoutException",
+    "ConnectError",
+    "ReadTimeout",
+}
+
+
+class SchedulerTimeout(RuntimeError):
+    """큐 대기 시간이 max_wait_sec(또는 호출자가 준 deadline)를 넘은 경우"""
+
+
+class TokenBucket:
+    """capacity만큼 쌓이고 초당 refill_per_sec씩 채워지는 버킷. capacity<=0이면 무제한."""
+
+    def __init__(self, capacity: float):
+        self.capacity = float(capacity)
+        self.refill_per_sec = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float) -> None:
+        if self.unlimited:
+            return
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_sec)
+            self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount를 꺼내려면 몇 초 기다려야 하는지 (0이면 즉시 가능)"""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        # 버킷보다 큰 요청은 가득 찼을 때 한 번에 통과시킨다(영원히 막히지 않도록)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_sec
+
+    def take(self, amount: float) -> None:
+        if not self.unlimited:
+            self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """실제 사용량이 추정치와 달랐을 때 보정 (음수면 환불)"""
+        if not self.unlimited:
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+
+@dataclass
+class _ModelLimiter:
+    requests: TokenBucket
+    tokens: TokenBucket
+
+
+@dataclass(order=True)
+class _Ticket:
+    priority: int
+    seq: int
+    model: str = field(compare=False)
+    est_tokens: int = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    granted: bool = field(default=False, compare=False)
+
+
+def _load_limits() -> Dict[str, Dict[str, int]]:
+    limits = {k: dict(v) for k, v in DEFAULT_LIMITS.items()}
+    raw = os.getenv("LLM_SCHEDULER_LIMITS", "").strip()
+    if raw:
+        try:
+            for model, conf in json.loads(raw).items():
+                limits.setdefault(model, dict(FALLBACK_LIMITS)).update(conf)
+        except Exception:
+            pass
+    return limits
+
+
+def estimate_tokens(messages: Any = None, max_output_tokens: int = 0) -> int:
+    """요청 토큰 수를 대략 추정 (한국어 기준 글자 2개 ≈ 1토큰으로 보수적으로 계산)"""
+    chars = 0
+    if isinstance(messages, str):
+        chars = len(messages)
+    elif isinstance(messages, Iterable):
+        for m in messages:
+            if isinstance(m, dict):
+                chars += len(str(m.get("content", "")))
+            else:
+                chars += len(str(m))
+    return chars // 2 + int(max_output_tokens or 0)
+
+
+def usage_total_tokens(result: Any) -> Optional[int]:
+    """chat.completions / responses 응답에서 실제 사용 토큰 수를 꺼낸다."""
+    usage = getattr(result, "usage", None)
+    if usage is None:
+        return None
+    total = getattr(usage, "total_tokens", None)
+    if total is None:
+        inp = getattr(usage, "input_tokens", None) or getattr(usage, "prompt_tokens", None) or 0
+        out = getattr(usage, "output_tokens", None) or getattr(usage, "completion_tokens", None) or 0
+        total = inp + out
+    try:
+        return int(total)
+    except Exception:
+        return None
+
+
+def _retry_after_seconds(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except Exception:
+        return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if type(exc).__name__ in RETRYABLE_ERRORS:
+        return True
+    status = getattr(exc, "status_code", None)
+    return status in RETRYABLE_STATUS
+
+
+class LLMScheduler:
+    """
+    동기 호출자를 위한 스케줄러.
+    호출 스레드가 직접 submit()을 부르면 우선순위 순서대로 토큰 버킷/동시성 슬롯을 받은 뒤 호출을 실행한다.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Dict[str, int]]] = None,
+        max_concurrency: int = 16,
+        max_retries: int = 3,
+        backoff_base_sec: float = 0.5,
+        backoff_cap_sec: float = 8.0,
+        max_wait_sec: float = 60.0,
+    ):
+        self._limits = limits if limits is not None else _load_limits()
+        self._limiters: Dict[str, _ModelLimiter] = {}
+        self._max_concurrency = max(1, int(max_concurrency))
+        self._max_retries = max(0, int(max_retries))
+        self._backoff_base = backoff_base_sec
+        self._backoff_cap = backoff_cap_sec
+        self._max_wait = max_wait_sec
+
+        self._cv = threading.Condition()
+        self._heap: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+
+        # 지표
+        self._stats_lock = threading.Lock()
+        self._submitted: Dict[str, int] = {p.name: 0 for p in Priority}
+        self._retries: Dict[str, int] = {}
+        self._failures: Dict[str, int] = {}
+        self._wait_total_sec: Dict[str, float] = {p.name: 0.0 for p in Priority}
+        self._wait_max_sec: Dict[str, float] = {p.name: 0.0 for p in Priority}
+
+    # ─── 버킷 ─────────────────────────────────────────────
+    def _limiter(self, model: str) -> _ModelLimiter:
+        lim = self._limiters.get(model)
+        if lim is None:
+            conf = self._limits.get(model, FALLBACK_LIMITS)
+            lim = _ModelLimiter(
+                requests=TokenBucket(conf.get("rpm", 0)),
+                tokens=TokenBucket(conf.get("tpm", 0)),
+            )
+            self._limiters[model] = lim
+        return lim
+
+    # ─── 대기열 ───────────────────────────────────────────
+    def _acquire(self, model: str, priority: Priority, est_tokens: int, deadline: Optional[float] = None) -> float:
+        """슬롯을 얻을 때까지 대기. 대기한 시간(초)을 반환"""
+        ticket = _Ticket(
+            priority=int(priority),
+            seq=next(self._seq),
+            model=model,
+            est_tokens=est_tokens,
+            enqueued_at=time.monotonic(),
+        )
+        wait_until = ticket.enqueued_at + self._max_wait
+        if deadline is not None:
+            wait_until = min(wait_until, deadline)
+        with self._cv:
+            heapq.heappush(self._heap, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = self._admit_wait(ticket, now)
+                    if wait == 0.0:
+                        # 다른 모델 요청은 맨 앞을 추월할 수 있으므로 heap[0]이 아니라 자기 티켓을 뺀다
+                        self._heap.remove(ticket)
+                        heapq.heapify(self._heap)
+                        lim = self._limiter(model)
+                        lim.requests.take(1)
+                        lim.tokens.take(est_tokens)
+                        self._in_flight += 1
+                        ticket.granted = True
+                        self._cv.notify_all()
+                        return now - ticket.enqueued_at
+                    if now >= wait_until:
+                        raise SchedulerTimeout(
+                            f"LLM 스케줄러 대기 시간 초과 (model={model}, priority={priority.name})"
+                        )
+                    self._cv.wait(timeout=min(wait, wait_until - now))
+            finally:
+                if not ticket.granted:
+                    self._heap.remove(ticket)
+                    heapq.heapify(self._heap)
+                    self._cv.notify_all()
+
+    def _admit_wait(self, ticket: _Ticket, now: float) -> float:
+        """0이면 바로 실행 가능, 아니면 다시 확인할 때까지의 대기 시간"""
+        if self._heap[0] is not ticket:
+            # 더 높은 우선순위(또는 먼저 온) 요청이 있는 경우.
+            # 같은 모델을 쓰는 앞선 요청만 순서를 지키고, 다른 모델은 버킷이 독립적이므로 추월 허용
+            if any(o.model == ticket.model and o < ticket for o in self._heap):
+                return 0.05
+            # 동시성 슬롯 하나는 맨 앞 요청 몫으로 남겨둔다
+            if self._in_flight >= self._max_concurrency - 1:
+                return 0.05
+        if self._in_flight >= self._max_concurrency:
+            return 0.05
+        lim = self._limiter(ticket.model)
+        return max(lim.requests.wait_time(1, now), lim.tokens.wait_time(ticket.est_tokens, now))
+
+    def _release(self, model: str, est_tokens: int, actual_tokens: Optional[int]) -> None:
+        with self._cv:
+            self._in_flight -= 1
+            if actual_tokens is not None:
+                self._limiter(model).tokens.adjust(actual_tokens - est_tokens)
+            self._cv.notify_all()
+
+    # ─── 공개 API ─────────────────────────────────────────
+    def submit(
+        self,
+        fn: Callable[[], T],
+        *,
+        model: str,
+        priority: Priority = Priority.INTERACTIVE,
+        call_site: str = "unknown",
+        est_tokens: int = 0,
+        max_retries: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> T:
+        """
+        fn()을 스케줄링해서 실행하고 결과를 돌려준다.
+        재시도 가능한 오류(429/5xx/타임아웃)는 지터 백오프 후 다시 대기열에 넣는다.
+        deadline(time.monotonic() 기준)을 주면 대기 + 재시도 전체가 그 안에서 끝난다
+        (남은 시간이 백오프보다 짧으면 더 재시도하지 않고 마지막 오류를 올린다).
+        """
+        retries = self._max_retries if max_retries is None else max_retries
+        with self._stats_lock:
+            self._submitted[priority.name] += 1
+
+        attempt = 0
+        while True:
+            waited = self._acquire(model, priority, est_tokens, deadline)
+            self._record_wait(priority, waited)
+            metrics.LLM_QUEUE_WAIT.observe(waited, call_site=call_site, priority=priority.name)
+
+            actual_tokens: Optional[int] = None
+            started = time.perf_counter()
+            try:
+                result = fn()
+                metrics.LLM_LATENCY.observe(time.perf_counter() - started, call_site=call_site, model=model)
+                metrics.LLM_REQUESTS.inc(call_site=call_site, model=model, outcome="ok")
+                metrics.record_llm_usage(call_site, model, result)
+                actual_tokens = usage_total_tokens(result)
+                return result
+            except Exception as exc:
+                metrics.LLM_LATENCY.observe(time.perf_counter() - started, call_site=call_site, model=model)
+                delay = _retry_after_seconds(exc)
+                if delay is None:
+                    # full jitter: [0, min(cap, base * 2^attempt)]
+                    delay = random.uniform(0, min(self._backoff_cap, self._backoff_base * (2 ** attempt)))
+                out_of_time = deadline is not None and time.monotonic() + delay >= deadline
+                if attempt >= retries or not is_retryable(exc) or out_of_time:
+                    metrics.LLM_REQUESTS.inc(call_site=call_site, model=model, outcome="error")
+                    with self._stats_lock:
+                        self._failures[call_site] = self._failures.get(call_site, 0) + 1
+                    raise
+                metrics.LLM_REQUESTS.inc(call_site=call_site, model=model, outcome="retry")
+                with self._stats_lock:
+                    self._retries[call_site] = self._retries.get(call_site, 0) + 1
+            finally:
+                self._release(model, est_tokens, actual_tokens)
+
+            attempt += 1
+            time.sleep(delay)
+
+    def _record_wait(self, priority: Priority, waited: float) -> None:
+        with self._stats_lock:
+            self._wait_total_sec[priority.name] += waited
+            if waited > self._wait_max_sec[priority.name]:
+                self._wait_max_sec[priority.name] = waited
+
+    def snapshot(self) -> Dict[str, Any]:
+        """큐 깊이 및 누적 지표"""
+        with self._cv:
+            depth = {p.name: 0 for p in Priority}
+            for t in self._heap:
+                depth[Priority(t.priority).name] += 1
+            in_flight = self._in_flight
+        with self._stats_lock:
+            return {
+                "queue_depth": depth,
+                "in_flight": in_flight,
+                "max_concurrency": self._max_concurrency,
+                "submitted": dict(self._submitted),
+                "retries": dict(self._retries),
+                "failures": dict(self._failures),
+                "wait_total_sec": dict(self._wait_total_sec),
+                "wait_max_sec": dict(self._wait_max_sec),
+            }
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler(
+                    max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "16")),
+                    max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+                    max_wait_sec=float(os.getenv("LLM_MAX_QUEUE_WAIT_SEC", "60")),
+                )
+    return _scheduler
+
+
+_QUEUE_DEPTH = metrics.gauge("llm_scheduler_queue_depth", "LLM 스케줄러 대기 중인 요청 수", ("priority",))
+_IN_FLIGHT = metrics.gauge("llm_scheduler_in_flight", "LLM 스케줄러 실행 중인 요청 수")
+
+
+def _collect_scheduler_gauges() -> None:
+    if _scheduler is None:
+        return
+    snap = _scheduler.snapshot()
+    for name, depth in snap["queue_depth"].items():
+        _QUEUE_DEPTH.set(depth, priority=name)
+    _IN_FLIGHT.set(snap["in_flight"])
+
+
+metrics.REGISTRY.add_collector(_collect_scheduler_gauges)
+
+
+def run_llm(
+    fn: Callable[[], T],
+    *,
+    model: str,
+    priority: Priority = Priority.INTERACTIVE,
+    call_site: str = "unknown",
+    est_tokens: int = 0,
+    deadline: Optional[float] = None,
+) -> T:
+    """
+    get_scheduler().submit(...) 단축 함수 (헤징이 켜진 호출 지점은 hedging.hedged로 감싼다)
+    deadline: time.monotonic() 기준 전체 마감 시각 (스케줄러 대기 + 재시도 포함)
+    서킷이 열려 있으면 대기열에 들어가지 않고 바로 CircuitOpenError.
+    재시도/헤지 시도도 매번 서킷을 거치며, 제공자 장애(is_retryable)만 실패로 센다.
+    """
+    scheduler = get_scheduler()
+    breaker = get_breaker("llm")
+    breaker.reject_if_open()
+
+    def guarded() -> T:
+        return breaker.call(fn, is_failure=is_retryable)
+
+    if hedging.is_enabled(call_site):
+        # 헤지 요청도 같은 레이트리밋을 거치며, 재시도는 하지 않는다 (비용 증폭 방지)
+        # 헤지 기준 지연은 대기열을 통과해 실제로 전송될 때부터 잰다
+        def primary(on_start: Callable[[], None]) -> T:
+            def started_then_call() -> T:
+                on_start()
+                return guarded()
+
+            return scheduler.submit(
+                started_then_call,
+                model=model,
+                priority=priority,
+                call_site=call_site,
+                est_tokens=est_tokens,
+                deadline=deadline,
+            )
+
+        return hedging.hedged(
+            primary,
+            lambda: scheduler.submit(
+                guarded,
+                model=model,
+                priority=priority,
+                call_site=f"{call_site}.hedge",
+                est_tokens=est_tokens,
+                max_retries=0,
+                deadline=deadline,
+            ),
+            call_site,
+        )
+    return scheduler.submit(
+        guarded, model=model, priority=priority, call_site=call_site, est_tokens=est_tokens, deadline=deadline
+    )
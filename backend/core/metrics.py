@@ -0,0 +1,381 @@
+"""
+File: metrics.py
+Created: 2026-10-19
+Description: 프로세스 내 Prometheus 형식 지표 (Counter / Gauge / Histogram)
+             - /metrics 엔드포인트에서 render()로 텍스트 노출
+             - HTTP 라우트 지연, LLM 호출 지연/토큰/비용, 임베딩, Chroma 질의, DB 질의, STT/TTS 실시간 배율(RTF)
+             - prometheus_client 의존성 없이 표준 라이브러리만 사용
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: 구조화 출력(strict json_schema) 파싱 결과 카운터 추가
+- 2026-10-19: 호출 단위 토큰/비용 집계(capture_llm_usage) 추가
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+RTF_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 4.0)
+
+# 모델별 단가 (USD / 1M tokens). LLM_PRICING 환경변수(JSON)로 덮어쓸 수 있음
+DEFAULT_PRICING: Dict[str, Dict[str, float]] = {
+    "gpt-4.1-mini": {"input": 0.40, "cached": 0.10, "output": 1.60},
+    "gpt-4o-mini": {"input": 0.15, "cached": 0.075, "output": 0.60},
+    "text-embedding-3-small": {"input": 0.02, "cached": 0.02, "output": 0.0},
+}
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 불일치 {sorted(labels)} != {sorted(self.labelnames)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counter는 감소할 수 없습니다")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self._header()
+        for key, v in items:
+            lines.append(f"{self.name}{_label_str(self.labelnames, key)} {_fmt(v)}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self._header()
+        for key, v in items:
+            lines.append(f"{self.name}{_label_str(self.labelnames, key)} {_fmt(v)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        # key -> [bucket별 개수..., +Inf 개수], sum
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        idx = len(self.buckets)
+        for i, b in enumerate(self.buckets):
+            if value <= b:
+                idx = i
+                break
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = [0] * (len(self.buckets) + 1)
+                self._counts[key] = counts
+                self._sums[key] = 0.0
+            counts[idx] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            return sum(self._counts.get(self._key(labels), ()))
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(c), self._sums[k]) for k, c in self._counts.items())
+        lines = self._header()
+        for key, counts, total in items:
+            cumulative = 0
+            for b, c in zip(self.buckets + (math.inf,), counts):
+                cumulative += c
+                le = f'le="{_fmt(b)}"'
+                lines.append(f"{self.name}_bucket{_label_str(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_str(self.labelnames, key)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{_label_str(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def add_collector(self, fn: Callable[[], None]) -> None:
+        """render() 직전에 호출되어 Gauge 값을 갱신하는 콜백 (큐 깊이 등 스냅샷형 지표용)"""
+        with self._lock:
+            self._collectors.append(fn)
+
+    def render(self) -> str:
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+        for fn in collectors:
+            try:
+                fn()
+            except Exception:
+                pass
+        lines: List[str] = []
+        for m in metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def counter(name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, help_text, labelnames))  # type: ignore[return-value]
+
+
+def gauge(name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, help_text, labelnames))  # type: ignore[return-value]
+
+
+def histogram(
+    name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, help_text, labelnames, buckets))  # type: ignore[return-value]
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+# ─── 공용 지표 ────────────────────────────────────────────────
+HTTP_LATENCY = histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route", "status")
+)
+LLM_LATENCY = histogram(
+    "llm_request_duration_seconds", "LLM API 호출 시간 (스케줄러 대기 제외)", ("call_site", "model")
+)
+LLM_STREAM_LATENCY = histogram(
+    "llm_stream_duration_seconds", "LLM 스트리밍 응답 전체 수신 시간", ("call_site",)
+)
+LLM_QUEUE_WAIT = histogram(
+    "llm_queue_wait_seconds", "LLM 스케줄러 대기 시간", ("call_site", "priority")
+)
+LLM_REQUESTS = counter(
+    "llm_requests_total", "LLM API 호출 수", ("call_site", "model", "outcome")
+)
+LLM_TOKENS = counter(
+    "llm_tokens_total", "LLM 토큰 사용량 (kind=input|output|cached)", ("call_site", "model", "kind")
+)
+LLM_COST = counter("llm_cost_usd_total", "LLM 추정 비용 (USD)", ("call_site", "model"))
+LLM_STRUCTURED_OUTPUT = counter(
+    "llm_structured_output_total",
+    "구조화 출력 파싱 결과 (outcome=valid|salvaged|repaired|failed, repaired는 재호출 발생)",
+    ("call_site", "outcome"),
+)
+EMBEDDING_LATENCY = histogram("embedding_duration_seconds", "임베딩 호출 시간", ("model",))
+EMBEDDING_INPUTS = counter("embedding_inputs_total", "임베딩한 문서 수", ("model",))
+CHROMA_LATENCY = histogram("chroma_operation_duration_seconds", "ChromaDB 연산 시간", ("operation",))
+DB_LATENCY = histogram("db_query_duration_seconds", "DB 질의 시간", ("driver", "statement"))
+STT_RTF = histogram("stt_real_time_factor", "STT 처리시간 / 음성 길이", ("engine",), RTF_BUCKETS)
+TTS_RTF = histogram("tts_real_time_factor", "TTS 처리시간 / 생성 음성 길이", ("engine",), RTF_BUCKETS)
+AUDIO_SECONDS = counter("audio_seconds_total", "STT 입력 / TTS 출력 음성 길이 합계", ("direction",))
+
+
+def _load_pricing() -> Dict[str, Dict[str, float]]:
+    pricing = {k: dict(v) for k, v in DEFAULT_PRICING.items()}
+    raw = os.getenv("LLM_PRICING", "").strip()
+    if raw:
+        try:
+            for model, conf in json.loads(raw).items():
+                pricing.setdefault(model, {}).update(conf)
+        except Exception:
+            pass
+    return pricing
+
+
+_pricing = _load_pricing()
+
+
+def usage_breakdown(result: Any) -> Optional[Dict[str, int]]:
+    """chat.completions / responses / embeddings 응답의 usage를 input/output/cached로 정규화"""
+    usage = getattr(result, "usage", None)
+    if usage is None:
+        return None
+    inp = getattr(usage, "input_tokens", None)
+    if inp is None:
+        inp = getattr(usage, "prompt_tokens", None)
+    out = getattr(usage, "output_tokens", None)
+    if out is None:
+        out = getattr(usage, "completion_tokens", None)
+    details = getattr(usage, "input_tokens_details", None) or getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else None
+    try:
+        return {"input": int(inp or 0), "output": int(out or 0), "cached": int(cached or 0)}
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_cost(model: str, usage: Dict[str, int]) -> float:
+    price = _pricing.get(model)
+    if not price:
+        return 0.0
+    cached = usage.get("cached", 0)
+    uncached = max(0, usage.get("input", 0) - cached)
+    return (
+        uncached * price.get("input", 0.0)
+        + cached * price.get("cached", price.get("input", 0.0))
+        + usage.get("output", 0) * price.get("output", 0.0)
+    ) / 1_000_000
+
+
+_usage_capture = threading.local()
+
+
+@contextmanager
+def capture_llm_usage() -> Iterator[Dict[str, float]]:
+    """
+    with 블록 안에서 이 스레드가 한 LLM 호출의 토큰/비용을 모은다 (평가 하네스처럼 동시 실행 중 호출 단위 집계용).
+    전역 카운터는 call_site별 합계라 동시에 돈 호출들을 구분할 수 없다. 헤지 요청처럼 다른 스레드에서 끝난 호출은 빠진다.
+    """
+    totals: Dict[str, float] = {"calls": 0, "input": 0, "output": 0, "cached": 0, "cost_usd": 0.0}
+    previous = getattr(_usage_capture, "totals", None)
+    _usage_capture.totals = totals
+    try:
+        yield totals
+    finally:
+        _usage_capture.totals = previous
+
+
+def record_llm_usage(call_site: str, model: str, result: Any) -> None:
+    """응답(또는 스트림 마지막 청크)의 usage를 토큰/비용 지표에 반영"""
+    usage = usage_breakdown(result)
+    if usage is None:
+        return
+    for kind, n in usage.items():
+        if n:
+            LLM_TOKENS.inc(n, call_site=call_site, model=model, kind=kind)
+    cost = estimate_cost(model, usage)
+    if cost:
+        LLM_COST.inc(cost, call_site=call_site, model=model)
+    captured = getattr(_usage_capture, "totals", None)
+    if captured is not None:
+        captured["calls"] += 1
+        for kind, n in usage.items():
+            captured[kind] += n
+        captured["cost_usd"] += cost or 0.0
+
+
+def observe_rtf(hist: Histogram, engine: str, direction: str, elapsed_sec: float, audio_sec: float) -> None:
+    if audio_sec <= 0:
+        return
+    hist.observe(elapsed_sec / audio_sec, engine=engine)
+    AUDIO_SECONDS.inc(audio_sec, direction=direction)
+
+
+_SQL_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE(?:\s+IF\s+NOT\s+EXISTS)?)\s+`?(\w+)`?", re.IGNORECASE)
+
+
+def statement_label(sql: Any) -> str:
+    """SQL 문을 '동사 테이블' 형태의 저카디널리티 라벨로 축약 (예: 'SELECT question_pool')"""
+    text = str(sql or "").lstrip()
+    if not text:
+        return "UNKNOWN"
+    verb = text.split(None, 1)[0].upper()
+    m = _SQL_TABLE_RE.search(text)
+    return f"{verb} {m.group(1)}" if m else verb
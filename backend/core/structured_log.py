@@ -0,0 +1,242 @@
+"""
+File: structured_log.py
+Created: 2026-10-19
+Description: 핫패스용 구조화 로깅 (JSON 한 줄 / 큐 기반 백그라운드 출력 / 카테고리별 샘플링 / 필드 길이 제한)
+             요청 스레드에서는 샘플링 판정과 큐 적재만 하고, 직렬화와 stdout 쓰기는 리스너 스레드가 담당한다.
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: 재설정/종료 시 이전 리스너의 출력 핸들러를 닫음 (LOG_FILE 파일 핸들 누수 수정)
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from typing import Any, Dict, Optional, TextIO
+
+# 카테고리별 기본 샘플링 비율 (LOG_SAMPLE_RATES="llm.prompt=0.1,attitude.frame=1" 형식으로 덮어씀)
+DEFAULT_SAMPLE_RATES: Dict[str, float] = {
+    "llm.prompt": 0.01,        # 평가 프롬프트 전문 (매 턴 수 KB)
+    "attitude.frame": 0.05,    # 프레임 단위 태도 지표
+    "landmark.payload": 0.05,  # HF Space 응답 미리보기
+}
+DEFAULT_RATE = 1.0
+DEFAULT_MAX_FIELD_CHARS = 500
+DEFAULT_QUEUE_SIZE = 10000
+
+_LOGGER_PREFIX = "aiwork"
+
+
+def _parse_rates(raw: str) -> Dict[str, float]:
+    rates: Dict[str, float] = {}
+    for part in (raw or "").split(","):
+        if "=" not in part:
+            continue
+        k, v = part.split("=", 1)
+        try:
+            rates[k.strip()] = max(0.0, min(1.0, float(v)))
+        except ValueError:
+            continue
+    return rates
+
+
+def truncate(value: Any, limit: int) -> Any:
+    """문자열/컨테이너를 limit 글자 기준으로 잘라 로그 페이로드 크기를 제한"""
+    if isinstance(value, str):
+        if len(value) <= limit:
+            return value
+        return f"{value[:limit]}...(+{len(value) - limit} chars)"
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {str(k): truncate(v, limit) for k, v in list(value.items())[:50]}
+    if isinstance(value, (list, tuple)):
+        items = [truncate(v, limit) for v in list(value)[:50]]
+        if len(value) > 50:
+            items.append(f"...(+{len(value) - 50} items)")
+        return items
+    return truncate(str(value), limit)
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "category": getattr(record, "category", record.name),
+            "event": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            payload.update(fields)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 요청 스레드를 막지 않고 버린다."""
+
+    def __init__(self, q: "queue.Queue[logging.LogRecord]"):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 구현은 여기서 포매팅을 수행하므로(요청 스레드 비용) 그대로 넘긴다
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _LogState:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.configured = False
+        self.enabled = True
+        self.rates: Dict[str, float] = dict(DEFAULT_SAMPLE_RATES)
+        self.max_field_chars = DEFAULT_MAX_FIELD_CHARS
+        self.handler: Optional[_DroppingQueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.stream_handler: Optional[logging.Handler] = None
+
+
+_state = _LogState()
+
+
+def configure_logging(
+    *,
+    enabled: Optional[bool] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
+    max_field_chars: Optional[int] = None,
+    stream: Optional[TextIO] = None,
+    queue_size: Optional[int] = None,
+) -> None:
+    """로깅 설정 (인자가 없으면 환경변수 기준). 다시 호출하면 기존 리스너를 정리하고 새로 구성한다."""
+    with _state.lock:
+        _stop_listener_locked()
+
+        _state.enabled = (
+            enabled if enabled is not None else os.getenv("LOG_ENABLED", "true").lower() != "false"
+        )
+        rates = dict(DEFAULT_SAMPLE_RATES)
+        rates.update(_parse_rates(os.getenv("LOG_SAMPLE_RATES", "")))
+        if sample_rates:
+            rates.update(sample_rates)
+        _state.rates = rates
+        _state.max_field_chars = int(
+            max_field_chars
+            if max_field_chars is not None
+            else os.getenv("LOG_MAX_FIELD_CHARS", DEFAULT_MAX_FIELD_CHARS)
+        )
+
+        log_file = os.getenv("LOG_FILE", "").strip() if stream is None else ""
+        # LOG_FILE은 FileHandler가 열고 close()에서 닫는다 (stdout / 호출 측 stream은 닫지 않음)
+        stream_handler: logging.Handler = (
+            logging.FileHandler(log_file, mode="a", encoding="utf-8")
+            if log_file
+            else logging.StreamHandler(stream or sys.stdout)
+        )
+        stream_handler.setFormatter(_JsonFormatter())
+
+        q: "queue.Queue[logging.LogRecord]" = queue.Queue(
+            maxsize=int(queue_size or os.getenv("LOG_QUEUE_SIZE", DEFAULT_QUEUE_SIZE))
+        )
+        handler = _DroppingQueueHandler(q)
+        listener = logging.handlers.QueueListener(q, stream_handler, respect_handler_level=False)
+        listener.start()
+
+        root = logging.getLogger(_LOGGER_PREFIX)
+        for h in list(root.handlers):
+            root.removeHandler(h)
+        root.addHandler(handler)
+        root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+        root.propagate = False
+
+        _state.handler = handler
+        _state.listener = listener
+        _state.stream_handler = stream_handler
+        _state.configured = True
+
+
+def _stop_listener_locked() -> None:
+    if _state.listener is not None:
+        try:
+            _state.listener.stop()  # 남은 레코드를 모두 flush한 뒤 종료
+        except Exception:
+            pass
+    if _state.stream_handler is not None:
+        try:
+            _state.stream_handler.close()
+        except Exception:
+            pass
+    _state.listener = None
+    _state.stream_handler = None
+
+
+def shutdown_logging() -> None:
+    with _state.lock:
+        _stop_listener_locked()
+        _state.configured = False
+
+
+atexit.register(shutdown_logging)
+
+
+def _ensure_configured() -> None:
+    if not _state.configured:
+        configure_logging()
+
+
+def get_logger(category: str) -> logging.Logger:
+    _ensure_configured()
+    return logging.getLogger(f"{_LOGGER_PREFIX}.{category}")
+
+
+def should_log(category: str) -> bool:
+    """카테고리 샘플링 판정. 필드 계산 자체가 비싼 곳에서는 emit 전에 먼저 호출한다."""
+    _ensure_configured()
+    if not _state.enabled:
+        return False
+    rate = _state.rates.get(category, DEFAULT_RATE)
+    if rate >= 1.0:
+        return True
+    if rate <= 0.0:
+        return False
+    return random.random() < rate
+
+
+def emit(category: str, event: str, level: int = logging.INFO, **fields: Any) -> None:
+    """샘플링 판정 없이 바로 큐에 적재 (should_log 통과 후 사용)"""
+    logger = get_logger(category)
+    if not logger.isEnabledFor(level):
+        return
+    limit = _state.max_field_chars
+    logger.log(
+        level,
+        event,
+        extra={"category": category, "fields": {k: truncate(v, limit) for k, v in fields.items()}},
+    )
+
+
+def log_event(category: str, event: str, level: int = logging.INFO, **fields: Any) -> None:
+    """구조화 로그 한 건. 경고 이상은 샘플링하지 않는다."""
+    if level < logging.WARNING and not should_log(category):
+        return
+    if not _state.enabled:
+        return
+    emit(category, event, level, **fields)
+
+
+def dropped_count() -> int:
+    return _state.handler.dropped if _state.handler is not None else 0
+
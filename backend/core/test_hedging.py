@@ -0,0 +1,74 @@
+"""
+File: test_hedging.py
+Created: 2026-10-19
+Description: LLM 호출 헤징 회귀 테스트
+             - 기준 지연이 대기열 대기가 아니라 실제 전송 시점부터 재지는지
+             - 헤지 풀 슬롯이 모두 차 있으면 헤징 없이 호출자 스레드에서 바로 실행하는지
+
+실행: python -m pytest -q backend/core/test_hedging.py
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+import threading
+import time
+
+import pytest
+
+from backend.core import hedging
+
+
+def _policy() -> hedging.HedgePolicy:
+    return hedging.HedgePolicy(budget=1.0, burst=5.0, initial_delay_sec=0.2, min_delay_sec=0.0)
+
+
+def test_deadline_starts_when_primary_is_sent():
+    site = "test.queue_wait"
+    hedging.configure(site, _policy())
+    hedges = []
+
+    def primary(on_start):
+        time.sleep(0.3)  # 스케줄러 대기열에서 기다리는 시간 (기준 지연 0.2초보다 길다)
+        on_start()
+        time.sleep(0.1)
+        return "primary"
+
+    def hedge():
+        hedges.append(1)
+        return "hedge"
+
+    try:
+        assert hedging.hedged(primary, hedge, site) == "primary"
+        assert hedges == []
+    finally:
+        hedging.configure(site, None)
+
+
+def test_no_free_worker_runs_inline_without_hedge():
+    site = "test.no_worker"
+    hedging.configure(site, _policy())
+    held = 0
+    while hedging._slots.acquire(blocking=False):
+        held += 1
+    before = hedging.LLM_HEDGES.value(call_site=site, outcome="no_worker")
+    caller = threading.current_thread()
+    ran_on = []
+
+    def primary(on_start):
+        on_start()
+        ran_on.append(threading.current_thread())
+        return "primary"
+
+    try:
+        assert hedging.hedged(primary, lambda: "hedge", site) == "primary"
+        assert ran_on == [caller]
+        assert hedging.LLM_HEDGES.value(call_site=site, outcome="no_worker") == before + 1
+    finally:
+        for _ in range(held):
+            hedging._slots.release()
+        hedging.configure(site, None)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
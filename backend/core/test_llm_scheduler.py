@@ -0,0 +1,76 @@
+"""
+File: test_llm_scheduler.py
+Created: 2026-10-19
+Description: LLM 스케줄러 대기열 회귀 테스트
+             - 다른 모델 요청이 제한에 걸린 앞선 요청을 추월해도 대기열에서 자기 티켓만 빠지는지
+             - deadline을 주면 재시도 백오프가 마감을 넘기지 않는지
+
+실행: python -m pytest -q backend/core/test_llm_scheduler.py
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+import threading
+import time
+
+import pytest
+
+from backend.core.llm_scheduler import LLMScheduler, SchedulerTimeout
+
+
+def test_other_model_overtakes_throttled_head():
+    # model-a는 분당 1회라 두 번째 요청이 대기열 맨 앞에서 막힌다
+    scheduler = LLMScheduler(
+        limits={"model-a": {"rpm": 1, "tpm": 0}, "model-b": {"rpm": 0, "tpm": 0}},
+        max_concurrency=4,
+        max_retries=0,
+        max_wait_sec=0.5,
+    )
+    assert scheduler.submit(lambda: "a1", model="model-a") == "a1"
+
+    errors = []
+
+    def throttled():
+        try:
+            scheduler.submit(lambda: "a2", model="model-a")
+        except Exception as exc:
+            errors.append(exc)
+
+    waiter = threading.Thread(target=throttled)
+    waiter.start()
+    while not scheduler.snapshot()["queue_depth"]["INTERACTIVE"]:
+        time.sleep(0.005)
+
+    # model-b는 버킷이 따로라 맨 앞의 model-a 요청을 추월한다
+    assert scheduler.submit(lambda: "b1", model="model-b") == "b1"
+    waiter.join()
+
+    assert len(errors) == 1 and isinstance(errors[0], SchedulerTimeout)
+    # 추월한 요청의 티켓이 남아 있으면 다음 model-b 호출이 시간 초과로 막힌다
+    assert scheduler.submit(lambda: "b2", model="model-b") == "b2"
+    assert sum(scheduler.snapshot()["queue_depth"].values()) == 0
+
+
+
+class APITimeoutError(Exception):
+    """재시도 대상 예외 (is_retryable은 클래스 이름으로 판별)"""
+
+
+def test_deadline_bounds_retries():
+    scheduler = LLMScheduler(limits={}, max_retries=10, backoff_base_sec=0.2, backoff_cap_sec=0.2)
+    calls = []
+
+    def flaky():
+        calls.append(time.monotonic())
+        raise APITimeoutError("timeout")
+
+    started = time.monotonic()
+    with pytest.raises(APITimeoutError):
+        scheduler.submit(flaky, model="model-a", deadline=started + 0.5)
+    assert time.monotonic() - started < 0.5
+    assert 1 <= len(calls) < 11
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -1,4 +1,4 @@
-from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -78,3 +78,59 @@ class InterviewDetail(Base):
     created_at = Column(DateTime, server_default=func.now())
 
     session = relationship("InterviewSession", back_populates="details")
+
+
+class InterviewReport(Base):
+    __tablename__ = "interview_reports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("interview_sessions.id", ondelete="CASCADE"), nullable=False, unique=True)
+    status = Column(String(20), nullable=False, default="PENDING")  # PENDING / RUNNING / DONE / FAILED
+    total_score = Column(Float, nullable=True)
+    report_markdown = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    owner = Column(String(64), nullable=True)  # RUNNING 작업을 가져간 워커 (프로세스별 id)
+    lease_until = Column(DateTime, nullable=True)  # 이 시각이 지나도록 갱신이 없으면 다른 워커가 다시 가져갈 수 있다
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime, nullable=True)
+
+
+class TurnRescore(Base):
+    """LLM 장애 중 임시 점수로 처리된 턴. 제공자 복구 후 다시 채점한다."""
+
+    __tablename__ = "turn_rescore_queue"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("interview_sessions.id", ondelete="CASCADE"), nullable=True, index=True)
+    turn_index = Column(Integer, nullable=True)
+    question = Column(Text, nullable=True)
+    answer = Column(Text, nullable=True)
+    job_role = Column(String(100), nullable=True)
+    difficulty = Column(String(20), nullable=True)
+    persona_style = Column(String(50), nullable=True)
+    provisional_score = Column(Float, nullable=True)
+    status = Column(String(20), nullable=False, default="PENDING", index=True)  # PENDING / DONE / FAILED
+    final_score = Column(Float, nullable=True)
+    feedback = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class InterviewDetailScore(Base):
+    """평가 프롬프트/모델 버전별 재채점 결과 (backend/cli/rescore_answers.py). 같은 버전끼리만 점수를 비교한다."""
+
+    __tablename__ = "interview_detail_scores"
+    __table_args__ = (UniqueConstraint("detail_id", "scoring_version", name="uq_detail_scoring_version"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    detail_id = Column(Integer, ForeignKey("interview_details.id", ondelete="CASCADE"), nullable=False)
+    scoring_version = Column(String(100), nullable=False, index=True)
+    model = Column(String(100), nullable=True)
+    score = Column(Float, nullable=True)
+    passed = Column(Boolean, nullable=True)
+    feedback = Column(Text, nullable=True)
+    eval_json = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
@@ -7,21 +7,45 @@ Description: DB 모델들의 기본 뼈대
 Modification History:
 - 2026-02-24: 벡엔드 DB 모델 정의
 - 2026-02-27 (김지우) :  기존 User 모델 외에 직무 분류, 질문 풀, 면접 기록 테이블 추가
+- 2026-10-19: 질의 시간 지표를 남기는 TimedDictCursor 적용
+- 2026-10-19: 면접 리포트 백그라운드 작업 결과 테이블(interview_reports) 추가
+- 2026-10-19: LLM 장애 중 임시 점수 턴의 재채점 대기열(turn_rescore_queue) 추가
+- 2026-10-19: get_questions_by_role / get_common_questions를 질문 풀 메모리 캐시 조회로 변경 (ORDER BY RAND() 제거)
+- 2026-10-19: get_questions_by_resume_keywords를 키워드 역색인 조회로 변경 (LIKE 체인 / 보충 RAND 질의 제거)
+- 2026-10-19: 평가 버전별 재채점 결과 테이블(interview_detail_scores) 추가
+- 2026-10-19: interview_reports에 작업 소유자/임대 만료 시각(owner, lease_until) 컬럼 추가
 """
 
 import os
 import json
+import time
 import pymysql
 from pymysql.cursors import DictCursor
 from contextlib import contextmanager
 from dotenv import load_dotenv
 
+from backend.core import metrics
+
 current_file_dir = os.path.dirname(os.path.abspath(__file__))
 backend_dir = os.path.dirname(current_file_dir)
 env_path = os.path.join(backend_dir, ".env")
 
 load_dotenv(dotenv_path=env_path, override=True)
 
+
+class TimedDictCursor(DictCursor):
+    """execute 시간을 db_query_duration_seconds에 기록하는 DictCursor (executemany도 내부적으로 execute를 거친다)"""
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            metrics.DB_LATENCY.observe(
+                time.perf_counter() - started, driver="pymysql", statement=metrics.statement_label(query)
+            )
+
+
 # DB 연결 설정 (.env에서 읽기)
 DB_CONFIG = {
     "host": os.getenv("DB_HOST", "localhost"),
@@ -30,7 +54,7 @@ DB_CONFIG = {
     "password": os.getenv("DB_PASSWORD", ""),
     "db": os.getenv("DB_NAME", "ai_interview"),
     "charset": "utf8mb4",
-    "cursorclass": DictCursor,
+    "cursorclass": TimedDictCursor,
 }
 
 # DDL
@@ -111,6 +135,58 @@ CREATE TABLE IF NOT EXISTS interview_details (
     FOREIGN KEY (session_id) REFERENCES interview_sessions(id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+CREATE TABLE IF NOT EXISTS interview_reports (
+    id              INT AUTO_INCREMENT PRIMARY KEY,
+    session_id      INT NOT NULL UNIQUE,
+    status          VARCHAR(20) NOT NULL DEFAULT 'PENDING',
+    total_score     FLOAT DEFAULT NULL,
+    report_markdown MEDIUMTEXT,
+    error           TEXT,
+    attempts        INT NOT NULL DEFAULT 0,
+    owner           VARCHAR(64) DEFAULT NULL,
+    lease_until     DATETIME NULL,
+    created_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    finished_at     TIMESTAMP NULL,
+    FOREIGN KEY (session_id) REFERENCES interview_sessions(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS turn_rescore_queue (
+    id                INT AUTO_INCREMENT PRIMARY KEY,
+    session_id        INT DEFAULT NULL,
+    turn_index        INT DEFAULT NULL,
+    question          TEXT,
+    answer            TEXT,
+    job_role          VARCHAR(100),
+    difficulty        VARCHAR(20),
+    persona_style     VARCHAR(50),
+    provisional_score FLOAT DEFAULT NULL,
+    status            VARCHAR(20) NOT NULL DEFAULT 'PENDING',
+    final_score       FLOAT DEFAULT NULL,
+    feedback          TEXT,
+    attempts          INT NOT NULL DEFAULT 0,
+    created_at        TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at        TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_rescore_status (status),
+    INDEX idx_rescore_session (session_id),
+    FOREIGN KEY (session_id) REFERENCES interview_sessions(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS interview_detail_scores (
+    id              INT AUTO_INCREMENT PRIMARY KEY,
+    detail_id       INT NOT NULL,
+    scoring_version VARCHAR(100) NOT NULL,
+    model           VARCHAR(100),
+    score           FLOAT DEFAULT NULL,
+    passed          TINYINT(1) DEFAULT NULL,
+    feedback        TEXT,
+    eval_json       MEDIUMTEXT,
+    created_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_detail_scoring_version (detail_id, scoring_version),
+    INDEX idx_detail_scores_version (scoring_version),
+    FOREIGN KEY (detail_id) REFERENCES interview_details(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
 CREATE TABLE IF NOT EXISTS guestbook_memos (
     id INT AUTO_INCREMENT PRIMARY KEY,
     author VARCHAR(100) NOT NULL,
@@ -138,7 +214,7 @@ def get_connection():
         "password": os.getenv("DB_PASSWORD", ""),
         "db": os.getenv("DB_NAME", "ai_interview"),
         "charset": "utf8mb4",
-        "cursorclass": DictCursor,
+        "cursorclass": TimedDictCursor,
     }
     conn = pymysql.connect(**db_config)
     try:
@@ -276,73 +352,28 @@ def get_questions_by_role(
     diff_map = {"주니어": "Easy", "미들": "Medium", "시니어": "Hard"}
     db_difficulty = diff_map.get(difficulty, difficulty)
 
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """SELECT qp.id, qp.content AS question, qp.question_type, qp.difficulty
-                   FROM question_pool qp
-                   LEFT JOIN job_categories jc ON qp.category_id = jc.id
-                   WHERE jc.target_role = %s AND qp.difficulty = %s AND qp.question_type = %s
-                   ORDER BY RAND() LIMIT %s""",
-                (job_role, db_difficulty, q_type, limit),
-            )
-            return cur.fetchall()
+    # ORDER BY RAND() 대신 메모리에 올려 둔 질문 풀에서 추출
+    from backend.services.question_pool_cache import get_question_pool_cache
+
+    return get_question_pool_cache().sample(job_role, db_difficulty, q_type, limit)
 
 
 def get_common_questions(limit: int = 1) -> list[dict]:
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """SELECT id, content AS question FROM question_pool
-                   WHERE question_type='인성' OR question_type='공통'
-                   ORDER BY RAND() LIMIT %s""",
-                (limit,),
-            )
-            return cur.fetchall()
+    from backend.services.question_pool_cache import get_question_pool_cache
+
+    return get_question_pool_cache().sample_common(limit)
 
 
 def get_questions_by_resume_keywords(
     job_role: str, difficulty: str, keywords: list[str], limit: int = 3
 ) -> list[dict]:
-    if not keywords:
-        return get_questions_by_role(job_role, difficulty, "기술", limit)
-
     diff_map = {"주니어": "Easy", "미들": "Medium", "시니어": "Hard"}
     db_difficulty = diff_map.get(difficulty, difficulty)
 
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            likes_clauses = []
-            params = [job_role, db_difficulty]
-            for k in keywords:
-                likes_clauses.append("(qp.content LIKE %s OR qp.keywords LIKE %s)")
-                params.extend([f"%{k}%", f"%{k}%"])
-
-            likes_sql = " OR ".join(likes_clauses)
-            query = f"""
-                SELECT qp.id, qp.content AS question, qp.question_type, qp.difficulty
-                FROM question_pool qp
-                LEFT JOIN job_categories jc ON qp.category_id = jc.id
-                WHERE jc.target_role = %s AND qp.difficulty = %s AND ({likes_sql})
-                ORDER BY RAND() LIMIT %s
-            """
-            params.append(limit)
-            cur.execute(query, tuple(params))
-            results = cur.fetchall()
-
-            if len(results) < limit:
-                needed = limit - len(results)
-                fallback = get_questions_by_role(
-                    job_role, difficulty, "기술", limit * 2
-                )
-                existing_ids = {r["id"] for r in results}
-                for f in fallback:
-                    if f["id"] not in existing_ids:
-                        results.append(f)
-                        existing_ids.add(f["id"])
-                        if len(results) == limit:
-                            break
-            return results
+    # LIKE 체인 + RAND 보충 질의 대신 질문 풀 캐시의 키워드 역색인에서 한 번에 조회
+    from backend.services.question_pool_cache import get_question_pool_cache
+
+    return get_question_pool_cache().search_by_keywords(job_role, db_difficulty, keywords or [], limit)
 
 
 # 이력서 보관함 CRUD
@@ -13,6 +13,11 @@ USER_COLUMN_PATCHES = {
     "status": "ALTER TABLE users ADD COLUMN status VARCHAR(20) NOT NULL DEFAULT 'active'",
 }
 
+REPORT_COLUMN_PATCHES = {
+    "owner": "ALTER TABLE interview_reports ADD COLUMN owner VARCHAR(64) NULL",
+    "lease_until": "ALTER TABLE interview_reports ADD COLUMN lease_until DATETIME NULL",
+}
+
 
 def _column_exists(conn, table_name: str, column_name: str) -> bool:
     query = text(
@@ -38,3 +43,11 @@ def patch_user_table_columns() -> None:
             if _column_exists(conn, "users", column_name):
                 continue
             conn.execute(text(alter_sql))
+
+
+def patch_report_table_columns() -> None:
+    with engine.begin() as conn:
+        for column_name, alter_sql in REPORT_COLUMN_PATCHES.items():
+            if _column_exists(conn, "interview_reports", column_name):
+                continue
+            conn.execute(text(alter_sql))
@@ -7,10 +7,14 @@ Description: 데이터베이스 연결 및 세션 관리 (Base 정의 포함 통
 Modification History:
 - 2026-02-15 (양창일): 초기 생성
 - 2026-02-22 (김지우): Base 정의 추가 및 SQLAlchemy 임포트 에러 수정
+- 2026-10-19: 커서 실행 이벤트로 질의 시간 지표 기록
 """
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from backend.core import metrics
 from backend.core.config import settings  # 기존 설정 파일 유지
 
 # 엔진 설정
@@ -20,6 +24,23 @@ if not settings.DATABASE_URL:
 connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
 engine = create_engine(settings.DATABASE_URL, connect_args=connect_args, future=True)
 
+
+# 질의 시간 지표 (db_query_duration_seconds{driver="sqlalchemy"})
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_started", None)
+    if started is None:
+        return
+    metrics.DB_LATENCY.observe(
+        time.perf_counter() - started, driver="sqlalchemy", statement=metrics.statement_label(statement)
+    )
+
+
 # 세션 팩토리 설정
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 
@@ -44,3 +44,18 @@ def run_admin_sql(
         return {"result": "SUCCESS"}
     except Exception as exc:
         return {"result": f"ERROR: {str(exc)}"}
+
+
+@router.post("/question-pool/refresh")
+def refresh_question_pool():
+    """question_pool을 수정한 뒤 호출: 질문 풀 메모리 캐시와 사전 채점 키워드 색인을 다시 읽는다"""
+    from backend.services import prescore_service
+    from backend.services.question_pool_cache import get_question_pool_cache
+
+    try:
+        cache = get_question_pool_cache()
+        cache.refresh()
+        prescore_service.reload_keyword_index()
+        return {"result": "SUCCESS", **cache.stats()}
+    except Exception as exc:
+        return {"result": f"ERROR: {str(exc)}"}
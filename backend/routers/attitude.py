@@ -6,21 +6,84 @@ Description: 화상면접 태도
 
 Modification History:
 - 2026-02-28 (양창일): 초기 생성
+- 2026-10-19: 샘플링 계획 조회(GET /attitude/plan) + 멀티파트 바이너리 프레임 업로드(POST /attitude/frames), 업로드 크기 지표
+- 2026-10-19: 답변 중 실시간 분석 WebSocket(/attitude/stream) 추가
+- 2026-10-19: 길이 0인 멀티파트 프레임은 400으로 거절
 """
 
 
-from fastapi import APIRouter, HTTPException
-from backend.schemas.attitude_schema import AttitudeRequest, AttitudeResponse, AttitudeMetrics, AttitudeEvent
-from backend.services.attitude_service import analyze_attitude
+from typing import List
+
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile, WebSocket
+from backend.core import metrics as app_metrics
+from backend.schemas.attitude_schema import AttitudeRequest, AttitudeResponse, AttitudeMetrics, AttitudeEvent, AttitudeSamplingPlan
+from backend.services.attitude_service import MAX_CAPTURE_FRAMES, MAX_FRAME_BYTES, analyze_attitude, sampling_plan
+from backend.services.attitude_stream_service import serve_attitude_stream
 
 router = APIRouter(prefix="/api/infer", tags=["attitude"])
 
+UPLOAD_BYTES = app_metrics.histogram(
+    "attitude_upload_bytes",
+    "태도 분석 요청 본문 크기 (턴당)",
+    ("transport",),
+    (16e3, 32e3, 64e3, 128e3, 256e3, 512e3, 1e6, 2e6, 4e6),
+)
+
+
+def _to_response(result: dict) -> AttitudeResponse:
+    metrics = AttitudeMetrics(**result["metrics"])
+    events = [AttitudeEvent(**e) for e in result["events"]]
+    return AttitudeResponse(metrics=metrics, events=events, summary_text=result["summary_text"])
+
+
+def _observe_upload(request: Request, transport: str) -> None:
+    length = request.headers.get("content-length")
+    if length and length.isdigit():
+        UPLOAD_BYTES.observe(int(length), transport=transport)
+
+
+@router.get("/attitude/plan", response_model=AttitudeSamplingPlan)
+def attitude_plan():
+    return AttitudeSamplingPlan(**sampling_plan())
+
+
 @router.post("/attitude", response_model=AttitudeResponse)
-def infer_attitude(req: AttitudeRequest):
+def infer_attitude(req: AttitudeRequest, request: Request):
     if not req.frames:
         raise HTTPException(status_code=400, detail="frames is empty")
+    _observe_upload(request, "json")
     result = analyze_attitude([f.model_dump() for f in req.frames], fps=2.0)
+    return _to_response(result)
 
-    metrics = AttitudeMetrics(**result["metrics"])
-    events = [AttitudeEvent(**e) for e in result["events"]]
-    return AttitudeResponse(metrics=metrics, events=events, summary_text=result["summary_text"])
\ No newline at end of file
+
+@router.post("/attitude/frames", response_model=AttitudeResponse)
+def infer_attitude_frames(
+    request: Request,
+    frames: List[UploadFile] = File(...),
+    t_ms: List[int] = Form(...),
+):
+    """JPEG 프레임을 base64 없이 멀티파트로 받는다. t_ms는 frames와 같은 순서로 하나씩"""
+    if not frames:
+        raise HTTPException(status_code=400, detail="frames is empty")
+    if len(frames) != len(t_ms):
+        raise HTTPException(status_code=400, detail="frames and t_ms must have the same length")
+    if len(frames) > MAX_CAPTURE_FRAMES:
+        raise HTTPException(status_code=413, detail=f"too many frames (max {MAX_CAPTURE_FRAMES})")
+    _observe_upload(request, "multipart")
+
+    items = []
+    for f, t in zip(frames, t_ms):
+        data = f.file.read(MAX_FRAME_BYTES + 1)
+        if len(data) > MAX_FRAME_BYTES:
+            raise HTTPException(status_code=413, detail=f"frame too large (max {MAX_FRAME_BYTES} bytes)")
+        if not data:
+            raise HTTPException(status_code=400, detail="frame is empty")
+        items.append({"t_ms": t, "image_bytes": data})
+    result = analyze_attitude(items, fps=2.0)
+    return _to_response(result)
+
+
+@router.websocket("/attitude/stream")
+async def attitude_stream(websocket: WebSocket):
+    """답변하는 동안 프레임을 받아 누적 분석, stop 신호에 최종 요약 (프로토콜은 attitude_stream_service 참고)"""
+    await serve_attitude_stream(websocket)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
 from backend.db.database import get_all_memos, save_memo
 from backend.services.llm_service import (
@@ -43,3 +44,26 @@ def create_guide_response(body: dict):
     web_context = get_web_context_first(user_message) if use_web_search and user_message else ""
     reply = "".join(get_home_guide_response_stream(user_message, web_context))
     return {"content": reply, "web_context": web_context}
+
+
+@router.post("/guide/stream")
+def stream_guide_response(body: dict):
+    """
+    /guide와 같은 입력, 모델 델타를 도착하는 대로 chunked text/plain으로 흘려보낸다.
+    웹 검색도 제너레이터 안에서 수행해 응답 헤더는 즉시 나간다.
+    """
+    user_message = body.get("message", "")
+    use_web_search = bool(body.get("use_web_search", False))
+
+    def chunks():
+        web_context = get_web_context_first(user_message) if use_web_search and user_message else ""
+        for delta in get_home_guide_response_stream(user_message, web_context):
+            if delta:
+                yield delta.encode("utf-8")
+
+    return StreamingResponse(
+        chunks(),
+        media_type="text/plain; charset=utf-8",
+        # 프록시(nginx 등) 버퍼링을 끄지 않으면 청크가 모였다가 한 번에 나간다
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -8,17 +8,25 @@ Modification History:
 - 2026-02-15: 초기 생성
 - 2026-02-22: RAG + DB 질문 풀 기반 AI 면접 실행 및 기록 API 통합, 면접 종료 시 최종 점수 계산 및 세션 정보 업데이트
 - 2026-02-28(양창일) : 태도값 추가
+- 2026-10-19: /tts OpenAI 폴백을 LLM 스케줄러 경유로 변경
+- 2026-10-19: /end 시 리포트 생성 백그라운드 작업 등록
+- 2026-10-19: /tts 폴백이 요청마다 OpenAI 클라이언트를 만들지 않고 공용 연결 풀 클라이언트 사용
+- 2026-10-19: /evaluate-turn 임시 점수(provisional) 응답은 재채점 대기열에 적재
+- 2026-10-19: /ask, /questions의 ORDER BY RAND() 질의를 질문 풀 메모리 캐시 추출로 변경 (/ask는 파싱 실패 시에만 조회)
 """
 import os
 from fastapi import APIRouter, Depends, Request, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from openai import OpenAI
 from backend.db.session import get_db
 from backend.db import base  # JobCategory, QuestionPool, InterviewDetail 등 포함
 from backend.schemas.infer_schema import InferRequest, InferResponse
 from backend.services.rag_service import get_ai_service  # 통합된 AI 서비스
 from backend.services.llm_service import evaluate_and_respond
+from backend.services import report_job_service, rescore_service
+from backend.services.question_pool_cache import get_question_pool_cache
+from backend.core.http_clients import get_openai_client
+from backend.core.llm_scheduler import Priority, run_llm
 from backend.services import auth_service
 from backend.models.user import User
 
@@ -151,12 +159,6 @@ def ask_next_question(req: Request, body: dict, db: Session = Depends(get_db)):
     response_time = body.get("response_time", 0)
     current_question = body.get("current_question", "자기소개")
 
-    # 500개 질문 DB에서 해당 직무/난이도 질문 랜덤 추출
-    question_record = db.query(base.QuestionPool).join(base.JobCategory).filter(
-        base.JobCategory.target_role == job_role,
-        base.QuestionPool.difficulty == difficulty
-    ).order_by(func.rand()).first()
-
     # AI 서비스(RAG + GPT-4o-mini) 호출
     # 이력서 문맥과 사용자 답변을 대조하여 피드백 및 다음 질문 생성
     ai_result_raw = _get_ai().generate_interview_response(
@@ -171,8 +173,9 @@ def ask_next_question(req: Request, body: dict, db: Session = Depends(get_db)):
         score = float(score_str.strip("[]"))
         confidence = float(conf_str.strip("[]"))
     except ValueError:
-        # 파싱 실패 시 기본 질문 제공
-        score, confidence, feedback, next_q = 0.0, 0.0, "분석 중", question_record.content if question_record else "다음 질문입니다."
+        # 파싱 실패 시 질문 풀(메모리 캐시)에서 해당 직무/난이도 질문 랜덤 추출
+        picked = get_question_pool_cache().sample(job_role, difficulty, limit=1)
+        score, confidence, feedback, next_q = 0.0, 0.0, "분석 중", picked[0]["question"] if picked else "다음 질문입니다."
 
     # 4. 💾 일반 DB(MySQL)에 문항별 상세 내역 저장 (소요 시간 및 실제 질문 텍스트 포함)
     new_detail = base.InterviewDetail(
@@ -231,6 +234,7 @@ def end_interview(body: dict, db: Session = Depends(get_db)):
         session_record.total_score = round(results.avg_score, 2)
         session_record.status = "COMPLETED" # 면접 완료 상태로 변경
         db.commit()
+        report_job_service.enqueue_report(session_record.id)
 
     return {
         "message": "면접이 종료되었습니다.",
@@ -258,29 +262,9 @@ def read_question_pool(
     job_role: str,
     difficulty: str,
     limit: int = 5,
-    db: Session = Depends(get_db),
 ):
-    rows = (
-        db.query(base.QuestionPool)
-        .join(base.JobCategory)
-        .filter(
-            base.JobCategory.target_role == job_role,
-            base.QuestionPool.difficulty == difficulty,
-        )
-        .order_by(func.rand())
-        .limit(limit)
-        .all()
-    )
-    return {
-        "items": [
-            {
-                "id": row.id,
-                "question": row.content,
-                "difficulty": row.difficulty,
-            }
-            for row in rows
-        ]
-    }
+    items = get_question_pool_cache().sample(job_role, difficulty, limit=limit, fields=("id", "question", "difficulty"))
+    return {"items": items}
 
 
 @router.post("/stt")
@@ -319,11 +303,16 @@ def text_to_speech(body: dict):
             api_key = os.getenv("OPENAI_API_KEY", "")
             if not api_key:
                 raise RuntimeError("OPENAI_API_KEY가 설정되지 않았습니다.")
-            client = OpenAI(api_key=api_key)
-            tts_response = client.audio.speech.create(
+            client = get_openai_client(api_key)
+            tts_response = run_llm(
+                lambda: client.audio.speech.create(
+                    model="tts-1",
+                    voice="alloy",
+                    input=text,
+                ),
                 model="tts-1",
-                voice="alloy",
-                input=text,
+                priority=Priority.INTERACTIVE,
+                call_site="tts_fallback",
             )
             return Response(content=tts_response.content, media_type="audio/mpeg")
         except Exception as e2:
@@ -348,6 +337,8 @@ def evaluate_turn(body: dict):
     next_main_question = body.get("next_main_question")
     followup_count = int(body.get("followup_count", 0))
     attitude = body.get("attitude")
+    session_id = body.get("session_id")
+    turn_index = body.get("turn_index")
 
     if not answer or not str(answer).strip():
         raise HTTPException(status_code=400, detail="answer가 비어 있습니다.")
@@ -364,6 +355,19 @@ def evaluate_turn(body: dict):
             next_main_question=next_main_question,
             followup_count=followup_count,
         )
+        if result.get("provisional"):
+            result["rescore_id"] = rescore_service.enqueue_rescore(
+                session_id=int(session_id) if session_id else None,
+                turn_index=int(turn_index) if turn_index is not None else None,
+                question=question,
+                answer=answer,
+                job_role=job_role,
+                difficulty=difficulty,
+                persona_style=persona_style,
+                provisional_score=result.get("score", 0.0),
+            )
+        else:
+            rescore_service.kick()
         summary_text = ""
         if isinstance(attitude, dict):
             summary_text = (attitude.get("summary_text") or "").strip()
@@ -3,12 +3,20 @@ File: routers/interview.py
 Author: 김지우
 Created: 2026-03-01
 Description: 면접 기록 삭제 (PyMySQL 원시 SQL 적용 + 인증 호환성 패치)
+
+Modification History:
+- 2026-10-19: 세션 COMPLETED 시 리포트 백그라운드 작업 등록, 리포트 조회(폴링/SSE) API 추가
 """
+import json
+
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from backend.db.session import get_db
 from backend.routers.auth import get_current_user
 from backend.db.database import get_connection
+from backend.services import report_job_service
 
 router = APIRouter(prefix="/api/interview", tags=["Interview"])
 
@@ -93,4 +101,68 @@ async def update_interview_session(
             session_record.ended_at = func.now()
     
     db.commit()
+
+    # 면접 완료 → 리포트 생성은 백그라운드로 (세션당 1회, 중복 호출은 무시됨)
+    if body.get("status") == "COMPLETED":
+        report_job_service.enqueue_report(session_id)
     return {"message": "세션 업데이트 완료"}
+
+
+def _require_session_owner(request: Request, db: Session, session_id: int) -> None:
+    from backend.db.base import InterviewSession
+    current_user = get_current_user(request, db)
+    session_record = db.query(InterviewSession).filter(InterviewSession.id == session_id).first()
+    if not session_record or session_record.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없거나 조회 권한이 없습니다.")
+
+
+@router.post("/sessions/{session_id}/report")
+def request_interview_report(
+    session_id: int,
+    request: Request,
+    force: bool = False,
+    db: Session = Depends(get_db)
+):
+    """리포트 작업 등록 (이미 있으면 현재 상태 반환, FAILED면 재시도, force=true면 다시 생성)"""
+    _require_session_owner(request, db, session_id)
+    return report_job_service.enqueue_report(session_id, force=force)
+
+
+@router.get("/sessions/{session_id}/report")
+def get_interview_report(
+    session_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """폴링용: status가 DONE이면 report_markdown 포함"""
+    _require_session_owner(request, db, session_id)
+    report = report_job_service.get_report(session_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="리포트 작업이 없습니다.")
+    return report
+
+
+@router.get("/sessions/{session_id}/report/stream")
+async def stream_interview_report(
+    session_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """SSE: 상태가 바뀔 때마다 event: status 를 보내고 DONE/FAILED에서 종료"""
+    await run_in_threadpool(_require_session_owner, request, db, session_id)
+
+    async def events():
+        last_status = None
+        for _ in range(120):  # 최대 약 4분
+            report = await run_in_threadpool(report_job_service.get_report, session_id)
+            status = report["status"] if report else "NONE"
+            if status != last_status:
+                yield f"event: status\ndata: {json.dumps(report, ensure_ascii=False)}\n\n"
+                last_status = status
+            if status in ("DONE", "FAILED", "NONE") or await request.is_disconnected():
+                return
+            await run_in_threadpool(report_job_service.wait_for_change, session_id, 2.0)
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
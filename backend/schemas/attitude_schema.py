@@ -6,6 +6,7 @@ Description: AI 요청과 응답 데이터 모양 정의
 
 Modification History:
 - 2026-02-28 (양창일): 초기 생성
+- 2026-10-19: 프론트 캡처/업로드 샘플링 계획(AttitudeSamplingPlan) 추가
 """
 
 from pydantic import BaseModel      # FastAPI에서 request/response 데이터 구조를 정의하기 위한 기본 클래스
@@ -18,6 +19,14 @@ class FrameIn(BaseModel):           # 프론트(JS)에서 보내는 "프레임 1
 class AttitudeRequest(BaseModel):   # 프론트가 보내는 전체 요청 구조
     frames: List[FrameIn]           # 프레임 리스트 (start~stop 사이 수집된 것들)
 
+class AttitudeSamplingPlan(BaseModel):  # 서버가 알려주는 캡처/업로드 규칙 (분석에 쓰일 프레임만 보내도록)
+    capture_interval_ms: int        # 캡처 간격
+    max_capture_frames: int         # 턴당 캡처 상한 (이후 프레임은 버림)
+    max_frames: int                 # 실제 분석(업로드)하는 프레임 수
+    width: int                      # 캡처 폭 (높이는 비율 유지)
+    jpeg_quality: float             # canvas.toBlob JPEG 품질
+    max_frame_bytes: int            # 프레임 1장 최대 크기
+
 class AttitudeMetrics(BaseModel):   # 계산된 태도 지표 결과
     head_center_ratio: float        # 정면 유지 비율
     downward_ratio: float           # 고개 숙임 비율
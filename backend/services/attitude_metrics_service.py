@@ -6,121 +6,220 @@ Description: 랜드마크 그룹 JSON에서 지표를 계산하는 로직
 
 Modification History:
 - 2026-02-28 (양창일): 초기 생성 (랜드마크 그룹 JSON에서 지표를 계산하는 로직)
+- 2026-10-19: 프레임 단위 print를 샘플링되는 구조화 로그로 교체
+- 2026-10-19: 턴 전체를 (프레임, 72, 2) 배열 하나로 두고 NumPy 배열 연산으로 지표/이벤트 계산 (compute_turn_features / analyze_turn)
+              프레임 단위 compute_frame_features / compute_turn_metrics / detect_events는 얇은 래퍼로 유지
 """
 
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
-import math
-import statistics
-
-Point = Tuple[float, float]
-
-def _flatten_points(groups: dict) -> List[Point]:
-    pts: List[Point] = []
-    for k, arr in (groups or {}).items():
-        if isinstance(arr, list):
-            for p in arr:
-                if isinstance(p, (list, tuple)) and len(p) >= 2:
-                    pts.append((float(p[0]), float(p[1])))
-    return pts
-
-def _avg(points: List[Point]) -> Optional[Point]:
-    if not points:
-        return None
-    return (sum(p[0] for p in points)/len(points), sum(p[1] for p in points)/len(points))
-
-def _get(group: dict, key: str) -> List[Point]:
-    arr = group.get(key) or []
-    return [(float(x), float(y)) for x, y in arr if isinstance(x, (int,float)) and isinstance(y, (int,float))]
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence
 
-def compute_frame_features(groups: dict) -> Optional[dict]:
+import numpy as np
+
+from backend.core.structured_log import emit, should_log
+
+# face_recognition 그룹 형식 (Space / 로컬 엔진 응답과 같은 키/점 개수).
+# 68점 중 입술 4점이 top_lip / bottom_lip에 겹쳐 들어가 72칸이 된다 - 그룹 값을 그대로 두어야 기존 계산과 같아진다
+GROUP_LAYOUT = (
+    ("chin", 17),
+    ("left_eyebrow", 5),
+    ("right_eyebrow", 5),
+    ("nose_bridge", 4),
+    ("nose_tip", 5),
+    ("left_eye", 6),
+    ("right_eye", 6),
+    ("top_lip", 12),
+    ("bottom_lip", 12),
+)
+GROUP_SLICES: Dict[str, slice] = {}
+_offset = 0
+for _name, _size in GROUP_LAYOUT:
+    GROUP_SLICES[_name] = slice(_offset, _offset + _size)
+    _offset += _size
+N_POINTS = _offset
+
+# thresholds (MVP용; 실측 후 조정 권장)
+CENTER_YAW_MAX = 0.12
+CENTER_PITCH_MAX = 0.40
+DOWN_PITCH_MIN = 0.40
+MIN_POINTS = 10
+
+FEATURE_KEYS = ("yaw_proxy", "pitch_proxy", "is_center", "is_down", "mouth_open_norm", "eye_open_norm", "expr_signal")
+
+
+def groups_to_points(groups: dict, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """그룹 dict → (72, 2) 좌표 배열. 없는 점 / 숫자가 아닌 좌표는 NaN"""
+    if out is None:
+        out = np.empty((N_POINTS, 2), dtype=np.float64)
+    out.fill(np.nan)
+    for name, sl in GROUP_SLICES.items():
+        arr = (groups or {}).get(name)
+        if not isinstance(arr, list) or not arr:
+            continue
+        size = sl.stop - sl.start
+        try:
+            pts = np.asarray(arr[:size], dtype=np.float64)
+        except (TypeError, ValueError):
+            pts = None
+        if pts is not None and pts.ndim == 2 and pts.shape[1] >= 2:
+            out[sl.start : sl.start + len(pts)] = pts[:, :2]
+            continue
+        # 모양이 들쭉날쭉한 응답은 점 단위로 채운다
+        for i, p in enumerate(arr[:size]):
+            if isinstance(p, (list, tuple)) and len(p) >= 2 and all(isinstance(v, (int, float)) for v in p[:2]):
+                out[sl.start + i] = (float(p[0]), float(p[1]))
+    return out
+
+
+def stack_turn(groups_list: Sequence[dict]) -> np.ndarray:
+    """턴의 그룹 dict 목록 → (프레임, 72, 2)"""
+    points = np.empty((len(groups_list), N_POINTS, 2), dtype=np.float64)
+    # 그룹/점 개수가 형식과 정확히 맞는 프레임은 좌표를 이어 붙여 np.array 한 번으로 변환
+    flat: List[Any] = []
+    exact: List[int] = []
+    for i, groups in enumerate(groups_list):
+        seq = [(groups or {}).get(name) for name, _ in GROUP_LAYOUT]
+        if all(isinstance(arr, list) and len(arr) == size for arr, (_, size) in zip(seq, GROUP_LAYOUT)):
+            for arr in seq:
+                flat.extend(arr)
+            exact.append(i)
+        else:
+            groups_to_points(groups, points[i])
+    if exact:
+        try:
+            coords = np.fromiter(chain.from_iterable(flat), dtype=np.float64)
+            if coords.size != 2 * len(flat):
+                raise ValueError("point is not (x, y)")
+            points[exact] = coords.reshape(len(exact), N_POINTS, 2)
+        except (TypeError, ValueError):
+            for i in exact:
+                groups_to_points(groups_list[i], points[i])
+    return points
+
+
+def _group_stats(points: np.ndarray, name: str):
+    """그룹별 (점 개수, 평균 x, 평균 y, 최소 y, 최대 y) - 프레임 축 배열"""
+    g = points[:, GROUP_SLICES[name]]
+    ok = ~np.isnan(g).any(axis=2)
+    count = ok.sum(axis=1)
+    safe = np.maximum(count, 1)
+    gx = np.where(ok, g[..., 0], 0.0)
+    gy = np.where(ok, g[..., 1], 0.0)
+    min_y = np.where(ok, g[..., 1], np.inf).min(axis=1)
+    max_y = np.where(ok, g[..., 1], -np.inf).max(axis=1)
+    return count, gx.sum(axis=1) / safe, gy.sum(axis=1) / safe, min_y, max_y
+
+
+@dataclass
+class TurnFeatures:
+    """프레임 축 배열 모음. valid=False 프레임의 값은 의미 없음"""
+    valid: np.ndarray
+    yaw_proxy: np.ndarray
+    pitch_proxy: np.ndarray
+    is_center: np.ndarray
+    is_down: np.ndarray
+    mouth_open_norm: np.ndarray
+    eye_open_norm: np.ndarray
+    expr_signal: np.ndarray
+
+    def select(self, mask: np.ndarray) -> "TurnFeatures":
+        return TurnFeatures(**{k: getattr(self, k)[mask] for k in ("valid",) + FEATURE_KEYS})
+
+    def frame_dict(self, i: int) -> Optional[dict]:
+        if not self.valid[i]:
+            return None
+        return {
+            "yaw_proxy": float(self.yaw_proxy[i]),
+            "pitch_proxy": float(self.pitch_proxy[i]),
+            "is_center": bool(self.is_center[i]),
+            "is_down": bool(self.is_down[i]),
+            "mouth_open_norm": float(self.mouth_open_norm[i]),
+            "eye_open_norm": float(self.eye_open_norm[i]),
+            "expr_signal": float(self.expr_signal[i]),
+        }
+
+    @classmethod
+    def from_dicts(cls, frame_features: List[dict]) -> "TurnFeatures":
+        cols = {
+            k: np.array([f.get(k, 0.0) for f in frame_features], dtype=bool if k.startswith("is_") else np.float64)
+            for k in FEATURE_KEYS
+        }
+        return cls(valid=np.ones(len(frame_features), dtype=bool), **cols)
+
+
+def compute_turn_features(points: np.ndarray) -> TurnFeatures:
     """
-    returns dict with:
-      yaw_proxy, pitch_proxy, is_center, is_down,
-      mouth_open_norm, eye_open_norm
+    points: (프레임, 72, 2). 프레임별
+      yaw_proxy, pitch_proxy, is_center, is_down, mouth_open_norm, eye_open_norm, expr_signal
+    을 한 번에 계산한다.
     """
-    pts = _flatten_points(groups)
-    if len(pts) < 10:
-        return None
-
-    xs = [p[0] for p in pts]; ys = [p[1] for p in pts]
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    w = max_x - min_x
-    h = max_y - min_y
-    if w <= 1e-6 or h <= 1e-6:
-        return None
-
-    mid_x = (min_x + max_x) / 2.0
-
-    nose = _avg(_get(groups, "nose_tip")) or _avg(_get(groups, "nose_bridge"))
-    l_eye = _get(groups, "left_eye")
-    r_eye = _get(groups, "right_eye")
-    mouth_top = _get(groups, "top_lip")
-    mouth_bot = _get(groups, "bottom_lip")
-    l_brow = _get(groups, "left_eyebrow")
-    r_brow = _get(groups, "right_eyebrow")
-
-    if nose is None or not l_eye or not r_eye:
-        return None
-
-    eye_y = (sum(p[1] for p in l_eye)/len(l_eye) + sum(p[1] for p in r_eye)/len(r_eye)) / 2.0
-    nose_x, nose_y = nose
-
-    # yaw: 코가 얼굴 중앙에서 얼마나 좌우로 치우쳤는지(정규화)
-    yaw_proxy = (nose_x - mid_x) / w
-
-    # pitch: 코가 눈보다 얼마나 아래에 있는지(정규화)
-    pitch_proxy = (nose_y - eye_y) / h
-
-    # mouth open: 입 위/아래 y-범위로 근사
-    mouth_open = 0.0
-    if mouth_top and mouth_bot:
-        mouth_open = (max(p[1] for p in mouth_bot) - min(p[1] for p in mouth_top)) / h
-
-    # eye open: 눈 y-범위/얼굴높이로 근사(좌우 평균)
-    def eye_open_norm(eye_pts: List[Point]) -> float:
-        if not eye_pts: return 0.0
-        return (max(p[1] for p in eye_pts) - min(p[1] for p in eye_pts)) / h
-    eye_open = (eye_open_norm(l_eye) + eye_open_norm(r_eye)) / 2.0
-
-    # expression signal: 입/눈썹 변화량(프레임 단위 값)
-    brow_signal = 0.0
-    if l_brow and r_brow:
-        brow_y = (sum(p[1] for p in l_brow)/len(l_brow) + sum(p[1] for p in r_brow)/len(r_brow)) / 2.0
-        brow_signal = (eye_y - brow_y) / h  # 눈썹이 올라가면 커짐
-
-    # thresholds (MVP용; 실측 후 조정 권장)
-    is_center = (abs(yaw_proxy) < 0.12) and (abs(pitch_proxy) < 0.40)
-    is_down = (pitch_proxy > 0.40)
-
-    print(
-        "[DEBUG][attitude_metrics] frame_values",
-        {
-            "yaw_proxy": round(yaw_proxy, 4),
-            "pitch_proxy": round(pitch_proxy, 4),
-            "mouth_open_norm": round(mouth_open, 4),
-            "eye_open_norm": round(eye_open, 4),
-            "expr_signal": round(brow_signal, 4),
-            "is_center": is_center,
-            "is_down": is_down,
-        },
+    points = np.asarray(points, dtype=np.float64).reshape(-1, N_POINTS, 2)
+    ok = ~np.isnan(points).any(axis=2)
+    xs = points[..., 0]
+    ys = points[..., 1]
+    min_x = np.where(ok, xs, np.inf).min(axis=1)
+    max_x = np.where(ok, xs, -np.inf).max(axis=1)
+    min_y = np.where(ok, ys, np.inf).min(axis=1)
+    max_y = np.where(ok, ys, -np.inf).max(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        w = max_x - min_x
+        h = max_y - min_y
+        mid_x = (min_x + max_x) / 2.0
+
+        tip_n, tip_x, tip_y, _, _ = _group_stats(points, "nose_tip")
+        bridge_n, bridge_x, bridge_y, _, _ = _group_stats(points, "nose_bridge")
+        le_n, _, le_y, le_min, le_max = _group_stats(points, "left_eye")
+        re_n, _, re_y, re_min, re_max = _group_stats(points, "right_eye")
+        top_n, _, _, top_min, _ = _group_stats(points, "top_lip")
+        bot_n, _, _, _, bot_max = _group_stats(points, "bottom_lip")
+        lb_n, _, lb_y, _, _ = _group_stats(points, "left_eyebrow")
+        rb_n, _, rb_y, _, _ = _group_stats(points, "right_eyebrow")
+
+        nose_x = np.where(tip_n > 0, tip_x, bridge_x)
+        nose_y = np.where(tip_n > 0, tip_y, bridge_y)
+        eye_y = (le_y + re_y) / 2.0
+
+        valid = (
+            (ok.sum(axis=1) >= MIN_POINTS)
+            & (w > 1e-6)
+            & (h > 1e-6)
+            & ((tip_n > 0) | (bridge_n > 0))
+            & (le_n > 0)
+            & (re_n > 0)
+        )
+
+        # yaw: 코가 얼굴 중앙에서 얼마나 좌우로 치우쳤는지(정규화)
+        yaw_proxy = (nose_x - mid_x) / w
+        # pitch: 코가 눈보다 얼마나 아래에 있는지(정규화)
+        pitch_proxy = (nose_y - eye_y) / h
+        # mouth open: 입 위/아래 y-범위로 근사
+        mouth_open = np.where((top_n > 0) & (bot_n > 0), (bot_max - top_min) / h, 0.0)
+        # eye open: 눈 y-범위/얼굴높이로 근사(좌우 평균)
+        eye_open = (np.where(le_n > 0, (le_max - le_min) / h, 0.0) + np.where(re_n > 0, (re_max - re_min) / h, 0.0)) / 2.0
+        # expression signal: 눈썹이 올라가면 커짐
+        brow_signal = np.where((lb_n > 0) & (rb_n > 0), (eye_y - (lb_y + rb_y) / 2.0) / h, 0.0)
+
+    is_center = valid & (np.abs(yaw_proxy) < CENTER_YAW_MAX) & (np.abs(pitch_proxy) < CENTER_PITCH_MAX)
+    is_down = valid & (pitch_proxy > DOWN_PITCH_MIN)
+    return TurnFeatures(
+        valid=valid,
+        yaw_proxy=yaw_proxy,
+        pitch_proxy=pitch_proxy,
+        is_center=is_center,
+        is_down=is_down,
+        mouth_open_norm=mouth_open,
+        eye_open_norm=eye_open,
+        expr_signal=brow_signal,
     )
 
-    return {
-        "yaw_proxy": yaw_proxy,
-        "pitch_proxy": pitch_proxy,
-        "is_center": is_center,
-        "is_down": is_down,
-        "mouth_open_norm": mouth_open,
-        "eye_open_norm": eye_open,
-        "expr_signal": brow_signal,
-    }
 
-def compute_turn_metrics(frame_features: List[dict]) -> dict:
-    n = len(frame_features)
+def turn_metrics(feats: TurnFeatures) -> dict:
+    """유효 프레임만 담긴 TurnFeatures → 턴 지표"""
+    n = len(feats.is_center)
     if n == 0:
         return {
             "head_center_ratio": 0.0,
@@ -128,56 +227,87 @@ def compute_turn_metrics(frame_features: List[dict]) -> dict:
             "expression_variability": 0.0,
             "eye_open_variability": 0.0,
         }
+    return {
+        "head_center_ratio": float(np.count_nonzero(feats.is_center) / n),
+        "downward_ratio": float(np.count_nonzero(feats.is_down) / n),
+        # 모표준편차 (statistics.pstdev와 같음)
+        "expression_variability": float(feats.expr_signal.std()) if n >= 2 else 0.0,
+        "eye_open_variability": float(feats.eye_open_norm.std()) if n >= 2 else 0.0,
+    }
 
-    head_center_ratio = sum(1 for f in frame_features if f["is_center"]) / n
-    downward_ratio = sum(1 for f in frame_features if f["is_down"]) / n
-
-    expr_vals = [f["expr_signal"] for f in frame_features]
-    eye_vals = [f["eye_open_norm"] for f in frame_features]
 
-    expression_variability = float(statistics.pstdev(expr_vals)) if len(expr_vals) >= 2 else 0.0
-    eye_open_variability = float(statistics.pstdev(eye_vals)) if len(eye_vals) >= 2 else 0.0
+def _runs(mask: np.ndarray):
+    """True 연속 구간의 (시작, 끝) 인덱스 배열 (끝 포함)"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1
 
-    return {
-        "head_center_ratio": float(head_center_ratio),
-        "downward_ratio": float(downward_ratio),
-        "expression_variability": float(expression_variability),
-        "eye_open_variability": float(eye_open_variability),
-    }
 
-def detect_events(t_ms: List[int], frame_features: List[dict], fps: float = 2.0) -> List[dict]:
+def turn_events(t_ms: Sequence[int], feats: TurnFeatures, fps: float = 2.0) -> List[dict]:
     """
-    연속 구간 기반 이벤트.
+    연속 구간 기반 이벤트 (t_ms는 feats와 같은 프레임 순서).
     - head_off_center: is_center=False가 1.5초 이상 지속
     - head_down: is_down=True가 2.0초 이상 지속
     """
     events: List[dict] = []
-    if not frame_features:
+    if len(feats.is_center) == 0:
         return events
+    t = np.asarray(t_ms)
+    for mask, typ, min_sec in ((~feats.is_center, "head_off_center", 1.5), (feats.is_down, "head_down", 2.0)):
+        starts, ends = _runs(mask)
+        keep = (ends - starts + 1) / fps >= min_sec
+        for s, e in zip(starts[keep], ends[keep]):
+            events.append({
+                "t_start_ms": int(t[s]),
+                "t_end_ms": int(t[e]),
+                "type": typ,
+                "severity": "warn",
+            })
+    return events
 
-    def push_event(start_i, end_i, typ, severity="warn"):
-        events.append({
-            "t_start_ms": t_ms[start_i],
-            "t_end_ms": t_ms[end_i],
-            "type": typ,
-            "severity": severity,
-        })
-
-    # helper: run-length
-    def scan(predicate, typ, min_sec):
-        run_start = None
-        for i, f in enumerate(frame_features):
-            ok = predicate(f)
-            if ok and run_start is None:
-                run_start = i
-            if (not ok or i == len(frame_features)-1) and run_start is not None:
-                run_end = i if ok and i == len(frame_features)-1 else i-1
-                dur_sec = (run_end - run_start + 1) / fps
-                if dur_sec >= min_sec:
-                    push_event(run_start, run_end, typ, "warn")
-                run_start = None
-
-    scan(lambda f: not f["is_center"], "head_off_center", min_sec=1.5)
-    scan(lambda f: f["is_down"], "head_down", min_sec=2.0)
 
-    return events
+def analyze_turn(t_ms: Sequence[int], groups_list: Sequence[dict], fps: float = 2.0) -> Dict[str, Any]:
+    """턴 전체: 그룹 dict 목록 → 지표 + 이벤트 + 프레임별 유효 여부"""
+    feats = compute_turn_features(stack_turn(groups_list))
+    good = feats.select(feats.valid)
+    if should_log("attitude.frame"):
+        emit(
+            "attitude.frame",
+            "turn_values",
+            frames=len(feats.valid),
+            valid=int(np.count_nonzero(feats.valid)),
+            yaw_proxy=np.round(good.yaw_proxy, 4).tolist(),
+            pitch_proxy=np.round(good.pitch_proxy, 4).tolist(),
+            mouth_open_norm=np.round(good.mouth_open_norm, 4).tolist(),
+            eye_open_norm=np.round(good.eye_open_norm, 4).tolist(),
+            expr_signal=np.round(good.expr_signal, 4).tolist(),
+        )
+    return {
+        "metrics": turn_metrics(good),
+        "events": turn_events(np.asarray(t_ms)[feats.valid], good, fps=fps),
+        "valid": feats.valid,
+    }
+
+
+# ─── 프레임 단위 API (기존 호출부 호환용 래퍼) ─────────────────────
+
+def compute_frame_features(groups: dict) -> Optional[dict]:
+    """
+    returns dict with:
+      yaw_proxy, pitch_proxy, is_center, is_down,
+      mouth_open_norm, eye_open_norm
+    """
+    feats = compute_turn_features(groups_to_points(groups)[None])
+    ff = feats.frame_dict(0)
+    if ff is not None and should_log("attitude.frame"):
+        emit("attitude.frame", "frame_values", **{k: (round(v, 4) if isinstance(v, float) else v) for k, v in ff.items()})
+    return ff
+
+
+def compute_turn_metrics(frame_features: List[dict]) -> dict:
+    return turn_metrics(TurnFeatures.from_dicts(frame_features))
+
+
+def detect_events(t_ms: List[int], frame_features: List[dict], fps: float = 2.0) -> List[dict]:
+    if not frame_features:
+        return []
+    return turn_events(t_ms[: len(frame_features)], TurnFeatures.from_dicts(frame_features), fps=fps)
@@ -6,91 +6,120 @@ Description: 프레임 여러 장을 HF에 보내고 요약
 
 Modification History:
 - 2026-02-28 (양창일): 초기 생성
+- 2026-10-19: 디버그 print를 구조화 로그로 교체, 사용하지 않는 순차 처리 루프 제거
+- 2026-10-19: 턴 단위 배치 랜드마크 추론(infer_landmark_groups_batch)으로 전환 - LANDMARK_BACKEND=local이면 로컬 CPU 추론
+- 2026-10-19: 샘플링 계획(sampling_plan) 공개 + 프레임 선택 규칙(select_frames) 분리, 바이너리 프레임(image_bytes) 허용
+- 2026-10-19: 턴 단위 배열 계산(analyze_turn)으로 전환, 얼굴 인식 실패 프레임이 섞여도 이벤트 시각이 밀리지 않도록 수정
+- 2026-10-19: 요약 텍스트 생성(build_result) 분리 - WebSocket 스트리밍 분석과 공유
+- 2026-10-19: 추론 풀에서 건너뛴 프레임(None)은 표본에서 빼고 dropped_frames로 따로 보고
+- 2026-10-19: 빈 바이너리 프레임(b"")이 image_b64로 넘어가 KeyError가 나던 문제 수정
 """
 
-from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
-from backend.services.hf_landmark_service import infer_landmark_groups
-from backend.services.attitude_metrics_service import compute_frame_features, compute_turn_metrics, detect_events
+from backend.services.hf_landmark_service import infer_landmark_groups_batch
+from backend.services.attitude_metrics_service import analyze_turn
+from backend.core.structured_log import emit, log_event, should_log
+
+# 프론트가 캡처/업로드할 때 따르는 샘플링 계획 (GET /api/infer/attitude/plan)
+CAPTURE_INTERVAL_MS = 500     # 2fps
+MAX_CAPTURE_FRAMES = 40       # 20초 @2fps
+MAX_ANALYZED_FRAMES = 10
+FRAME_WIDTH = 320
+JPEG_QUALITY = 0.6
+MAX_FRAME_BYTES = 256 * 1024
+
+
+def sampling_plan() -> Dict[str, Any]:
+    return {
+        "capture_interval_ms": CAPTURE_INTERVAL_MS,
+        "max_capture_frames": MAX_CAPTURE_FRAMES,
+        "max_frames": MAX_ANALYZED_FRAMES,
+        "width": FRAME_WIDTH,
+        "jpeg_quality": JPEG_QUALITY,
+        "max_frame_bytes": MAX_FRAME_BYTES,
+    }
+
+
+def select_frames(frames: List[dict]) -> List[dict]:
+    """분석할 프레임만 남긴다. 프론트도 같은 규칙으로 골라 보내므로 이미 고른 목록에는 변화가 없다"""
+    # 프레임 과다 방지: 최대 40장(20초 @2fps)
+    frames = frames[:MAX_CAPTURE_FRAMES]
+    if len(frames) > MAX_ANALYZED_FRAMES:
+        step = max(1, len(frames) // MAX_ANALYZED_FRAMES)
+        frames = frames[::step][:MAX_ANALYZED_FRAMES]
+    return frames
+
 
 def analyze_attitude(frames: List[dict], fps: float = 2.0) -> Dict[str, Any]:
-    # 1) 프레임 과다 방지: 최대 40장(20초 @2fps)
-    frames = frames[:40]
-    if len(frames) > 10:
-        step = max(1, len(frames) // 10)
-        frames = frames[::step][:10]
-
-    t_ms_list = []
-    feats = []
-
-    def _analyze_frame(item: tuple[int, dict]):
-        idx, fr = item
-        t_ms = int(fr["t_ms"])
-        groups = infer_landmark_groups(fr["image_b64"])
-        ff = compute_frame_features(groups)
-        return idx, t_ms, groups, ff
-
-    indexed_frames = list(enumerate(frames, start=1))
-    results = []
-    for batch_start in range(0, len(indexed_frames), 5):
-        batch = indexed_frames[batch_start:batch_start + 5]
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            results.extend(executor.map(_analyze_frame, batch))
-
-    results = sorted(results, key=lambda item: item[0])
-    for idx, t_ms, groups, ff in results:
-        t_ms_list.append(t_ms)
-        print(
-            "[DEBUG][attitude_service] frame",
-            idx,
-            "group_keys=",
-            list((groups or {}).keys())[:12],
-            "feature_ok=",
-            ff is not None,
-        )
-        if ff is not None:
-            feats.append(ff)
-
-    for fr in []:
-        t_ms_list.append(int(fr["t_ms"]))
-        groups = infer_landmark_groups(fr["image_b64"])
-        ff = compute_frame_features(groups)
-        print(
-            "[DEBUG][attitude_service] frame",
-            len(t_ms_list),
-            "group_keys=",
-            list((groups or {}).keys())[:12],
-            "feature_ok=",
-            ff is not None,
-        )
-        if ff is not None:
-            feats.append(ff)
-        else:
-            # landmark 실패 프레임은 스킵(또는 별도 카운트)
-            pass
-
-    metrics = compute_turn_metrics(feats)
-    events = detect_events(t_ms_list[:len(feats)], feats, fps=fps) if feats else []
-    print(
-        "[DEBUG][attitude_service] sampled_frames=",
-        len(frames),
-        "valid_features=",
-        len(feats),
-        "metrics=",
-        metrics,
+    """frames: [{"t_ms", "image_b64"}] 또는 [{"t_ms", "image_bytes"}] (멀티파트 업로드)"""
+    # 1) 분석 대상 프레임 선택
+    frames = select_frames(frames)
+
+    # 한 턴의 프레임을 한 번에 넘긴다 (로컬 백엔드는 배치 추론, 원격은 동시 요청)
+    all_groups = infer_landmark_groups_batch(
+        [fr["image_bytes"] if "image_bytes" in fr else fr["image_b64"] for fr in frames]
     )
+    # 추론하지 못한 프레임(None: 대기열 가득 / 마감 / 취소 / 오류)은 얼굴 인식 실패와 달리 표본에서 뺀다
+    kept = [(fr, groups) for fr, groups in zip(frames, all_groups) if groups is not None]
+    dropped = len(frames) - len(kept)
+    frames = [fr for fr, _ in kept]
+    all_groups = [groups for _, groups in kept]
+    # 턴 전체를 배열 하나로 계산 - 이벤트 시각은 유효 프레임 자신의 t_ms를 쓴다
+    turn = analyze_turn([int(fr["t_ms"]) for fr in frames], all_groups, fps=fps)
+    metrics, events = turn["metrics"], turn["events"]
+    valid_count = int(turn["valid"].sum())
+    if should_log("attitude.frame"):
+        for idx, (groups, ok) in enumerate(zip(all_groups, turn["valid"]), start=1):
+            emit(
+                "attitude.frame",
+                "landmark_frame",
+                idx=idx,
+                group_keys=list((groups or {}).keys())[:12],
+                feature_ok=bool(ok),
+            )
 
-    # 2) 요약 텍스트(면접 내용과 같이 보낼 한두 줄)
+    log_event(
+        "attitude.turn",
+        "analyze_attitude",
+        sampled_frames=len(frames),
+        valid_features=valid_count,
+        dropped_frames=dropped,
+        metrics=metrics,
+    )
+    return build_result(
+        metrics, events, sampled_frames=len(frames), valid_features=valid_count, dropped_frames=dropped
+    )
+
+
+def build_result(
+    metrics: Dict[str, Any],
+    events: List[dict],
+    sampled_frames: int,
+    valid_features: int,
+    dropped_frames: int = 0,
+) -> Dict[str, Any]:
+    """지표/이벤트 → 응답 dict (요약 텍스트 포함). 일괄 분석과 스트리밍 분석이 같이 쓴다"""
+    debug = {
+        "sampled_frames": sampled_frames,
+        "valid_features": valid_features,
+        "dropped_frames": dropped_frames,
+    }
+
+    # 요약 텍스트(면접 내용과 같이 보낼 한두 줄)
     tips = []
-    if not feats:
+    if not sampled_frames and dropped_frames:
+        return {
+            "metrics": metrics,
+            "events": events,
+            "summary_text": "서버가 혼잡해 이번 답변의 태도 분석을 건너뛰었습니다.",
+            "debug": debug,
+        }
+    if not valid_features:
         return {
             "metrics": metrics,
             "events": events,
             "summary_text": "태도 분석에 필요한 얼굴 포인트를 충분히 인식하지 못했습니다. 카메라 각도와 조명을 확인해 주세요.",
-            "debug": {
-                "sampled_frames": len(frames),
-                "valid_features": len(feats),
-            },
+            "debug": debug,
         }
     if metrics["head_center_ratio"] < 0.45:
         tips.append("정면 유지가 자주 무너졌습니다(고개의 좌우를 돌리지 않고 정면을 유지해보세요).")
@@ -105,8 +134,5 @@ def analyze_attitude(frames: List[dict], fps: float = 2.0) -> Dict[str, Any]:
         "metrics": metrics,
         "events": events,
         "summary_text": summary_text,
-        "debug": {
-            "sampled_frames": len(frames),
-            "valid_features": len(feats),
-        },
+        "debug": debug,
     }
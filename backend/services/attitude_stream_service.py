@@ -0,0 +1,322 @@
+"""
+File: attitude_stream_service.py
+Created: 2026-10-19
+Description: 답변 중 실시간 태도 분석 (WebSocket /api/infer/attitude/stream)
+             - 답변하는 동안 프레임을 받아 바로 랜드마크 → 특징을 계산하고 턴 지표를 누적
+               (정면/하방 비율은 카운터, 표정/눈 변화량은 Welford 온라인 분산)
+             - head_off_center / head_down 연속 구간을 온라인으로 추적해 구간이 끝나는 즉시 이벤트 전송
+             - 정지 신호를 받으면 밀린 프레임만 마저 처리하고 최종 요약(POST /attitude와 같은 응답 모양)을 바로 돌려준다
+             - 프로토콜
+               서버 → {"type": "plan", capture_interval_ms, width, jpeg_quality, max_frame_bytes, max_frames}
+               클라 → 바이너리 메시지: 4바이트 빅엔디언 t_ms + JPEG 바이트 (프레임 1장)
+               서버 → {"type": "progress", frames, valid, dropped, metrics, events(새로 끝난 구간)}
+               클라 → {"type": "stop"}
+               서버 → {"type": "result", metrics, events, summary_text, debug} 후 종료
+             - 랜드마크 추론이 밀리면 큐(ATTITUDE_STREAM_MAX_PENDING)를 넘는 프레임은 버리고 dropped로 알린다
+               추론 풀이 거절/마감/취소한 프레임(None)도 dropped로 세고 frames/valid 비율에는 넣지 않는다
+             - 분석 샘플링 (plan의 analyze_interval_ms / max_frames, 클라는 이 간격으로만 보내고 서버도 같은 규칙으로 거른다)
+               · LANDMARK_BACKEND=hf(기본): 일괄 분석(select_frames)과 같은 예산 - 2초 간격, 최대 MAX_ANALYZED_FRAMES장
+                 → 20초 이상 답변이면 멀티파트 업로드와 같은 프레임(앞 20초의 4장마다 1장)을 분석한다.
+                   20초보다 짧은 답변은 일괄 분석이 간격을 좁혀 10장을 채우는 것과 달리 2초 간격 그대로라 표본이 더 적다.
+               · LANDMARK_BACKEND=local: 원격 Space 부하가 없으므로 캡처한 프레임 전부(최대 ATTITUDE_STREAM_MAX_FRAMES장)
+               · 간격/상한 밖의 프레임은 skipped로 세고 dropped(적체/순서 오류)와 구분한다
+             - 설정: ATTITUDE_STREAM_INTERVAL_MS (캡처 간격, 기본 500 = 2fps), ATTITUDE_STREAM_MAX_FRAMES,
+                     ATTITUDE_STREAM_MAX_PENDING, ATTITUDE_STREAM_MAX_BATCH
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: 랜드마크 추론을 전역 추론 풀에 턴별 CancelToken으로 제출, 연결이 끊기면 남은 프레임 취소
+- 2026-10-19: 원격(hf) 백엔드에서는 일괄 분석과 같은 프레임 예산으로 샘플링 (전체 프레임 분석은 local 백엔드만)
+- 2026-10-19: 추론 풀에서 건너뛴 프레임은 얼굴 인식 실패와 구분해 dropped로 집계
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import os
+import struct
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+
+from backend.core import metrics as app_metrics
+from backend.core.inference_pool import CancelToken
+from backend.core.structured_log import log_event
+from backend.services.attitude_metrics_service import compute_turn_features, stack_turn
+from backend.services.attitude_service import (
+    FRAME_WIDTH,
+    JPEG_QUALITY,
+    MAX_ANALYZED_FRAMES,
+    MAX_CAPTURE_FRAMES,
+    MAX_FRAME_BYTES,
+    build_result,
+)
+from backend.services.hf_landmark_service import LANDMARK_BACKEND, infer_landmark_groups_batch
+
+STREAM_INTERVAL_MS = int(os.getenv("ATTITUDE_STREAM_INTERVAL_MS", "500"))
+MAX_STREAM_FRAMES = int(os.getenv("ATTITUDE_STREAM_MAX_FRAMES", "360"))  # 3분 @2fps
+MAX_PENDING_FRAMES = int(os.getenv("ATTITUDE_STREAM_MAX_PENDING", "16"))
+MAX_BATCH = int(os.getenv("ATTITUDE_STREAM_MAX_BATCH", "8"))
+
+_HEADER = struct.Struct(">I")  # t_ms
+
+STREAM_FRAMES = app_metrics.counter("attitude_stream_frames_total", "스트리밍 태도 분석 프레임 수", ("result",))
+STREAM_FINALIZE = app_metrics.histogram(
+    "attitude_stream_finalize_seconds",
+    "정지 신호부터 최종 요약 전송까지 걸린 시간",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+# 이벤트 규칙 (attitude_metrics_service.turn_events와 같은 기준, 같은 출력 순서)
+EVENT_RULES = (("head_off_center", 1.5), ("head_down", 2.0))
+
+
+def stream_plan() -> Dict[str, Any]:
+    if LANDMARK_BACKEND == "local":
+        analyze_interval_ms, max_frames = STREAM_INTERVAL_MS, MAX_STREAM_FRAMES
+    else:
+        # select_frames가 40장 중 4장마다 1장을 고르는 것과 같은 간격
+        analyze_interval_ms = STREAM_INTERVAL_MS * max(1, MAX_CAPTURE_FRAMES // MAX_ANALYZED_FRAMES)
+        max_frames = MAX_ANALYZED_FRAMES
+    return {
+        "capture_interval_ms": STREAM_INTERVAL_MS,
+        "analyze_interval_ms": analyze_interval_ms,
+        "max_frames": max_frames,
+        "width": FRAME_WIDTH,
+        "jpeg_quality": JPEG_QUALITY,
+        "max_frame_bytes": MAX_FRAME_BYTES,
+    }
+
+
+class RunningStat:
+    """Welford 온라인 평균/분산 (모표준편차 = statistics.pstdev)"""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def pstdev(self) -> float:
+        return math.sqrt(self.m2 / self.n) if self.n >= 2 else 0.0
+
+
+class RunDetector:
+    """조건이 이어지는 프레임 수를 세다가 구간이 끝나면 min_sec 이상일 때 이벤트 하나"""
+
+    def __init__(self, typ: str, min_sec: float, fps: float) -> None:
+        self.typ = typ
+        self.min_frames = min_sec * fps  # 일괄 분석과 같이 (프레임 수 / fps)로 길이를 잰다
+        self.start_ms: Optional[int] = None
+        self.last_ms: Optional[int] = None
+        self.count = 0
+
+    def push(self, active: bool, t_ms: int) -> Optional[dict]:
+        if active:
+            if self.start_ms is None:
+                self.start_ms = t_ms
+            self.last_ms = t_ms
+            self.count += 1
+            return None
+        return self.close()
+
+    def close(self) -> Optional[dict]:
+        if self.start_ms is None:
+            return None
+        event = None
+        if self.count >= self.min_frames:
+            event = {"t_start_ms": self.start_ms, "t_end_ms": self.last_ms, "type": self.typ, "severity": "warn"}
+        self.start_ms = self.last_ms = None
+        self.count = 0
+        return event
+
+
+class AttitudeStream:
+    """한 턴의 누적 상태. 프레임은 t_ms 순서로 add 해야 한다"""
+
+    def __init__(self, fps: float = 1000.0 / STREAM_INTERVAL_MS) -> None:
+        self.frames = 0
+        self.valid = 0
+        self.center = 0
+        self.down = 0
+        self.expr = RunningStat()
+        self.eye = RunningStat()
+        self.detectors = [RunDetector(typ, min_sec, fps) for typ, min_sec in EVENT_RULES]
+        self.events: List[dict] = []
+
+    def add(self, t_ms: Sequence[int], groups_list: Sequence[dict]) -> List[dict]:
+        """프레임 묶음 반영. 이번에 끝난 이벤트 목록을 돌려준다"""
+        feats = compute_turn_features(stack_turn(groups_list))
+        self.frames += len(groups_list)
+        new_events: List[dict] = []
+        for i in range(len(groups_list)):
+            if not feats.valid[i]:
+                continue
+            is_center, is_down = bool(feats.is_center[i]), bool(feats.is_down[i])
+            self.valid += 1
+            self.center += is_center
+            self.down += is_down
+            self.expr.push(float(feats.expr_signal[i]))
+            self.eye.push(float(feats.eye_open_norm[i]))
+            for detector, active in zip(self.detectors, (not is_center, is_down)):
+                event = detector.push(active, int(t_ms[i]))
+                if event is not None:
+                    new_events.append(event)
+        self.events.extend(new_events)
+        return new_events
+
+    def metrics(self) -> Dict[str, float]:
+        n = self.valid
+        return {
+            "head_center_ratio": self.center / n if n else 0.0,
+            "downward_ratio": self.down / n if n else 0.0,
+            "expression_variability": self.expr.pstdev(),
+            "eye_open_variability": self.eye.pstdev(),
+        }
+
+    def finish(self) -> Tuple[Dict[str, float], List[dict]]:
+        for detector in self.detectors:
+            event = detector.close()
+            if event is not None:
+                self.events.append(event)
+        order = {typ: i for i, (typ, _) in enumerate(EVENT_RULES)}
+        events = sorted(self.events, key=lambda e: (order[e["type"]], e["t_start_ms"]))
+        return self.metrics(), events
+
+
+async def _consume(
+    queue: "asyncio.Queue[Optional[Tuple[int, bytes]]]",
+    stream: AttitudeStream,
+    websocket: WebSocket,
+    stats: Dict[str, int],
+    token: CancelToken,
+) -> None:
+    """큐에 쌓인 프레임을 최대 MAX_BATCH장씩 묶어 추론하고 진행 상황을 보낸다. None을 받으면 종료"""
+    done = False
+    while not done:
+        batch = [await queue.get()]
+        while len(batch) < MAX_BATCH and not queue.empty():
+            batch.append(queue.get_nowait())
+        if None in batch:
+            done = True
+        frames = [item for item in batch if item is not None]
+        if not frames:
+            continue
+        try:
+            groups = await run_in_threadpool(infer_landmark_groups_batch, [img for _, img in frames], token=token)
+        except Exception as e:
+            STREAM_FRAMES.inc(len(frames), result="failed")
+            log_event("attitude.stream", "landmark_failed", level=logging.WARNING, frames=len(frames), error=repr(e))
+            continue
+        # None = 추론 풀이 건너뛴 프레임 (얼굴 인식 실패 {}와 달리 표본에서 뺀다)
+        kept = [(t, g) for (t, _), g in zip(frames, groups) if g is not None]
+        lost = len(frames) - len(kept)
+        if lost:
+            stats["dropped"] += lost
+            STREAM_FRAMES.inc(lost, result="dropped")
+        new_events = stream.add([t for t, _ in kept], [g for _, g in kept]) if kept else []
+        STREAM_FRAMES.inc(len(kept), result="analyzed")
+        await websocket.send_json({
+            "type": "progress",
+            "frames": stream.frames,
+            "valid": stream.valid,
+            "dropped": stats["dropped"],
+            "metrics": stream.metrics(),
+            "events": new_events,
+        })
+
+
+async def serve_attitude_stream(websocket: WebSocket) -> None:
+    await websocket.accept()
+    plan = stream_plan()
+    await websocket.send_json({"type": "plan", **plan})
+    # 캡처 타이머 흔들림을 감안해 반 간격까지는 허용
+    min_gap_ms = plan["analyze_interval_ms"] - STREAM_INTERVAL_MS // 2
+
+    stream = AttitudeStream()
+    stats = {"received": 0, "accepted": 0, "skipped": 0, "dropped": 0}
+    queue: "asyncio.Queue[Optional[Tuple[int, bytes]]]" = asyncio.Queue(maxsize=MAX_PENDING_FRAMES)
+    token = CancelToken()
+    worker = asyncio.create_task(_consume(queue, stream, websocket, stats, token))
+    last_t_ms = -1
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            data = message.get("bytes")
+            if data is not None:
+                stats["received"] += 1
+                if len(data) <= _HEADER.size or len(data) > MAX_FRAME_BYTES + _HEADER.size:
+                    stats["dropped"] += 1
+                    STREAM_FRAMES.inc(result="rejected")
+                    continue
+                (t_ms,) = _HEADER.unpack_from(data)
+                # 순서가 뒤바뀐 프레임은 버린다 (온라인 구간 추적은 시간순이어야 함)
+                if t_ms <= last_t_ms:
+                    stats["dropped"] += 1
+                    STREAM_FRAMES.inc(result="dropped")
+                    continue
+                # 분석 간격 / 프레임 예산 밖 - 샘플링 계획대로 거른 것이므로 dropped와 따로 센다
+                if stats["accepted"] >= plan["max_frames"] or (last_t_ms >= 0 and t_ms - last_t_ms < min_gap_ms):
+                    stats["skipped"] += 1
+                    STREAM_FRAMES.inc(result="skipped")
+                    continue
+                # 추론 적체
+                if queue.full():
+                    stats["dropped"] += 1
+                    STREAM_FRAMES.inc(result="dropped")
+                    continue
+                last_t_ms = t_ms
+                stats["accepted"] += 1
+                queue.put_nowait((t_ms, data[_HEADER.size :]))
+                continue
+            try:
+                control = json.loads(message.get("text") or "{}")
+            except ValueError:
+                continue
+            if isinstance(control, dict) and control.get("type") == "stop":
+                break
+
+        stop_at = time.perf_counter()
+        await queue.put(None)
+        await worker
+        metrics, events = stream.finish()
+        result = build_result(
+            metrics, events, sampled_frames=stream.frames, valid_features=stream.valid, dropped_frames=stats["dropped"]
+        )
+        finalize_sec = time.perf_counter() - stop_at
+        result["debug"].update(skipped_frames=stats["skipped"], finalize_ms=round(finalize_sec * 1000, 2))
+        STREAM_FINALIZE.observe(finalize_sec)
+        log_event(
+            "attitude.turn",
+            "analyze_attitude_stream",
+            received_frames=stats["received"],
+            sampled_frames=stream.frames,
+            valid_features=stream.valid,
+            skipped_frames=stats["skipped"],
+            dropped_frames=stats["dropped"],
+            finalize_ms=round(finalize_sec * 1000, 2),
+            metrics=metrics,
+        )
+        await websocket.send_json({"type": "result", **result})
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if not worker.done():
+            # 버려진 턴: 추론 풀에 남은 프레임을 빼서 다른 면접이 기다리지 않도록
+            token.cancel()
+            worker.cancel()
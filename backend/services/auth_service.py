@@ -8,6 +8,7 @@ Modification History:
 - 2026-02-15 (양창일): 초기 생성 (로그인, JWT 토큰 관리 로직)
 - 2026-02-21 (김지우): 비밀번호 찾기 (이메일 인증, 비밀번호 업데이트) SQLAlchemy 통합
 - 2026-02-22 (양창일): username 혼동으로 email, name으로 정리, 소셜 로그인 수정
+- 2026-10-19: SMTP_HOST / SMTP_PORT / SMTP_STARTTLS 환경변수로 메일 서버 교체 가능 (로컬 스탠드인 등)
 """
 
 import os
@@ -32,6 +33,9 @@ load_dotenv(override=True)
 # 이메일 발송 환경변수
 SENDER_EMAIL = os.getenv("SENDER_EMAIL")
 APP_PASSWORD = os.getenv("APP_PASSWORD")
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() != "false"
 
 
 # ==========================================
@@ -166,8 +170,9 @@ def send_auth_email(receiver_email: str, auth_code: str) -> tuple[bool, str]:
     msg.attach(MIMEText(body, 'html'))
     
     try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
+        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
+        if SMTP_STARTTLS:
+            server.starttls()
         server.login(SENDER_EMAIL, APP_PASSWORD)
         server.sendmail(SENDER_EMAIL, receiver_email, msg.as_string())
         server.quit()
@@ -1,17 +1,37 @@
 """
 Hugging Face Space wrapper for landmark inference.
+HF_LANDMARK_STANDIN_URL is set -> POST {url}/infer (local stand-in, same groups payload).
+LANDMARK_BACKEND=local -> local_landmark_service (OpenCV + ONNX on CPU, whole turn in one batch),
+falls back to the Space per frame if the local engine cannot load.
+All calls run on the process-wide "landmark" inference pool (LANDMARK_POOL_WORKERS / LANDMARK_POOL_MAX_QUEUE);
+frames that miss LANDMARK_DEADLINE_SEC, are rejected by a full queue, are cancelled or fail come back as None
+(not analysed), distinct from {} (analysed, no face found).
 """
 
 import base64
 import ast
 import json
 import os
+import logging
 import tempfile
+from typing import List, Optional, Sequence, Union
 
 from gradio_client import Client, handle_file
 
+from backend.core.http_clients import get_http_client
+from backend.core.inference_pool import CancelToken, DeadlineExceeded, InferencePool, JobCancelled, PoolSaturated, get_pool
+from backend.core.structured_log import emit, log_event, should_log
+
 
 HF_SPACE = "Akjava/mediapipe-68-points-facial-landmark"
+STANDIN_URL = os.getenv("HF_LANDMARK_STANDIN_URL", "").rstrip("/")
+LANDMARK_BACKEND = os.getenv("LANDMARK_BACKEND", "hf").strip().lower()
+POOL_WORKERS = int(os.getenv("LANDMARK_POOL_WORKERS", "5"))
+POOL_MAX_QUEUE = int(os.getenv("LANDMARK_POOL_MAX_QUEUE", "64"))  # 대기 프레임 수 상한 (동시 면접 전체)
+DEADLINE_SEC = float(os.getenv("LANDMARK_DEADLINE_SEC", "15"))
+
+# base64 문자열(JSON 업로드) 또는 JPEG 바이트(멀티파트 업로드)
+FrameImage = Union[str, bytes]
 _CLIENT = None
 
 
@@ -60,14 +80,20 @@ def _normalize_groups_payload(payload) -> dict:
     return {}
 
 
-def infer_landmark_groups(image_b64: str) -> dict:
+def infer_landmark_groups(image: FrameImage) -> dict:
     """
     Space infer signature:
     process_images(image, draw_number, font_scale, text_color, dot_size, dot_color,
                    line_size, line_color, box_size, box_color, json_format, draw_mesh)
     outputs: annotated_image, jsons, download_path
     """
-    image_bytes = base64.b64decode(image_b64)
+    if STANDIN_URL:
+        image_b64 = image if isinstance(image, str) else base64.b64encode(image).decode("ascii")
+        res = get_http_client("landmark").post(f"{STANDIN_URL}/infer", json={"image_b64": image_b64})
+        res.raise_for_status()
+        return _normalize_groups_payload(res.json())
+
+    image_bytes = base64.b64decode(image) if isinstance(image, str) else image
 
     with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
         tmp.write(image_bytes)
@@ -92,20 +118,72 @@ def infer_landmark_groups(image_b64: str) -> dict:
             api_name="/infer",
         )
         normalized = _normalize_groups_payload(jsons)
-        print("[DEBUG][hf_landmark_service] raw_jsons_type:", type(jsons).__name__)
-        if isinstance(jsons, str):
-            print("[DEBUG][hf_landmark_service] raw_jsons_preview:", jsons[:500])
-        print("[DEBUG][hf_landmark_service] normalized_keys:", list(normalized.keys())[:20])
-        if normalized:
-            first_key = next(iter(normalized.keys()))
-            first_value = normalized.get(first_key)
-            print("[DEBUG][hf_landmark_service] first_key:", first_key)
-            print("[DEBUG][hf_landmark_service] first_value_type:", type(first_value).__name__)
-            if isinstance(first_value, list):
-                print("[DEBUG][hf_landmark_service] first_value_len:", len(first_value))
-        else:
-            print("[DEBUG][hf_landmark_service] normalized payload is empty")
+        if should_log("landmark.payload"):
+            first_key = next(iter(normalized.keys()), None)
+            first_value = normalized.get(first_key) if first_key is not None else None
+            emit(
+                "landmark.payload",
+                "infer_landmark_groups",
+                raw_type=type(jsons).__name__,
+                raw_preview=jsons if isinstance(jsons, str) else None,
+                normalized_keys=list(normalized.keys())[:20],
+                first_key=first_key,
+                first_value_type=type(first_value).__name__,
+                first_value_len=len(first_value) if isinstance(first_value, list) else None,
+            )
         return normalized
     finally:
         if os.path.exists(tmp_path):
             os.remove(tmp_path)
+
+
+def get_landmark_pool() -> InferencePool:
+    return get_pool("landmark", workers=POOL_WORKERS, max_queue=POOL_MAX_QUEUE)
+
+
+def _collect(results: list, frames: int) -> List[Optional[dict]]:
+    failed = [r for r in results if isinstance(r, BaseException)]
+    if failed:
+        log_event(
+            "landmark",
+            "frames_skipped",
+            level=logging.WARNING,
+            frames=frames,
+            skipped=len(failed),
+            errors=sorted({type(r).__name__ for r in failed}),
+        )
+    return [r if isinstance(r, dict) else None for r in results]
+
+
+def infer_landmark_groups_batch(
+    images: Sequence[FrameImage],
+    *,
+    token: Optional[CancelToken] = None,
+    deadline_sec: Optional[float] = None,
+) -> List[Optional[dict]]:
+    """
+    Landmark groups for every frame of a turn, in input order.
+    {} when no face was found, None when the frame was not analysed (pool saturated, deadline, cancelled, error)
+    - callers must leave None frames out of the sample instead of counting them as invalid.
+    token: cancel it when the turn is abandoned so its queued frames are dropped.
+    """
+    if not images:
+        return []
+    pool = get_landmark_pool()
+    timeout = DEADLINE_SEC if deadline_sec is None else deadline_sec
+    if LANDMARK_BACKEND == "local":
+        from backend.services.local_landmark_service import infer_landmark_groups_local
+
+        # the local engine batches internally, so the whole turn is one job weighted by its frame count
+        (result,) = pool.run_all(
+            [lambda: infer_landmark_groups_local(images)], timeout=timeout, token=token, weights=[len(images)]
+        )
+        if isinstance(result, list):
+            return result
+        if isinstance(result, (PoolSaturated, DeadlineExceeded, JobCancelled)):
+            # saturated / expired / cancelled: skip the turn's frames rather than piling onto the Space
+            return _collect([result] * len(images), len(images))
+        # engine failed to load (already logged): use the Space instead
+
+    results = pool.run_all([lambda img=img: infer_landmark_groups(img) for img in images], timeout=timeout, token=token)
+    return _collect(results, len(images))
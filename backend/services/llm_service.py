@@ -11,16 +11,45 @@ Modification History:
 - 2026-02-24 (유헌상): 영문 DB 질문을 자연스러운 한국어 구어체로 자동 번역, 할루시네이션 방지 특별 원칙 적용
 - 2026-02-24 (김지우): 4점 이하 시에만 꼬리질문(최대 2회) 허용 통제
 - 2026-02-25 (김지우): 홈 화면 챗봇용 Tavily 웹 검색 연동으로 최신 정보 기반 답변
+- 2026-10-19: 모든 OpenAI 호출을 중앙 LLM 스케줄러(core/llm_scheduler.py) 경유로 변경 (우선순위/레이트리밋/재시도)
+- 2026-10-19: 프롬프트 디버그 print를 샘플링되는 구조화 로그(core/structured_log.py)로 교체
+- 2026-10-19: 가이드봇 스트리밍 응답의 전체 수신 시간 및 토큰 사용량 지표 기록
+- 2026-10-19: 리포트 생성 본체를 generate_evaluation_report로 분리 (백그라운드 작업용, 예외 전파)
+- 2026-10-19: evaluate_and_respond를 strict json_schema 구조화 출력 + TurnEvaluation 단일 검증으로 변경
+- 2026-10-19: OpenAI 클라이언트를 공용 연결 풀 팩토리(core/http_clients.py)에서 가져오도록 변경
+- 2026-10-19: 제공자 장애/서킷 OPEN 시 evaluate_and_respond가 임시 점수 + 저장된 번역으로 즉시 응답 (provisional)
+- 2026-10-19: 로컬 사전 채점(prescore_service)으로 모름/빈 답변은 LLM 호출 없이 템플릿 응답
+- 2026-10-19: 턴 평가 타임아웃을 시도별이 아닌 전체 마감(대기 + 재시도 포함)으로 변경
+- 2026-10-19: evaluate_and_respond에 스케줄러 우선순위 인자 추가 (재채점은 면접 턴보다 뒤로)
 """
 
 import os
 
 import json
+import logging
 import re
-from openai import OpenAI
+import threading
+import time
+from collections import OrderedDict
+from pydantic import ValidationError
+from ai.eval_schema import TurnEvaluation, chat_response_format
+from backend.core import metrics
+from backend.core.http_clients import get_openai_client
+from backend.core.circuit_breaker import CircuitOpenError
+from backend.core.llm_scheduler import Priority, SchedulerTimeout, estimate_tokens, is_retryable, run_llm
+from backend.core.structured_log import emit, log_event, should_log
+from backend.services import prescore_service
 from backend.services.rag_service import get_resume_context_for_question
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
+client = get_openai_client()
+
+# 면접 턴 평가는 프론트 타임아웃(30초)보다 먼저 끝나야 성능 저하 응답이라도 돌려줄 수 있다
+# 시도별 타임아웃이 아니라 스케줄러 대기 + 재시도까지 합친 전체 마감 시간
+EVAL_TURN_TIMEOUT_SEC = float(os.getenv("EVAL_TURN_TIMEOUT_SEC", "20"))
+
+DEGRADED_RESPONSES = metrics.counter(
+    "llm_degraded_responses_total", "LLM 장애로 임시 응답을 돌려준 횟수", ("call_site", "reason")
+)
 
 PERSONA_MAP = {
     "깐깐한 기술팀장": "당신은 10년 경력의 깐깐한 기술팀장입니다. 의심 많고 세부사항을 완벽하게 파고드는 직설적인 스타일입니다.",
@@ -110,6 +139,54 @@ def build_eval_user_prompt(
     "{user_answer_text}"
     """
 
+# ─── 성능 저하(degraded) 응답용 ──────────────────────────────
+# 정상 응답에서 받은 "다음 질문 한국어 번역"을 기억해 두었다가 장애 시 재사용
+_TRANSLATION_CACHE_MAX = 2000
+_translations: "OrderedDict[str, str]" = OrderedDict()
+_translations_lock = threading.Lock()
+
+
+def _remember_translation(source: str | None, translated: str | None) -> None:
+    if not source or not translated:
+        return
+    with _translations_lock:
+        _translations[source] = translated
+        _translations.move_to_end(source)
+        while len(_translations) > _TRANSLATION_CACHE_MAX:
+            _translations.popitem(last=False)
+
+
+def get_stored_translation(source: str | None) -> str | None:
+    if not source:
+        return None
+    with _translations_lock:
+        return _translations.get(source)
+
+
+def provisional_score(question: str, answer: str) -> float:
+    """LLM 없이 매기는 임시 점수 (사전 채점 휴리스틱과 동일, 10점 만점 최대 6점)"""
+    return prescore_service.prescore(question, answer).score
+
+
+def degraded_evaluation(question: str, answer: str, next_main_question: str | None, reason: str) -> dict:
+    """LLM 장애 시 즉시 돌려주는 응답 (꼬리질문 없이 다음 메인 질문으로 진행, 점수는 provisional)"""
+    DEGRADED_RESPONSES.inc(call_site="evaluate_and_respond", reason=reason)
+    score = provisional_score(question, answer)
+    feedback = "현재 AI 평가 서버가 불안정해 임시 점수로 기록했습니다. 연결이 복구되면 자동으로 다시 채점됩니다."
+    if next_main_question:
+        translated = get_stored_translation(next_main_question) or next_main_question
+        reply_text = f"{feedback}\n\n{translated} [NEXT_MAIN]"
+    else:
+        reply_text = f"{feedback}\n\n수고하셨습니다. 준비된 모든 질문이 끝났습니다. [INTERVIEW_END]"
+    return {
+        "score": score,
+        "feedback": feedback,
+        "reply_text": reply_text,
+        "is_followup": False,
+        "provisional": True,
+    }
+
+
 # 메인 평가
 def evaluate_and_respond(
     question: str, 
@@ -121,8 +198,25 @@ def evaluate_and_respond(
     resume_text: str | None,
     next_main_question: str | None,
     followup_count: int,
+    priority: Priority = Priority.INTERACTIVE,
 ) -> dict:
+    # priority: 면접 화면의 턴은 INTERACTIVE, 임시 점수 재채점(rescore_service)은 그보다 낮게
     
+    # 0. 로컬 사전 채점: 결과가 뻔한 답변(빈 STT / 모르겠습니다)은 LLM 없이 바로 응답
+    if prescore_service.ENABLED:
+        pre = prescore_service.prescore(question, answer)
+        if pre.short_circuit:
+            templated = prescore_service.templated_result(
+                pre, next_main_question, get_stored_translation(next_main_question), followup_count
+            )
+            if templated is not None:
+                prescore_service.record_decision(pre)
+                return templated
+            # 다음 질문 번역이 필요해 LLM 경로로 보냄
+            pre.short_circuit, pre.reason = False, "needs_translation"
+        prescore_service.record_decision(pre)
+    turn_started = time.perf_counter()
+
     # 1. RAG 컨텍스트 추출
     rag_context_text = None
     if resume_text:
@@ -149,30 +243,53 @@ def evaluate_and_respond(
         answer,
         rag_context_dict,
     )
-    print("\n[DEBUG][evaluate_and_respond] SYSTEM PROMPT START")
-    print(sys_prompt)
-    print("[DEBUG][evaluate_and_respond] SYSTEM PROMPT END")
-    print("[DEBUG][evaluate_and_respond] USER PROMPT START")
-    print(user_prompt)
-    print("[DEBUG][evaluate_and_respond] USER PROMPT END\n")
+    if should_log("llm.prompt"):
+        emit(
+            "llm.prompt",
+            "evaluate_and_respond.prompt",
+            system_prompt=sys_prompt,
+            user_prompt=user_prompt,
+            followup_count=followup_count,
+        )
     
     if next_main_question:
         user_prompt += f"\n\n[NEXT_MAIN_QUESTION]\n{next_main_question}\n\n[🚨 번역 절대 원칙 🚨]\n위 [NEXT_MAIN_QUESTION]이 영문일 경우, 반드시 실제 한국인 면접관이 말하듯 아주 자연스러운 '한국어 존댓말(구어체)'로 완벽하게 번역해서 next_question_translated 필드에 넣어라. 절대 영어를 그대로 출력하지 마라."
 
-    # 5. LLM 호출 (JSON 강제)
+    # 5. LLM 호출 (strict json_schema 구조화 출력)
     try:
-        response = client.chat.completions.create(
+        messages = [
+            {"role": "system", "content": sys_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        deadline = time.monotonic() + EVAL_TURN_TIMEOUT_SEC
+        response = run_llm(
+            lambda: client.chat.completions.create(
+                model="gpt-4.1-mini",
+                messages=messages,
+                response_format=chat_response_format(TurnEvaluation),
+                temperature=0.2,
+                # 시도마다 남은 시간만큼만 기다린다
+                timeout=max(1.0, deadline - time.monotonic()),
+            ),
             model="gpt-4.1-mini",
-            messages=[
-                {"role": "system", "content": sys_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            response_format={ "type": "json_object" },
-            temperature=0.2,
+            priority=priority,
+            call_site="evaluate_and_respond",
+            est_tokens=estimate_tokens(messages, 900),
+            deadline=deadline,
         )
         
-        raw_json = response.choices[0].message.content.strip()
-        data = json.loads(raw_json)
+        raw_json = (response.choices[0].message.content or "").strip()
+        try:
+            data = TurnEvaluation.model_validate_json(raw_json).model_dump()
+            metrics.LLM_STRUCTURED_OUTPUT.inc(call_site="evaluate_and_respond", outcome="valid")
+        except ValidationError:
+            # 스키마 위반(잘린 응답 등)은 기존처럼 느슨하게 읽고, 읽지 못하면 아래 except로 넘어간다
+            try:
+                data = json.loads(raw_json)
+            except ValueError:
+                metrics.LLM_STRUCTURED_OUTPUT.inc(call_site="evaluate_and_respond", outcome="failed")
+                raise
+            metrics.LLM_STRUCTURED_OUTPUT.inc(call_site="evaluate_and_respond", outcome="salvaged")
         
         # 100점 만점을 우리 시스템 기준인 10점 만점으로 스케일링
         score = float(data.get("score", 50)) / 10.0 
@@ -180,6 +297,7 @@ def evaluate_and_respond(
         follow_up_needed = data.get("follow_up_needed", False)
         follow_up_question = data.get("follow_up_question", "")
         next_q_trans = data.get("next_question_translated", "")
+        _remember_translation(next_main_question, next_q_trans)
 
         # 6. 최종 텍스트 조립
         reply_text = f"{feedback}\n\n"
@@ -197,20 +315,36 @@ def evaluate_and_respond(
             else:
                 reply_text += "수고하셨습니다. 준비된 모든 질문이 끝났습니다. [INTERVIEW_END]"
 
-        return {
+        result = {
             "score": score,
             "feedback": feedback,
             "reply_text": reply_text.strip(),
-            "is_followup": follow_up_needed
+            "is_followup": follow_up_needed,
+            "provisional": False,
         }
-
+        prescore_service.observe_llm_turn(time.perf_counter() - turn_started)
+        return result
+
+    except CircuitOpenError as e:
+        log_event("llm.error", "evaluate_and_respond.degraded", level=logging.WARNING, reason="circuit_open", error=repr(e))
+        return degraded_evaluation(question, answer, next_main_question, "circuit_open")
+    except SchedulerTimeout as e:
+        # 마감 안에 스케줄러 슬롯을 얻지 못함: 오류 대신 임시 점수로 진행
+        log_event("llm.error", "evaluate_and_respond.degraded", level=logging.WARNING, reason="deadline", error=repr(e))
+        return degraded_evaluation(question, answer, next_main_question, "deadline")
     except Exception as e:
-
+        if is_retryable(e):
+            # 타임아웃 / 429 / 5xx 등 제공자 장애: 점수 0 대신 임시 점수로 진행
+            log_event("llm.error", "evaluate_and_respond.degraded", level=logging.WARNING, reason="provider_error", error=repr(e))
+            return degraded_evaluation(question, answer, next_main_question, "provider_error")
+        log_event("llm.error", "evaluate_and_respond.failed", level=logging.WARNING, error=repr(e))
         return {
             "score": 0.0,
             "feedback": "평가 중 오류가 발생했습니다.",
             "reply_text": f"네, 알겠습니다. 다음 질문 드리겠습니다..\n**{next_main_question}** [NEXT_MAIN]" if next_main_question else "[INTERVIEW_END]",
-            "is_followup": False
+            "is_followup": False,
+            "provisional": False,
+            "error": True,
         }
 
 # ─── 레거시 호환성 유지용 (혹시 모를 에러 방지) ──────────────────────────
@@ -233,10 +367,17 @@ def extract_keywords_from_resume(resume_text: str) -> list[str]:
     {resume_text[:1500]}
     """
     try:
-        response = client.chat.completions.create(
+        messages = [{"role": "user", "content": prompt}]
+        response = run_llm(
+            lambda: client.chat.completions.create(
+                model="gpt-4.1-mini",
+                messages=messages,
+                temperature=0.1,
+            ),
             model="gpt-4.1-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.1,
+            priority=Priority.RESUME,
+            call_site="extract_keywords_from_resume",
+            est_tokens=estimate_tokens(messages, 50),
         )
         raw = response.choices[0].message.content.strip()
         keywords = [k.strip() for k in raw.split(",") if k.strip()]
@@ -260,21 +401,29 @@ def extract_keywords_from_text_input(text: str) -> list[str]:
     (예시: Spring Boot, JPA, AWS)
     """
     try:
-        response = client.chat.completions.create(
+        messages = [{"role": "user", "content": prompt}]
+        response = run_llm(
+            lambda: client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                temperature=0.1,
+            ),
             model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.1,
+            priority=Priority.RESUME,
+            call_site="extract_keywords_from_text_input",
+            est_tokens=estimate_tokens(messages, 50),
         )
         raw = response.choices[0].message.content.strip()
         keywords = [k.strip() for k in raw.split(",") if k.strip()]
         return keywords[:3]
     except Exception as e:
-        print(f"[extract_keywords_from_text_input] 에러: {e}")
+        log_event("llm.error", "extract_keywords_from_text_input.failed", level=logging.WARNING, error=repr(e))
         return []
 
 
 # ─── 종합 리포트 생성 (내 기록에 저장됨.) ─────────────────────────────────────────
-def generate_evaluation(messages: list, job_role: str, difficulty: str, resume_text: str | None = None) -> str:
+def generate_evaluation_report(messages: list, job_role: str, difficulty: str, resume_text: str | None = None) -> str:
+    """종합 리포트 생성. 실패 시 예외를 그대로 올린다 (백그라운드 작업에서 실패 상태를 기록하기 위함)"""
     conversation_log = "\n".join([f"[{'면접관' if m['role'] == 'assistant' else '지원자'}] {m['content']}" for m in messages])
     resume_section = f"\n지원자 이력서:\n{resume_text[:800]}\n" if resume_text else ""
 
@@ -305,13 +454,24 @@ def generate_evaluation(messages: list, job_role: str, difficulty: str, resume_t
 
 [면접 대화]
 {conversation_log}"""
-    try:
-        response = client.chat.completions.create(
+    messages = [{"role": "user", "content": eval_prompt}]
+    response = run_llm(
+        lambda: client.chat.completions.create(
             model="gpt-4.1-mini",
-            messages=[{"role": "user", "content": eval_prompt}],
+            messages=messages,
             max_tokens=2000,
-        )
-        return response.choices[0].message.content
+        ),
+        model="gpt-4.1-mini",
+        priority=Priority.REPORT,
+        call_site="generate_evaluation",
+        est_tokens=estimate_tokens(messages, 2000),
+    )
+    return response.choices[0].message.content
+
+
+def generate_evaluation(messages: list, job_role: str, difficulty: str, resume_text: str | None = None) -> str:
+    try:
+        return generate_evaluation_report(messages, job_role, difficulty, resume_text)
     except Exception as e:
         return f"평가 오류: {e}"
 
@@ -343,23 +503,24 @@ def analyze_resume_comprehensive(resume_text: str, job_role: str) -> dict:
 }}
 """
     try:
-        from openai import OpenAI
-        import os
-        import json
-        import re
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
-        
-        response = client.chat.completions.create(
+        messages = [{"role": "user", "content": prompt}]
+        response = run_llm(
+            lambda: client.chat.completions.create(
+                model="gpt-4.1-mini",
+                messages=messages,
+                response_format={ "type": "json_object" },
+                temperature=0.3,
+            ),
             model="gpt-4.1-mini",
-            messages=[{"role": "user", "content": prompt}],
-            response_format={ "type": "json_object" },
-            temperature=0.3,
+            priority=Priority.RESUME,
+            call_site="analyze_resume_comprehensive",
+            est_tokens=estimate_tokens(messages, 800),
         )
         raw_json = response.choices[0].message.content.strip()
         data = json.loads(raw_json)
         return data
     except Exception as e:
-        print(f"이력서 분석 오류: {e}")
+        log_event("llm.error", "analyze_resume_comprehensive.failed", level=logging.WARNING, error=repr(e))
         return {
             "keywords": ["분석 실패"],
             "expected_questions": ["분석 서버에 일시적인 오류가 있습니다."],
@@ -399,13 +560,20 @@ def get_home_guide_response(user_message: str, web_context: str) -> str:
 """.replace("{web_context}", web_context if web_context else "관련 웹 검색 정보 없음.")
 
     try:
-        response = client.chat.completions.create(
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+        response = run_llm(
+            lambda: client.chat.completions.create(
+                model="gpt-4.1-mini",
+                messages=messages,
+                temperature=0.5
+            ),
             model="gpt-4.1-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.5
+            priority=Priority.INTERACTIVE,
+            call_site="get_home_guide_response",
+            est_tokens=estimate_tokens(messages, 800),
         )
         return response.choices[0].message.content
     except Exception as e:
@@ -439,16 +607,23 @@ def get_translated_news_summary(raw_news_data: str) -> str:
 """
 
     try:
-        response = client.chat.completions.create(
+        messages = [
+            {"role": "user", "content": prompt}
+        ]
+        response = run_llm(
+            lambda: client.chat.completions.create(
+                model="gpt-4.1-mini",
+                messages=messages,
+                temperature=0.6
+            ),
             model="gpt-4.1-mini",
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.6
+            priority=Priority.NEWS,
+            call_site="get_translated_news_summary",
+            est_tokens=estimate_tokens(messages, 1500),
         )
         return response.choices[0].message.content
     except Exception as e:
-        print(f"LLM 번역 에러: {e}")
+        log_event("llm.error", "get_translated_news_summary.failed", level=logging.WARNING, error=repr(e))
         return ""
 
         # services/llm_service.py 파일 맨 아래 추가!
@@ -475,19 +650,32 @@ def get_home_guide_response_stream(user_message: str, web_context: str):
 - 트렌드, 동향 등을 물어보면 [웹 검색 정보]를 요약해서 팩트 기반으로 답변하세요.
 """
     try:
-        response = client.chat.completions.create(
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+        # 스트리밍은 연결이 열릴 때까지만 스케줄러 슬롯을 점유한다
+        response = run_llm(
+            lambda: client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                temperature=0.5,
+                stream=True,
+                stream_options={"include_usage": True},
+            ),
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.5,
-            stream=True  
+            priority=Priority.INTERACTIVE,
+            call_site="get_home_guide_response_stream",
+            est_tokens=estimate_tokens(messages, 800),
         )
         
-        for chunk in response:
-            if chunk.choices[0].delta.content is not None:
-                yield chunk.choices[0].delta.content
+        # 스트림 전체 시간은 스케줄러 밖에서 따로 기록 (include_usage → 마지막 청크에 usage, choices는 비어 있음)
+        with metrics.LLM_STREAM_LATENCY.time(call_site="get_home_guide_response_stream"):
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content is not None:
+                    yield chunk.choices[0].delta.content
+                if getattr(chunk, "usage", None) is not None:
+                    metrics.record_llm_usage("get_home_guide_response_stream", "gpt-4o-mini", chunk)
                 
     except Exception as e:
         yield f"죄송합니다. 오류가 발생했습니다. ({e})"
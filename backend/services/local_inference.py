@@ -10,12 +10,16 @@ Modification History:
 - 2026-02-22 (김다빈): 초기 생성 — faster-whisper STT + Qwen3-TTS
 - 2026-02-23 (김다빈): faster-whisper STT 프롬프트 최적화 및 한국어 추론 안정화
 - 2026-02-25 (김다빈): 유료(OpenAI) 폴백 로직 완전 제거 (로컬 전용 전환)
+- 2026-10-19: STT/TTS 실시간 배율(RTF = 처리시간 / 음성 길이) 지표 기록
 """
 
 import os
 import sys
 import io
 import tempfile
+import time
+
+from backend.core import metrics
 
 # 외부 패키지 경로 (macOS SIP 우회용)
 _EXT_PKG_PATH = "/tmp/fw_pkg"
@@ -94,13 +98,19 @@ def local_stt(audio_bytes: bytes, language: str = "ko") -> str:
             tmp.write(audio_bytes)
             tmp.flush()
             tmp.close()
+            started = time.perf_counter()
             segments, info = whisper.transcribe(
                 tmp.name,
                 language=language,
                 beam_size=5,
                 initial_prompt="면접, 자기소개, 프로젝트, 경험, 기술스택, 데이터분석, 머신러닝, 딥러닝, 파이썬, FastAPI, Streamlit, AWS",
             )
+            # segments는 제너레이터라 실제 디코딩은 join 시점에 끝난다
             text = "".join([seg.text for seg in segments])
+            metrics.observe_rtf(
+                metrics.STT_RTF, "faster-whisper", "stt",
+                time.perf_counter() - started, float(getattr(info, "duration", 0.0) or 0.0),
+            )
             return text.strip()
         finally:
             os.unlink(tmp.name)
@@ -122,11 +132,16 @@ def local_tts(text: str, voice: str = "echo") -> bytes:
         try:
             import soundfile as sf
 
+            started = time.perf_counter()
             wavs, sample_rate = qwen_tts.generate_custom_voice(
                 text=text,
                 speaker="Chelsie",
                 language="Korean",
             )
+            metrics.observe_rtf(
+                metrics.TTS_RTF, "qwen3-tts", "tts",
+                time.perf_counter() - started, len(wavs[0]) / float(sample_rate or 1),
+            )
             buf = io.BytesIO()
             sf.write(buf, wavs[0], sample_rate, format="WAV")
             buf.seek(0)
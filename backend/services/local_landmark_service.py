@@ -0,0 +1,247 @@
+"""
+File: local_landmark_service.py
+Created: 2026-10-19
+Description: 로컬 CPU 얼굴 랜드마크 추론 (Hugging Face Space 대체)
+             - 얼굴 검출: OpenCV Haar cascade (opencv-python 동봉 모델), 축소 이미지에서 검출 후 원본 좌표로 환산
+             - 가장 큰 얼굴 ROI를 여백을 두고 정사각형으로 잘라 ONNX 68점 랜드마크 모델에 배치 입력
+               (한 턴의 모든 프레임을 한 번의 session.run으로 처리, 모델 배치 축이 고정이면 프레임별 실행)
+             - 모델 입출력 규약 (PFLD 계열 68점 모델 기준)
+               입력: (N, 3, S, S) float32, RGB, 0~1 스케일 / 출력: (N, 136) 또는 (N, 68, 2), 크롭 기준 0~1 정규화 좌표
+               (출력 값이 픽셀 단위면 입력 크기로 나눠 정규화)
+             - 결과는 Space와 같은 face_recognition 형식 그룹 dict (원본 이미지 픽셀 정수 좌표)
+               → attitude_metrics_service.compute_frame_features가 그대로 사용
+             - 설정: LANDMARK_ONNX_PATH, LANDMARK_INPUT_SIZE(모델 입력이 동적일 때), LANDMARK_DETECT_MAX_SIDE,
+                     LANDMARK_ROI_MARGIN, LANDMARK_INTRA_THREADS
+             - 모델 준비: 저장소에는 모델 파일이 없다. 300-W(iBUG 68점)로 학습한 PFLD / MobileFaceNet 계열
+               랜드마크 모델을 torch.onnx.export로 내보내 LANDMARK_ONNX_PATH(기본 models/face_landmark_68.onnx)에 둔다.
+               모델이 평균/표준편차 정규화나 BGR 입력을 기대하면 그 전처리를 ONNX 그래프 앞단에 넣어 위 입력 규약에 맞추고,
+               배치 축은 동적(dynamic_axes)으로 내보내야 턴 단위 한 번 실행이 된다.
+               규약 확인: python -m pytest -q backend/services/test_local_landmark_service.py
+             - 모델 로드에 실패하면 실패를 기억해 두고 이후 호출은 바로 LocalEngineUnavailable (매번 다시 로드하지 않음)
+               → hf_landmark_service가 Space로 넘어간다
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: 멀티파트 업로드용 JPEG 바이트 입력 허용
+- 2026-10-19: 모델 로드 실패를 캐시 (호출마다 재시도/경고 로그 반복 방지), 모델 준비 방법 문서화
+"""
+
+from __future__ import annotations
+
+import base64
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+
+from backend.core import metrics
+from backend.core.structured_log import log_event
+
+MODEL_PATH = os.getenv("LANDMARK_ONNX_PATH", os.path.join("models", "face_landmark_68.onnx"))
+DEFAULT_INPUT_SIZE = int(os.getenv("LANDMARK_INPUT_SIZE", "112"))
+DETECT_MAX_SIDE = int(os.getenv("LANDMARK_DETECT_MAX_SIDE", "320"))
+ROI_MARGIN = float(os.getenv("LANDMARK_ROI_MARGIN", "0.2"))
+INTRA_THREADS = int(os.getenv("LANDMARK_INTRA_THREADS", "0"))  # 0이면 onnxruntime 기본값
+CASCADE_PATH = os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml")
+
+# 68점 인덱스 → face_recognition.face_landmarks 그룹 (Space 응답과 같은 키/순서)
+GROUP_INDICES: Dict[str, List[int]] = {
+    "chin": list(range(0, 17)),
+    "left_eyebrow": list(range(17, 22)),
+    "right_eyebrow": list(range(22, 27)),
+    "nose_bridge": list(range(27, 31)),
+    "nose_tip": list(range(31, 36)),
+    "left_eye": list(range(36, 42)),
+    "right_eye": list(range(42, 48)),
+    "top_lip": list(range(48, 55)) + [64, 63, 62, 61, 60],
+    "bottom_lip": list(range(54, 60)) + [48, 60, 67, 66, 65, 64],
+}
+
+LANDMARK_BATCH_SECONDS = metrics.histogram(
+    "landmark_local_batch_seconds", "로컬 랜드마크 배치 처리 시간 (검출 + 추론)", ("stage",)
+)
+LANDMARK_FRAMES = metrics.counter("landmark_local_frames_total", "로컬 랜드마크 처리 프레임 수", ("result",))
+
+Box = Tuple[int, int, int, int]  # x0, y0, x1, y1
+
+
+class LocalEngineUnavailable(RuntimeError):
+    """모델/캐스케이드 로드에 실패해 이 프로세스에서는 로컬 추론을 쓸 수 없음"""
+
+
+def decode_image(image: Union[str, bytes]) -> Optional[np.ndarray]:
+    """base64(data URL 접두어 허용) 또는 JPEG 바이트 → BGR 이미지. 디코딩 실패 시 None"""
+    if isinstance(image, str):
+        if "," in image[:64]:
+            image = image.split(",", 1)[1]
+        try:
+            image = base64.b64decode(image)
+        except Exception:
+            return None
+    buf = np.frombuffer(image, dtype=np.uint8)
+    if buf.size == 0:
+        return None
+    return cv2.imdecode(buf, cv2.IMREAD_COLOR)
+
+
+def square_roi(face: Box, width: int, height: int, margin: float = ROI_MARGIN) -> Box:
+    """검출 박스를 여백만큼 넓힌 정사각형으로 만들고 이미지 경계에 맞춘다"""
+    x0, y0, x1, y1 = face
+    side = max(x1 - x0, y1 - y0) * (1.0 + margin)
+    cx, cy = (x0 + x1) / 2.0, (y0 + y1) / 2.0
+    # Haar 박스는 이마 쪽으로 치우쳐 턱이 잘리기 쉬워 중심을 조금 내린다
+    cy += (y1 - y0) * 0.05
+    half = side / 2.0
+    return (
+        max(0, int(round(cx - half))),
+        max(0, int(round(cy - half))),
+        min(width, int(round(cx + half))),
+        min(height, int(round(cy + half))),
+    )
+
+
+def to_groups(points: np.ndarray) -> Dict[str, List[List[int]]]:
+    """(68, 2) 원본 픽셀 좌표 → 그룹 dict (Space와 동일하게 정수 좌표)"""
+    rounded = np.rint(points).astype(int).tolist()
+    return {name: [rounded[i] for i in idx] for name, idx in GROUP_INDICES.items()}
+
+
+class LocalLandmarkEngine:
+    """Haar 얼굴 검출 + ONNX 68점 랜드마크. 프로세스당 하나 (get_local_landmark_engine)"""
+
+    def __init__(self, model_path: str = MODEL_PATH, cascade_path: str = CASCADE_PATH) -> None:
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"랜드마크 ONNX 모델이 없습니다: {model_path} (LANDMARK_ONNX_PATH 확인)")
+        opts = ort.SessionOptions()
+        if INTRA_THREADS > 0:
+            opts.intra_op_num_threads = INTRA_THREADS
+        self._session = ort.InferenceSession(model_path, sess_options=opts, providers=["CPUExecutionProvider"])
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        batch_dim, _, h_dim, w_dim = model_input.shape
+        self.input_size = h_dim if isinstance(h_dim, int) and h_dim == w_dim else DEFAULT_INPUT_SIZE
+        # 배치 축이 고정(1)이면 한 번에 여러 장을 넣을 수 없다
+        self.batched = not isinstance(batch_dim, int) or batch_dim != 1
+        self._cascade_path = cascade_path
+        # CascadeClassifier는 스레드 간 공유가 안전하지 않아 스레드마다 만든다
+        self._local = threading.local()
+        if self._cascade().empty():
+            raise RuntimeError(f"Haar cascade 로드 실패: {cascade_path}")
+        log_event(
+            "landmark",
+            "local_engine.loaded",
+            model=model_path,
+            input_size=self.input_size,
+            batched=self.batched,
+        )
+
+    def _cascade(self) -> "cv2.CascadeClassifier":
+        cascade = getattr(self._local, "cascade", None)
+        if cascade is None:
+            cascade = self._local.cascade = cv2.CascadeClassifier(self._cascade_path)
+        return cascade
+
+    def detect_face(self, image: np.ndarray) -> Optional[Box]:
+        """가장 큰 얼굴 하나 (원본 좌표). 검출은 긴 변 DETECT_MAX_SIDE로 줄인 흑백 이미지에서"""
+        height, width = image.shape[:2]
+        scale = min(1.0, DETECT_MAX_SIDE / float(max(height, width)))
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if scale < 1.0:
+            gray = cv2.resize(gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+        gray = cv2.equalizeHist(gray)
+        min_side = max(24, int(min(gray.shape[:2]) * 0.15))
+        faces = self._cascade().detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(min_side, min_side))
+        if len(faces) == 0:
+            return None
+        x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+        return (int(x / scale), int(y / scale), int((x + w) / scale), int((y + h) / scale))
+
+    def _crop(self, image: np.ndarray, roi: Box) -> np.ndarray:
+        x0, y0, x1, y1 = roi
+        crop = cv2.resize(image[y0:y1, x0:x1], (self.input_size, self.input_size), interpolation=cv2.INTER_LINEAR)
+        crop = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0
+        return crop.transpose(2, 0, 1)
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        if self.batched:
+            outputs = [self._session.run(None, {self._input_name: batch})[0]]
+        else:
+            outputs = [self._session.run(None, {self._input_name: batch[i : i + 1]})[0] for i in range(len(batch))]
+        points = np.concatenate([o.reshape(o.shape[0], -1)[:, :136] for o in outputs]).reshape(-1, 68, 2)
+        if float(np.abs(points).max(initial=0.0)) > 2.0:
+            points = points / float(self.input_size)
+        return points
+
+    def infer_batch(self, images: Sequence[Union[str, bytes]]) -> List[dict]:
+        """프레임 목록(base64 또는 바이트) → 그룹 dict 목록 (입력 순서 유지). 얼굴을 못 찾은 프레임은 {}"""
+        results: List[dict] = [{} for _ in images]
+        crops, rois, slots = [], [], []
+
+        started = time.perf_counter()
+        for i, raw in enumerate(images):
+            image = decode_image(raw)
+            if image is None:
+                LANDMARK_FRAMES.inc(result="decode_error")
+                continue
+            face = self.detect_face(image)
+            if face is None:
+                LANDMARK_FRAMES.inc(result="no_face")
+                continue
+            roi = square_roi(face, image.shape[1], image.shape[0])
+            if roi[2] - roi[0] < 2 or roi[3] - roi[1] < 2:
+                LANDMARK_FRAMES.inc(result="no_face")
+                continue
+            crops.append(self._crop(image, roi))
+            rois.append(roi)
+            slots.append(i)
+        LANDMARK_BATCH_SECONDS.observe(time.perf_counter() - started, stage="detect")
+        if not crops:
+            return results
+
+        started = time.perf_counter()
+        points = self._run(np.stack(crops))
+        LANDMARK_BATCH_SECONDS.observe(time.perf_counter() - started, stage="landmark")
+
+        for slot, roi, pts in zip(slots, rois, points):
+            x0, y0, x1, y1 = roi
+            scaled = pts * np.array([x1 - x0, y1 - y0], dtype=np.float32) + np.array([x0, y0], dtype=np.float32)
+            results[slot] = to_groups(scaled)
+            LANDMARK_FRAMES.inc(result="face")
+        return results
+
+
+_engine: Optional[LocalLandmarkEngine] = None
+_engine_error: Optional[str] = None
+_engine_lock = threading.Lock()
+
+
+def get_local_landmark_engine() -> LocalLandmarkEngine:
+    """로드 실패는 한 번만 기록하고 이후에는 다시 로드하지 않고 LocalEngineUnavailable"""
+    global _engine, _engine_error
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                if _engine_error is not None:
+                    raise LocalEngineUnavailable(_engine_error)
+                try:
+                    _engine = LocalLandmarkEngine(MODEL_PATH)
+                except Exception as e:
+                    _engine_error = repr(e)
+                    log_event("landmark", "local_engine.unavailable", level=logging.ERROR, model=MODEL_PATH, error=_engine_error)
+                    raise LocalEngineUnavailable(_engine_error) from e
+    return _engine
+
+
+def infer_landmark_groups_local(images: Sequence[Union[str, bytes]]) -> List[dict]:
+    try:
+        return get_local_landmark_engine().infer_batch(images)
+    except LocalEngineUnavailable:
+        raise
+    except Exception as e:
+        log_event("landmark", "local_engine.failed", level=logging.WARNING, frames=len(images), error=repr(e))
+        raise
@@ -0,0 +1,249 @@
+"""
+File: prescore_service.py
+Created: 2026-10-19
+Description: LLM 평가 전 로컬 사전 채점 (evaluate_and_respond 앞단)
+             - "모르겠습니다" 류 / 거의 빈 STT 결과처럼 결과가 뻔한 답변은 LLM 없이 즉시 템플릿 응답
+             - 판단 근거: 답변 길이, 모름 패턴, question_pool.keywords / reference_answer와의 키워드 겹침
+             - 질문별 키워드 토큰 집합은 질문 풀 캐시(question_pool_cache)의 행으로 미리 계산 (질문 본문 → frozenset)
+               캐시가 다시 읽히면(TTL / 관리자 갱신) 다음 조회 때 색인도 다시 만든다 → DB 로드와 갱신 주기는 캐시 하나
+             - 단락(short-circuit) 비율과 절약한 LLM 시간을 지표로 기록
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: 키워드 색인을 별도 DB 조회 대신 질문 풀 캐시의 행으로 생성
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from backend.core import metrics
+from backend.core.structured_log import log_event
+
+ENABLED = os.getenv("PRESCORE_ENABLED", "1") == "1"
+
+# 이 길이 이하(공백 제외)의 답변은 내용과 관계없이 단락 대상
+MIN_ANSWER_CHARS = 4
+# 모름 패턴이 있어도 답변이 이보다 길면 내용이 섞여 있을 수 있으므로 LLM에 맡긴다
+DONT_KNOW_MAX_CHARS = 40
+
+_DONT_KNOW_PATTERNS = [
+    re.compile(p)
+    for p in (
+        r"모르겠",
+        r"모릅니다",
+        r"잘\s*몰라",
+        r"모르는\s*(내용|부분|질문)",
+        r"기억이\s*(안|나지)",
+        r"생각이\s*(안|나지)",
+        r"들어\s*본\s*적(이|은)?\s*없",
+        r"공부(를|는)?\s*(안|못)\s*했",
+        r"^\s*(패스|pass|skip|다음\s*질문)",
+        r"(i\s*don'?t\s*know|no\s*idea|not\s*sure)",
+    )
+]
+# "A는 모르겠지만 B는..." 처럼 모름 뒤에 내용이 이어지는 경우는 LLM에 맡긴다
+_CONTINUATION_PATTERN = re.compile(r"(지만|는데|그래도|하지만|다만|대신)")
+# STT가 잡음만 받아 적은 경우 (음, 어, 그... 등)
+_FILLER_PATTERN = re.compile(r"^[\s음어아에그저네예.,!?~…-]*$")
+_TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#.]*|[가-힣]{2,}")
+# 한국어 토큰 끝의 흔한 조사를 떼어 겹침 비교가 덜 민감하도록
+_JOSA_SUFFIX = re.compile(r"(은|는|이|가|을|를|의|에|에서|으로|로|와|과|도|만)$")
+
+PRESCORE_DECISIONS = metrics.counter(
+    "prescore_decisions_total", "사전 채점 결정 (decision=short_circuit|llm)", ("decision", "reason")
+)
+PRESCORE_SECONDS_SAVED = metrics.counter(
+    "prescore_llm_seconds_saved_total", "단락으로 생략한 LLM 평가 시간 추정 (최근 평균 지연 기준)"
+)
+PRESCORE_LATENCY = metrics.histogram(
+    "prescore_duration_seconds", "사전 채점 자체 소요 시간", buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+)
+
+
+def tokenize(text: str) -> FrozenSet[str]:
+    tokens = set()
+    for tok in _TOKEN_PATTERN.findall((text or "").lower()):
+        if tok[0] >= "가":
+            tok = _JOSA_SUFFIX.sub("", tok) if len(tok) > 2 else tok
+        tokens.add(tok)
+    return frozenset(tokens)
+
+
+def _normalize_question(text: str) -> str:
+    return " ".join((text or "").split()).lower()
+
+
+# ─── 질문별 키워드 토큰 (질문 풀 캐시에서 미리 계산) ─────────────
+_index_lock = threading.Lock()
+_keyword_index: Optional[Dict[str, FrozenSet[str]]] = None
+# 색인을 만든 캐시 세대. None이면 reload_keyword_index(index)로 직접 지정된 색인 (캐시를 보지 않음)
+_index_generation: Optional[int] = -1
+
+
+def build_keyword_index(rows: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> Dict[str, FrozenSet[str]]:
+    """(content, keywords, reference_answer) 행들 → 질문 본문별 토큰 집합"""
+    index: Dict[str, FrozenSet[str]] = {}
+    for content, keywords, reference_answer in rows:
+        kw = tokenize((keywords or "").replace(",", " "))
+        index[_normalize_question(content)] = kw | tokenize(reference_answer or "")
+    return index
+
+
+def _current_index() -> Dict[str, FrozenSet[str]]:
+    """캐시 세대가 바뀌었으면 색인을 다시 만든다. 캐시를 읽지 못하면 마지막 색인(없으면 빈 색인)"""
+    global _keyword_index, _index_generation
+    if _index_generation is None:
+        return _keyword_index or {}
+    # question_pool_cache가 이 모듈의 tokenize를 쓰므로 호출 시점에 import
+    from backend.services.question_pool_cache import get_question_pool_cache
+
+    try:
+        rows, generation = get_question_pool_cache().rows_with_generation()
+    except Exception as e:
+        log_event("prescore", "keyword_index.load_failed", level=logging.WARNING, error=repr(e))
+        return _keyword_index or {}
+    if generation != _index_generation:
+        with _index_lock:
+            if generation != _index_generation:
+                _keyword_index = build_keyword_index(
+                    (r.get("question"), r.get("keywords"), r.get("reference_answer")) for r in rows
+                )
+                _index_generation = generation
+    return _keyword_index or {}
+
+
+def keyword_tokens(question: str) -> FrozenSet[str]:
+    """질문 풀에 있는 질문이면 keywords + reference_answer 토큰, 없으면 질문 본문 토큰"""
+    found = _current_index().get(_normalize_question(question))
+    return found if found else tokenize(question)
+
+
+def reload_keyword_index(index: Optional[Dict[str, FrozenSet[str]]] = None) -> int:
+    """
+    질문 풀이 바뀐 뒤 호출 (관리자 갱신 등) - 질문 풀 캐시의 현재 행으로 즉시 다시 만든다.
+    index를 주면 캐시 대신 그 값을 고정해서 사용 (벤치마크/테스트용)
+    """
+    global _keyword_index, _index_generation
+    with _index_lock:
+        _keyword_index = index
+        _index_generation = None if index is not None else -1
+    return len(_current_index())
+
+
+# ─── 사전 채점 ────────────────────────────────────────────────
+@dataclass
+class PreScore:
+    short_circuit: bool
+    reason: str          # empty / filler / dont_know / ok
+    score: float         # 10점 만점 휴리스틱 점수
+    overlap: float       # 질문 키워드 중 답변에 나온 비율 (0~1)
+
+
+def heuristic_score(answer: str, overlap: float) -> float:
+    """LLM 없이 매기는 점수 (10점 만점, 최대 6점). 길이 + 키워드 겹침"""
+    length = len((answer or "").strip())
+    score = 2.0 if length < 30 else 3.0 if length < 100 else 4.0 if length < 300 else 4.5
+    return round(min(score + 1.5 * overlap, 6.0), 1)
+
+
+def prescore(question: str, answer: str) -> PreScore:
+    started = time.perf_counter()
+    try:
+        text = (answer or "").strip()
+        compact = "".join(text.split())
+        if len(compact) <= MIN_ANSWER_CHARS:
+            return PreScore(True, "empty", 0.0, 0.0)
+        if _FILLER_PATTERN.match(text):
+            return PreScore(True, "filler", 0.0, 0.0)
+
+        answer_tokens = tokenize(text)
+        q_tokens = keyword_tokens(question)
+        overlap = len(q_tokens & answer_tokens) / len(q_tokens) if q_tokens else 0.0
+
+        lowered = text.lower()
+        if (
+            len(text) <= DONT_KNOW_MAX_CHARS
+            and any(p.search(lowered) for p in _DONT_KNOW_PATTERNS)
+            and not _CONTINUATION_PATTERN.search(text)
+            and not (q_tokens & answer_tokens)
+        ):
+            return PreScore(True, "dont_know", 0.0, 0.0)
+        return PreScore(False, "ok", heuristic_score(text, overlap), overlap)
+    finally:
+        PRESCORE_LATENCY.observe(time.perf_counter() - started)
+
+
+# 최근 LLM 평가 지연의 지수 이동 평균 (절약 시간 추정용)
+_ewma_lock = threading.Lock()
+_llm_turn_ewma: Optional[float] = None
+
+
+def observe_llm_turn(seconds: float) -> None:
+    global _llm_turn_ewma
+    with _ewma_lock:
+        _llm_turn_ewma = seconds if _llm_turn_ewma is None else 0.9 * _llm_turn_ewma + 0.1 * seconds
+
+
+def record_decision(pre: PreScore) -> None:
+    if pre.short_circuit:
+        PRESCORE_DECISIONS.inc(decision="short_circuit", reason=pre.reason)
+        with _ewma_lock:
+            saved = _llm_turn_ewma
+        if saved:
+            PRESCORE_SECONDS_SAVED.inc(saved)
+    else:
+        PRESCORE_DECISIONS.inc(decision="llm", reason=pre.reason)
+
+
+_FEEDBACK = {
+    "empty": "답변이 거의 인식되지 않았습니다. 마이크 상태를 확인하고 핵심 내용을 한두 문장으로 말씀해 주세요.",
+    "filler": "답변이 거의 인식되지 않았습니다. 마이크 상태를 확인하고 핵심 내용을 한두 문장으로 말씀해 주세요.",
+    "dont_know": "모르는 부분을 솔직하게 말씀해 주신 점은 좋습니다. 다만 관련된 개념이나 경험을 조금이라도 연결해 보려는 시도가 있으면 더 좋습니다.",
+}
+_FOLLOW_UP = {
+    "empty": "방금 질문에 대해 떠오르는 핵심 키워드 하나만이라도 말씀해 주시겠어요?",
+    "filler": "방금 질문에 대해 떠오르는 핵심 키워드 하나만이라도 말씀해 주시겠어요?",
+    "dont_know": "괜찮습니다. 이 질문과 관련해 직접 써 보셨거나 들어 보신 기술이 있다면 그 경험을 간단히 말씀해 주시겠어요?",
+}
+
+
+def templated_result(
+    pre: PreScore,
+    next_main_question: Optional[str],
+    translated_next: Optional[str],
+    followup_count: int,
+) -> Optional[dict]:
+    """
+    evaluate_and_respond와 같은 형태의 결과. LLM의 통제 규칙(40점 이하 + 누적 2회 미만이면 꼬리질문)을 그대로 따른다.
+    다음 질문이 번역이 필요한데 저장된 번역이 없으면 None (LLM 경로로 보낸다).
+    """
+    feedback = _FEEDBACK.get(pre.reason, _FEEDBACK["dont_know"])
+    if followup_count < 2:
+        follow_up = _FOLLOW_UP.get(pre.reason, _FOLLOW_UP["dont_know"])
+        reply_text = f"{feedback}\n\n✦ 추가 질문을 드리겠습니다. {follow_up}"
+        is_followup = True
+    elif next_main_question:
+        if translated_next is None and re.search(r"[A-Za-z]{3,}", next_main_question) and not re.search(
+            r"[가-힣]", next_main_question
+        ):
+            return None
+        reply_text = f"{feedback}\n\n{translated_next or next_main_question} [NEXT_MAIN]"
+        is_followup = False
+    else:
+        reply_text = f"{feedback}\n\n수고하셨습니다. 준비된 모든 질문이 끝났습니다. [INTERVIEW_END]"
+        is_followup = False
+    return {
+        "score": pre.score,
+        "feedback": feedback,
+        "reply_text": reply_text,
+        "is_followup": is_followup,
+        "provisional": False,
+        "prescored": True,
+    }
@@ -0,0 +1,258 @@
+"""
+File: question_pool_cache.py
+Created: 2026-10-19
+Description: question_pool (+ job_categories) 프로세스 메모리 캐시
+             - ORDER BY RAND()는 후보 행 전체를 읽고 정렬하므로, 질문 풀 전체를 한 번 읽어
+               (target_role, difficulty, question_type)별로 묶어 두고 메모리에서 비복원 무작위 추출
+             - QUESTION_POOL_CACHE_TTL_SEC(기본 600초)가 지나면 다음 조회 때 백그라운드로 다시 읽는다 (그동안은 기존 캐시 사용)
+             - 관리자 갱신: POST /api/admin/question-pool/refresh
+             - 질문 풀이 바뀌었을 때만 DB를 읽으므로 요청당 DB 왕복이 없다
+             - 이력서 키워드 검색: keywords / skill_tag / 질문 본문 토큰 → 질문 역색인 ((직무, 난이도)별).
+               일치한 키워드 수로 순위를 매기고 부족분은 같은 묶음의 기술 질문으로 채움 (LIKE 체인 + 두 번째 RAND 질의 대체)
+             - 사전 채점(prescore_service) 키워드 색인도 이 캐시의 행으로 만든다 (generation이 바뀌면 다시 계산)
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: 이력서 키워드 역색인(search_by_keywords) 추가
+- 2026-10-19: search_by_keywords가 갱신 도중 서로 다른 세대의 색인을 섞어 읽던 문제 수정
+- 2026-10-19: reference_answer 로드 + rows_with_generation 공개 (사전 채점 색인이 별도로 DB를 읽지 않도록)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from backend.core import metrics
+from backend.core.structured_log import log_event
+from backend.services.prescore_service import tokenize
+
+CACHE_TTL_SEC = float(os.getenv("QUESTION_POOL_CACHE_TTL_SEC", "600"))
+COMMON_TYPES = ("인성", "공통")
+DEFAULT_FIELDS = ("id", "question", "question_type", "difficulty")
+
+_LOAD_SQL = """
+    SELECT qp.id, qp.content AS question, qp.question_type, qp.difficulty,
+           qp.skill_tag, qp.keywords, qp.reference_answer, jc.target_role
+    FROM question_pool qp
+    LEFT JOIN job_categories jc ON qp.category_id = jc.id
+"""
+
+QUESTION_POOL_ROWS = metrics.gauge("question_pool_cache_rows", "캐시에 올라와 있는 질문 수")
+QUESTION_POOL_REFRESH = metrics.histogram(
+    "question_pool_cache_refresh_seconds", "질문 풀 전체 로드 시간", buckets=(0.01, 0.05, 0.1, 0.5, 1, 5)
+)
+QUESTION_POOL_SAMPLES = metrics.counter("question_pool_cache_samples_total", "캐시에서 뽑은 질문 요청 수", ("kind",))
+
+
+def _load_from_db() -> List[dict]:
+    from backend.db.database import get_connection
+
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(_LOAD_SQL)
+            return list(cur.fetchall())
+
+
+def normalize_terms(text: str) -> FrozenSet[str]:
+    """키워드/본문 → 정규화 토큰. "react.js" 같은 토큰은 "react"로도 찾을 수 있게 점 앞부분을 함께 넣는다"""
+    terms = set()
+    for tok in tokenize(text):
+        terms.add(tok)
+        head = tok.split(".", 1)[0]
+        if head and head != tok:
+            terms.add(head)
+    return frozenset(terms)
+
+
+def question_terms(row: dict) -> FrozenSet[str]:
+    text = " ".join(
+        ((row.get("keywords") or "").replace(",", " "), row.get("skill_tag") or "", row.get("question") or "")
+    )
+    return normalize_terms(text)
+
+
+class QuestionPoolCache:
+    """
+    질문 행은 dict 하나를 여러 묶음이 공유한다. 호출 측에는 필요한 키만 복사해 돌려주므로 캐시가 변하지 않는다.
+    loader는 [{id, question, question_type, difficulty, skill_tag, keywords, reference_answer, target_role}] 를 돌려주는 함수.
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[dict]] = _load_from_db, ttl_sec: float = CACHE_TTL_SEC):
+        self._loader = loader
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="question-pool-refresh")
+        self.loaded_at = 0.0
+        self.generation = 0  # refresh()마다 1씩 증가 (파생 색인 재계산 기준)
+        self.rows: List[dict] = []
+        self._by_key: Dict[Tuple[str, str, str], List[dict]] = {}
+        self._by_role_difficulty: Dict[Tuple[str, str], List[dict]] = {}
+        self._common: List[dict] = []
+        # (직무, 난이도) -> 정규화 키워드 -> _by_role_difficulty 목록 내 위치
+        self._keyword_index: Dict[Tuple[str, str], Dict[str, List[int]]] = {}
+
+    # ─── 로드 ───────────────────────────────────────────
+    def refresh(self) -> int:
+        """DB에서 다시 읽어 묶음을 새로 만든 뒤 한 번에 교체. 읽은 행 수 반환"""
+        started = time.perf_counter()
+        rows = [dict(r) for r in self._loader()]
+        by_key: Dict[Tuple[str, str, str], List[dict]] = {}
+        by_role_difficulty: Dict[Tuple[str, str], List[dict]] = {}
+        common: List[dict] = []
+        keyword_index: Dict[Tuple[str, str], Dict[str, List[int]]] = {}
+        for r in rows:
+            role, difficulty, q_type = r.get("target_role") or "", r.get("difficulty") or "", r.get("question_type") or ""
+            by_key.setdefault((role, difficulty, q_type), []).append(r)
+            group = by_role_difficulty.setdefault((role, difficulty), [])
+            postings = keyword_index.setdefault((role, difficulty), {})
+            for term in question_terms(r):
+                postings.setdefault(term, []).append(len(group))
+            group.append(r)
+            if q_type in COMMON_TYPES:
+                common.append(r)
+        with self._lock:
+            self.rows = rows
+            self._by_key = by_key
+            self._by_role_difficulty = by_role_difficulty
+            self._common = common
+            self._keyword_index = keyword_index
+            self.generation += 1
+            self.loaded_at = time.monotonic()
+        elapsed = time.perf_counter() - started
+        QUESTION_POOL_REFRESH.observe(elapsed)
+        QUESTION_POOL_ROWS.set(len(rows))
+        log_event("question_pool", "cache.refreshed", rows=len(rows), groups=len(by_key), duration_ms=round(elapsed * 1000, 1))
+        return len(rows)
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            log_event("question_pool", "cache.refresh_failed", level=logging.WARNING, error=repr(e))
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _ensure_fresh(self) -> None:
+        if not self.loaded_at:
+            # 첫 조회는 동기 로드 (동시에 들어온 첫 요청들이 각자 DB를 읽지 않도록)
+            with self._load_lock:
+                if not self.loaded_at:
+                    self.refresh()
+            return
+        if self.ttl_sec > 0 and time.monotonic() - self.loaded_at >= self.ttl_sec:
+            with self._lock:
+                if self._refreshing:
+                    return
+                self._refreshing = True
+            self._executor.submit(self._background_refresh)
+
+    # ─── 추출 ───────────────────────────────────────────
+    @staticmethod
+    def _sample(candidates: List[dict], limit: int, fields: Sequence[str], rng: Optional[random.Random]) -> List[dict]:
+        if limit <= 0 or not candidates:
+            return []
+        picked = (rng or random).sample(candidates, min(limit, len(candidates)))
+        return [{k: r.get(k) for k in fields} for r in picked]
+
+    def sample(
+        self,
+        target_role: str,
+        difficulty: str,
+        question_type: Optional[str] = None,
+        limit: int = 1,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        rng: Optional[random.Random] = None,
+    ) -> List[dict]:
+        """해당 직무/난이도(/유형) 질문을 중복 없이 최대 limit개 무작위 추출"""
+        self._ensure_fresh()
+        if question_type is None:
+            group = self._by_role_difficulty.get((target_role, difficulty), [])
+        else:
+            group = self._by_key.get((target_role, difficulty, question_type), [])
+        QUESTION_POOL_SAMPLES.inc(kind="role")
+        return self._sample(group, limit, fields, rng)
+
+    def sample_common(
+        self, limit: int = 1, fields: Sequence[str] = ("id", "question"), rng: Optional[random.Random] = None
+    ) -> List[dict]:
+        """인성/공통 질문 무작위 추출"""
+        self._ensure_fresh()
+        QUESTION_POOL_SAMPLES.inc(kind="common")
+        return self._sample(self._common, limit, fields, rng)
+
+    def search_by_keywords(
+        self,
+        target_role: str,
+        difficulty: str,
+        keywords: Sequence[str],
+        limit: int = 3,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        rng: Optional[random.Random] = None,
+    ) -> List[dict]:
+        """
+        이력서 키워드와 가장 많이 겹치는 질문 최대 limit개 (동점은 무작위).
+        키워드 하나는 그 토큰이 모두 들어 있는 질문과 일치한 것으로 본다 ("Spring Boot" → spring, boot).
+        일치 질문이 모자라면 같은 직무/난이도의 기술 질문에서 무작위로 채운다.
+        """
+        self._ensure_fresh()
+        rng = rng or random
+        # refresh()가 세 색인을 함께 교체하므로 같은 세대의 참조를 한 번에 잡는다 (위치 → 행 대응이 세대마다 다름)
+        with self._lock:
+            group = self._by_role_difficulty.get((target_role, difficulty), [])
+            postings = self._keyword_index.get((target_role, difficulty), {})
+            tech = self._by_key.get((target_role, difficulty, "기술"), [])
+        counts: Dict[int, int] = {}
+        for kw in dict.fromkeys(k.strip().lower() for k in keywords if k and k.strip()):
+            terms = normalize_terms(kw)
+            lists = sorted((postings.get(t, ()) for t in terms), key=len)
+            if not lists or not lists[0]:
+                continue
+            matched = set(lists[0]).intersection(*lists[1:]) if len(lists) > 1 else lists[0]
+            for pos in matched:
+                counts[pos] = counts.get(pos, 0) + 1
+        QUESTION_POOL_SAMPLES.inc(kind="keywords")
+
+        top = heapq.nlargest(limit, counts, key=lambda pos: (counts[pos], rng.random())) if limit > 0 else []
+        picked = [group[pos] for pos in top]
+        if len(picked) < limit:
+            chosen = {id(r) for r in picked}
+            rest = [r for r in tech if id(r) not in chosen]
+            picked.extend(rng.sample(rest, min(limit - len(picked), len(rest))))
+        return [{k: r.get(k) for k in fields} for r in picked]
+
+    def rows_with_generation(self) -> Tuple[List[dict], int]:
+        """전체 행과 그 세대 번호 (행 dict는 읽기 전용으로 다룰 것)"""
+        self._ensure_fresh()
+        with self._lock:
+            return self.rows, self.generation
+
+    def stats(self) -> dict:
+        return {
+            "rows": len(self.rows),
+            "groups": len(self._by_key),
+            "common": len(self._common),
+            "age_sec": round(time.monotonic() - self.loaded_at, 1) if self.loaded_at else None,
+            "ttl_sec": self.ttl_sec,
+        }
+
+_cache: Optional[QuestionPoolCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_question_pool_cache() -> QuestionPoolCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = QuestionPoolCache()
+    return _cache
@@ -3,6 +3,11 @@ File: services/rag_service.py
 Description: ChromaDB 기반 RAG 서비스
              - 이력서 텍스트 → 청크 분할 → 임베딩 → ChromaDB 저장
              - 면접 중 질문 주제와 유사한 이력서 청크 검색
+
+Modification History:
+- 2026-10-19: 임베딩 호출 / ChromaDB 연산 시간 지표(core/metrics.py) 기록
+- 2026-10-19: OPENAI_BASE_URL이 있으면 임베딩도 해당 엔드포인트(로컬 스탠드인 등)로 호출
+- 2026-10-19: 임베딩 호출을 "embedding" 서킷 브레이커로 감쌈 (장애 시 검색은 빈 결과로 즉시 반환)
 """
 
 import os
@@ -11,18 +16,39 @@ from typing import Optional
 import chromadb
 from chromadb.utils import embedding_functions
 
+from backend.core import metrics
+from backend.core.circuit_breaker import get_breaker
+from backend.core.llm_scheduler import is_retryable
+
 
 
 # ─── ChromaDB 클라이언트 초기화 ───────────────────────────────
 _CHROMA_PATH = os.getenv("CHROMA_PATH", "./backend/chroma_db")
 _COLLECTION_NAME = "resumes"
 
+_EMBED_MODEL = "text-embedding-3-small"
+
+
+class _TimedOpenAIEmbeddingFunction(embedding_functions.OpenAIEmbeddingFunction):
+    """임베딩 호출 시간과 문서 수를 지표로 남기는 래퍼 (서킷 브레이커 경유)"""
+
+    def __call__(self, input):
+        with metrics.EMBEDDING_LATENCY.time(model=_EMBED_MODEL):
+            result = get_breaker("embedding").call(
+                lambda: super(_TimedOpenAIEmbeddingFunction, self).__call__(input),
+                is_failure=is_retryable,
+            )
+        metrics.EMBEDDING_INPUTS.inc(len(input), model=_EMBED_MODEL)
+        return result
+
+
 # OpenAI 임베딩 함수 (text-embedding-3-small 사용, 저렴 + 충분한 품질)
 def _get_embed_fn():
     api_key = os.getenv("OPENAI_API_KEY", "")
-    return embedding_functions.OpenAIEmbeddingFunction(
+    return _TimedOpenAIEmbeddingFunction(
         api_key=api_key,
-        model_name="text-embedding-3-small",
+        model_name=_EMBED_MODEL,
+        api_base=os.getenv("OPENAI_BASE_URL") or None,
     )
 
 
@@ -94,9 +120,11 @@ def store_resume(resume_text: str, user_id: str = "anonymous") -> int:
 
     # 기존 이 유저의 청크 삭제
     try:
-        existing = collection.get(where={"user_id": user_id})
+        with metrics.CHROMA_LATENCY.time(operation="get"):
+            existing = collection.get(where={"user_id": user_id})
         if existing["ids"]:
-            collection.delete(ids=existing["ids"])
+            with metrics.CHROMA_LATENCY.time(operation="delete"):
+                collection.delete(ids=existing["ids"])
     except Exception:
         pass
 
@@ -116,7 +144,9 @@ def store_resume(resume_text: str, user_id: str = "anonymous") -> int:
             "total_chunks": len(chunks),
         })
 
-    collection.add(ids=ids, documents=documents, metadatas=metadatas)
+    # add 시간에는 임베딩 시간이 포함된다 (embedding_duration_seconds와 함께 비교)
+    with metrics.CHROMA_LATENCY.time(operation="add"):
+        collection.add(ids=ids, documents=documents, metadatas=metadatas)
     return len(chunks)
 
 
@@ -132,11 +162,12 @@ def retrieve_relevant_chunks(
     """
     try:
         collection = _get_collection()
-        results = collection.query(
-            query_texts=[query],
-            n_results=n_results,
-            where={"user_id": user_id},
-        )
+        with metrics.CHROMA_LATENCY.time(operation="query"):
+            results = collection.query(
+                query_texts=[query],
+                n_results=n_results,
+                where={"user_id": user_id},
+            )
         docs = results.get("documents", [[]])[0]
         return [d for d in docs if d]
     except Exception:
@@ -231,11 +262,12 @@ class AIServiceFacade:
             text = f"[{role}] {content}"
             if len(text.strip()) > 10:
                 chunk_hash = hashlib.md5(f"{session_id}_{time.time()}_{text[:50]}".encode()).hexdigest()[:12]
-                collection.add(
-                    ids=[f"log_{session_id}_{chunk_hash}"],
-                    documents=[text],
-                    metadatas=[{"user_id": session_id, "type": "interview_log"}]
-                )
+                with metrics.CHROMA_LATENCY.time(operation="add"):
+                    collection.add(
+                        ids=[f"log_{session_id}_{chunk_hash}"],
+                        documents=[text],
+                        metadatas=[{"user_id": session_id, "type": "interview_log"}]
+                    )
         except Exception:
             pass
 
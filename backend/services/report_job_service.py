@@ -0,0 +1,292 @@
+"""
+File: report_job_service.py
+Created: 2026-10-19
+Description: 면접 종료 리포트(generate_evaluation) 백그라운드 작업
+             - 세션당 1건 (interview_reports.session_id UNIQUE) → 중복 요청은 기존 작업을 그대로 돌려준다
+             - PENDING → RUNNING → DONE / FAILED, FAILED는 다시 요청하면 재시도
+             - RUNNING은 워커별 임대(owner, lease_until)로 가져가고 실행 중에는 주기적으로 연장한다
+               → 여러 uvicorn/gunicorn 워커가 같은 작업을 동시에 실행하지 않고,
+                 임대가 끝난(워커가 죽은) RUNNING 작업만 다른 워커가 다시 가져간다
+             - 서버 시작 시 PENDING 작업과 임대가 끝난 RUNNING 작업을 다시 큐에 넣는다
+             - 대화 내용은 요청 본문이 아니라 DB(interview_details)에서 복원하므로 프론트 재실행과 무관
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: 시작 시 RUNNING 작업을 무조건 되돌리던 것을 워커 임대(owner/lease_until) 기반 원자적 선점으로 변경
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
+
+from backend.core import metrics
+from backend.core.structured_log import log_event
+from backend.db.base import InterviewDetail, InterviewReport, InterviewSession, UserResume
+from backend.db.session import SessionLocal
+from backend.services.llm_service import generate_evaluation_report
+
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+FINISHED = (DONE, FAILED)
+
+# 작업 임대: 실행 중에는 LEASE_SEC / 3마다 연장, 연장이 끊기고 LEASE_SEC가 지나면 다른 워커가 가져갈 수 있다
+LEASE_SEC = float(os.getenv("REPORT_JOB_LEASE_SEC", "120"))
+WORKER_ID = f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("REPORT_JOB_WORKERS", "4")), thread_name_prefix="report-job"
+)
+_lock = threading.Lock()
+_inflight: set = set()
+_events: Dict[int, threading.Event] = {}
+
+_JOBS = metrics.counter("report_jobs_total", "면접 리포트 작업 결과", ("outcome",))
+_JOB_LATENCY = metrics.histogram("report_job_duration_seconds", "면접 리포트 작업 처리 시간")
+
+
+def _to_dict(row: InterviewReport) -> dict:
+    return {
+        "session_id": row.session_id,
+        "status": row.status,
+        "total_score": row.total_score,
+        "report_markdown": row.report_markdown if row.status == DONE else None,
+        "error": row.error if row.status == FAILED else None,
+        "attempts": row.attempts,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "finished_at": row.finished_at.isoformat() if row.finished_at else None,
+    }
+
+
+def _event(session_id: int) -> threading.Event:
+    with _lock:
+        ev = _events.get(session_id)
+        if ev is None:
+            ev = threading.Event()
+            _events[session_id] = ev
+        return ev
+
+
+def _lease_deadline() -> datetime:
+    return datetime.now() + timedelta(seconds=LEASE_SEC)
+
+
+def _claimable():
+    """PENDING이거나, RUNNING인데 임대가 끝난(또는 임대 정보가 없는 예전) 작업"""
+    return or_(
+        InterviewReport.status == PENDING,
+        and_(
+            InterviewReport.status == RUNNING,
+            or_(InterviewReport.lease_until.is_(None), InterviewReport.lease_until < datetime.now()),
+        ),
+    )
+
+
+def _submit(session_id: int) -> None:
+    with _lock:
+        if session_id in _inflight:
+            return
+        _inflight.add(session_id)
+    _executor.submit(_run, session_id)
+
+
+def enqueue_report(session_id: int, force: bool = False) -> Optional[dict]:
+    """
+    세션 리포트 작업을 등록하고 현재 상태를 반환 (세션이 없으면 None).
+    이미 진행 중이거나 완료된 작업은 건드리지 않는다. FAILED이거나 force=True면 다시 실행.
+    """
+    session_id = int(session_id)
+    db = SessionLocal()
+    try:
+        if db.query(InterviewSession.id).filter(InterviewSession.id == session_id).first() is None:
+            return None
+
+        row = db.query(InterviewReport).filter(InterviewReport.session_id == session_id).first()
+        if row is None:
+            row = InterviewReport(session_id=session_id, status=PENDING, attempts=0)
+            db.add(row)
+            try:
+                db.commit()
+            except IntegrityError:
+                # 동시에 들어온 다른 요청이 먼저 만들었다
+                db.rollback()
+                row = db.query(InterviewReport).filter(InterviewReport.session_id == session_id).first()
+        elif row.status == FAILED or (force and row.status == DONE):
+            row.status = PENDING
+            row.error = None
+            db.commit()
+        db.refresh(row)
+        result = _to_dict(row)
+        # 실행하던 워커가 죽어 임대가 끝난 작업도 다시 가져간다
+        stale = row.status == RUNNING and (row.lease_until is None or row.lease_until < datetime.now())
+    finally:
+        db.close()
+
+    if result["status"] == PENDING or stale:
+        _submit(session_id)
+    return result
+
+
+def get_report(session_id: int) -> Optional[dict]:
+    db = SessionLocal()
+    try:
+        row = db.query(InterviewReport).filter(InterviewReport.session_id == int(session_id)).first()
+        return _to_dict(row) if row is not None else None
+    finally:
+        db.close()
+
+
+def wait_for_change(session_id: int, timeout: float) -> bool:
+    """작업이 끝나면 True (SSE 엔드포인트에서 폴링 간격 대신 사용)"""
+    return _event(int(session_id)).wait(timeout)
+
+
+def _load_inputs(db, session_id: int) -> tuple[List[dict], str, str, Optional[str], float]:
+    session = db.query(InterviewSession).filter(InterviewSession.id == session_id).first()
+    if session is None:
+        raise LookupError("세션을 찾을 수 없습니다.")
+    details = (
+        db.query(InterviewDetail)
+        .filter(InterviewDetail.session_id == session_id)
+        .order_by(InterviewDetail.turn_index, InterviewDetail.id)
+        .all()
+    )
+    if not details:
+        raise LookupError("면접 기록이 없습니다.")
+
+    messages: List[dict] = []
+    for d in details:
+        if d.question:
+            messages.append({"role": "assistant", "content": d.question})
+        if d.answer:
+            messages.append({"role": "user", "content": d.answer})
+        if d.feedback:
+            messages.append({"role": "assistant", "content": d.feedback})
+
+    resume_text = None
+    if session.resume_used and session.resume_id:
+        resume = db.query(UserResume).filter(UserResume.id == session.resume_id).first()
+        resume_text = resume.resume_text if resume else None
+
+    # 프론트 리포트 모달과 같은 기준 (문항 점수 0~10 평균 × 10)
+    avg = db.query(func.avg(InterviewDetail.score)).filter(InterviewDetail.session_id == session_id).scalar()
+    total_score = round(float(avg or 0.0) * 10, 1)
+    return messages, session.job_role or "", session.difficulty or "", resume_text, total_score
+
+
+def _heartbeat(session_id: int, stop: threading.Event) -> None:
+    """실행 중인 작업의 임대 연장 (자기 소유일 때만)"""
+    while not stop.wait(LEASE_SEC / 3):
+        db = SessionLocal()
+        try:
+            db.query(InterviewReport).filter(
+                InterviewReport.session_id == session_id,
+                InterviewReport.status == RUNNING,
+                InterviewReport.owner == WORKER_ID,
+            ).update({"lease_until": _lease_deadline()}, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            log_event("report.job", "lease_renew.failed", level=logging.WARNING, session_id=session_id, error=repr(e))
+        finally:
+            db.close()
+
+
+def _run(session_id: int) -> None:
+    started = time.perf_counter()
+    outcome = "skipped"
+    stop = threading.Event()
+    db = SessionLocal()
+    try:
+        # 조건부 UPDATE 한 번으로 선점 (다른 워커/프로세스와의 중복 실행 방지)
+        claimed = (
+            db.query(InterviewReport)
+            .filter(InterviewReport.session_id == session_id, _claimable())
+            .update(
+                {
+                    "status": RUNNING,
+                    "owner": WORKER_ID,
+                    "lease_until": _lease_deadline(),
+                    "attempts": InterviewReport.attempts + 1,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if not claimed:
+            return
+        threading.Thread(
+            target=_heartbeat, args=(session_id, stop), name=f"report-lease-{session_id}", daemon=True
+        ).start()
+
+        try:
+            messages, job_role, difficulty, resume_text, total_score = _load_inputs(db, session_id)
+            report = generate_evaluation_report(messages, job_role, difficulty, resume_text)
+            report = re.sub(r"\*\*[\d\.]+\s*/\s*100점\*\*", f"**{total_score} / 100점**", report or "")
+            values = {
+                "status": DONE,
+                "total_score": total_score,
+                "report_markdown": report,
+                "error": None,
+                "finished_at": func.now(),
+            }
+            outcome = "done"
+        except Exception as e:
+            log_event("report.job", "generate_report.failed", level=logging.WARNING, session_id=session_id, error=repr(e))
+            values = {"status": FAILED, "error": str(e)[:2000], "finished_at": func.now()}
+            outcome = "failed"
+
+        values.update(owner=None, lease_until=None)
+        # 임대를 잃은 사이 다른 워커가 가져갔다면 그쪽 결과를 덮어쓰지 않는다
+        updated = (
+            db.query(InterviewReport)
+            .filter(InterviewReport.session_id == session_id, InterviewReport.owner == WORKER_ID)
+            .update(values, synchronize_session=False)
+        )
+        db.commit()
+        if not updated:
+            outcome = "lost_lease"
+            log_event("report.job", "report_job.lease_lost", level=logging.WARNING, session_id=session_id)
+    except Exception as e:
+        db.rollback()
+        outcome = "error"
+        log_event("report.job", "report_job.crashed", level=logging.ERROR, session_id=session_id, error=repr(e))
+    finally:
+        stop.set()
+        db.close()
+        with _lock:
+            _inflight.discard(session_id)
+            ev = _events.pop(session_id, None)
+        if ev is not None:
+            ev.set()
+        _JOBS.inc(outcome=outcome)
+        if outcome != "skipped":
+            _JOB_LATENCY.observe(time.perf_counter() - started)
+
+
+def resume_unfinished_reports() -> int:
+    """
+    서버(워커 프로세스) 시작 시 호출. PENDING 작업과 임대가 끝난 RUNNING 작업을 다시 실행한다.
+    다른 워커가 실행 중인(임대가 살아 있는) 작업은 건드리지 않으며, 실제 선점은 _run의 조건부 UPDATE가 정한다.
+    """
+    db = SessionLocal()
+    try:
+        ids = [r.session_id for r in db.query(InterviewReport.session_id).filter(_claimable())]
+    finally:
+        db.close()
+    for sid in ids:
+        _submit(sid)
+    return len(ids)
@@ -0,0 +1,201 @@
+"""
+File: rescore_service.py
+Created: 2026-10-19
+Description: LLM 장애 중 임시 점수(provisional)로 처리된 면접 턴 재채점
+             - evaluate-turn이 성능 저하 응답을 돌려줄 때 turn_rescore_queue에 적재
+             - "llm" 서킷이 CLOSED로 돌아오거나 정상 평가가 성공하면 대기열을 비운다 (단일 실행)
+             - 재채점 결과로 interview_details 점수/피드백을 갱신하고, 이미 만들어진 리포트는 다시 생성
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: 평가 오류 응답(error)은 성공으로 처리하지 않고 임시 점수 유지, 시도 횟수 초과 시 FAILED
+- 2026-10-19: 재채점 평가를 REPORT 우선순위로 요청 (복구 직후 면접 턴과 같은 우선순위로 경쟁하지 않도록)
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from backend.core import metrics
+from backend.core.circuit_breaker import CLOSED, OPEN, get_breaker
+from backend.core.llm_scheduler import Priority
+from backend.core.structured_log import log_event
+from backend.db.base import InterviewDetail, InterviewReport, TurnRescore
+from backend.db.session import SessionLocal
+from backend.services import report_job_service
+from backend.services.llm_service import evaluate_and_respond
+
+PENDING = "PENDING"
+DONE = "DONE"
+FAILED = "FAILED"
+MAX_ATTEMPTS = 5
+BATCH_SIZE = 20
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="turn-rescore")
+_lock = threading.Lock()
+_running = False
+# 재시작 직후에는 대기열 상태를 모르므로 True로 시작
+_maybe_pending = True
+
+_RESCORES = metrics.counter("turn_rescores_total", "임시 점수 턴 재채점 결과", ("outcome",))
+
+
+def enqueue_rescore(
+    *,
+    session_id: Optional[int],
+    turn_index: Optional[int],
+    question: str,
+    answer: str,
+    job_role: str,
+    difficulty: str,
+    persona_style: str,
+    provisional_score: float,
+) -> Optional[int]:
+    """재채점 대기열에 추가하고 id를 반환 (DB 오류 시 None - 응답 자체는 막지 않는다)"""
+    global _maybe_pending
+    db = SessionLocal()
+    try:
+        row = TurnRescore(
+            session_id=session_id,
+            turn_index=turn_index,
+            question=question,
+            answer=answer,
+            job_role=job_role,
+            difficulty=difficulty,
+            persona_style=persona_style,
+            provisional_score=provisional_score,
+            status=PENDING,
+            attempts=0,
+        )
+        db.add(row)
+        db.commit()
+        db.refresh(row)
+        _maybe_pending = True
+        return row.id
+    except Exception as e:
+        db.rollback()
+        log_event("rescore", "enqueue_rescore.failed", level=logging.WARNING, session_id=session_id, error=repr(e))
+        return None
+    finally:
+        db.close()
+
+
+def kick() -> None:
+    """대기열에 남은 작업이 있을 수 있고 서킷이 열려 있지 않으면 백그라운드로 재채점 시작"""
+    global _running
+    if not _maybe_pending or get_breaker("llm").state == OPEN:
+        return
+    with _lock:
+        if _running:
+            return
+        _running = True
+    _executor.submit(_drain)
+
+
+def _on_breaker_change(old: str, new: str) -> None:
+    if new == CLOSED:
+        kick()
+
+
+get_breaker("llm").add_listener(_on_breaker_change)
+
+
+def _drain() -> None:
+    global _running, _maybe_pending
+    touched_sessions = set()
+    retry_later = set()  # 평가 오류로 남은 행은 이번 실행에서 다시 잡지 않는다
+    try:
+        while True:
+            db = SessionLocal()
+            try:
+                query = db.query(TurnRescore).filter(TurnRescore.status == PENDING)
+                if retry_later:
+                    query = query.filter(~TurnRescore.id.in_(retry_later))
+                rows = query.order_by(TurnRescore.id).limit(BATCH_SIZE).all()
+                if not rows:
+                    # 오류로 남긴 행은 다음 kick에서 다시 시도
+                    _maybe_pending = bool(retry_later)
+                    return
+                for row in rows:
+                    if get_breaker("llm").state == OPEN:
+                        return
+                    if not _rescore_one(db, row):
+                        # 제공자가 아직 불안정 → 다음 복구 신호까지 대기
+                        return
+                    if row.status == PENDING:
+                        retry_later.add(row.id)
+                    elif row.session_id:
+                        touched_sessions.add(row.session_id)
+            finally:
+                db.close()
+    except Exception as e:
+        log_event("rescore", "drain.crashed", level=logging.ERROR, error=repr(e))
+    finally:
+        with _lock:
+            _running = False
+        _refresh_reports(touched_sessions)
+
+
+def _rescore_one(db, row: TurnRescore) -> bool:
+    """True면 다음 행으로 진행, False면 재채점 중단"""
+    row.attempts = (row.attempts or 0) + 1
+    result = evaluate_and_respond(
+        question=row.question or "",
+        answer=row.answer or "",
+        job_role=row.job_role or "",
+        difficulty=row.difficulty or "",
+        persona_style=row.persona_style or "",
+        user_id="rescore",
+        resume_text=None,
+        next_main_question=None,
+        followup_count=2,  # 재채점에서는 꼬리질문 생성 금지
+        # 서킷이 닫히는 순간은 진행 중인 면접도 막 복구되는 때 → 재채점은 면접 턴 뒤로 양보
+        priority=Priority.REPORT,
+    )
+    if result.get("provisional"):
+        if row.attempts >= MAX_ATTEMPTS:
+            row.status = FAILED
+            _RESCORES.inc(outcome="failed")
+        db.commit()
+        return row.status == FAILED
+    if result.get("error"):
+        # 제공자는 정상인데 이 턴의 평가가 실패 (응답 파싱 등): 0점/오류 문구로 덮어쓰지 않고 임시 점수 유지
+        if row.attempts >= MAX_ATTEMPTS:
+            row.status = FAILED
+            _RESCORES.inc(outcome="failed")
+        else:
+            _RESCORES.inc(outcome="error")
+        db.commit()
+        return True
+
+    row.status = DONE
+    row.final_score = float(result.get("score", 0.0))
+    row.feedback = result.get("feedback", "")
+    if row.session_id is not None and row.turn_index is not None:
+        db.query(InterviewDetail).filter(
+            InterviewDetail.session_id == row.session_id,
+            InterviewDetail.turn_index == row.turn_index,
+            InterviewDetail.answer == row.answer,
+        ).update({"score": row.final_score, "feedback": row.feedback}, synchronize_session=False)
+    db.commit()
+    _RESCORES.inc(outcome="done")
+    return True
+
+
+def _refresh_reports(session_ids: set) -> None:
+    """점수가 바뀐 세션에 리포트가 이미 있으면 다시 생성"""
+    if not session_ids:
+        return
+    db = SessionLocal()
+    try:
+        existing = [
+            sid
+            for (sid,) in db.query(InterviewReport.session_id).filter(InterviewReport.session_id.in_(session_ids))
+        ]
+    finally:
+        db.close()
+    for sid in existing:
+        report_job_service.enqueue_report(sid, force=True)
@@ -6,9 +6,17 @@ Description: Tavily 웹 검색 API 호출 헬퍼
 
 Modification History:
 - 2026-02-25 (김지우) : 초기 생성
+- 2026-10-19: TAVILY_BASE_URL 환경변수로 API 주소 교체 가능 (로컬 스탠드인 등)
+- 2026-10-19: 호출마다 새로 만들던 TavilyClient를 공용 팩토리(core/http_clients.py)에서 재사용
 """
 import os
-from tavily import TavilyClient
+
+from backend.core.http_clients import get_tavily_client
+
+
+def _make_client(api_key: str):
+    return get_tavily_client(api_key)
+
 
 def get_web_context_first(query: str) -> str:
     """사용자의 질문을 바탕으로 Tavily 웹 검색을 수행하고 요약 텍스트를 반환합니다."""
@@ -16,7 +24,7 @@ def get_web_context_first(query: str) -> str:
     if not tavily_api_key:
         return ""
         
-    tavily = TavilyClient(api_key=tavily_api_key)
+    tavily = _make_client(tavily_api_key)
     
     try:
         response = tavily.search(query=query, search_depth="basic", include_answer=True)
@@ -31,7 +39,7 @@ def get_web_context_second(query: str) -> str:
     if not tavily_api_key:
         return ""
         
-    tavily = TavilyClient(api_key=tavily_api_key)
+    tavily = _make_client(tavily_api_key)
     
     try:
         response = tavily.search(query=query, search_depth="basic", include_answer=True)
@@ -0,0 +1,113 @@
+"""
+File: test_local_landmark_service.py
+Created: 2026-10-19
+Description: 로컬 랜드마크 엔진 입출력 규약 스모크 테스트
+             - 규약대로 만든 작은 ONNX 그래프 (입력 (N, 3, S, S) / 출력 (N, 136) 크롭 기준 0~1 좌표)로
+               그룹 dict 형태와 ROI → 원본 픽셀 좌표 환산을 확인 (배치 축 동적 / 1 고정 둘 다)
+             - 모델 로드 실패가 캐시되어 두 번째 호출에서 다시 로드하지 않는지
+             - 실제 모델을 받으면 LANDMARK_ONNX_PATH로 같은 테스트를 돌려 규약을 확인할 수 있다 (test_real_model_contract)
+
+실행: python -m pytest -q backend/services/test_local_landmark_service.py
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+onnx = pytest.importorskip("onnx")
+from onnx import TensorProto, helper  # noqa: E402
+
+from backend.services import local_landmark_service as lls  # noqa: E402
+
+INPUT_SIZE = 32
+# 점 k: 크롭 기준 (x, y) = ((k % 17 + 1) / 18, (k // 17 + 1) / 5)
+POINTS = np.array([[(k % 17 + 1) / 18.0, (k // 17 + 1) / 5.0] for k in range(68)], dtype=np.float32)
+
+
+def _write_model(path: str, batch_dim) -> None:
+    """입력과 무관하게 POINTS를 내는 그래프: ReduceMean(x) * 0 + POINTS (배치 수만큼 브로드캐스트)"""
+    x = helper.make_tensor_value_info("input", TensorProto.FLOAT, [batch_dim, 3, INPUT_SIZE, INPUT_SIZE])
+    y = helper.make_tensor_value_info("landmarks", TensorProto.FLOAT, [batch_dim, 136])
+    nodes = [
+        helper.make_node("ReduceMean", ["input"], ["mean"], axes=[1, 2, 3], keepdims=1),
+        helper.make_node("Reshape", ["mean", "shape"], ["mean2d"]),
+        helper.make_node("Mul", ["mean2d", "zero"], ["zeros"]),
+        helper.make_node("Add", ["zeros", "points"], ["landmarks"]),
+    ]
+    inits = [
+        helper.make_tensor("shape", TensorProto.INT64, [2], [-1, 1]),
+        helper.make_tensor("zero", TensorProto.FLOAT, [1], [0.0]),
+        helper.make_tensor("points", TensorProto.FLOAT, [1, 136], POINTS.reshape(-1).tolist()),
+    ]
+    graph = helper.make_graph(nodes, "landmark_contract", [x], [y], inits)
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.checker.check_model(model)
+    onnx.save(model, path)
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    ok, buf = cv2.imencode(".jpg", np.full((height, width, 3), 127, dtype=np.uint8))
+    assert ok
+    return buf.tobytes()
+
+
+@pytest.mark.parametrize("batch_dim", ["N", 1])
+def test_groups_shape_and_roi_mapping(tmp_path, batch_dim):
+    path = str(tmp_path / "landmark.onnx")
+    _write_model(path, batch_dim)
+    engine = lls.LocalLandmarkEngine(path)
+    assert engine.input_size == INPUT_SIZE
+    assert engine.batched is (batch_dim != 1)
+
+    # 합성 이미지에는 얼굴이 없으므로 검출 박스를 고정
+    face = (100, 60, 180, 140)
+    engine.detect_face = lambda image: face
+    width, height = 320, 240
+    results = engine.infer_batch([_jpeg(width, height), b"not a jpeg", _jpeg(width, height)])
+
+    assert results[1] == {}
+    roi = lls.square_roi(face, width, height)
+    expected = np.rint(POINTS * [roi[2] - roi[0], roi[3] - roi[1]] + [roi[0], roi[1]]).astype(int)
+    for groups in (results[0], results[2]):
+        assert list(groups) == list(lls.GROUP_INDICES)
+        for name, idx in lls.GROUP_INDICES.items():
+            assert len(groups[name]) == len(idx)
+            assert groups[name] == expected[idx].tolist()
+            assert all(isinstance(v, int) for pt in groups[name] for v in pt)
+
+
+def test_load_failure_is_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(lls, "MODEL_PATH", str(tmp_path / "missing.onnx"))
+    monkeypatch.setattr(lls, "_engine", None)
+    monkeypatch.setattr(lls, "_engine_error", None)
+    loads = []
+    real_init = lls.LocalLandmarkEngine.__init__
+
+    def counting_init(self, *args, **kwargs):
+        loads.append(1)
+        real_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(lls.LocalLandmarkEngine, "__init__", counting_init)
+    for _ in range(3):
+        with pytest.raises(lls.LocalEngineUnavailable):
+            lls.infer_landmark_groups_local([b"frame"])
+    assert len(loads) == 1
+
+
+@pytest.mark.skipif(not os.path.exists(lls.MODEL_PATH), reason="LANDMARK_ONNX_PATH 모델 없음")
+def test_real_model_contract():
+    engine = lls.LocalLandmarkEngine(lls.MODEL_PATH)
+    crop = np.random.default_rng(0).random((2, 3, engine.input_size, engine.input_size), dtype=np.float32)
+    points = engine._run(crop)
+    assert points.shape == (2, 68, 2)
+    assert float(points.min()) > -0.5 and float(points.max()) < 1.5
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1 @@
+"""로컬 개발/성능 측정용 도구 모음 (운영 코드에서 import하지 않음)"""
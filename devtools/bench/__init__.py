@@ -0,0 +1 @@
+"""벤치마크 스크립트 모음. 각 모듈은 python -m devtools.bench.<name> 으로 실행한다."""
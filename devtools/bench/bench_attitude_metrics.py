@@ -0,0 +1,132 @@
+"""
+File: bench_attitude_metrics.py
+Created: 2026-10-19
+Description: 태도 지표 계산 비용 - 프레임별 파이썬 루프(예전) vs 턴 단위 NumPy 배열 계산
+             - legacy : 예전 compute_frame_features(튜플 평탄화 + 제너레이터 min/max/평균)를 프레임마다 호출한 뒤
+                        compute_turn_metrics / detect_events 파이썬 루프 (아래 _legacy_* 로 재현, 로그 출력 제외)
+             - vector : analyze_turn (그룹 dict → (프레임, 72, 2) 변환 포함)
+             - array  : 이미 배열로 들고 있을 때 compute_turn_features + turn_metrics + turn_events만
+             - 입력은 랜드마크 스탠드인과 같은 합성 얼굴 (devtools.standins.landmark_standin.synthetic_face)
+             - 두 방식의 지표가 같은지도 확인한다
+
+실행: python -m devtools.bench.bench_attitude_metrics --frames 10,100,1000 --iters 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import statistics
+import time
+from typing import Callable, List, Optional
+
+from backend.services import attitude_metrics_service as ams
+from devtools.standins.landmark_standin import synthetic_face
+
+
+# ─── 예전 구현 (비교용 재현) ──────────────────────────────
+def _legacy_frame(groups: dict) -> Optional[dict]:
+    pts = [(float(p[0]), float(p[1])) for arr in groups.values() if isinstance(arr, list) for p in arr]
+    if len(pts) < 10:
+        return None
+    xs = [p[0] for p in pts]; ys = [p[1] for p in pts]
+    min_x, max_x, min_y, max_y = min(xs), max(xs), min(ys), max(ys)
+    w, h = max_x - min_x, max_y - min_y
+    if w <= 1e-6 or h <= 1e-6:
+        return None
+
+    def get(key):
+        return [(float(x), float(y)) for x, y in groups.get(key) or []]
+
+    def avg(points):
+        return (sum(p[0] for p in points) / len(points), sum(p[1] for p in points) / len(points)) if points else None
+
+    nose = avg(get("nose_tip")) or avg(get("nose_bridge"))
+    l_eye, r_eye = get("left_eye"), get("right_eye")
+    if nose is None or not l_eye or not r_eye:
+        return None
+    eye_y = (sum(p[1] for p in l_eye) / len(l_eye) + sum(p[1] for p in r_eye) / len(r_eye)) / 2.0
+    yaw = (nose[0] - (min_x + max_x) / 2.0) / w
+    pitch = (nose[1] - eye_y) / h
+    top, bot = get("top_lip"), get("bottom_lip")
+    mouth = (max(p[1] for p in bot) - min(p[1] for p in top)) / h if top and bot else 0.0
+    eye_open = sum((max(p[1] for p in e) - min(p[1] for p in e)) / h for e in (l_eye, r_eye)) / 2.0
+    lb, rb = get("left_eyebrow"), get("right_eyebrow")
+    brow = (eye_y - (sum(p[1] for p in lb) / len(lb) + sum(p[1] for p in rb) / len(rb)) / 2.0) / h if lb and rb else 0.0
+    return {
+        "yaw_proxy": yaw, "pitch_proxy": pitch,
+        "is_center": abs(yaw) < 0.12 and abs(pitch) < 0.40, "is_down": pitch > 0.40,
+        "mouth_open_norm": mouth, "eye_open_norm": eye_open, "expr_signal": brow,
+    }
+
+
+def _legacy_turn(t_ms: List[int], groups_list: List[dict], fps: float = 2.0):
+    feats = [f for f in (_legacy_frame(g) for g in groups_list) if f is not None]
+    n = len(feats)
+    metrics = {
+        "head_center_ratio": sum(1 for f in feats if f["is_center"]) / n,
+        "downward_ratio": sum(1 for f in feats if f["is_down"]) / n,
+        "expression_variability": statistics.pstdev([f["expr_signal"] for f in feats]) if n >= 2 else 0.0,
+        "eye_open_variability": statistics.pstdev([f["eye_open_norm"] for f in feats]) if n >= 2 else 0.0,
+    }
+    events = []
+
+    def scan(predicate, typ, min_sec):
+        run_start = None
+        for i, f in enumerate(feats):
+            ok = predicate(f)
+            if ok and run_start is None:
+                run_start = i
+            if (not ok or i == n - 1) and run_start is not None:
+                run_end = i if ok and i == n - 1 else i - 1
+                if (run_end - run_start + 1) / fps >= min_sec:
+                    events.append({"t_start_ms": t_ms[run_start], "t_end_ms": t_ms[run_end], "type": typ, "severity": "warn"})
+                run_start = None
+
+    scan(lambda f: not f["is_center"], "head_off_center", 1.5)
+    scan(lambda f: f["is_down"], "head_down", 2.0)
+    return metrics, events
+
+
+# ─── 측정 ────────────────────────────────────────────────
+def _timed(fn: Callable[[], object], iters: int) -> float:
+    samples = []
+    for _ in range(iters):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", default="10,100,1000")
+    parser.add_argument("--iters", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'frames':>7}{'legacy ms':>12}{'vector ms':>12}{'array ms':>12}{'speedup':>10}{'array x':>10}")
+    for n in (int(x) for x in args.frames.split(",")):
+        groups_list = [synthetic_face(i) for i in range(n)]
+        t_ms = [i * 500 for i in range(n)]
+        points = ams.stack_turn(groups_list)
+
+        # 결과 일치 확인
+        legacy_metrics, legacy_events = _legacy_turn(t_ms, groups_list)
+        turn = ams.analyze_turn(t_ms, groups_list)
+        assert legacy_events == turn["events"], "이벤트 불일치"
+        for key, value in legacy_metrics.items():
+            assert math.isclose(value, turn["metrics"][key], rel_tol=1e-9, abs_tol=1e-12), key
+
+        def array_only():
+            feats = ams.compute_turn_features(points)
+            good = feats.select(feats.valid)
+            return ams.turn_metrics(good), ams.turn_events(t_ms, good)
+
+        legacy = _timed(lambda: _legacy_turn(t_ms, groups_list), args.iters)
+        vector = _timed(lambda: ams.analyze_turn(t_ms, groups_list), args.iters)
+        array = _timed(array_only, args.iters)
+        print(f"{n:>7}{legacy:>12.3f}{vector:>12.3f}{array:>12.3f}{legacy / vector:>9.1f}x{legacy / array:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+File: bench_attitude_upload.py
+Created: 2026-10-19
+Description: 태도 분석 업로드 턴당 페이로드 크기 + 서버 요청 처리 시간 비교
+             - json     : 예전 방식. 캡처한 프레임 전부(최대 40장)를 base64로 JSON 본문에 담아 POST /api/infer/attitude
+             - multipart: 샘플링 계획(GET /api/infer/attitude/plan)대로 고른 프레임(10장)만 JPEG 바이너리로 POST /api/infer/attitude/frames
+             - 프레임은 320px 폭 합성 이미지(그라디언트 + 노이즈 + 얼굴 모양 타원)를 품질 0.6 JPEG로 인코딩
+               (실제 카메라 프레임과 압축률이 다르므로 절대 크기보다 비율을 볼 것)
+             - 서버 시간은 TestClient로 라우터만 띄워 측정, 랜드마크 추론(analyze_attitude 내부)은 프레임 디코딩만 하는 가짜로 바꾼다
+
+실행: python -m devtools.bench.bench_attitude_upload --seconds 20 --iters 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import statistics
+import time
+from typing import Dict, List
+
+import cv2
+import httpx
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers import attitude as attitude_router
+from backend.services import attitude_service
+
+
+def synthetic_frames(count: int, width: int, quality: float, seed: int = 7) -> List[bytes]:
+    rng = np.random.default_rng(seed)
+    height = width * 3 // 4
+    base = np.tile(np.linspace(60, 200, width, dtype=np.float32), (height, 1))
+    frames = []
+    for i in range(count):
+        img = base + rng.normal(0, 12, size=(height, width)).astype(np.float32)
+        img = np.clip(img, 0, 255).astype(np.uint8)
+        img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        center = (width // 2 + int(rng.integers(-10, 10)), height // 2 + int(rng.integers(-5, 5)))
+        cv2.ellipse(img, center, (width // 6, height // 4), 0, 0, 360, (150, 170, 210), -1)
+        ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, int(quality * 100)])
+        frames.append(buf.tobytes())
+    return frames
+
+
+def json_body(frames: List[bytes], interval_ms: int) -> bytes:
+    payload = {"frames": [{"t_ms": i * interval_ms, "image_b64": base64.b64encode(f).decode()} for i, f in enumerate(frames)]}
+    return json.dumps(payload).encode()
+
+
+def multipart_request(frames: List[bytes], interval_ms: int) -> httpx.Request:
+    picked = attitude_service.select_frames([{"t_ms": i * interval_ms, "image_bytes": f} for i, f in enumerate(frames)])
+    files = [("frames", (f"frame_{i}.jpg", fr["image_bytes"], "image/jpeg")) for i, fr in enumerate(picked)]
+    data = {"t_ms": [str(fr["t_ms"]) for fr in picked]}
+    return httpx.Request("POST", "http://bench/api/infer/attitude/frames", files=files, data=data)
+
+
+def _fake_batch(images) -> List[dict]:
+    # 서버 측 비용 중 업로드 형식에 따라 달라지는 부분(본문 파싱 / base64 디코딩 / JPEG 디코딩)만 남긴다
+    for image in images:
+        raw = base64.b64decode(image) if isinstance(image, str) else image
+        cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_COLOR)
+    return [{} for _ in images]
+
+
+def _timed(fn, iters: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(iters):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {"p50": statistics.median(samples), "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=20.0, help="턴 길이 (캡처 시간)")
+    parser.add_argument("--iters", type=int, default=50)
+    args = parser.parse_args()
+
+    plan = attitude_service.sampling_plan()
+    interval = plan["capture_interval_ms"]
+    captured = min(plan["max_capture_frames"], int(args.seconds * 1000 / interval))
+    frames = synthetic_frames(captured, plan["width"], plan["jpeg_quality"])
+
+    body_json = json_body(frames, interval)
+    req_multi = multipart_request(frames, interval)
+    body_multi = req_multi.read()
+
+    attitude_service.infer_landmark_groups_batch = _fake_batch
+    app = FastAPI()
+    app.include_router(attitude_router.router)
+    client = TestClient(app)
+
+    def post_json():
+        res = client.post("/api/infer/attitude", content=body_json, headers={"Content-Type": "application/json"})
+        res.raise_for_status()
+
+    def post_multipart():
+        res = client.post(
+            "/api/infer/attitude/frames", content=body_multi, headers={"Content-Type": req_multi.headers["Content-Type"]}
+        )
+        res.raise_for_status()
+
+    t_json = _timed(post_json, args.iters)
+    t_multi = _timed(post_multipart, args.iters)
+
+    print(f"turn={args.seconds:.0f}s captured={captured} analyzed={plan['max_frames']} "
+          f"avg_jpeg={statistics.mean(len(f) for f in frames) / 1024:.1f}KiB")
+    print(f"{'transport':<10}{'frames':>8}{'bytes/turn':>14}{'p50 ms':>10}{'p95 ms':>10}")
+    print(f"{'json':<10}{captured:>8}{len(body_json):>14,}{t_json['p50']:>10.2f}{t_json['p95']:>10.2f}")
+    analyzed = min(captured, plan["max_frames"])
+    print(f"{'multipart':<10}{analyzed:>8}{len(body_multi):>14,}{t_multi['p50']:>10.2f}{t_multi['p95']:>10.2f}")
+    print(f"payload {len(body_multi) / len(body_json) * 100:.1f}% of json ({(1 - len(body_multi) / len(body_json)) * 100:.1f}% smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+File: bench_bank_snapshot.py
+Created: 2026-10-19
+Description: 질문은행 콜드 스타트 측정 - CSV 파싱 vs ormsgpack 스냅샷 (이득은 CSV 파싱 + 인덱스 구성 생략에서 나옴)
+             - 새 파이썬 프로세스에서 import + QuestionBank 생성 + 첫 출제까지 걸린 시간 (워커 기동/포크 후 상황)
+             - 같은 프로세스 안에서 QuestionBank 생성만 반복한 시간
+             합성 CSV를 크기별로 만들어 측정 (실제 질문 CSV는 저장소에 포함되지 않음)
+
+실행: python -m devtools.bench.bench_bank_snapshot --sizes 500,5000,50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from ai.question_bank import QuestionBank, snapshot_path_for
+from devtools.bench.bench_question_bank import _write_csv
+
+# pathlib은 백엔드(FastAPI 등)에서 이미 로드되어 있으므로 타이머 밖에서 미리 import (ormsgpack이 사용)
+_CHILD = """
+import sys, time, pathlib
+t = time.perf_counter()
+from ai.question_bank import QuestionBank
+b = QuestionBank(sys.argv[1], use_snapshot=sys.argv[2] == "1")
+b.pick_next()
+print(time.perf_counter() - t, b.loaded_from)
+"""
+
+
+def _cold(path: str, snapshot: bool, repeat: int) -> float:
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _CHILD, path, "1" if snapshot else "0"],
+            cwd=root, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        assert out[1] == ("snapshot" if snapshot else "csv"), out
+        samples.append(float(out[0]))
+    return statistics.median(samples)
+
+
+def _warm(path: str, snapshot: bool, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        QuestionBank(path, use_snapshot=snapshot)
+        samples.append(time.perf_counter() - t)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="500,5000,50000")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="bench-snapshot-")
+    print("ms (median). cold = new process import + load + first pick, load = QuestionBank() only")
+    print(f"{'rows':>7} {'cold csv':>9} {'cold snap':>10} {'load csv':>9} {'load snap':>10} {'snap KiB':>9}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        path = os.path.join(tmpdir, f"q{n}.csv")
+        _write_csv(path, n)
+        QuestionBank(path)  # 스냅샷 생성
+        cold_csv = _cold(path, False, args.repeat)
+        cold_snap = _cold(path, True, args.repeat)
+        load_csv = _warm(path, False, args.repeat)
+        load_snap = _warm(path, True, args.repeat)
+        size = os.path.getsize(snapshot_path_for(path)) / 1024
+        print(
+            f"{n:>7} {cold_csv * 1000:>9.1f} {cold_snap * 1000:>10.1f} "
+            f"{load_csv * 1000:>9.1f} {load_snap * 1000:>10.1f} {size:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
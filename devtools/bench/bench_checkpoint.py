@@ -0,0 +1,145 @@
+"""
+File: bench_checkpoint.py
+Created: 2026-10-19
+Description: LangGraph 체크포인트 비용 측정 (ai/checkpoint.py)
+             - 턴당 invoke 지연: 체크포인터 없음 / SQLite 동기 커밋 / 쓰기 지연(write-behind) / 쓰기 지연 + durability=exit
+             - 재시작 후 복구: 새 프로세스처럼 체크포인터를 다시 열고 세션 상태를 읽는 데 걸리는 시간
+             - 그래프는 실제 ai/graph.build_answer_graph (병렬 분기, 출제 비트맵, 선출제 상태까지 그대로 저장됨)
+               LLM 평가와 ChromaDB 검색만 bench_graph_parallel의 가짜(--eval-ms / --retrieve-ms, 기본 0)로 바꾼다
+             - QUESTION_CSV_PATH가 없으면 합성 질문 CSV(--bank-size)로 질문은행을 만든다
+
+실행: python -m devtools.bench.bench_checkpoint --sessions 200 --turns 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench-not-used")
+
+from ai import graph as answer_graph  # noqa: E402
+from ai.checkpoint import SqliteWriteBehindSaver, thread_config  # noqa: E402
+from ai.question_bank import QuestionBank  # noqa: E402
+from ai.state import init_state, set_question, set_user_answer  # noqa: E402
+from devtools.bench.bench_graph_parallel import _install_fakes  # noqa: E402
+from devtools.bench.bench_question_bank import _write_csv  # noqa: E402
+
+_ANSWER = "프로세스는 독립된 메모리를 가지고 스레드는 메모리를 공유합니다. Redis로 세션을 캐시했습니다. " * 3
+
+
+def _pct(ordered: List[float], p: float) -> float:
+    return ordered[min(len(ordered) - 1, max(0, int(round(p * len(ordered))) - 1))]
+
+
+def _first_questions(bank: QuestionBank, sessions: int) -> Dict[str, dict]:
+    states = {}
+    for i in range(sessions):
+        st = init_state(f"sess-{i}")
+        q = bank.pick_for_state(st)
+        states[f"sess-{i}"] = set_question(st, q.id, q.question, question_row=q.to_dict())
+    return states
+
+
+def run_turns(
+    graph,
+    saver: Optional[SqliteWriteBehindSaver],
+    bank: QuestionBank,
+    sessions: int,
+    turns: int,
+    durability: str = "async",
+) -> Dict[str, float]:
+    random.seed(7)
+    states = _first_questions(bank, sessions)
+    latencies: List[float] = []
+    started_all = time.perf_counter()
+    for _ in range(turns):
+        for sid, st in states.items():
+            st = set_user_answer(st, _ANSWER)
+            started = time.perf_counter()
+            if saver is not None:
+                st = graph.invoke(st, thread_config(sid), durability=durability)
+            else:
+                st = graph.invoke(st)
+            latencies.append(time.perf_counter() - started)
+            states[sid] = st
+    wall = time.perf_counter() - started_all
+    flush_started = time.perf_counter()
+    if saver is not None:
+        saver.flush()
+    ordered = sorted(latencies)
+    return {
+        "p50": _pct(ordered, 0.50) * 1000,
+        "p99": _pct(ordered, 0.99) * 1000,
+        "mean": statistics.mean(ordered) * 1000,
+        "wall": wall,
+        "drain": time.perf_counter() - flush_started,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--recover", type=int, default=200, help="복구 시간을 잴 세션 수")
+    parser.add_argument("--eval-ms", type=float, default=0.0, help="가짜 LLM 평가 지연")
+    parser.add_argument("--retrieve-ms", type=float, default=0.0, help="가짜 팩트체크 검색 지연")
+    parser.add_argument("--bank-size", type=int, default=500)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="bench-checkpoint-")
+    csv_path = os.environ.get("QUESTION_CSV_PATH")
+    if not csv_path or not os.path.exists(csv_path):
+        csv_path = os.path.join(tmpdir, "questions.csv")
+        _write_csv(csv_path, args.bank_size)
+    bank = QuestionBank(csv_path)
+    answer_graph.get_bank = lambda: bank
+
+    def build_graph(checkpointer=None):
+        # 모드마다 평가 점수 순서를 같게 (같은 분기 / 같은 상태 크기)
+        _install_fakes(args.eval_ms, args.retrieve_ms, seed=7)
+        return answer_graph.build_answer_graph(checkpointer=checkpointer)
+
+    results = {"none": run_turns(build_graph(), None, bank, args.sessions, args.turns)}
+    for mode, write_behind, durability in (("sync", False, "sync"), ("behind", True, "async"), ("exit", True, "exit")):
+        saver = SqliteWriteBehindSaver(os.path.join(tmpdir, f"{mode}.sqlite"), write_behind=write_behind)
+        results[mode] = run_turns(build_graph(saver), saver, bank, args.sessions, args.turns, durability)
+        saver.close()
+
+    print(f"sessions={args.sessions} turns={args.turns} (invoke latency in ms)")
+    print(f"{'mode':<7} {'p50':>7} {'p99':>7} {'mean':>7} {'+mean':>7} {'wall s':>7} {'drain s':>8}")
+    base = results["none"]["mean"]
+    for mode, r in results.items():
+        print(
+            f"{mode:<7} {r['p50']:>7.3f} {r['p99']:>7.3f} {r['mean']:>7.3f} {r['mean'] - base:>7.3f} "
+            f"{r['wall']:>7.2f} {r['drain']:>8.3f}"
+        )
+
+    # 재시작 시뮬레이션: 캐시 없는 새 체크포인터로 세션 상태 읽기
+    path = os.path.join(tmpdir, "exit.sqlite")
+    started = time.perf_counter()
+    saver = SqliteWriteBehindSaver(path)
+    graph = build_graph(saver)
+    opened = time.perf_counter() - started
+    sample = random.Random(3).sample(range(args.sessions), min(args.recover, args.sessions))
+    loads: List[float] = []
+    for i in sample:
+        t0 = time.perf_counter()
+        values = graph.get_state(thread_config(f"sess-{i}")).values
+        loads.append(time.perf_counter() - t0)
+        assert values.get("history"), f"sess-{i} 복구 실패"
+    saver.close()
+    ordered = sorted(loads)
+    print(
+        f"recovery: open={opened * 1000:.1f} ms, per-session cold load p50={_pct(ordered, 0.5) * 1000:.3f} ms "
+        f"p99={_pct(ordered, 0.99) * 1000:.3f} ms (history {args.turns} turns), db={os.path.getsize(path) / 1024:.0f} KiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
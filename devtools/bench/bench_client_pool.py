@@ -0,0 +1,105 @@
+"""
+File: bench_client_pool.py
+Created: 2026-10-19
+Description: 면접 1턴 동안 OpenAI 호출이 새로 여는 연결(= 실제 API에서는 TLS 핸드셰이크) 수 측정
+             - legacy: 변경 전 구조 (모듈별 클라이언트 2개 + TTS마다 새 클라이언트)
+             - shared: core/http_clients 공용 풀 하나로 모든 호출
+             OpenAI 스탠드인(devtools/standins)을 상대로 돌리며 스탠드인은 평문 HTTP이므로
+             TCP 연결 수를 센다. api.openai.com에서는 새 연결마다 TLS 핸드셰이크가 1회 붙는다.
+
+실행: python -m devtools.bench.bench_client_pool --turns 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from openai import OpenAI
+
+from backend.core import http_clients
+from devtools.standins.common import StandinConfig, LatencyProfile, serve_in_thread
+from devtools.standins.openai_standin import OpenAIStandinHandler
+
+_MESSAGES = [
+    {"role": "system", "content": "너는 기술 면접관이다."},
+    {"role": "user", "content": "GIL은 CPython의 전역 락입니다."},
+]
+
+
+def _client(name: str, base_url: str) -> OpenAI:
+    # 공용 풀과 같은 계측(trace)을 쓰되 풀은 따로 만든다 (변경 전 동작 재현)
+    return OpenAI(api_key="sk-bench", base_url=base_url, http_client=http_clients._build_http_client(name, http_clients.OPENAI_TIMEOUT))
+
+
+def _turn(llm: OpenAI, evaluator: OpenAI, tts: OpenAI) -> None:
+    """evaluate_and_respond + evaluate_answer + 가이드봇 스트림 + TTS"""
+    llm.chat.completions.create(model="gpt-4.1-mini", messages=_MESSAGES, response_format={"type": "json_object"})
+    evaluator.responses.create(model="gpt-4.1-mini", input=_MESSAGES, max_output_tokens=300)
+    for _ in llm.chat.completions.create(model="gpt-4o-mini", messages=_MESSAGES, stream=True):
+        pass
+    tts.audio.speech.create(model="tts-1", voice="alloy", input="다음 질문 드리겠습니다.")
+
+
+def run_mode(mode: str, base_url: str, turns: int) -> Dict[str, float]:
+    label = f"bench_{mode}"
+    before = http_clients.HTTP_CONNECTIONS.value(client=label if mode == "legacy" else "openai")
+    reqs_before = http_clients.HTTP_REQUESTS.value(client=label if mode == "legacy" else "openai")
+
+    if mode == "legacy":
+        llm = _client(label, base_url)
+        evaluator = _client(label, base_url)
+        make_tts: Callable[[], OpenAI] = lambda: _client(label, base_url)
+    else:
+        shared = http_clients.get_openai_client("sk-bench", base_url)
+        llm = evaluator = shared
+        make_tts = lambda: shared
+
+    durations: List[float] = []
+    for _ in range(turns):
+        started = time.perf_counter()
+        _turn(llm, evaluator, make_tts())
+        durations.append(time.perf_counter() - started)
+
+    key = label if mode == "legacy" else "openai"
+    conns = http_clients.HTTP_CONNECTIONS.value(client=key) - before
+    reqs = http_clients.HTTP_REQUESTS.value(client=key) - reqs_before
+    return {
+        "requests_per_turn": reqs / turns,
+        "connections_per_turn": conns / turns,
+        "turn_ms_mean": statistics.mean(durations) * 1000,
+        "turn_ms_p95": sorted(durations)[int(len(durations) * 0.95) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--latency", default="fixed:0.01", help="스탠드인 지연 분포 (예: lognormal:0.3,0.4)")
+    args = parser.parse_args()
+
+    standin = serve_in_thread(
+        OpenAIStandinHandler, StandinConfig("openai", latency=LatencyProfile.parse(args.latency))
+    )
+    base_url = f"{standin.url}/v1"
+    try:
+        results = {mode: run_mode(mode, base_url, args.turns) for mode in ("legacy", "shared")}
+    finally:
+        http_clients.close_all()
+        standin.stop()
+
+    print(f"turns={args.turns} latency={args.latency} http2={http_clients.HTTP2_ENABLED}")
+    print(f"{'mode':<8} {'req/turn':>9} {'conn/turn':>10} {'mean ms':>9} {'p95 ms':>9}")
+    for mode, r in results.items():
+        print(
+            f"{mode:<8} {r['requests_per_turn']:>9.2f} {r['connections_per_turn']:>10.2f} "
+            f"{r['turn_ms_mean']:>9.1f} {r['turn_ms_p95']:>9.1f}"
+        )
+    saved = results["legacy"]["connections_per_turn"] - results["shared"]["connections_per_turn"]
+    print(f"턴당 절감된 연결(TLS 핸드셰이크) 수: {saved:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+File: bench_graph_parallel.py
+Created: 2026-10-19
+Description: 답변 그래프(ai/graph.py) 턴당 벽시계 시간 - 병렬 분기 유무 비교
+             - sequential: fact_check → evaluate → (분기) follow_up | pick_question
+             - parallel  : evaluate | fact_check | speculate_pick 동시 실행 → (분기) follow_up | pick_question
+             - LLM 평가와 ChromaDB 검색은 지정한 지연(--eval-ms / --retrieve-ms)만큼 잠자는 가짜로 바꾼다
+               (그래프 구조 / 출제 / 상태 갱신은 실제 코드 그대로)
+             - QUESTION_CSV_PATH가 없으면 합성 질문 CSV(--bank-size)로 질문은행을 만든다
+             - 평가 호출은 외부로 나가지 않지만 ai.evaluator가 import 시 OpenAI 클라이언트를 만들므로 키가 없으면 더미 키를 넣는다
+
+실행: python -m devtools.bench.bench_graph_parallel --turns 40 --eval-ms 800 --retrieve-ms 120
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import List
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench-not-used")
+
+from ai import graph as answer_graph  # noqa: E402
+from ai.question_bank import QuestionBank  # noqa: E402
+from ai.state import init_state, set_question, set_user_answer  # noqa: E402
+from devtools.bench.bench_question_bank import _write_csv  # noqa: E402
+
+_ANSWER = "Redis로 세션을 캐시하고 Kafka로 이벤트를 넘겼습니다. 장애 시에는 Kubernetes에서 파드를 재시작했습니다."
+_RESUME_CHUNK = "Python, FastAPI, Redis 기반 백엔드 개발. MySQL 튜닝 경험."
+
+
+def _install_fakes(eval_ms: float, retrieve_ms: float, seed: int) -> None:
+    rng = random.Random(seed)
+
+    def fake_evaluate(question_row, user_answer_text, rag_context, **kwargs):
+        time.sleep(eval_ms / 1000.0)
+        score = rng.choice([40, 60, 80, 90])
+        return (
+            {
+                "score": score,
+                "feedback": "핵심은 맞지만 근거가 부족합니다.",
+                "follow_up_question": "그 선택의 단점은 무엇인가요?",
+                "rubric_hits": {"correctness": True, "depth": score > 60, "structure": True, "example": False},
+            },
+            "",
+            "",
+        )
+
+    def fake_retrieve(query, session_id):
+        time.sleep(retrieve_ms / 1000.0)
+        return [_RESUME_CHUNK]
+
+    answer_graph.evaluate_answer = fake_evaluate
+    answer_graph.retrieve_fact_chunks = fake_retrieve
+
+
+def run(bank: QuestionBank, parallel: bool, turns: int, eval_ms: float, retrieve_ms: float) -> List[float]:
+    _install_fakes(eval_ms, retrieve_ms, seed=7)
+    answer_graph.get_bank = lambda: bank
+    # 팩트체크는 기본 비활성이지만 켰을 때의 병렬화 효과를 보기 위해 항상 포함
+    g = answer_graph.build_answer_graph(parallel=parallel, fact_check=True)
+    st = init_state(f"bench-{'par' if parallel else 'seq'}")
+    q = bank.pick_for_state(st)
+    st = set_question(st, q.id, q.question, question_row=q.to_dict())
+
+    walls = []
+    for _ in range(turns):
+        st = set_user_answer(st, _ANSWER)
+        started = time.perf_counter()
+        st = g.invoke(st)
+        walls.append(time.perf_counter() - started)
+        assert st.get("current_question_text")
+        assert (st.get("fact_check") or {}).get("unverified_terms") == ["kafka", "kubernetes"]
+    return walls
+
+
+def _summary(name: str, walls: List[float]) -> str:
+    ordered = sorted(walls)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"{name:<10} p50={statistics.median(ordered) * 1000:8.1f}ms  p95={p95 * 1000:8.1f}ms  mean={statistics.mean(ordered) * 1000:8.1f}ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--eval-ms", type=float, default=800)
+    parser.add_argument("--retrieve-ms", type=float, default=120)
+    parser.add_argument("--bank-size", type=int, default=500)
+    args = parser.parse_args()
+
+    csv_path = os.environ.get("QUESTION_CSV_PATH")
+    with tempfile.TemporaryDirectory() as tmp:
+        if not csv_path or not os.path.exists(csv_path):
+            csv_path = os.path.join(tmp, "questions.csv")
+            _write_csv(csv_path, args.bank_size)
+        bank = QuestionBank(csv_path)
+        seq = run(bank, False, args.turns, args.eval_ms, args.retrieve_ms)
+        par = run(bank, True, args.turns, args.eval_ms, args.retrieve_ms)
+    print(f"turns={args.turns}  eval={args.eval_ms:.0f}ms  retrieve={args.retrieve_ms:.0f}ms")
+    print(_summary("sequential", seq))
+    print(_summary("parallel", par))
+    saved = statistics.median(seq) - statistics.median(par)
+    print(f"턴당 절감 p50 {saved * 1000:.1f}ms ({saved / statistics.median(seq) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+File: bench_hedging.py
+Created: 2026-10-19
+Description: LLM 헤지 요청 효과 측정 (지연 주입 OpenAI 스탠드인 상대)
+             - off  : 헤징 없이 run_llm
+             - hedge: run_llm + 호출 지점 헤징 (백분위 / 예산 지정)
+             지연 백분위(p50/p95/p99/max)와 실제로 스탠드인에 도달한 요청 비율(추가 비용)을 비교한다.
+             표준 라이브러리(urllib)로 호출하므로 openai 패키지 없이도 실행 가능.
+
+실행: python -m devtools.bench.bench_hedging --requests 400 --latency lognormal:0.3,0.8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+import urllib.request
+from typing import Dict, List
+
+# 전역 스케줄러가 만들어지기 전에 벤치 전용 모델을 무제한으로 등록
+os.environ.setdefault("LLM_SCHEDULER_LIMITS", json.dumps({"bench-model": {"rpm": 0, "tpm": 0}}))
+
+from backend.core import hedging
+from backend.core.llm_scheduler import run_llm
+from devtools.standins.common import LatencyProfile, StandinConfig, serve_in_thread
+from devtools.standins.openai_standin import OpenAIStandinHandler
+
+CALL_SITE = "bench_hedging"
+
+
+def _post(url: str, i: int) -> dict:
+    body = json.dumps(
+        {"model": "bench-model", "messages": [{"role": "user", "content": f"질문 {i}"}]}
+    ).encode("utf-8")
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=60) as res:
+        return json.loads(res.read())
+
+
+def _pct(ordered: List[float], p: float) -> float:
+    return ordered[min(len(ordered) - 1, max(0, int(round(p * len(ordered))) - 1))]
+
+
+def run_mode(url: str, standin, n: int, concurrency: int) -> Dict[str, float]:
+    before = sum(standin.server.stats.snapshot()["requests"].values())
+    latencies: List[float] = []
+    lock = threading.Lock()
+    counter = iter(range(n))
+
+    def worker() -> None:
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            started = time.perf_counter()
+            run_llm(lambda: _post(url, i), model="bench-model", call_site=CALL_SITE)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # 버려진(진) 요청이 스탠드인에 도달할 때까지 잠시 대기
+    time.sleep(1.0)
+    upstream = sum(standin.server.stats.snapshot()["requests"].values()) - before
+    ordered = sorted(latencies)
+    return {
+        "p50": _pct(ordered, 0.50),
+        "p95": _pct(ordered, 0.95),
+        "p99": _pct(ordered, 0.99),
+        "max": ordered[-1],
+        "mean": statistics.mean(ordered),
+        "extra": upstream / n - 1.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", default="lognormal:0.3,0.8")
+    parser.add_argument("--percentile", type=float, default=0.95)
+    parser.add_argument("--budget", type=float, default=0.05)
+    args = parser.parse_args()
+
+    standin = serve_in_thread(
+        OpenAIStandinHandler, StandinConfig("openai", latency=LatencyProfile.parse(args.latency), seed=7)
+    )
+    url = f"{standin.url}/v1/chat/completions"
+    results = {}
+    try:
+        hedging.configure(CALL_SITE, None)
+        results["off"] = run_mode(url, standin, args.requests, args.concurrency)
+        hedging.configure(
+            CALL_SITE, hedging.HedgePolicy(percentile=args.percentile, budget=args.budget, initial_delay_sec=5.0)
+        )
+        results["hedge"] = run_mode(url, standin, args.requests, args.concurrency)
+    finally:
+        standin.stop()
+
+    print(
+        f"requests={args.requests} concurrency={args.concurrency} latency={args.latency} "
+        f"percentile={args.percentile} budget={args.budget}"
+    )
+    print(f"{'mode':<6} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} {'mean':>7} {'extra req':>10}")
+    for mode, r in results.items():
+        print(
+            f"{mode:<6} {r['p50']:>7.3f} {r['p95']:>7.3f} {r['p99']:>7.3f} {r['max']:>7.3f} "
+            f"{r['mean']:>7.3f} {r['extra'] * 100:>9.1f}%"
+        )
+    fired = hedging.LLM_HEDGES.value(call_site=CALL_SITE, outcome="fired")
+    won = hedging.LLM_HEDGES.value(call_site=CALL_SITE, outcome="won")
+    print(f"hedges fired={fired:g} won={won:g} no_budget={hedging.LLM_HEDGES.value(call_site=CALL_SITE, outcome='no_budget'):g}")
+
+
+if __name__ == "__main__":
+    main()
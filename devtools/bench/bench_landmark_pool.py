@@ -0,0 +1,100 @@
+"""
+File: bench_landmark_pool.py
+Created: 2026-10-19
+Description: 동시 면접 N개가 랜드마크 추론을 호출할 때 - 호출마다 ThreadPoolExecutor(예전) vs 전역 추론 풀
+             - 프레임 1장 추론은 고정 지연(--latency-ms)만큼 잠드는 가짜 원격 Space,
+               동시에 --remote-capacity 건까지만 처리하고 나머지는 원격 쪽에서 줄을 선다
+             - executor: 턴마다 ThreadPoolExecutor(max_workers=5)를 만들어 map → 동시 호출 수 = 면접 수 x 5
+             - pool    : infer_landmark_groups_batch (LANDMARK_POOL_WORKERS 크기 전역 풀, 대기열 상한 / 마감 적용)
+             - 턴 지연 p50/p95, 동시에 실행된 추론 호출 최대치(원격에 가해지는 부하), 풀이 건너뛴(None) 프레임 수를 비교
+
+실행: python -m devtools.bench.bench_landmark_pool --interviews 1,4,16 --frames 10 --latency-ms 50 --remote-capacity 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from backend.services import hf_landmark_service as hf
+
+
+class _FakeRemote:
+    def __init__(self, latency_sec: float, capacity: int) -> None:
+        self.latency_sec = latency_sec
+        self._slots = threading.Semaphore(capacity)
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, image) -> dict:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        with self._slots:
+            time.sleep(self.latency_sec)
+        with self._lock:
+            self.active -= 1
+        return {"nose_tip": [[0.0, 0.0]]}
+
+
+def _legacy_batch(images) -> List[dict]:
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        return list(executor.map(hf.infer_landmark_groups, images))
+
+
+def _run(batch: Callable[[list], List[dict]], interviews: int, frames: int, remote: _FakeRemote) -> Dict[str, float]:
+    remote.peak = 0
+    latencies: List[float] = []
+    skipped = [0]
+    lock = threading.Lock()
+
+    def turn() -> None:
+        started = time.perf_counter()
+        groups = batch([b"frame"] * frames)
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            skipped[0] += sum(1 for g in groups if g is None)
+
+    threads = [threading.Thread(target=turn) for _ in range(interviews)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "peak": remote.peak,
+        "skipped": skipped[0],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", default="1,4,16", help="동시 면접 수 목록")
+    parser.add_argument("--frames", type=int, default=10, help="턴당 분석 프레임 수")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="프레임 1장 추론 지연")
+    parser.add_argument("--remote-capacity", type=int, default=5, help="원격이 동시에 처리하는 호출 수")
+    args = parser.parse_args()
+
+    remote = _FakeRemote(args.latency_ms / 1000, args.remote_capacity)
+    hf.infer_landmark_groups = remote
+    hf.LANDMARK_BACKEND = "hf"
+
+    print(f"pool workers={hf.POOL_WORKERS} max_queue={hf.POOL_MAX_QUEUE} deadline={hf.DEADLINE_SEC}s")
+    print(f"{'interviews':>10}{'mode':>10}{'p50 ms':>10}{'p95 ms':>10}{'peak calls':>12}{'skipped':>9}")
+    for n in (int(x) for x in args.interviews.split(",")):
+        for mode, batch in (("executor", _legacy_batch), ("pool", hf.infer_landmark_groups_batch)):
+            r = _run(batch, n, args.frames, remote)
+            print(f"{n:>10}{mode:>10}{r['p50']:>10.1f}{r['p95']:>10.1f}{r['peak']:>12}{r['skipped']:>9}")
+    print(hf.get_landmark_pool().snapshot())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+File: bench_prescore.py
+Created: 2026-10-19
+Description: 로컬 사전 채점(prescore_service) 효과 측정
+             - 실제 면접 답변 분포를 흉내 낸 합성 답변 세트(모름 / 잡음 / 짧은 답 / 정상 답변)를 사전 채점
+             - 단락 비율, 답변당 사전 채점 시간, 생략한 LLM 평가 시간 추정(--llm-sec 기준)을 출력
+             - 질문 풀 키워드는 DB 대신 아래 표본으로 주입하므로 DB/외부 패키지 없이 실행 가능
+
+실행: python -m devtools.bench.bench_prescore --answers 20000 --llm-sec 4.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections import Counter
+
+from backend.services import prescore_service
+
+_QUESTIONS = [
+    (
+        "프로세스와 스레드의 차이를 설명해 주세요.",
+        "프로세스, 스레드, 메모리, 컨텍스트 스위칭",
+        "프로세스는 독립된 메모리 공간을 가지며 스레드는 프로세스 안에서 메모리를 공유합니다.",
+    ),
+    (
+        "인덱스가 조회 성능을 높이는 원리는 무엇인가요?",
+        "인덱스, b-tree, 조회, 풀스캔",
+        "b-tree 인덱스는 정렬된 구조로 풀스캔 없이 범위를 빠르게 찾습니다.",
+    ),
+    (
+        "REST API 설계 시 중요하게 생각하는 점은?",
+        "rest, 리소스, http, 멱등성",
+        "리소스 중심 url 설계와 http 메서드의 멱등성을 지킵니다.",
+    ),
+]
+
+_DONT_KNOW = ["모르겠습니다.", "잘 모르겠어요", "그 부분은 공부를 못 했습니다", "기억이 안 나네요", "I don't know", "패스할게요"]
+_FILLER = ["음...", "어 그", "네", "", "음 어 음"]
+_HEDGED = ["GIL은 모르겠지만 스레드는 메모리를 공유한다고 알고 있습니다", "정확히는 모르는데 인덱스는 b-tree로 되어 있어요"]
+_NORMAL = [
+    "프로세스는 운영체제로부터 독립된 메모리를 할당받고, 스레드는 같은 프로세스 안에서 힙을 공유합니다. "
+    "그래서 스레드 간 컨텍스트 스위칭 비용이 더 작습니다.",
+    "인덱스는 b-tree 구조로 정렬되어 있어서 조건에 맞는 범위를 풀스캔 없이 찾을 수 있습니다. "
+    "다만 쓰기 시 인덱스 갱신 비용이 생깁니다.",
+    "REST에서는 리소스를 명사로 표현하고 http 메서드로 행위를 나타냅니다. PUT과 DELETE는 멱등성을 보장해야 합니다.",
+]
+
+
+def _sample_answer(rng: random.Random, mix: dict) -> str:
+    roll = rng.random()
+    acc = 0.0
+    for kind, share in mix.items():
+        acc += share
+        if roll < acc:
+            return rng.choice({"dont_know": _DONT_KNOW, "filler": _FILLER, "hedged": _HEDGED}.get(kind, _NORMAL))
+    return rng.choice(_NORMAL)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=20000)
+    parser.add_argument("--llm-sec", type=float, default=4.5, help="LLM 평가 1회 평균 지연 (절약 시간 추정용)")
+    parser.add_argument("--dont-know", type=float, default=0.12, help="모름 답변 비율")
+    parser.add_argument("--filler", type=float, default=0.05, help="잡음/빈 STT 비율")
+    parser.add_argument("--hedged", type=float, default=0.05, help="모름 + 내용이 섞인 답변 비율")
+    args = parser.parse_args()
+
+    prescore_service.reload_keyword_index(prescore_service.build_keyword_index(_QUESTIONS))
+    mix = {"dont_know": args.dont_know, "filler": args.filler, "hedged": args.hedged}
+    rng = random.Random(7)
+    cases = [(rng.choice(_QUESTIONS)[0], _sample_answer(rng, mix)) for _ in range(args.answers)]
+
+    reasons: Counter = Counter()
+    started = time.perf_counter()
+    for question, answer in cases:
+        pre = prescore_service.prescore(question, answer)
+        reasons[pre.reason if pre.short_circuit else "llm"] += 1
+    elapsed = time.perf_counter() - started
+
+    short = args.answers - reasons["llm"]
+    print(f"answers={args.answers} mix={mix} llm_sec={args.llm_sec}")
+    print(f"prescore: {elapsed / args.answers * 1e6:.1f} us/answer (total {elapsed * 1000:.1f} ms)")
+    print(f"short-circuit: {short} ({short / args.answers * 100:.1f}%) " + " ".join(f"{k}={v}" for k, v in sorted(reasons.items())))
+    print(
+        f"LLM calls avoided={short}  estimated LLM time saved={short * args.llm_sec:.0f}s "
+        f"({short * args.llm_sec / args.answers:.2f}s per turn on average)"
+    )
+
+
+if __name__ == "__main__":
+    main()
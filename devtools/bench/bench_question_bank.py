@@ -0,0 +1,113 @@
+"""
+File: bench_question_bank.py
+Created: 2026-10-19
+Description: QuestionBank 출제 비용 / 분포 측정
+             - 합성 질문 CSV(크기별)를 만들어 세션 1개가 질문 --picks개를 받는 동안의 출제 시간 비교
+               linear: 예전 방식 (asked 리스트로 set 재생성 + rows 순차 탐색 → 모든 세션이 같은 순서)
+               scan  : 예전 구조 그대로 무작위 출제 (미출제 행을 전부 걸러 낸 뒤 random.choice)
+               indexed: pick_for_state (비트맵 + topic 가중 무작위)
+             - 약점 topic 가중치가 실제 출제 비율에 반영되는지 확인
+
+실행: python -m devtools.bench.bench_question_bank --sizes 500,5000,50000 --picks 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from typing import List
+
+from ai.question_bank import QuestionBank, QuestionRow
+
+_TOPICS = ["python_basics", "python_internals", "data_structures", "algorithms", "concurrency", "web", "database", "testing"]
+_DIFFICULTIES = ["easy", "middle", "hard"]
+
+
+def _write_csv(path: str, n: int) -> None:
+    rng = random.Random(n)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["id", "question", "answer", "difficulty", "topic", "subcategory", "difficulty_score", "tags"])
+        for i in range(n):
+            topic = _TOPICS[i % len(_TOPICS)]
+            w.writerow([
+                f"q{i}", f"{topic} 질문 {i}", "모범 답안", rng.choice(_DIFFICULTIES), topic,
+                f"{topic}_sub{i % 5}", round(rng.uniform(1, 5), 1), f"{topic},tag{i % 17}",
+            ])
+
+
+def _linear_pick(bank: QuestionBank, asked_ids: List[str]) -> QuestionRow:
+    asked = set(str(x) for x in (asked_ids or []))
+    for q in bank.rows:
+        if q.id not in asked:
+            return q
+    raise RuntimeError("all asked")
+
+
+def _scan_pick(bank: QuestionBank, asked_ids: List[str]) -> QuestionRow:
+    asked = set(str(x) for x in (asked_ids or []))
+    return random.choice([q for q in bank.rows if q.id not in asked])
+
+
+def _session_linear(bank: QuestionBank, picks: int, pick=_linear_pick) -> float:
+    asked: List[str] = []
+    started = time.perf_counter()
+    for _ in range(picks):
+        q = pick(bank, asked)
+        asked.append(q.id)
+    return time.perf_counter() - started
+
+
+def _session_indexed(bank: QuestionBank, picks: int) -> float:
+    st = {"asked_question_ids": [], "asked_bitmap": None, "topic_weakness": {}}
+    started = time.perf_counter()
+    for _ in range(picks):
+        q = bank.pick_for_state(st)
+        st["question_row"] = q.to_dict()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="500,5000,50000")
+    parser.add_argument("--picks", type=int, default=40, help="세션당 출제 수")
+    parser.add_argument("--sessions", type=int, default=50)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="bench-qbank-")
+    print(f"picks/session={args.picks} sessions={args.sessions} (us per pick)")
+    print(f"{'rows':>7} {'linear':>9} {'scan':>9} {'indexed':>9}")
+    bank = None
+    for n in (int(x) for x in args.sizes.split(",")):
+        path = os.path.join(tmpdir, f"q{n}.csv")
+        _write_csv(path, n)
+        bank = QuestionBank(path)
+        total = args.picks * args.sessions
+        linear = sum(_session_linear(bank, args.picks) for _ in range(args.sessions)) / total * 1e6
+        scan = sum(_session_linear(bank, args.picks, _scan_pick) for _ in range(args.sessions)) / total * 1e6
+        indexed = sum(_session_indexed(bank, args.picks) for _ in range(args.sessions)) / total * 1e6
+        print(f"{n:>7} {linear:>9.1f} {scan:>9.1f} {indexed:>9.1f}")
+
+    # 분포: concurrency topic의 루브릭이 계속 낮게 나오는 세션
+    weak = {"rubric_hits": {"clarity": 1, "correctness": 1, "depth": 0, "structure": 1}}
+    good = {"rubric_hits": {"clarity": 5, "correctness": 5, "depth": 4, "structure": 5}}
+    topics: Counter = Counter()
+    for _ in range(args.sessions):
+        st = {"asked_question_ids": [], "asked_bitmap": None, "topic_weakness": {}}
+        for _ in range(args.picks):
+            q = bank.pick_for_state(st)
+            topics[q.topic] += 1
+            st["question_row"] = q.to_dict()
+            st["last_eval_json"] = weak if q.topic == "concurrency" else good
+    total = sum(topics.values())
+    print("topic share with a weak 'concurrency' topic (uniform = %.1f%%):" % (100 / len(_TOPICS)))
+    print("  " + "  ".join(f"{t}={c / total * 100:.1f}%" for t, c in topics.most_common()))
+
+
+if __name__ == "__main__":
+    main()
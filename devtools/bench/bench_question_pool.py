@@ -0,0 +1,152 @@
+"""
+File: bench_question_pool.py
+Created: 2026-10-19
+Description: 질문 풀 추출 비용 비교 (ORDER BY RAND() vs 메모리 캐시)
+             - 합성 question_pool / job_categories 테이블(크기별)을 만들고 같은 조건으로 --limit개씩 --iters번 추출
+               rand : 요청마다 JOIN + WHERE + ORDER BY RANDOM() LIMIT (sqlite 메모리 DB. MySQL ORDER BY RAND()와 같이
+                      조건에 맞는 행 전체를 읽어 정렬하므로 풀 크기에 비례해 느려진다)
+               cache: QuestionPoolCache.sample (같은 테이블을 한 번 읽어 둔 뒤 메모리에서 비복원 추출)
+             - 캐시 전체 로드 시간(refresh)도 함께 출력
+             - 이력서 키워드 검색: LIKE 체인 + 부족분 RAND 보충 질의(예전 get_questions_by_resume_keywords) vs 역색인
+             - 실제 MySQL은 네트워크 왕복이 더해지므로 rand 쪽 수치는 하한으로 보면 된다
+
+실행: python -m devtools.bench.bench_question_pool --sizes 500,5000,50000 --iters 200 --limit 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+from typing import List
+
+from backend.services.question_pool_cache import QuestionPoolCache
+
+_ROLES = ["Python 개발자", "Java 개발자", "프론트엔드 개발자", "데이터 엔지니어", "AI 엔지니어", "DevOps 엔지니어"]
+_DIFFICULTIES = ["Easy", "Medium", "Hard"]
+_TYPES = ["기술", "기술", "기술", "인성", "공통"]
+
+_SELECT = """
+    SELECT qp.id, qp.content AS question, qp.question_type, qp.difficulty,
+           qp.skill_tag, qp.keywords, jc.target_role
+    FROM question_pool qp
+    LEFT JOIN job_categories jc ON qp.category_id = jc.id
+"""
+
+
+def _build_db(n: int) -> sqlite3.Connection:
+    rng = random.Random(n)
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE job_categories (id INTEGER PRIMARY KEY, main_category TEXT, sub_category TEXT, target_role TEXT)")
+    conn.execute(
+        "CREATE TABLE question_pool (id INTEGER PRIMARY KEY, category_id INTEGER, question_type TEXT, skill_tag TEXT, "
+        "difficulty TEXT, content TEXT, reference_answer TEXT, keywords TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO job_categories VALUES (?, 'IT', '개발', ?)", [(i + 1, role) for i, role in enumerate(_ROLES)]
+    )
+    conn.executemany(
+        "INSERT INTO question_pool VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                i + 1, rng.randint(1, len(_ROLES)), rng.choice(_TYPES), f"skill{i % 40}", rng.choice(_DIFFICULTIES),
+                f"합성 질문 {i}", "모범 답안", f"kw{i % 97},kw{i % 131}",
+            )
+            for i in range(n)
+        ],
+    )
+    conn.commit()
+    return conn
+
+
+def _rand_query(conn: sqlite3.Connection, role: str, difficulty: str, q_type: str, limit: int) -> List[dict]:
+    cur = conn.execute(
+        _SELECT + " WHERE jc.target_role = ? AND qp.difficulty = ? AND qp.question_type = ? ORDER BY RANDOM() LIMIT ?",
+        (role, difficulty, q_type, limit),
+    )
+    return [dict(r) for r in cur.fetchall()]
+
+
+def _like_query(conn: sqlite3.Connection, role: str, difficulty: str, keywords: List[str], limit: int) -> List[dict]:
+    likes = " OR ".join("(qp.content LIKE ? OR qp.keywords LIKE ?)" for _ in keywords)
+    params: list = [role, difficulty]
+    for k in keywords:
+        params.extend([f"%{k}%", f"%{k}%"])
+    cur = conn.execute(
+        _SELECT + f" WHERE jc.target_role = ? AND qp.difficulty = ? AND ({likes}) ORDER BY RANDOM() LIMIT ?",
+        (*params, limit),
+    )
+    results = [dict(r) for r in cur.fetchall()]
+    if len(results) < limit:
+        seen = {r["id"] for r in results}
+        for r in _rand_query(conn, role, difficulty, "기술", limit * 2):
+            if r["id"] not in seen and len(results) < limit:
+                results.append(r)
+                seen.add(r["id"])
+    return results
+
+
+def _percentiles(samples: List[float]) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return f"p50={p50 * 1e6:9.1f}us  p95={p95 * 1e6:9.1f}us"
+
+
+def run(size: int, iters: int, limit: int) -> None:
+    conn = _build_db(size)
+    rng = random.Random(0)
+    queries = [(rng.choice(_ROLES), rng.choice(_DIFFICULTIES), "기술") for _ in range(iters)]
+
+    rand_times = []
+    for role, difficulty, q_type in queries:
+        started = time.perf_counter()
+        _rand_query(conn, role, difficulty, q_type, limit)
+        rand_times.append(time.perf_counter() - started)
+
+    cache = QuestionPoolCache(loader=lambda: conn.execute(_SELECT).fetchall(), ttl_sec=0)
+    started = time.perf_counter()
+    cache.refresh()
+    load_sec = time.perf_counter() - started
+
+    cache_times = []
+    for role, difficulty, q_type in queries:
+        started = time.perf_counter()
+        picked = cache.sample(role, difficulty, q_type, limit)
+        cache_times.append(time.perf_counter() - started)
+        assert len({q["id"] for q in picked}) == len(picked)
+
+    keyword_sets = [rng.sample([f"kw{i}" for i in range(131)], 4) for _ in range(iters)]
+    like_times, index_times = [], []
+    for (role, difficulty, _), keywords in zip(queries, keyword_sets):
+        started = time.perf_counter()
+        _like_query(conn, role, difficulty, keywords, limit)
+        like_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        cache.search_by_keywords(role, difficulty, keywords, limit)
+        index_times.append(time.perf_counter() - started)
+
+    speedup = statistics.median(rand_times) / max(statistics.median(cache_times), 1e-9)
+    kw_speedup = statistics.median(like_times) / max(statistics.median(index_times), 1e-9)
+    print(f"[pool={size:>7}] rand : {_percentiles(rand_times)}")
+    print(f"[pool={size:>7}] cache: {_percentiles(cache_times)}  (load {load_sec * 1000:.1f}ms, x{speedup:.0f})")
+    print(f"[pool={size:>7}] like : {_percentiles(like_times)}")
+    print(f"[pool={size:>7}] index: {_percentiles(index_times)}  (x{kw_speedup:.0f})")
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="500,5000,50000")
+    parser.add_argument("--iters", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        run(size, args.iters, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+File: bench_turn_logging.py
+Created: 2026-10-19
+Description: 면접 1턴 동안 요청 스레드에서 발생하는 로깅 비용 측정
+             - legacy : 기존 방식(print로 프롬프트 전문 + 프레임별 지표를 동기 출력)
+             - off    : 구조화 로깅 비활성화
+             - sampled: 구조화 로깅 + 기본 샘플링 비율
+             - full   : 구조화 로깅 + 모든 카테고리 100% 기록(큐 적재 비용 상한)
+
+실행: python -m devtools.bench.bench_turn_logging --turns 300 --frames 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from ai.prompts import EVAL_FEWSHOT, EVAL_JSON_SCHEMA_INSTRUCTIONS, SYSTEM_PROMPT_EVAL
+from backend.core import structured_log
+from backend.services.attitude_metrics_service import compute_frame_features
+
+# 68점 랜드마크를 face_recognition 그룹 형태로 흉내낸 합성 프레임
+_GROUP_SIZES = {
+    "chin": 17,
+    "left_eyebrow": 5,
+    "right_eyebrow": 5,
+    "nose_bridge": 4,
+    "nose_tip": 5,
+    "left_eye": 6,
+    "right_eye": 6,
+    "top_lip": 12,
+    "bottom_lip": 12,
+}
+_GROUP_Y = {
+    "chin": (150, 260),
+    "left_eyebrow": (95, 100),
+    "right_eyebrow": (95, 100),
+    "nose_bridge": (110, 150),
+    "nose_tip": (155, 165),
+    "left_eye": (115, 125),
+    "right_eye": (115, 125),
+    "top_lip": (190, 200),
+    "bottom_lip": (200, 215),
+}
+
+
+def synthetic_groups(rng: random.Random) -> dict:
+    groups = {}
+    for key, n in _GROUP_SIZES.items():
+        y0, y1 = _GROUP_Y[key]
+        groups[key] = [[100 + rng.uniform(0, 120), rng.uniform(y0, y1)] for _ in range(n)]
+    return groups
+
+
+def synthetic_prompts() -> tuple[str, str]:
+    sys_prompt = f"{SYSTEM_PROMPT_EVAL}\n\n{EVAL_JSON_SCHEMA_INSTRUCTIONS}\n\n{EVAL_FEWSHOT}"
+    user_prompt = "주어진 입력을 평가하라.\n" + ("GIL은 CPython의 전역 락입니다. " * 40)
+    return sys_prompt, user_prompt
+
+
+def _run_turn_legacy(sink, sys_prompt: str, user_prompt: str, frames: List[dict]) -> None:
+    # 기존 evaluate_and_respond / compute_frame_features의 print 동작 재현
+    print("\n[DEBUG][evaluate_and_respond] SYSTEM PROMPT START", file=sink)
+    print(sys_prompt, file=sink)
+    print("[DEBUG][evaluate_and_respond] USER PROMPT START", file=sink)
+    print(user_prompt, file=sink)
+    for groups in frames:
+        ff = compute_frame_features(groups)
+        print("[DEBUG][attitude_metrics] frame_values", ff, file=sink)
+    sink.flush()
+
+
+def _run_turn_structured(sys_prompt: str, user_prompt: str, frames: List[dict]) -> None:
+    if structured_log.should_log("llm.prompt"):
+        structured_log.emit("llm.prompt", "evaluate_and_respond.prompt", system_prompt=sys_prompt, user_prompt=user_prompt)
+    for groups in frames:
+        compute_frame_features(groups)
+    structured_log.log_event("interview.result", "generate_interview_response", score=7.5, feedback="피드백 " * 20)
+
+
+def measure(fn: Callable[[], None], turns: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(turns):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    samples.sort()
+    return {
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+        "p99_ms": samples[int(len(samples) * 0.99) - 1],
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--turns", type=int, default=300)
+    ap.add_argument("--frames", type=int, default=10, help="턴당 태도 분석 프레임 수")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    frames = [synthetic_groups(rng) for _ in range(args.frames)]
+    sys_prompt, user_prompt = synthetic_prompts()
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # 실제 디스크 I/O가 발생하도록 파일을 싱크로 사용
+        legacy_path = os.path.join(tmp, "legacy.log")
+        with open(legacy_path, "w", encoding="utf-8") as sink:
+            # legacy 측정 중에는 구조화 로그가 섞이지 않도록 끈다
+            structured_log.configure_logging(enabled=False, stream=sink)
+            results["legacy"] = measure(lambda: _run_turn_legacy(sink, sys_prompt, user_prompt, frames), args.turns)
+
+        structured_path = os.path.join(tmp, "structured.log")
+        with open(structured_path, "w", encoding="utf-8") as sink:
+            structured_log.configure_logging(enabled=False, stream=sink)
+            results["off"] = measure(lambda: _run_turn_structured(sys_prompt, user_prompt, frames), args.turns)
+
+            structured_log.configure_logging(enabled=True, stream=sink)
+            results["sampled"] = measure(lambda: _run_turn_structured(sys_prompt, user_prompt, frames), args.turns)
+
+            all_on = {k: 1.0 for k in structured_log.DEFAULT_SAMPLE_RATES}
+            structured_log.configure_logging(enabled=True, stream=sink, sample_rates=all_on)
+            results["full"] = measure(lambda: _run_turn_structured(sys_prompt, user_prompt, frames), args.turns)
+            structured_log.shutdown_logging()
+
+    print(f"turns={args.turns} frames/turn={args.frames} (요청 스레드 기준 지연)")
+    print(f"{'mode':<10}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for mode, r in results.items():
+        print(f"{mode:<10}{r['mean_ms']:>10.3f}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}{r['p99_ms']:>10.3f}")
+    print(f"dropped_records={structured_log.dropped_count()}")
+
+
+if __name__ == "__main__":
+    with contextlib.suppress(KeyboardInterrupt):
+        main(sys.argv[1:])
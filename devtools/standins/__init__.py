@@ -0,0 +1,112 @@
+"""
+File: devtools/standins/__init__.py
+Created: 2026-10-19
+Description: 외부 의존성(OpenAI / 워크넷 / Tavily / HF 랜드마크 Space / SMTP / Redis) 로컬 스탠드인 서버 모음
+             - start_all()로 모두 띄우고 env_exports()의 환경변수를 백엔드에 주면 오프라인으로 전체 흐름을 재현할 수 있다.
+             - 서버별 지연/오류: STANDIN_<NAME>_LATENCY="lognormal:0.4,0.5", STANDIN_<NAME>_FAULTS="error=0.05,statuses=429|503"
+               (NAME = OPENAI / WORKNET / TAVILY / LANDMARK / SMTP / REDIS), 난수 시드는 STANDIN_SEED
+
+실행: python -m devtools.standins  (포트 고정은 --base-port 18100)
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: 세션 상태 저장소용 Redis(RESP) 스탠드인 추가
+- 2026-10-19: OpenAI 스탠드인만 띄워 현재 프로세스 환경변수에 연결하는 use_openai_standin() 추가 (재채점 CLI / 평가 하네스 드라이런)
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Dict, Optional
+
+from devtools.standins.common import (
+    FaultProfile,
+    LatencyProfile,
+    RunningStandin,
+    StandinConfig,
+    serve_in_thread,
+)
+from devtools.standins.landmark_standin import LandmarkStandinHandler
+from devtools.standins.openai_standin import OpenAIStandinHandler
+from devtools.standins.redis_standin import serve_redis_in_thread
+from devtools.standins.smtp_standin import serve_smtp_in_thread
+from devtools.standins.tavily_standin import TavilyStandinHandler
+from devtools.standins.worknet_standin import WorknetStandinHandler
+
+# 이름 → (핸들러, 기본 지연 분포). 기본값은 실제 API의 대략적인 중앙값 수준
+HTTP_STANDINS = {
+    "openai": (OpenAIStandinHandler, "lognormal:0.6,0.5"),
+    "worknet": (WorknetStandinHandler, "lognormal:0.3,0.4"),
+    "tavily": (TavilyStandinHandler, "lognormal:0.8,0.4"),
+    "landmark": (LandmarkStandinHandler, "lognormal:0.25,0.3"),
+}
+SMTP_DEFAULT_LATENCY = "uniform:0.05,0.2"
+REDIS_DEFAULT_LATENCY = "fixed:0"
+
+
+def start_all(
+    host: str = "127.0.0.1",
+    base_port: int = 0,
+    configs: Optional[Dict[str, StandinConfig]] = None,
+) -> Dict[str, RunningStandin]:
+    """모든 스탠드인을 백그라운드로 기동. base_port=0이면 빈 포트 자동 할당, 아니면 base_port부터 순서대로"""
+    configs = configs or {}
+    running: Dict[str, RunningStandin] = {}
+    for i, (name, (handler, default_latency)) in enumerate(HTTP_STANDINS.items()):
+        cfg = configs.get(name) or StandinConfig.from_env(name, default_latency)
+        running[name] = serve_in_thread(handler, cfg, host, base_port + i if base_port else 0)
+    smtp_cfg = configs.get("smtp") or StandinConfig.from_env("smtp", SMTP_DEFAULT_LATENCY)
+    running["smtp"] = serve_smtp_in_thread(smtp_cfg, host, base_port + len(HTTP_STANDINS) if base_port else 0)
+    redis_cfg = configs.get("redis") or StandinConfig.from_env("redis", REDIS_DEFAULT_LATENCY)
+    running["redis"] = serve_redis_in_thread(redis_cfg, host, base_port + len(HTTP_STANDINS) + 1 if base_port else 0)
+    return running
+
+
+def stop_all(running: Dict[str, RunningStandin]) -> None:
+    for r in running.values():
+        r.stop()
+
+
+def env_exports(running: Dict[str, RunningStandin]) -> Dict[str, str]:
+    """백엔드/프론트를 스탠드인에 연결하는 환경변수"""
+    env: Dict[str, str] = {}
+    if "openai" in running:
+        env["OPENAI_BASE_URL"] = f"{running['openai'].url}/v1"
+        env["OPENAI_API_KEY"] = "sk-standin"
+    if "tavily" in running:
+        env["TAVILY_BASE_URL"] = running["tavily"].url
+        env["TAVILY_API_KEY"] = "tvly-standin"
+    if "worknet" in running:
+        env["WORKNET_URL_BASE"] = f"{running['worknet'].url}/cgi-bin/openapi.do"
+        env["WORKNET_API_KEY"] = "standin"
+    if "landmark" in running:
+        env["HF_LANDMARK_STANDIN_URL"] = running["landmark"].url
+    if "smtp" in running:
+        env["SMTP_HOST"] = running["smtp"].host
+        env["SMTP_PORT"] = str(running["smtp"].port)
+        env["SMTP_STARTTLS"] = "false"
+        env["SENDER_EMAIL"] = "noreply@standin.local"
+        env["APP_PASSWORD"] = "standin"
+    if "redis" in running:
+        env["STATE_STORE_URL"] = f"{running['redis'].url}/0"
+    return env
+
+
+def use_openai_standin(host: str = "127.0.0.1") -> RunningStandin:
+    """OpenAI 스탠드인 하나만 띄우고 이 프로세스의 OPENAI_BASE_URL / OPENAI_API_KEY를 그쪽으로 돌린다 (클라이언트 생성 전에 호출)"""
+    handler, default_latency = HTTP_STANDINS["openai"]
+    running = serve_in_thread(handler, StandinConfig.from_env("openai", default_latency), host)
+    os.environ.update(env_exports({"openai": running}))
+    return running
+
+
+__all__ = [
+    "FaultProfile",
+    "LatencyProfile",
+    "RunningStandin",
+    "StandinConfig",
+    "start_all",
+    "stop_all",
+    "env_exports",
+    "use_openai_standin",
+]
@@ -0,0 +1,77 @@
+"""
+File: devtools/standins/__main__.py
+Created: 2026-10-19
+Description: 스탠드인 서버를 모두 띄우고 연결용 export 문을 출력한 뒤 Ctrl+C까지 대기
+
+예: python -m devtools.standins --base-port 18100 --latency openai=lognormal:1.2,0.6 --faults openai=error=0.05
+
+Modification History:
+- 2026-10-19: 초기 생성
+- 2026-10-19: Redis 스탠드인 기본 지연 등록
+"""
+
+from __future__ import annotations
+
+import argparse
+import shlex
+import time
+
+from devtools.standins import (
+    HTTP_STANDINS,
+    REDIS_DEFAULT_LATENCY,
+    SMTP_DEFAULT_LATENCY,
+    env_exports,
+    start_all,
+    stop_all,
+)
+from devtools.standins.common import FaultProfile, LatencyProfile, StandinConfig
+
+
+def _parse_overrides(values):
+    out = {}
+    for v in values or []:
+        name, _, spec = v.partition("=")
+        out[name.strip().lower()] = spec
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="외부 API 스탠드인 서버")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--base-port", type=int, default=0, help="0이면 빈 포트 자동 할당")
+    ap.add_argument("--latency", action="append", help="name=분포 (예: openai=lognormal:0.6,0.5)")
+    ap.add_argument("--faults", action="append", help="name=설정 (예: openai=error=0.05,statuses=429|503)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    latency = _parse_overrides(args.latency)
+    faults = _parse_overrides(args.faults)
+    configs = {}
+    defaults = {name: d for name, (_h, d) in HTTP_STANDINS.items()}
+    defaults["smtp"] = SMTP_DEFAULT_LATENCY
+    defaults["redis"] = REDIS_DEFAULT_LATENCY
+    for name, default_latency in defaults.items():
+        cfg = StandinConfig.from_env(name, default_latency)
+        if name in latency:
+            cfg.latency = LatencyProfile.parse(latency[name])
+        if name in faults:
+            cfg.faults = FaultProfile.parse(faults[name])
+        if args.seed:
+            cfg.seed = args.seed
+        configs[name] = cfg
+
+    running = start_all(args.host, args.base_port, configs)
+    for name, r in running.items():
+        cfg = configs[name]
+        print(f"# {name:<9} {r.url:<28} latency={cfg.latency} error_rate={cfg.faults.error_rate}")
+    for k, v in env_exports(running).items():
+        print(f"export {k}={shlex.quote(v)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stop_all(running)
+
+
+if __name__ == "__main__":
+    main()
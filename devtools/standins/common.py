@@ -0,0 +1,325 @@
+"""
+File: common.py
+Created: 2026-10-19
+Description: 스탠드인 서버 공통 기반
+             - 지연 분포(fixed/uniform/normal/lognormal)와 오류 주입(상태 코드 / 연결 끊기 / 무응답)
+             - 표준 라이브러리 ThreadingHTTPServer 기반, 백그라운드 스레드로 기동/종료
+             - 응답 본문은 요청 내용의 해시로 결정되므로 같은 입력이면 항상 같은 결과
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def stable_hash(*parts: Any) -> int:
+    """입력값으로부터 결정적인 64비트 정수 생성 (PYTHONHASHSEED 영향 없음)"""
+    h = hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).digest()
+    return int.from_bytes(h[:8], "big")
+
+
+@dataclass
+class LatencyProfile:
+    """
+    요청 1건당 지연 시간 분포 (초)
+    - fixed:     value
+    - uniform:   [low, high]
+    - normal:    mean, stddev (0 미만은 0으로 자름)
+    - lognormal: median, sigma (꼬리가 긴 실제 API 지연에 가까움)
+    """
+
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyProfile":
+        """'lognormal:0.4,0.5' / 'uniform:0.1,0.3' / 'fixed:0.2' / '0.2' 형식"""
+        spec = (spec or "").strip()
+        if not spec:
+            return cls()
+        if ":" not in spec:
+            return cls("fixed", float(spec))
+        kind, args = spec.split(":", 1)
+        nums = [float(x) for x in args.split(",") if x.strip()]
+        nums += [0.0] * (2 - len(nums))
+        kind = kind.strip().lower()
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"알 수 없는 지연 분포: {kind}")
+        return cls(kind, nums[0], nums[1])
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(self.a, self.b))
+        if self.kind == "lognormal":
+            if self.a <= 0:
+                return 0.0
+            return rng.lognormvariate(0.0, self.b) * self.a
+        return max(0.0, self.a)
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.a},{self.b}" if self.kind != "fixed" else f"fixed:{self.a}"
+
+
+@dataclass
+class FaultProfile:
+    """
+    오류 주입 설정
+    - error_rate: 이 확률로 error_statuses 중 하나를 응답 (429면 Retry-After 헤더 포함)
+    - drop_rate:  이 확률로 응답 없이 연결을 끊음 (연결 오류 재현)
+    - hang_rate:  이 확률로 hang_sec 동안 응답하지 않음 (클라이언트 타임아웃 재현)
+    """
+
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (429, 500, 503)
+    retry_after_sec: float = 1.0
+    drop_rate: float = 0.0
+    hang_rate: float = 0.0
+    hang_sec: float = 30.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "FaultProfile":
+        """'error=0.05,statuses=429|503,drop=0.01,hang=0.01,hang_sec=20,retry_after=2' 형식"""
+        fp = cls()
+        for part in (spec or "").split(","):
+            if "=" not in part:
+                continue
+            k, v = (x.strip() for x in part.split("=", 1))
+            if k == "error":
+                fp.error_rate = float(v)
+            elif k == "statuses":
+                fp.error_statuses = tuple(int(x) for x in v.split("|") if x)
+            elif k == "retry_after":
+                fp.retry_after_sec = float(v)
+            elif k == "drop":
+                fp.drop_rate = float(v)
+            elif k == "hang":
+                fp.hang_rate = float(v)
+            elif k == "hang_sec":
+                fp.hang_sec = float(v)
+        return fp
+
+
+@dataclass
+class StandinConfig:
+    name: str
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    faults: FaultProfile = field(default_factory=FaultProfile)
+    seed: int = 0
+
+    @classmethod
+    def from_env(cls, name: str, default_latency: str = "") -> "StandinConfig":
+        """STANDIN_<NAME>_LATENCY / STANDIN_<NAME>_FAULTS / STANDIN_SEED 환경변수에서 읽는다."""
+        key = name.upper()
+        return cls(
+            name=name,
+            latency=LatencyProfile.parse(os.getenv(f"STANDIN_{key}_LATENCY", default_latency)),
+            faults=FaultProfile.parse(os.getenv(f"STANDIN_{key}_FAULTS", "")),
+            seed=int(os.getenv("STANDIN_SEED", "0")),
+        )
+
+
+class StandinStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self.injected: Dict[str, int] = {}
+
+    def hit(self, route: str) -> None:
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def fault(self, kind: str) -> None:
+        with self._lock:
+            self.injected[kind] = self.injected.get(kind, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {"requests": dict(self.requests), "injected": dict(self.injected)}
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """
+    하위 클래스는 routes()에서 (method, path) -> 메서드명 매핑을 돌려준다.
+    path가 '*'이면 모든 경로에 매칭. 지연/오류 주입은 라우트 실행 전에 공통 처리.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server: "StandinHTTPServer"
+
+    def routes(self) -> Dict[Tuple[str, str], str]:
+        return {}
+
+    # 기본 access log 출력 억제 (벤치마크 중 stderr I/O 방지)
+    def log_message(self, format: str, *args: Any) -> None:
+        if os.getenv("STANDIN_VERBOSE"):
+            super().log_message(format, *args)
+
+    # ─── 요청/응답 유틸 ──────────────────────────────────
+    @property
+    def path_only(self) -> str:
+        return self.path.split("?", 1)[0]
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length > 0 else b""
+
+    def read_json(self) -> Dict[str, Any]:
+        raw = self.read_body()
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except Exception:
+            return {}
+
+    def send_bytes(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status: int, obj: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_bytes(status, body, "application/json", headers)
+
+    def start_sse(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def send_sse(self, data: str) -> None:
+        self.wfile.write(f"data: {data}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    # ─── 공통 처리 ───────────────────────────────────────
+    def _dispatch(self, method: str) -> None:
+        table = self.routes()
+        name = table.get((method, self.path_only)) or table.get((method, "*"))
+        if name is None:
+            if self.path_only == "/__stats" and method == "GET":
+                self.send_json(200, self.server.stats.snapshot())
+                return
+            self.send_json(404, {"error": {"message": f"no route {method} {self.path_only}"}})
+            return
+
+        self.server.stats.hit(f"{method} {self.path_only}")
+        if self._inject_fault():
+            return
+        delay = self.server.next_delay()
+        if delay > 0:
+            time.sleep(delay)
+        getattr(self, name)()
+
+    def _inject_fault(self) -> bool:
+        fp = self.server.config.faults
+        roll = self.server.roll()
+        if roll < fp.drop_rate:
+            self.server.stats.fault("drop")
+            self.close_connection = True
+            try:
+                self.connection.shutdown(2)
+            except OSError:
+                pass
+            return True
+        roll -= fp.drop_rate
+        if roll < fp.hang_rate:
+            self.server.stats.fault("hang")
+            time.sleep(fp.hang_sec)
+            self.close_connection = True
+            return True
+        roll -= fp.hang_rate
+        if roll < fp.error_rate and fp.error_statuses:
+            status = fp.error_statuses[int(self.server.roll() * len(fp.error_statuses)) % len(fp.error_statuses)]
+            self.server.stats.fault(str(status))
+            # 요청 본문을 비워야 keep-alive 연결이 꼬이지 않는다
+            self.read_body()
+            headers = {"Retry-After": f"{fp.retry_after_sec:g}"} if status == 429 else None
+            self.send_json(status, {"error": {"message": f"injected {status}", "type": "standin_fault"}}, headers)
+            return True
+        return False
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+
+class StandinHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, addr: Tuple[str, int], handler: type, config: StandinConfig):
+        super().__init__(addr, handler)
+        self.config = config
+        self.stats = StandinStats()
+        self._rng = random.Random(config.seed or stable_hash(config.name))
+        self._rng_lock = threading.Lock()
+
+    def roll(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def next_delay(self) -> float:
+        with self._rng_lock:
+            return self.config.latency.sample(self._rng)
+
+
+class RunningStandin:
+    """백그라운드 스레드에서 도는 스탠드인 서버 핸들"""
+
+    def __init__(self, server: Any, thread: threading.Thread, scheme: str = "http"):
+        self.server = server
+        self.thread = thread
+        self.scheme = scheme
+
+    @property
+    def host(self) -> str:
+        return self.server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"{self.scheme}://{self.host}:{self.port}"
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join(timeout=5)
+
+
+def serve_in_thread(
+    handler: type, config: StandinConfig, host: str = "127.0.0.1", port: int = 0
+) -> RunningStandin:
+    """port=0이면 빈 포트를 자동 할당"""
+    server = StandinHTTPServer((host, port), handler, config)
+    thread = threading.Thread(target=server.serve_forever, name=f"standin-{config.name}", daemon=True)
+    thread.start()
+    return RunningStandin(server, thread)
+
+
+def split_words(text: str) -> List[str]:
+    return [w for w in (text or "").replace("\n", " ").split(" ") if w]
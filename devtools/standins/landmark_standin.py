@@ -0,0 +1,81 @@
+"""
+File: landmark_standin.py
+Created: 2026-10-19
+Description: Hugging Face 랜드마크 Space 스탠드인 (HF_LANDMARK_STANDIN_URL=http://127.0.0.1:<port>)
+             - POST /infer  {"image_b64": "..."} → face_recognition 형식 68점 그룹 JSON
+             gradio 프로토콜 대신 단순 REST로 응답하며, hf_landmark_service가 위 환경변수가 있으면 이 경로를 쓴다.
+             이미지 해시로 머리 방향/입 벌림 정도가 정해지므로 같은 프레임은 항상 같은 랜드마크를 돌려준다.
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import Dict, List
+
+from devtools.standins.common import StandinHandler, stable_hash
+
+# (그룹, 점 개수) — face_recognition.face_landmarks 순서
+GROUP_LAYOUT = [
+    ("chin", 17),
+    ("left_eyebrow", 5),
+    ("right_eyebrow", 5),
+    ("nose_bridge", 4),
+    ("nose_tip", 5),
+    ("left_eye", 6),
+    ("right_eye", 6),
+    ("top_lip", 12),
+    ("bottom_lip", 12),
+]
+
+
+def _arc(cx: float, cy: float, rx: float, ry: float, a0: float, a1: float, n: int) -> List[List[float]]:
+    if n == 1:
+        return [[cx, cy]]
+    return [
+        [cx + rx * math.cos(a0 + (a1 - a0) * i / (n - 1)), cy + ry * math.sin(a0 + (a1 - a0) * i / (n - 1))]
+        for i in range(n)
+    ]
+
+
+def synthetic_face(seed: int, size: float = 240.0) -> Dict[str, List[List[int]]]:
+    """
+    seed로 yaw(좌우) / pitch(상하) / 입 벌림 / 눈 뜸을 정한 68점 얼굴.
+    좌표계는 size×size 이미지 기준 픽셀 정수 (Space 응답과 동일하게 int)
+    """
+    rng = random.Random(seed)
+    yaw = rng.gauss(0.0, 0.08) * size
+    pitch = rng.gauss(0.0, 0.06) * size
+    mouth_open = max(0.0, rng.gauss(0.04, 0.04)) * size
+    eye_open = max(0.01, rng.gauss(0.035, 0.01)) * size
+    cx, cy = size / 2, size / 2
+    nx, ny = cx + yaw, cy + pitch
+
+    groups = {
+        "chin": _arc(cx, cy - 0.05 * size, 0.38 * size, 0.45 * size, 0.0, math.pi, 17),
+        "left_eyebrow": _arc(cx - 0.18 * size, cy - 0.2 * size, 0.1 * size, 0.03 * size, math.pi, 2 * math.pi, 5),
+        "right_eyebrow": _arc(cx + 0.18 * size, cy - 0.2 * size, 0.1 * size, 0.03 * size, math.pi, 2 * math.pi, 5),
+        "nose_bridge": [[nx, cy - 0.12 * size + i * 0.05 * size + pitch * 0.5] for i in range(4)],
+        "nose_tip": _arc(nx, ny + 0.1 * size, 0.06 * size, 0.02 * size, 0.0, math.pi, 5),
+        "left_eye": _arc(cx - 0.17 * size, cy - 0.1 * size, 0.06 * size, eye_open / 2, 0.0, 2 * math.pi * 5 / 6, 6),
+        "right_eye": _arc(cx + 0.17 * size, cy - 0.1 * size, 0.06 * size, eye_open / 2, 0.0, 2 * math.pi * 5 / 6, 6),
+        "top_lip": _arc(nx, cy + 0.22 * size, 0.14 * size, 0.03 * size, math.pi, 2 * math.pi, 12),
+        "bottom_lip": _arc(nx, cy + 0.22 * size + mouth_open, 0.14 * size, 0.04 * size, 0.0, math.pi, 12),
+    }
+    return {k: [[int(round(x)), int(round(y))] for x, y in pts] for k, pts in groups.items()}
+
+
+class LandmarkStandinHandler(StandinHandler):
+    def routes(self):
+        return {("POST", "/infer"): "infer"}
+
+    def infer(self) -> None:
+        req = self.read_json()
+        image_b64 = str(req.get("image_b64", ""))
+        if not image_b64:
+            self.send_json(400, {"error": "image_b64 is required"})
+            return
+        self.send_json(200, synthetic_face(stable_hash("landmark", image_b64)))
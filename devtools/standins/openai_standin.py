@@ -0,0 +1,341 @@
+"""
+File: openai_standin.py
+Created: 2026-10-19
+Description: OpenAI API 스탠드인 (OPENAI_BASE_URL=http://127.0.0.1:<port>/v1 로 연결)
+             - POST /v1/chat/completions  (stream=True 시 SSE, stream_options.include_usage 지원)
+             - POST /v1/responses
+             - POST /v1/embeddings        (float / base64 인코딩)
+             - POST /v1/audio/speech      (무음 WAV)
+             JSON 모드(response_format / text.format / 프롬프트 내 "JSON")에서는
+             평가·이력서 분석 스키마 키를 모두 채운 객체를, json_schema가 주어지면 스키마에 맞는 객체를 돌려준다.
+             같은 프롬프트 접두어(1024토큰 이상)가 반복되면 cached_tokens를 채워 프롬프트 캐시를 흉내낸다.
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import json
+import math
+import os
+import random
+import re
+import struct
+import threading
+import time
+import wave
+from typing import Any, Dict, List, Optional, Tuple
+
+from devtools.standins.common import StandinHandler, stable_hash
+
+_WORDS = [
+    "핵심", "개념을", "잘", "설명해", "주셨습니다", "다만", "예시가", "조금", "부족했고",
+    "트레이드오프에", "대한", "언급이", "있었다면", "더", "좋았을", "것", "같습니다",
+    "실무", "관점에서", "성능과", "안정성을", "함께", "고려해", "보세요",
+]
+_KEYWORDS = ["Python", "FastAPI", "MySQL", "Docker", "Redis", "AWS", "PyTorch", "LangChain"]
+
+_CACHE_MIN_TOKENS = 1024
+_CACHE_BLOCK = 128
+_seen_prefixes: set = set()
+_seen_lock = threading.Lock()
+
+
+def approx_tokens(text: str) -> int:
+    return max(1, len(text) // 2)
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for p in content:
+            if isinstance(p, dict):
+                parts.append(str(p.get("text") or p.get("input_text") or ""))
+            else:
+                parts.append(str(p))
+        return "".join(parts)
+    return "" if content is None else str(content)
+
+
+def messages_text(messages: Any) -> Tuple[str, str]:
+    """(전체 프롬프트, 첫 user 메시지 이전까지의 접두어) — 접두어는 캐시 판정용"""
+    if isinstance(messages, str):
+        return messages, ""
+    full: List[str] = []
+    prefix: List[str] = []
+    seen_user = False
+    for m in messages or []:
+        if not isinstance(m, dict):
+            continue
+        text = _content_text(m.get("content"))
+        full.append(text)
+        if m.get("role") == "user":
+            seen_user = True
+        if not seen_user:
+            prefix.append(text)
+    return "\n".join(full), "\n".join(prefix)
+
+
+def cached_tokens_for(prefix: str) -> int:
+    """동일 접두어가 두 번째로 들어오면 128토큰 단위로 캐시 적중 처리"""
+    tokens = approx_tokens(prefix) if prefix else 0
+    if tokens < _CACHE_MIN_TOKENS:
+        return 0
+    key = stable_hash(prefix)
+    with _seen_lock:
+        hit = key in _seen_prefixes
+        _seen_prefixes.add(key)
+    return (tokens // _CACHE_BLOCK) * _CACHE_BLOCK if hit else 0
+
+
+def plain_reply(prompt: str, max_tokens: Optional[int]) -> str:
+    if "쉼표" in prompt or "comma" in prompt.lower():
+        start = stable_hash(prompt) % len(_KEYWORDS)
+        return ", ".join(_KEYWORDS[(start + i) % len(_KEYWORDS)] for i in range(3))
+    rng = random.Random(stable_hash(prompt))
+    n = rng.randint(25, 60)
+    if max_tokens:
+        n = min(n, max(1, int(max_tokens) // 2))
+    return " ".join(rng.choice(_WORDS) for _ in range(n)) + "."
+
+
+def universal_json(prompt: str) -> Dict[str, Any]:
+    """평가(evaluate_and_respond / ai.evaluator)와 이력서 분석 응답 키를 모두 포함한 객체"""
+    rng = random.Random(stable_hash(prompt))
+    score = int(max(0, min(100, rng.gauss(65, 18))))
+    m = re.search(r'"(?:question_)?id"\s*:\s*"([^"]+)"', prompt)
+    follow_up = score <= 40
+    rubric = {k: max(0, min(5, round(score / 20 + rng.uniform(-1, 1)))) for k in ("clarity", "correctness", "depth", "structure")}
+    start = stable_hash(prompt, "kw") % len(_KEYWORDS)
+    return {
+        "question_id": m.group(1) if m else "standin",
+        "score": score,
+        "passed": score >= 60,
+        "feedback": plain_reply(prompt + "feedback", 40),
+        "strengths": ["핵심 개념을 정확히 언급함"],
+        "weaknesses": ["구체적인 예시 부족"],
+        "missing_points": ["트레이드오프 설명"] if score < 80 else [],
+        "follow_up_needed": follow_up,
+        "follow_up_question": "방금 말씀하신 내용을 실제 프로젝트에서 어떻게 적용하셨나요?" if follow_up else "",
+        "next_question_translated": "" if follow_up else "좋습니다. 그럼 다음 질문 드리겠습니다.",
+        "rubric_hits": rubric,
+        "evidence": [],
+        "keywords": [_KEYWORDS[(start + i) % len(_KEYWORDS)] for i in range(4)],
+        "expected_questions": [
+            "이력서에 적힌 프로젝트에서 가장 어려웠던 기술적 문제는 무엇이었나요?",
+            "해당 기술을 선택한 이유와 대안은 무엇이었나요?",
+            "성능 문제를 어떻게 측정하고 개선했나요?",
+        ],
+        "match_rate": score,
+        "match_feedback": "직무 관련 경험이 잘 드러납니다. 정량적인 성과를 보완하면 좋겠습니다.",
+    }
+
+
+def from_schema(schema: Dict[str, Any], seed: int, defs: Optional[Dict[str, Any]] = None) -> Any:
+    """JSON Schema(구조화 출력에서 쓰는 부분집합)를 만족하는 결정적 값 생성"""
+    defs = defs if defs is not None else (schema.get("$defs") or schema.get("definitions") or {})
+    if "$ref" in schema:
+        return from_schema(defs.get(schema["$ref"].rsplit("/", 1)[-1], {}), seed, defs)
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"] or schema[key]
+            return from_schema(options[0], seed, defs)
+    if "enum" in schema:
+        return schema["enum"][seed % len(schema["enum"])]
+    if "const" in schema:
+        return schema["const"]
+    t = schema.get("type")
+    if isinstance(t, list):
+        t = next((x for x in t if x != "null"), "null")
+    rng = random.Random(seed)
+    if t == "object":
+        props = schema.get("properties", {})
+        return {k: from_schema(v, stable_hash(seed, k), defs) for k, v in props.items()}
+    if t == "array":
+        n = max(int(schema.get("minItems", 1)), min(int(schema.get("maxItems", 2)), 2))
+        return [from_schema(schema.get("items", {}), stable_hash(seed, i), defs) for i in range(n)]
+    if t == "integer":
+        lo, hi = int(schema.get("minimum", 0)), int(schema.get("maximum", 100))
+        return rng.randint(lo, hi)
+    if t == "number":
+        lo, hi = float(schema.get("minimum", 0)), float(schema.get("maximum", 1))
+        return round(rng.uniform(lo, hi), 3)
+    if t == "boolean":
+        return rng.random() < 0.5
+    if t == "null":
+        return None
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(3, 8)))
+
+
+def _json_mode(fmt: Any, prompt: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    if isinstance(fmt, dict):
+        if fmt.get("type") == "json_schema":
+            schema = fmt.get("schema") or (fmt.get("json_schema") or {}).get("schema") or {}
+            return True, schema
+        if fmt.get("type") == "json_object":
+            return True, None
+    return ("JSON" in prompt), None
+
+
+def reply_for(prompt: str, fmt: Any, max_tokens: Optional[int]) -> str:
+    is_json, schema = _json_mode(fmt, prompt)
+    if is_json and schema:
+        return json.dumps(from_schema(schema, stable_hash(prompt)), ensure_ascii=False)
+    if is_json:
+        return json.dumps(universal_json(prompt), ensure_ascii=False)
+    return plain_reply(prompt, max_tokens)
+
+
+def silent_wav(seconds: float, sample_rate: int = 16000) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(b"\x00\x00" * int(seconds * sample_rate))
+    return buf.getvalue()
+
+
+def embedding_vector(text: str, dims: int) -> List[float]:
+    rng = random.Random(stable_hash("emb", text))
+    v = [rng.gauss(0.0, 1.0) for _ in range(dims)]
+    norm = math.sqrt(sum(x * x for x in v)) or 1.0
+    return [x / norm for x in v]
+
+
+class OpenAIStandinHandler(StandinHandler):
+    # SSE 청크 사이 지연 (토큰 생성 속도 흉내)
+    chunk_delay_sec = float(os.getenv("STANDIN_OPENAI_CHUNK_DELAY", "0.01"))
+
+    def routes(self):
+        return {
+            ("POST", "/v1/chat/completions"): "chat_completions",
+            ("POST", "/v1/responses"): "create_response",
+            ("POST", "/v1/embeddings"): "embeddings",
+            ("POST", "/v1/audio/speech"): "audio_speech",
+        }
+
+    def chat_completions(self) -> None:
+        req = self.read_json()
+        model = req.get("model", "gpt-4o-mini")
+        prompt, prefix = messages_text(req.get("messages"))
+        text = reply_for(prompt, req.get("response_format"), req.get("max_tokens") or req.get("max_completion_tokens"))
+        usage = {
+            "prompt_tokens": approx_tokens(prompt),
+            "completion_tokens": approx_tokens(text),
+            "prompt_tokens_details": {"cached_tokens": cached_tokens_for(prefix)},
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        cid = f"chatcmpl-standin-{stable_hash(prompt) % 10**12}"
+        created = int(time.time())
+
+        if not req.get("stream"):
+            self.send_json(200, {
+                "id": cid,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text, "refusal": None},
+                    "finish_reason": "stop",
+                    "logprobs": None,
+                }],
+                "usage": usage,
+            })
+            return
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> str:
+            return json.dumps({
+                "id": cid, "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish, "logprobs": None}],
+            }, ensure_ascii=False)
+
+        self.start_sse()
+        self.send_sse(chunk({"role": "assistant", "content": ""}))
+        pieces = re.findall(r"\S+\s*", text) or [text]
+        for piece in pieces:
+            if self.chunk_delay_sec > 0:
+                time.sleep(self.chunk_delay_sec)
+            self.send_sse(chunk({"content": piece}))
+        self.send_sse(chunk({}, "stop"))
+        if (req.get("stream_options") or {}).get("include_usage"):
+            self.send_sse(json.dumps({
+                "id": cid, "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [], "usage": usage,
+            }))
+        self.send_sse("[DONE]")
+
+    def create_response(self) -> None:
+        req = self.read_json()
+        model = req.get("model", "gpt-4.1-mini")
+        inp = req.get("input")
+        prompt, prefix = messages_text(inp)
+        if req.get("instructions"):
+            prompt = f"{req['instructions']}\n{prompt}"
+            prefix = f"{req['instructions']}\n{prefix}"
+        fmt = (req.get("text") or {}).get("format")
+        text = reply_for(prompt, fmt, req.get("max_output_tokens"))
+        in_tokens = approx_tokens(prompt)
+        out_tokens = approx_tokens(text)
+        rid = stable_hash(prompt) % 10**12
+        self.send_json(200, {
+            "id": f"resp_standin_{rid}",
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": "completed",
+            "model": model,
+            "output": [{
+                "type": "message",
+                "id": f"msg_standin_{rid}",
+                "status": "completed",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }],
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "error": None,
+            "incomplete_details": None,
+            "instructions": req.get("instructions"),
+            "metadata": {},
+            "usage": {
+                "input_tokens": in_tokens,
+                "input_tokens_details": {"cached_tokens": cached_tokens_for(prefix)},
+                "output_tokens": out_tokens,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": in_tokens + out_tokens,
+            },
+        })
+
+    def embeddings(self) -> None:
+        req = self.read_json()
+        inputs = req.get("input")
+        if isinstance(inputs, str) or (isinstance(inputs, list) and inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        inputs = [i if isinstance(i, str) else json.dumps(i) for i in (inputs or [])]
+        dims = int(req.get("dimensions") or 1536)
+        as_b64 = req.get("encoding_format") == "base64"
+        data = []
+        for idx, text in enumerate(inputs):
+            vec = embedding_vector(text, dims)
+            emb: Any = base64.b64encode(struct.pack(f"<{dims}f", *vec)).decode("ascii") if as_b64 else vec
+            data.append({"object": "embedding", "index": idx, "embedding": emb})
+        tokens = sum(approx_tokens(t) for t in inputs)
+        self.send_json(200, {
+            "object": "list",
+            "data": data,
+            "model": req.get("model", "text-embedding-3-small"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+    def audio_speech(self) -> None:
+        req = self.read_json()
+        # 한국어 낭독 속도 ≈ 초당 6~7글자. 포맷과 무관하게 WAV를 돌려준다(브라우저/soundfile 모두 재생 가능)
+        seconds = max(0.5, len(str(req.get("input", ""))) / 6.5)
+        self.send_bytes(200, silent_wav(seconds), "audio/wav")
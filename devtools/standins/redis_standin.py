@@ -0,0 +1,220 @@
+"""
+File: redis_standin.py
+Created: 2026-10-19
+Description: Redis(RESP2) 스탠드인 (STATE_STORE_URL=redis://127.0.0.1:<port>/0)
+             - 세션 상태 저장소가 쓰는 명령만 지원: PING, ECHO, SELECT, CLIENT, GET, SET(EX/PX/NX/XX), DEL,
+               EXISTS, EXPIRE, TTL, PTTL, DBSIZE, FLUSHDB, FLUSHALL
+             - 값은 메모리에 보관하고 만료는 조회 시점에 판단
+             - 명령마다 지연을 넣고, 오류 주입 시 -ERR 응답 / drop 주입 시 연결 종료
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+from __future__ import annotations
+
+import random
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from devtools.standins.common import RunningStandin, StandinConfig, StandinStats, stable_hash
+
+
+class RedisStandinHandler(socketserver.StreamRequestHandler):
+    server: "RedisStandinServer"
+
+    # ─── RESP 입출력 ──────────────────────────────────────
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline(65536)
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # 인라인 명령 (redis-cli / telnet)
+            return [w for w in line.strip().split(b" ") if w]
+        args = []
+        for _ in range(int(line[1:].strip())):
+            header = self.rfile.readline(65536)
+            length = int(header[1:].strip())
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _write(self, data: bytes) -> None:
+        self.wfile.write(data)
+        self.wfile.flush()
+
+    def _simple(self, text: str) -> None:
+        self._write(f"+{text}\r\n".encode("utf-8"))
+
+    def _error(self, text: str) -> None:
+        self._write(f"-{text}\r\n".encode("utf-8"))
+
+    def _int(self, n: int) -> None:
+        self._write(f":{n}\r\n".encode("ascii"))
+
+    def _bulk(self, value: Optional[bytes]) -> None:
+        if value is None:
+            self._write(b"$-1\r\n")
+        else:
+            self._write(b"$%d\r\n%s\r\n" % (len(value), value))
+
+    def handle(self) -> None:
+        try:
+            while True:
+                args = self._read_command()
+                if args is None:
+                    return
+                if not args:
+                    continue
+                cmd = args[0].decode("utf-8", errors="replace").upper()
+                self.server.stats.hit(cmd)
+                if not self._inject_fault():
+                    self._execute(cmd, args[1:])
+        except (ConnectionError, OSError, ValueError):
+            return
+
+    def _inject_fault(self) -> bool:
+        fp = self.server.config.faults
+        roll = self.server.roll()
+        if roll < fp.drop_rate:
+            self.server.stats.fault("drop")
+            raise ConnectionError("injected drop")
+        roll -= fp.drop_rate
+        delay = self.server.next_delay()
+        if delay > 0:
+            time.sleep(delay)
+        if roll < fp.error_rate:
+            self.server.stats.fault("error")
+            self._error("ERR injected failure (standin)")
+            return True
+        return False
+
+    # ─── 명령 ────────────────────────────────────────────
+    def _execute(self, cmd: str, args: List[bytes]) -> None:
+        db = self.server
+        if cmd == "PING" and args:
+            self._bulk(args[0])
+        elif cmd == "PING":
+            self._simple("PONG")
+        elif cmd == "ECHO":
+            self._bulk(args[0] if args else b"")
+        elif cmd in ("SELECT", "CLIENT"):
+            self._simple("OK")
+        elif cmd == "GET":
+            self._bulk(db.get(args[0]))
+        elif cmd == "SET":
+            self._set(args)
+        elif cmd == "DEL":
+            self._int(sum(db.delete(k) for k in args))
+        elif cmd == "EXISTS":
+            self._int(sum(1 for k in args if db.get(k) is not None))
+        elif cmd == "EXPIRE":
+            self._int(db.expire(args[0], float(args[1])))
+        elif cmd in ("TTL", "PTTL"):
+            ttl = db.ttl(args[0])
+            self._int(ttl if ttl < 0 else int(ttl * 1000) if cmd == "PTTL" else int(ttl + 0.5))
+        elif cmd == "DBSIZE":
+            self._int(db.size())
+        elif cmd in ("FLUSHDB", "FLUSHALL"):
+            db.flush()
+            self._simple("OK")
+        else:
+            self._error(f"ERR unknown command '{cmd}' (standin)")
+
+    def _set(self, args: List[bytes]) -> None:
+        key, value = args[0], args[1]
+        ttl: Optional[float] = None
+        nx = xx = False
+        opts = [a.decode("ascii").upper() for a in args[2:]]
+        i = 0
+        while i < len(opts):
+            if opts[i] == "EX":
+                ttl, i = float(opts[i + 1]), i + 2
+            elif opts[i] == "PX":
+                ttl, i = float(opts[i + 1]) / 1000.0, i + 2
+            elif opts[i] in ("NX", "XX"):
+                nx, xx = nx or opts[i] == "NX", xx or opts[i] == "XX"
+                i += 1
+            else:
+                self._error("ERR syntax error")
+                return
+        exists = self.server.get(key) is not None
+        if (nx and exists) or (xx and not exists):
+            self._bulk(None)
+            return
+        self.server.set(key, value, ttl)
+        self._simple("OK")
+
+
+class RedisStandinServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, addr, config: StandinConfig):
+        super().__init__(addr, RedisStandinHandler)
+        self.config = config
+        self.stats = StandinStats()
+        self._lock = threading.Lock()
+        self._rng = random.Random(config.seed or stable_hash(config.name))
+        # key -> (value, 만료 시각 monotonic 또는 None)
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+    def roll(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def next_delay(self) -> float:
+        with self._lock:
+            return self.config.latency.sample(self._rng)
+
+    def _live(self, key: bytes) -> Optional[Tuple[bytes, Optional[float]]]:
+        item = self._data.get(key)
+        if item is not None and item[1] is not None and item[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return item
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        with self._lock:
+            item = self._live(key)
+            return item[0] if item else None
+
+    def set(self, key: bytes, value: bytes, ttl: Optional[float]) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl if ttl else None)
+
+    def delete(self, key: bytes) -> int:
+        with self._lock:
+            return 1 if self._live(key) is not None and self._data.pop(key, None) is not None else 0
+
+    def expire(self, key: bytes, ttl: float) -> int:
+        with self._lock:
+            item = self._live(key)
+            if item is None:
+                return 0
+            self._data[key] = (item[0], time.monotonic() + ttl)
+            return 1
+
+    def ttl(self, key: bytes) -> float:
+        """남은 초. 키 없음 -2, 만료 없음 -1 (Redis와 동일)"""
+        with self._lock:
+            item = self._live(key)
+            if item is None:
+                return -2
+            return -1 if item[1] is None else max(0.0, item[1] - time.monotonic())
+
+    def size(self) -> int:
+        with self._lock:
+            return sum(1 for k in list(self._data) if self._live(k) is not None)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def serve_redis_in_thread(config: StandinConfig, host: str = "127.0.0.1", port: int = 0) -> RunningStandin:
+    server = RedisStandinServer((host, port), config)
+    thread = threading.Thread(target=server.serve_forever, name="standin-redis", daemon=True)
+    thread.start()
+    return RunningStandin(server, thread, scheme="redis")
@@ -0,0 +1,134 @@
+"""
+File: smtp_standin.py
+Created: 2026-10-19
+Description: SMTP 스탠드인 (SMTP_HOST=127.0.0.1 SMTP_PORT=<port> SMTP_STARTTLS=false)
+             - EHLO/HELO, AUTH PLAIN/LOGIN(항상 성공), MAIL/RCPT/DATA, RSET, NOOP, QUIT
+             - 받은 메일은 메모리에 보관 (messages)
+             - DATA 완료 시점에 지연을 넣고, 오류 주입 시 451 응답
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+from __future__ import annotations
+
+import random
+import socketserver
+import threading
+import time
+from typing import Dict, List
+
+from devtools.standins.common import RunningStandin, StandinConfig, StandinStats, stable_hash
+
+
+class SMTPStandinHandler(socketserver.StreamRequestHandler):
+    server: "SMTPStandinServer"
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write((line + "\r\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def _readline(self) -> str:
+        raw = self.rfile.readline(65536)
+        if not raw:
+            raise ConnectionError("client closed")
+        return raw.decode("utf-8", errors="replace").rstrip("\r\n")
+
+    def handle(self) -> None:
+        self._reply("220 standin ESMTP ready")
+        mail_from = ""
+        rcpts: List[str] = []
+        try:
+            while True:
+                line = self._readline()
+                verb = line.split(" ", 1)[0].upper()
+                arg = line[len(verb):].strip()
+                self.server.stats.hit(verb)
+                if verb == "EHLO":
+                    self._reply("250-standin")
+                    self._reply("250-AUTH PLAIN LOGIN")
+                    self._reply("250 8BITMIME")
+                elif verb == "HELO":
+                    self._reply("250 standin")
+                elif verb == "AUTH":
+                    mech = arg.split(" ", 1)[0].upper()
+                    if mech == "LOGIN":
+                        if " " not in arg:
+                            self._reply("334 VXNlcm5hbWU6")
+                            self._readline()
+                        self._reply("334 UGFzc3dvcmQ6")
+                        self._readline()
+                    elif mech == "PLAIN" and " " not in arg:
+                        self._reply("334 ")
+                        self._readline()
+                    self._reply("235 2.7.0 Authentication successful")
+                elif verb == "MAIL":
+                    mail_from = arg.split(":", 1)[-1].strip().strip("<>")
+                    rcpts = []
+                    self._reply("250 OK")
+                elif verb == "RCPT":
+                    rcpts.append(arg.split(":", 1)[-1].strip().strip("<>"))
+                    self._reply("250 OK")
+                elif verb == "DATA":
+                    self._reply("354 End data with <CR><LF>.<CR><LF>")
+                    lines = []
+                    while True:
+                        data_line = self._readline()
+                        if data_line == ".":
+                            break
+                        lines.append(data_line[1:] if data_line.startswith("..") else data_line)
+                    delay = self.server.next_delay()
+                    if delay > 0:
+                        time.sleep(delay)
+                    if self.server.roll() < self.server.config.faults.error_rate:
+                        self.server.stats.fault("451")
+                        self._reply("451 4.3.0 injected temporary failure")
+                    else:
+                        self.server.store(mail_from, rcpts, "\n".join(lines))
+                        self._reply("250 OK queued")
+                elif verb == "RSET":
+                    mail_from, rcpts = "", []
+                    self._reply("250 OK")
+                elif verb == "NOOP":
+                    self._reply("250 OK")
+                elif verb == "QUIT":
+                    self._reply("221 Bye")
+                    return
+                elif verb == "STARTTLS":
+                    self._reply("454 4.7.0 TLS not available (standin)")
+                else:
+                    self._reply("502 5.5.2 Command not recognized")
+        except (ConnectionError, OSError):
+            return
+
+
+class SMTPStandinServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, addr, config: StandinConfig):
+        super().__init__(addr, SMTPStandinHandler)
+        self.config = config
+        self.stats = StandinStats()
+        self.messages: List[Dict[str, object]] = []
+        self._lock = threading.Lock()
+        self._rng = random.Random(config.seed or stable_hash(config.name))
+
+    def roll(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def next_delay(self) -> float:
+        with self._lock:
+            return self.config.latency.sample(self._rng)
+
+    def store(self, mail_from: str, rcpts: List[str], body: str) -> None:
+        with self._lock:
+            self.messages.append({"from": mail_from, "to": list(rcpts), "body": body})
+
+
+def serve_smtp_in_thread(config: StandinConfig, host: str = "127.0.0.1", port: int = 0) -> RunningStandin:
+    server = SMTPStandinServer((host, port), config)
+    thread = threading.Thread(target=server.serve_forever, name="standin-smtp", daemon=True)
+    thread.start()
+    return RunningStandin(server, thread, scheme="smtp")
@@ -0,0 +1,51 @@
+"""
+File: tavily_standin.py
+Created: 2026-10-19
+Description: Tavily 검색 API 스탠드인 (TAVILY_BASE_URL=http://127.0.0.1:<port>)
+             - POST /search → answer / results (include_answer 반영, max_results 기본 5)
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+from __future__ import annotations
+
+import random
+
+from devtools.standins.common import StandinHandler, stable_hash
+
+_TOPICS = ["생성형 AI", "백엔드 아키텍처", "클라우드 비용 최적화", "MLOps", "벡터 데이터베이스"]
+
+
+class TavilyStandinHandler(StandinHandler):
+    def routes(self):
+        return {("POST", "/search"): "search"}
+
+    def search(self) -> None:
+        req = self.read_json()
+        query = str(req.get("query", ""))
+        rng = random.Random(stable_hash("tavily", query))
+        n = int(req.get("max_results") or 5)
+        results = []
+        for i in range(n):
+            topic = rng.choice(_TOPICS)
+            results.append({
+                "title": f"{topic} 동향 리포트 #{i + 1}",
+                "url": f"https://news.example.com/{stable_hash(query, i) % 10**8}",
+                "content": f"{query} 관련 최신 소식: {topic} 분야에서 새로운 도구와 사례가 빠르게 늘고 있습니다.",
+                "score": round(1.0 - i * 0.1, 2),
+                "raw_content": None,
+            })
+        body = {
+            "query": query,
+            "follow_up_questions": None,
+            "images": [],
+            "results": results,
+            "response_time": 0.0,
+        }
+        if req.get("include_answer"):
+            body["answer"] = (
+                f"'{query}'에 대한 요약: 최근 {results[0]['title'].split(' 동향')[0]} 관련 채용 수요가 늘고 있으며, "
+                "실무 경험과 성능 최적화 역량이 중요하게 평가되고 있습니다."
+            )
+        self.send_json(200, body)
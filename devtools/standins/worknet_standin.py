@@ -0,0 +1,70 @@
+"""
+File: worknet_standin.py
+Created: 2026-10-19
+Description: 워크넷(고용24) 채용정보 API 스탠드인 (WORKNET_URL_BASE=http://127.0.0.1:<port>/openapi)
+             - GET 임의 경로 → dhsOpenEmpInfo 목록 XML (startPage / display / empWantedTitle 반영)
+             - 같은 쿼리에는 항상 같은 공고 목록
+
+Modification History:
+- 2026-10-19: 초기 생성
+"""
+
+from __future__ import annotations
+
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+from devtools.standins.common import StandinHandler, stable_hash
+
+TOTAL_POSTINGS = 1234
+_COMPANIES = ["에이아이웍스", "데이터랩", "클라우드원", "넥스트소프트", "파이랩스", "비전테크"]
+_TITLES = ["백엔드 개발자", "데이터 엔지니어", "머신러닝 엔지니어", "프론트엔드 개발자", "DevOps 엔지니어"]
+_TYPES = ["정규직", "계약직", "인턴"]
+
+
+def build_jobs_xml(start_page: int, display: int, title_filter: str = "") -> str:
+    start_page = max(1, start_page)
+    display = max(1, min(100, display))
+    items = []
+    first = (start_page - 1) * display
+    for i in range(first, min(first + display, TOTAL_POSTINGS)):
+        h = stable_hash("worknet", i, title_filter)
+        title = f"{title_filter or _TITLES[h % len(_TITLES)]} 채용 ({i + 1})"
+        items.append(
+            "<dhsOpenEmpInfo>"
+            f"<empSeqno>{100000 + i}</empSeqno>"
+            f"<empWantedTitle>{escape(title)}</empWantedTitle>"
+            f"<empBusiNm>{_COMPANIES[h % len(_COMPANIES)]}</empBusiNm>"
+            f"<coClcdNm>{'대기업' if h % 5 == 0 else '중소기업'}</coClcdNm>"
+            f"<empWantedStdt>20261001</empWantedStdt>"
+            f"<empWantedEndt>2026{11 + h % 2:02d}{1 + h % 28:02d}</empWantedEndt>"
+            f"<empWantedTypeNm>{_TYPES[h % len(_TYPES)]}</empWantedTypeNm>"
+            "<regLogImgNm></regLogImgNm>"
+            f"<empWantedHomepgDetail>https://example.com/jobs/{100000 + i}</empWantedHomepgDetail>"
+            f"<empWantedMobileUrl>https://m.example.com/jobs/{100000 + i}</empWantedMobileUrl>"
+            "</dhsOpenEmpInfo>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f"<dhsOpenEmpInfoList><total>{TOTAL_POSTINGS}</total><startPage>{start_page}</startPage>"
+        f"<display>{display}</display>{''.join(items)}</dhsOpenEmpInfoList>"
+    )
+
+
+class WorknetStandinHandler(StandinHandler):
+    def routes(self):
+        return {("GET", "*"): "search"}
+
+    def search(self) -> None:
+        qs = parse_qs(urlparse(self.path).query)
+
+        def first(key: str, default: str) -> str:
+            return (qs.get(key) or [default])[0]
+
+        try:
+            start_page = int(first("startPage", "1"))
+            display = int(first("display", "10"))
+        except ValueError:
+            start_page, display = 1, 10
+        body = build_jobs_xml(start_page, display, first("empWantedTitle", ""))
+        self.send_bytes(200, body.encode("utf-8"), "application/xml; charset=utf-8")
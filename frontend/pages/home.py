@@ -11,6 +11,7 @@ Modification History:
 - 2026-02-23 (김지우): UI 적용 및 마이페이지(my_info) 라우팅 연결, 프로필 기능 추가
 - 2026-02-24 (유헌상): 채용공고 APi 호출 및 연결
 - 2026-02-28 (김지우): require_login 중앙화 및 유령 버튼 투명화 버그 픽스
+- 2026-10-19: 가이드 챗봇 응답을 /home/guide/stream 토큰 스트리밍 + st.write_stream으로 표시
 """
 
 import streamlit as st
@@ -33,7 +34,7 @@ import streamlit.components.v1 as components
 from utils.function import inject_custom_header, require_login, render_memo_board
 from utils.home_api_render import render_memo_board, render_realtime_ai_news
 from streamlit_option_menu import option_menu
-from utils.api_utils import api_get_home_guide
+from utils.api_utils import api_stream_home_guide
 from api.jobs import search_jobs, get_latest_resume
 from services.jobs_service import build_job_cards_data
 from components.job_cards import render_job_cards
@@ -62,11 +63,7 @@ def get_web_context_first(query):
 
 def get_home_guide_response_stream(user_message, web_context):
     use_web_search = web_context == "__USE_WEB_SEARCH__"
-    success, result = api_get_home_guide(user_message, use_web_search=use_web_search)
-    if success:
-        yield result.get("content", "")
-    else:
-        yield str(result)
+    yield from api_stream_home_guide(user_message, use_web_search=use_web_search)
 
 
 # CSS
@@ -745,14 +742,16 @@ def chatbot_modal():
                     web_info = get_web_context_first(prompt)
 
             placeholder = st.empty()
-            full_reply = ""
 
-            for chunk in get_home_guide_response_stream(prompt, web_info):
-                full_reply += chunk
-                placeholder.markdown(
-                    f"""<div style="display:flex; align-items:flex-start; gap:10px; justify-content:flex-start; margin-bottom:12px; font-family: -apple-system, sans-serif;"><div style="font-size: 28px; line-height: 1;">🦁</div><div><div style="font-size: 12px; font-weight: 600; color: #bb38d0; margin-bottom: 4px; margin-left: 4px;">AI 사자개</div><div class="ai-bubble">{full_reply}▌</div></div></div>""",
+            # 스트리밍 중에는 st.write_stream으로 도착한 청크를 바로 그리고, 끝나면 말풍선으로 교체
+            with placeholder.container():
+                st.markdown(
+                    """<div style="display:flex; align-items:center; gap:10px; margin-bottom:4px; font-family: -apple-system, sans-serif;"><div style="font-size: 28px; line-height: 1;">🦁</div><div style="font-size: 12px; font-weight: 600; color: #bb38d0;">AI 사자개</div></div>""",
                     unsafe_allow_html=True,
                 )
+                full_reply = st.write_stream(get_home_guide_response_stream(prompt, web_info))
+            if not isinstance(full_reply, str):
+                full_reply = "".join(str(part) for part in full_reply)
 
             placeholder.markdown(
                 f"""<div style="display:flex; align-items:flex-start; gap:10px; justify-content:flex-start; margin-bottom:12px; font-family: -apple-system, sans-serif;"><div style="font-size: 28px; line-height: 1;">🦁</div><div><div style="font-size: 12px; font-weight: 600; color: #bb38d0; margin-bottom: 4px; margin-left: 4px;">AI 사자개</div><div class="ai-bubble">{full_reply}</div></div></div>""",
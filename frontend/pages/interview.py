@@ -7,12 +7,12 @@ import base64
 import io
 import json
 import os
+import re
 import time
 import requests
 
 import streamlit as st
 import streamlit.components.v1 as components
-from openai import OpenAI
 
 # 백엔드 모듈 경로 추가
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -27,7 +27,9 @@ if backend_dir not in sys.path:
 
 from utils.api_utils import (
     api_end_interview,
+    api_get_interview_report,
     api_get_question_pool,
+    api_request_interview_report,
     api_start_interview,
     api_stt_bytes,
 )
@@ -36,6 +38,8 @@ from utils.config import API_BASE_URL
 from utils.function import require_login, inject_custom_header
 
 from services.llm_service import generate_evaluation, analyze_resume_comprehensive
+from backend.core.http_clients import get_openai_client
+from backend.core.llm_scheduler import Priority, run_llm
 from services.rag_service import store_resume
 
 # 페이지 기본 설정
@@ -212,9 +216,14 @@ def generate_tts(text: str) -> bytes | None:
     if not api_key:
         return None
     try:
-        client = OpenAI(api_key=api_key)
-        tts_response = client.audio.speech.create(
-            model="tts-1", voice="echo", input=text
+        client = get_openai_client(api_key)
+        tts_response = run_llm(
+            lambda: client.audio.speech.create(
+                model="tts-1", voice="echo", input=text
+            ),
+            model="tts-1",
+            priority=Priority.INTERACTIVE,
+            call_site="generate_tts",
         )
         return tts_response.content
     except Exception:
@@ -274,6 +283,9 @@ def process_answer(answer_text: str) -> bool:
         "next_main_question": next_q,
         "followup_count": st.session_state.get("current_followup_count", 0),
         "attitude": None,
+        # 임시 점수로 처리된 턴을 나중에 재채점해 interview_details에 반영하기 위한 키
+        "session_id": st.session_state.get("db_session_id"),
+        "turn_index": st.session_state.turn_index + 1,
     }
 
     try:
@@ -304,6 +316,7 @@ def process_answer(answer_text: str) -> bool:
 
     st.session_state.db_scores.append(score)
     st.session_state.messages[-1]["score"] = score
+    st.session_state.messages[-1]["provisional"] = bool(result.get("provisional", False))
     st.session_state.turn_index += 1
 
     try:
@@ -356,6 +369,8 @@ defaults = {
     "interview_mode": None,
     "chatbot_started": False,
     "evaluation_result": None,
+    "report_job_requested": False,
+    "report_wait_started": None,
     "resume_text": None,
     "persona_style": None,
     "db_session_id": None,
@@ -375,6 +390,67 @@ for k, v in defaults.items():
         st.session_state[k] = v
 
 
+# 백엔드 리포트 작업 상태 확인 간격 / 최대 대기 (넘기면 로컬 생성으로 대체)
+REPORT_POLL_SEC = 2
+REPORT_WAIT_SEC = 90
+
+
+def poll_backend_report(session_id):
+    """
+    리포트 작업 상태를 한 번만 확인하고 (상태, 마크다운)을 돌려준다. 기다리지 않는다.
+    첫 호출에서 작업을 등록하고, 실패/시간 초과는 ("FAILED", None)
+    """
+    if not st.session_state.get("report_job_requested"):
+        ok, job = api_request_interview_report(session_id)
+        st.session_state.report_job_requested = True
+        st.session_state.report_wait_started = time.time()
+    else:
+        ok, job = api_get_interview_report(session_id)
+    if not ok or not isinstance(job, dict):
+        return "FAILED", None
+    status = job.get("status")
+    if status == "DONE":
+        return status, job.get("report_markdown")
+    if status == "FAILED" or time.time() - st.session_state.report_wait_started > REPORT_WAIT_SEC:
+        return "FAILED", None
+    return status, None
+
+
+# 리포트 본문만 주기적으로 다시 그린다 (페이지 전체를 막고 기다리지 않도록)
+@st.fragment(run_every=REPORT_POLL_SEC)
+def report_section(total_score, eval_resume_text):
+    if st.session_state.evaluation_result is None:
+        # 리포트는 세션 종료 시 백엔드에서 이미 생성 중 → 상태만 확인 (재실행되어도 작업은 유지)
+        raw_eval = None
+        if st.session_state.db_session_id:
+            status, raw_eval = poll_backend_report(st.session_state.db_session_id)
+            if status not in ("DONE", "FAILED"):
+                st.info("AI가 리포트를 작성하고 있습니다. 완료되면 이 자리에 바로 표시됩니다.")
+                return
+        if raw_eval is None:
+            with st.spinner("AI가 분석 중입니다..."):
+                raw_eval = generate_evaluation(
+                    st.session_state.messages,
+                    st.session_state.get("job_role"),
+                    st.session_state.get("difficulty"),
+                    eval_resume_text,
+                )
+        st.session_state.evaluation_result = re.sub(
+            r"\*\*[\d\.]+\s*/\s*100점\*\*", f"**{total_score} / 100점**", raw_eval
+        )
+
+    st.markdown(st.session_state.evaluation_result)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.download_button(
+        label="📄 결과 리포트 저장 (TXT)",
+        data=st.session_state.evaluation_result,
+        file_name=f"interview_report.txt",
+        mime="text/plain",
+        use_container_width=True,
+    )
+
+
 # 팝업(모달) 선언
 @st.dialog("면접 결과 리포트", width="large")
 def evaluation_modal():
@@ -409,30 +485,7 @@ def evaluation_modal():
     else:
         eval_resume_text = st.session_state.get("resume_text")
 
-    if st.session_state.evaluation_result is None:
-        with st.spinner("AI가 분석 중입니다..."):
-            raw_eval = generate_evaluation(
-                st.session_state.messages,
-                st.session_state.get("job_role"),
-                st.session_state.get("difficulty"),
-                eval_resume_text,
-            )
-            import re
-
-            st.session_state.evaluation_result = re.sub(
-                r"\*\*[\d\.]+\s*/\s*100점\*\*", f"**{total_score} / 100점**", raw_eval
-            )
-
-    st.markdown(st.session_state.evaluation_result)
-
-    st.markdown("<br>", unsafe_allow_html=True)
-    st.download_button(
-        label="📄 결과 리포트 저장 (TXT)",
-        data=st.session_state.evaluation_result,
-        file_name=f"interview_report.txt",
-        mime="text/plain",
-        use_container_width=True,
-    )
+    report_section(total_score, eval_resume_text)
 
     st.markdown("<br>", unsafe_allow_html=True)
     col1, col2 = st.columns(2)
@@ -920,11 +973,13 @@ else:
     const DIFFICULTY = __DIFFICULTY__;
     const PERSONA = __PERSONA__;
     const USER_ID = __USER_ID__;
+    const SESSION_ID = __SESSION_ID__;
     const RESUME_TEXT = __RESUME_TEXT__;
     const FIRST_ASSISTANT = __FIRST_ASSISTANT__;
     let currentQuestion = __CURRENT_Q__;
     let qIdx = __Q_IDX__;
     let followupCount = __FOLLOWUP_COUNT__;
+    let turnIndex = __TURN_INDEX__;
 
     const btnConnect = document.getElementById("btnConnect");
     const btnStart = document.getElementById("btnStart");
@@ -956,6 +1011,16 @@ else:
     let pendingAttitudePromise = null;
     let attVideoEl = null;
     let attCanvasEl = null;
+    // 서버 샘플링 계획 (GET /infer/attitude/plan) - 못 받으면 아래 기본값
+    let attPlan = { capture_interval_ms: 500, max_capture_frames: 40, max_frames: 10, width: 320, jpeg_quality: 0.6 };
+    // 답변 중 실시간 분석 WebSocket (/infer/attitude/stream) - 열리지 않으면 제출 시 멀티파트 업로드로 대체
+    let attWs = null;
+    let attWsChain = Promise.resolve();
+    let attWsMaxFrames = 0;
+    // 스트림 분석 간격 (plan.analyze_interval_ms) - 원격 백엔드면 일괄 분석과 같은 예산만 보낸다
+    let attWsMinGapMs = 0;
+    let attWsLastT = -1;
+    let attWsSent = 0;
 
     function setStatus(text) { statusEl.textContent = text; }
     function setButtons() {
@@ -1167,7 +1232,10 @@ else:
         resume_text: RESUME_TEXT,
         next_main_question: nextQ,
         followup_count: followupCount,
-        attitude: attitude
+        attitude: attitude,
+        // 임시 점수로 처리된 턴을 나중에 재채점해 interview_details에 반영하기 위한 키
+        session_id: SESSION_ID,
+        turn_index: turnIndex + 1
       };
 
       const res = await fetch(`${BACKEND_BASE}/infer/evaluate-turn`, {
@@ -1214,6 +1282,7 @@ else:
         }
 
         const evalRes = await evaluateTurn(transcript.trim(), attitudeResult);
+        turnIndex += 1;
         let reply = (evalRes.reply_text || "").trim();
         const isFollowup = !!evalRes.is_followup;
         const score = Number(evalRes.score || 0);
@@ -1266,28 +1335,140 @@ else:
       return true;
     }
 
+    async function loadAttitudePlan() {
+      try {
+        const res = await fetch(`${BACKEND_BASE}/infer/attitude/plan`);
+        if (res.ok) attPlan = await res.json();
+      } catch (_) {}
+    }
+
     function startAttitudeCapture() {
       if (!attVideoEl || !attCanvasEl) return;
       attFrames = [];
       const ctx = attCanvasEl.getContext("2d");
       const startTs = performance.now();
+      let captured = 0;
 
       stopAttitudeCapture();
       attTimer = setInterval(() => {
         try {
+          // 서버가 버리는 프레임(계획 상한 이후)은 캡처하지 않는다 - 스트리밍 중이면 스트림 상한까지
+          const streaming = attWs && attWs.readyState === WebSocket.OPEN;
+          if (captured >= (streaming ? Math.max(attWsMaxFrames, attPlan.max_capture_frames) : attPlan.max_capture_frames)) return stopAttitudeCapture();
           if (attVideoEl.readyState < 2 || !attVideoEl.videoWidth) return;
-          const w = 320;
+          const w = attPlan.width;
           const h = Math.round((attVideoEl.videoHeight / attVideoEl.videoWidth) * w);
           attCanvasEl.width = w;
           attCanvasEl.height = h;
           ctx.drawImage(attVideoEl, 0, 0, w, h);
-          const dataUrl = attCanvasEl.toDataURL("image/jpeg", 0.6);
-          attFrames.push({
-            t_ms: Math.round(performance.now() - startTs),
-            image_b64: dataUrl.split(",")[1],
-          });
+          const t_ms = Math.round(performance.now() - startTs);
+          captured += 1;
+          // base64 대신 JPEG 바이너리(Blob) 그대로 보관
+          attCanvasEl.toBlob((blob) => {
+            if (!blob) return;
+            if (attFrames.length < attPlan.max_capture_frames) attFrames.push({ t_ms, blob });
+            sendStreamFrame(t_ms, blob);
+          }, "image/jpeg", attPlan.jpeg_quality);
         } catch (_) {}
-      }, 500);
+      }, attPlan.capture_interval_ms);
+    }
+
+    // 서버 select_frames와 같은 규칙 - 실제로 분석될 프레임만 업로드
+    function selectAttitudeFrames(frames) {
+      let picked = frames.slice().sort((a, b) => a.t_ms - b.t_ms).slice(0, attPlan.max_capture_frames);
+      if (picked.length > attPlan.max_frames) {
+        const step = Math.max(1, Math.floor(picked.length / attPlan.max_frames));
+        picked = picked.filter((_, i) => i % step === 0).slice(0, attPlan.max_frames);
+      }
+      return picked;
+    }
+
+    function openAttitudeStream() {
+      closeAttitudeStream();
+      try {
+        const ws = new WebSocket(`${BACKEND_BASE.replace(/^http/, "ws")}/infer/attitude/stream`);
+        ws.binaryType = "arraybuffer";
+        ws.onmessage = (ev) => {
+          const msg = JSON.parse(ev.data);
+          if (msg.type === "plan") {
+            attWsMaxFrames = msg.max_frames;
+            attWsMinGapMs = (msg.analyze_interval_ms || 0) - Math.floor((msg.capture_interval_ms || 0) / 2);
+          }
+        };
+        ws.onerror = () => {};
+        attWs = ws;
+        attWsChain = Promise.resolve();
+        attWsMaxFrames = 0;
+        attWsMinGapMs = 0;
+        attWsLastT = -1;
+        attWsSent = 0;
+      } catch (_) {
+        attWs = null;
+      }
+    }
+
+    function closeAttitudeStream() {
+      if (attWs) {
+        try { attWs.close(); } catch (_) {}
+      }
+      attWs = null;
+    }
+
+    // 프레임 1장 = 4바이트 t_ms(빅엔디언) + JPEG. 순서가 바뀌면 서버가 버리므로 체인으로 차례대로 보낸다
+    function sendStreamFrame(t_ms, blob) {
+      const ws = attWs;
+      if (!ws || ws.readyState !== WebSocket.OPEN) return;
+      // 서버가 분석하지 않을 프레임(간격/예산 밖)은 보내지 않는다. 계획을 받기 전이면 서버가 거른다
+      if (attWsMaxFrames) {
+        if (attWsSent >= attWsMaxFrames) return;
+        if (attWsLastT >= 0 && t_ms - attWsLastT < attWsMinGapMs) return;
+      }
+      attWsLastT = t_ms;
+      attWsSent += 1;
+      attWsChain = attWsChain
+        .then(() => blob.arrayBuffer())
+        .then((buf) => {
+          if (ws.readyState !== WebSocket.OPEN) return;
+          const out = new Uint8Array(4 + buf.byteLength);
+          new DataView(out.buffer).setUint32(0, t_ms);
+          out.set(new Uint8Array(buf), 4);
+          ws.send(out);
+        })
+        .catch(() => {});
+    }
+
+    // stop 신호 후 서버가 바로 돌려주는 최종 요약. 스트림이 없거나 실패하면 null
+    function finishAttitudeStream(timeoutMs = 5000) {
+      const ws = attWs;
+      attWs = null;
+      if (!ws || ws.readyState !== WebSocket.OPEN) {
+        if (ws) { try { ws.close(); } catch (_) {} }
+        return Promise.resolve(null);
+      }
+      return new Promise((resolve) => {
+        const timer = setTimeout(() => { try { ws.close(); } catch (_) {} resolve(null); }, timeoutMs);
+        ws.onmessage = (ev) => {
+          const msg = JSON.parse(ev.data);
+          if (msg.type !== "result") return;
+          clearTimeout(timer);
+          delete msg.type;
+          resolve(msg);
+        };
+        ws.onclose = () => { clearTimeout(timer); resolve(null); };
+        attWsChain.then(() => ws.send(JSON.stringify({ type: "stop" })));
+      });
+    }
+
+    function uploadAttitudeFrames() {
+      const picked = selectAttitudeFrames(attFrames);
+      if (!picked.length) return Promise.resolve(null);
+      const form = new FormData();
+      picked.forEach((fr, i) => {
+        form.append("frames", fr.blob, `frame_${i}.jpg`);
+        form.append("t_ms", String(fr.t_ms));
+      });
+      return fetch(`${BACKEND_BASE}/infer/attitude/frames`, { method: "POST", body: form })
+        .then((res) => res.ok ? res.json() : null);
     }
 
     function stopAttitudeCapture() {
@@ -1401,6 +1582,7 @@ else:
           attCanvasEl.style.display = "none";
           document.body.appendChild(attCanvasEl);
         }
+        loadAttitudePlan();
 
         pc = new RTCPeerConnection();
         pc.addTrack(micTrack, stream);
@@ -1497,6 +1679,7 @@ else:
       sendEvent({ type: "input_audio_buffer.clear" });
       setStatus("녹음 중... 답변 후 [제출]을 눌러주세요.");
       setButtons();
+      openAttitudeStream();
       startAttitudeCapture();
     }
 
@@ -1521,12 +1704,8 @@ else:
           setButtons();
         }
       }, 250);
-      pendingAttitudePromise = fetch(`${BACKEND_BASE}/infer/attitude`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ frames: attFrames.slice(0, 40) }),
-      })
-        .then((res) => res.ok ? res.json() : null)
+      pendingAttitudePromise = finishAttitudeStream()
+        .then((data) => data || uploadAttitudeFrames())
         .then((data) => {
           lastAttitude = data;
           return data;
@@ -1538,6 +1717,7 @@ else:
       try {
         ended = true;
         if (micTrack) micTrack.enabled = false;
+        closeAttitudeStream();
         if (dc) dc.close();
         if (pc) pc.close();
         if (stream) stream.getTracks().forEach(t => t.stop());
@@ -1611,6 +1791,10 @@ else:
                     ensure_ascii=False,
                 ),
             )
+            .replace("__SESSION_ID__", json.dumps(st.session_state.get("db_session_id")))
+            .replace(
+                "__TURN_INDEX__", json.dumps(int(st.session_state.get("turn_index", 0)))
+            )
             .replace(
                 "__RESUME_TEXT__",
                 json.dumps(
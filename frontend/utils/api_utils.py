@@ -12,6 +12,8 @@ Modification History:
 - 2026-02-23 (김지우): 휴면(dormant)/탈퇴(withdrawn) 계정 로그인 차단 메시지 처리 대응 완비
 - 2026-02-23 (김지우): 휴면 계정 해제(Unlock) API 추가
 - 2026-03-01 (김지우): 면접 기록 삭제 API 수정 (토큰 획득 로직 강화)
+- 2026-10-19: 면접 리포트 백그라운드 작업 등록/조회 API 추가
+- 2026-10-19: 홈 가이드 챗봇 스트리밍 API(api_stream_home_guide) 추가
 """
 import requests
 import streamlit as st
@@ -235,6 +237,43 @@ def api_get_home_guide(message, use_web_search=False):
     )
 
 
+def api_stream_home_guide(message, use_web_search=False):
+    """
+    /home/guide/stream 응답을 청크 단위로 yield (st.write_stream에 그대로 전달 가능)
+    스트리밍 연결 자체가 실패하면 기존 /home/guide 단건 응답으로 대체
+    (이미 일부 청크를 보낸 뒤 끊긴 경우에는 중복 출력을 막기 위해 그대로 종료)
+    """
+    streamed = False
+    url = f"{API_BASE_URL.rstrip('/')}/home/guide/stream"
+    headers = {}
+    if st.session_state.get("token"):
+        headers["Authorization"] = f"Bearer {st.session_state.token}"
+
+    try:
+        # timeout=(연결, 청크 간 최대 대기)
+        with requests.post(
+            url,
+            json={"message": message, "use_web_search": use_web_search},
+            headers=headers,
+            stream=True,
+            timeout=(5, 120),
+        ) as response:
+            if response.status_code == 200:
+                response.encoding = "utf-8"
+                for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+                    if chunk:
+                        streamed = True
+                        yield chunk
+                return
+    except requests.exceptions.RequestException as e:
+        if streamed:
+            return
+        print(f"DEBUG: guide stream failed ({e}), fallback to /home/guide")
+
+    success, result = api_get_home_guide(message, use_web_search=use_web_search)
+    yield result.get("content", "") if success else str(result)
+
+
 # 면접 및 RAG 관련 (Inference)
 def api_ingest_resume(file):
     """이력서 PDF를 백엔드에 업로드하여 벡터 DB에 인덱싱
@@ -290,6 +329,17 @@ def api_end_interview(session_id):
     return _handle_request("POST", "/infer/end", json={"session_id": session_id})
 
 
+def api_request_interview_report(session_id, force=False):
+    """리포트 작업 등록 (세션당 1회, 이미 있으면 현재 상태 반환)"""
+    return _handle_request(
+        "POST", f"/interview/sessions/{session_id}/report", params={"force": force}, timeout=10
+    )
+
+
+def api_get_interview_report(session_id):
+    return _handle_request("GET", f"/interview/sessions/{session_id}/report", timeout=10)
+
+
 def api_stt_whisper(audio_file):
     """
     사용자의 음성 파일을 백엔드로 전달하여 텍스트(STT)로 변환합니다.